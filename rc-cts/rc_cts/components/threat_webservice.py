@@ -36,6 +36,7 @@ Searchers register to a single path, e.g. '/cts/gsb' for the Google Safe Browsin
 import json
 import logging
 import base64
+import threading
 from collections import namedtuple
 from distutils.util import strtobool
 from uuid import UUID, uuid4, uuid5
@@ -190,6 +191,8 @@ class CustomThreatService(BaseController):
         # IDs and their results are maintained in a cache so that we can set
         # an upper bound on the number of in-progress and recent lookups.
         self.cache = TTLCache(maxsize=self.cache_size, ttl=self.cache_ttl)
+        # The POST and GET handlers can run in the request workers of the web server
+        self.cache_lock = threading.Lock()
 
         # Helper component does event dispatch work
         self.async_helper = CustomThreatServiceHelper(self)
@@ -212,7 +215,7 @@ class CustomThreatService(BaseController):
         options = {"upload_file": bool(self.support_upload_file)}
         return options
 
-    @exposeWeb("POST")
+    @exposeWeb("POST", threaded=True)
     def _post_request(self, event, *args, **kwargs):
         LOG.info(event.args[0])
 
@@ -286,23 +289,25 @@ class CustomThreatService(BaseController):
             # and we want to return an immediate (not async) response
             return response_object
 
-        # If we already have a completed query for this key, return it immmediately
-        request_data = self.cache.get(cache_key)
-        if request_data and request_data.get("complete"):
-            response_object["hits"] = request_data.get("hits", [])
-            return response_object
+        with self.cache_lock:
+            # If we already have a completed query for this key, return it immmediately
+            request_data = self.cache.get(cache_key)
+            if request_data and request_data.get("complete"):
+                response_object["hits"] = request_data.get("hits", [])
+                return response_object
+
+            # Add the request to the cache, then notify searchers that there's a new request
+            self.cache.setdefault(cache_key, {"id": request_id, "artifact": body, "hits": [], "complete": False})
 
         response.status = 303
         response_object["retry_secs"] = self.first_retry_secs
 
-        # Add the request to the cache, then notify searchers that there's a new request
-        self.cache.setdefault(cache_key, {"id": request_id, "artifact": body, "hits": [], "complete": False})
         evt = ThreatServiceLookupEvent(request_id=request_id, name=artifact_type, artifact=body, channel=cts_channel)
         self.async_helper.fire(evt, HELPER_CHANNEL)
 
         return response_object
 
-    @exposeWeb("GET")
+    @exposeWeb("GET", threaded=True)
     def _get_request(self, event, *args, **kwargs):
         LOG.info(event.args[0])
 
@@ -312,7 +317,8 @@ class CustomThreatService(BaseController):
             response.status = 500
             return {"id": None, "hits": []}
 
-        result = self._handle_get_request(event, *args, **kwargs)
+        with self.cache_lock:
+            result = self._handle_get_request(event, *args, **kwargs)
         LOG.info("%s: %s", event.args[1].status, json.dumps(result))
         return result
 
@@ -409,7 +415,8 @@ class CustomThreatService(BaseController):
 
         # Store the result and mark as complete (or not)
         cache_key = (cts_channel, request_id)
-        self.cache[cache_key] = {"id": request_id, "artifact": artifact, "hits": hits, "complete": complete}
+        with self.cache_lock:
+            self.cache[cache_key] = {"id": request_id, "artifact": artifact, "hits": hits, "complete": complete}
 
     def _get_authentication_headers(self, request):
         """[extract user/password info in http header: Authentication Basic into a list]"""
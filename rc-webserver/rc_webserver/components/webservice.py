@@ -4,10 +4,16 @@
 """The main web server"""
 
 import os
+import time
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+
 import pkg_resources
+from circuits import Event, Timer, handler
+from circuits.net.events import close
 from circuits.web import Server
+from circuits.web.errors import httperror
 
 LOG = logging.getLogger(__name__)
 
@@ -16,6 +22,13 @@ CONFIG_SERVER = "server"
 CONFIG_PORT = "port"
 CONFIG_SECURE = "secure"
 CONFIG_CERTFILE = "certfile"
+CONFIG_REQUEST_WORKERS = "request_workers"
+CONFIG_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONFIG_MAX_BODY_SIZE = "max_body_size"
+CONFIG_KEEPALIVE_TIMEOUT = "keepalive_timeout"
+
+# Seconds a client is asked to wait before retrying when max_concurrent_requests is reached
+RETRY_AFTER_SECS = 1
 
 
 def config_section_data():
@@ -49,13 +62,132 @@ def _make_args(opts):
 
 
 class WebService(Server):
-    """A Circuits-based web server."""
+    """
+    A Circuits-based web server.
+
+    These options of the ``[webserver]`` section stop slow or large requests
+    from holding up the event loop that also dispatches the app's functions:
+
+    * ``request_workers``: threads that run the ``exposeWeb(..., threaded=True)`` handlers
+    * ``max_concurrent_requests``: requests handled at once, more are answered with 503
+    * ``max_body_size``: bytes of a request body, larger requests are answered with 413
+    * ``keepalive_timeout``: seconds an idle keep-alive connection stays open
+
+    Each is 0 by default, which leaves it off.
+
+    ``max_body_size`` and ``keepalive_timeout`` look at the requests that the
+    ``HTTP`` component of circuits is reading, in its ``_clients`` and ``_buffers``.
+    circuits has no public API for them, so its version is pinned to 3.2.
+    """
 
     def __init__(self, opts):
         try:
             super(WebService, self).__init__(_make_loc(opts), **_make_args(opts))
             self.options = opts.get(CONFIG_SECTION, {})
+
+            self.request_workers = int(self.options.get(CONFIG_REQUEST_WORKERS, 0))
+            self.max_concurrent_requests = int(self.options.get(CONFIG_MAX_CONCURRENT_REQUESTS, 0))
+            self.max_body_size = int(self.options.get(CONFIG_MAX_BODY_SIZE, 0))
+            self.keepalive_timeout = float(self.options.get(CONFIG_KEEPALIVE_TIMEOUT, 0))
+
+            # Socket of each request being handled
+            self._in_flight = {}
+            # Time of the last activity on each connection, if keepalive_timeout is set
+            self._last_active = {}
+            # Connections whose request was too large, ignored until they are closed
+            self._rejected = set()
+
+            # Pool of the exposeWeb(..., threaded=True) handlers of the requests this server accepts
+            self.request_pool = None
+            if self.request_workers > 0:
+                self.request_pool = ThreadPoolExecutor(max_workers=self.request_workers, thread_name_prefix="rc-webserver")
+            if self.keepalive_timeout > 0:
+                Timer(min(self.keepalive_timeout, 1), Event.create("keepalive_check"),
+                      self.channel, persist=True).register(self)
+
             LOG.info("WebService listen address: %s", self.http.base)
         except:
             LOG.error(traceback.format_exc())
             raise
+
+    @handler("read", priority=1.0)
+    def _on_read(self, event, sock, data):
+        """Reject a request as soon as its Content-Length is more than max_body_size"""
+        self._set_active(sock)
+        if sock in self._rejected:
+            event.stop()
+            return
+
+        # The headers of a request are parsed, and its body is still being read.
+        # Without them, the request is rejected once its body is read, in _on_request
+        clients = getattr(self.http, "_clients", {})
+        buffers = getattr(self.http, "_buffers", {})
+        if self.max_body_size and sock in clients and sock in buffers:
+            req, res = clients[sock]
+            if int(req.headers.get("Content-Length", 0)) > self.max_body_size:
+                event.stop()
+                del buffers[sock]
+                self._rejected.add(sock)
+                res.close = True
+                self.fire(httperror(req, res, 413))
+
+    @handler("request", priority=1.0)
+    def _on_request(self, event, req, res, peer_cert=None):
+        """Apply max_body_size and max_concurrent_requests before a request is dispatched"""
+        if self.max_body_size and len(req.body.getvalue()) > self.max_body_size:
+            event.stop()
+            res.close = True
+            return httperror(req, res, 413)
+
+        if self.max_concurrent_requests and len(self._in_flight) >= self.max_concurrent_requests:
+            event.stop()
+            res.headers["Retry-After"] = str(RETRY_AFTER_SECS)
+            return httperror(req, res, 503)
+
+        self._in_flight[req] = req.sock
+
+    @handler("request_complete")
+    def _on_request_complete(self, e, value):
+        # circuits sends no response for some values a handler returns
+        self._in_flight.pop(e.args[0], None)
+
+    @handler("response")
+    def _on_response(self, res):
+        self._in_flight.pop(res.request, None)
+        # The client may have disconnected while its request was handled
+        if res.request.sock in self._last_active:
+            self._set_active(res.request.sock)
+
+    @handler("connect")
+    def _on_connect(self, sock, *args):
+        self._set_active(sock)
+
+    @handler("disconnect")
+    def _on_disconnect(self, sock):
+        self._last_active.pop(sock, None)
+        self._rejected.discard(sock)
+        for req, req_sock in list(self._in_flight.items()):
+            if req_sock is sock:
+                del self._in_flight[req]
+
+    def _set_active(self, sock):
+        """Record activity on a connection, for the keep-alive check"""
+        if self.keepalive_timeout > 0:
+            self._last_active[sock] = time.time()
+
+    @handler("keepalive_check")
+    def _on_keepalive_check(self):
+        """Close the keep-alive connections idle for more than keepalive_timeout"""
+        idle_since = time.time() - self.keepalive_timeout
+        clients = getattr(self.http, "_clients", {})
+        for sock, last_active in list(self._last_active.items()):
+            # Leave the connections with a request being read or handled
+            if last_active < idle_since and sock not in clients:
+                del self._last_active[sock]
+                self.fire(close(sock))
+
+    @handler("stopped", channel="*")
+    def _on_stopped(self, manager):
+        if self.request_pool is not None:
+            self.request_pool.shutdown(wait=False)
+            self.request_pool = None
@@ -15,15 +15,88 @@ else:
     from inspect import getfullargspec
 
 
+from circuits import Event
 from circuits.core import handler
+from circuits.core.utils import findroot, findtype
 from circuits.web.wrappers import Response
 from circuits.web.exceptions import HTTPException
 from circuits.web.errors import httperror
-import circuits.six as six
+from six import string_types
 
 
 LOG = logging.getLogger(__name__)
 
+def get_request_workers(controller, request):
+    """
+    Get the pool of ``request_workers`` threads that runs the ``exposeWeb`` handlers
+    declared with ``threaded=True``: the pool of the ``WebService`` that accepted ``request``,
+    else of the first ``WebService`` registered with the manager of ``controller``
+
+    :param controller: the component of the handler
+    :type controller: circuits.web.BaseController
+    :param request: the request being handled
+    :type request: circuits.web.wrappers.Request
+    :return: the pool, or None if the handlers run on the event loop
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    server = getattr(request, "server", None)
+    if server is None or not hasattr(server, "request_pool"):
+        # imported here, as the WebService imports this module
+        from rc_webserver.components.webservice import WebService
+        server = findtype(findroot(controller), WebService)
+    return getattr(server, "request_pool", None)
+
+
+def _make_result(result, request, response):
+    """Convert what an exposeWeb handler returned to what circuits sends in the response"""
+    if (isinstance(result, httperror)
+            or isinstance(result, Response)
+            or isinstance(result, string_types)):
+        return result
+
+    if result is None:
+        response.status = 204
+        return ""
+    else:
+        try:
+            response.headers["Content-Type"] = "application/json; charset=utf-8"
+            return json.dumps(result)
+        except (JSONDecodeError, TypeError) as e:
+            return httperror(request, response, code=500,
+                             description="JSON decode failed for object of type '%s'" % type(result))
+
+
+def _make_error(e, request, response):
+    """Convert an exception raised by an exposeWeb handler to a httperror"""
+    LOG.exception(e)
+    if isinstance(e, HTTPException):
+        return httperror(request, response, code=e.code, description=e.description)
+    msg = getattr(e, 'message', repr(e))
+    return httperror(request, response, code=500, description=msg)
+
+
+def _call_threaded(f, self, event, request, response, args, kwargs):
+    """Call an exposeWeb handler in a thread of the request workers"""
+    try:
+        if not getattr(f, "event", False):
+            result = f(self, *args, **kwargs)
+        else:
+            result = f(self, event, *args, **kwargs)
+        result = _make_result(result, request, response)
+    except Exception as e:
+        result = _make_error(e, request, response)
+
+    # The value of a request that completes later is copied to the response body,
+    # so send the text of an error
+    return str(result) if isinstance(result, httperror) else result
+
+
+def _wait_threaded(future):
+    """Wait for a threaded handler without blocking the event loop, like FunctionWorker"""
+    while not future.done():
+        yield
+    yield future.result()
+
 
 def exposeWeb(*channels, **config):
     """
@@ -32,7 +105,10 @@ def exposeWeb(*channels, **config):
     :param channels: A path/fragment to handle calls that begin with that path.  A path of "index" is the
         handler for the "root document" or empty path.  Paths are all relative to `self.channel`.
         Alternatively, a HTTP verb ("GET", "POST", etc.) to handle all incoming events with that verb;
-    :param config: Optional (ignored)
+    :param config: Optional. If ``threaded=True`` and the ``[webserver]`` section sets ``request_workers``,
+        the handler runs in a thread of that pool instead of the circuits event loop. A threaded handler
+        must get the request and response from ``event.args``, as ``self.request`` is not set for it.
+        Controllers with an ``_auth`` method always run their handlers on the event loop.
     :return: Dictionary that should be returned as JSON by the web service.
 
     Your class should inherit from :class:`circuits.web.BaseController`, and may additionally
@@ -78,9 +154,21 @@ def exposeWeb(*channels, **config):
             pass
 
     """
+    threaded = config.pop("threaded", False)
+
     def decorate(f):
         @handler(*channels, **config)
         def wrapper(self, event, *args, **kwargs):
+            request_workers = get_request_workers(self, args[0] if args else None) if threaded and not hasattr(self, "_auth") else None
+            if request_workers is not None:
+                (request, response), args = args[:2], args[2:]
+                request.args = args
+                request.kwargs = kwargs
+                future = request_workers.submit(_call_threaded, f, self, event, request, response, args, kwargs)
+                # Wake the event loop when the handler is done, rather than at its next poll
+                future.add_done_callback(lambda _: self.fire(Event.create("web_request_done")))
+                return _wait_threaded(future)
+
             try:
                 if not hasattr(self, "request"):
                     (self.request, self.response), args = args[:2], args[2:]
@@ -98,28 +186,9 @@ def exposeWeb(*channels, **config):
                 else:
                     result = f(self, event, *args, **kwargs)
 
-                if (isinstance(result, httperror)
-                        or isinstance(result, Response)
-                        or isinstance(result, six.string_types)):
-                    return result
-
-                if result is None:
-                    self.response.status = 204
-                    return ""
-                else:
-                    try:
-                        self.response.headers["Content-Type"] = "application/json; charset=utf-8"
-                        return json.dumps(result)
-                    except (JSONDecodeError, TypeError) as e:
-                        return httperror(self.request, self.response, code=500,
-                                         description="JSON decode failed for object of type '%s'" % type(result))
-            except HTTPException as e:
-                LOG.exception(e)
-                return httperror(self.request, self.response, code=e.code, description=e.description)
+                return _make_result(result, self.request, self.response)
             except Exception as e:
-                LOG.exception(e)
-                msg = getattr(e, 'message', repr(e))
-                return httperror(self.request, self.response, code=500, description=msg)
+                return _make_error(e, self.request, self.response)
             finally:
                 if hasattr(self, "request"):
                     del self.request
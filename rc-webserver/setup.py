@@ -39,7 +39,9 @@ setup(
     license='MIT',
     author='IBM Resilient',
     install_requires=[
-        'resilient_circuits>=28.0.0'
+        'resilient_circuits>=28.0.0',
+        'circuits ~= 3.2.3',
+        'six'
     ],
     tests_require=["pytest>=3.0.0, <4.1.0",
                    "pytest_resilient_circuits"],
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""Tests for the request workers and limits of the WebService"""
+
+import socket
+import threading
+import time
+
+import pytest
+import requests
+from circuits import Manager
+from circuits.web import BaseController
+from rc_webserver import web
+from rc_webserver.components.webservice import WebService
+from rc_webserver.web import exposeWeb
+
+
+class LimitsTest(BaseController):
+    """ Test Web Component """
+
+    channel = "/limits"
+
+    def __init__(self):
+        super(LimitsTest, self).__init__()
+        self.release = threading.Event()
+
+    @exposeWeb("slow", threaded=True)
+    def _slow(self, event, *args, **kwargs):
+        self.release.wait(5)
+        return {"thread": threading.current_thread().name}
+
+    @exposeWeb("fast")
+    def _fast(self, event, *args, **kwargs):
+        return {"thread": threading.current_thread().name}
+
+    @exposeWeb("fail", threaded=True)
+    def _fail(self, event, *args, **kwargs):
+        raise ValueError("failed")
+
+    @exposeWeb("POST", threaded=True)
+    def _post(self, event, *args, **kwargs):
+        return {"size": len(event.args[0].body.getvalue())}
+
+
+def get_free_port():
+    sock = socket.socket()
+    sock.bind(("localhost", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+@pytest.fixture
+def web_app():
+    """ start a WebService with the given [webserver] options and a LimitsTest controller """
+    apps = []
+
+    def start(**options):
+        port = get_free_port()
+        options["port"] = str(port)
+        app = Manager()
+        service = WebService({"webserver": options}).register(app)
+        controller = LimitsTest().register(app)
+        controller.service = service
+        app.start()
+        apps.append((app, controller))
+
+        # wait for the server to listen
+        for _ in range(50):
+            try:
+                socket.create_connection(("localhost", port)).close()
+                break
+            except socket.error:
+                time.sleep(0.1)
+        return port, "http://localhost:{0}/limits".format(port), controller
+
+    yield start
+
+    for app, controller in apps:
+        controller.release.set()
+        app.stop()
+
+
+def test_threaded_handler(web_app):
+    port, url, controller = web_app(request_workers="2")
+    controller.release.set()
+    response = requests.get(url + "/slow")
+    assert response.status_code == 200
+    assert response.json()["thread"].startswith("rc-webserver")
+
+
+def test_threaded_handler_without_workers(web_app):
+    port, url, controller = web_app()
+    controller.release.set()
+    response = requests.get(url + "/slow")
+    assert response.status_code == 200
+    assert not response.json()["thread"].startswith("rc-webserver")
+
+
+def test_request_workers_of_each_web_service(web_app):
+    port, url, controller = web_app(request_workers="2")
+    other_port, other_url, other_controller = web_app()
+    controller.release.set()
+    other_controller.release.set()
+
+    # another web server without request_workers leaves the pool of the first one
+    assert controller.service.request_pool is not None
+    assert other_controller.service.request_pool is None
+    assert requests.get(url + "/slow").json()["thread"].startswith("rc-webserver")
+    assert not requests.get(other_url + "/slow").json()["thread"].startswith("rc-webserver")
+
+
+def test_get_request_workers_from_manager(web_app):
+    port, url, controller = web_app(request_workers="2")
+    # without the server of the request, the WebService is found from the controller's manager
+    assert web.get_request_workers(controller, None) is controller.service.request_pool
+
+
+def test_threaded_handler_error(web_app):
+    port, url, controller = web_app(request_workers="2")
+    response = requests.get(url + "/fail")
+    assert response.status_code == 500
+    assert "failed" in response.text
+
+
+def test_slow_handler_does_not_block(web_app):
+    port, url, controller = web_app(request_workers="2")
+    slow = []
+    thread = threading.Thread(target=lambda: slow.append(requests.get(url + "/slow")))
+    thread.start()
+    time.sleep(0.2)
+
+    response = requests.get(url + "/fast", timeout=2)
+    assert response.status_code == 200
+    assert not slow
+
+    controller.release.set()
+    thread.join()
+    assert slow[0].status_code == 200
+
+
+def test_max_body_size(web_app):
+    port, url, controller = web_app(request_workers="2", max_body_size="100")
+    response = requests.post(url, data="x" * 10)
+    assert response.status_code == 200
+    assert response.json() == {"size": 10}
+
+    response = requests.post(url, data="x" * 1000)
+    assert response.status_code == 413
+
+    # the Content-Length is checked before the whole body is read
+    response = requests.post(url, data="x" * 1000000)
+    assert response.status_code == 413
+
+
+def test_http_internals(web_app):
+    # max_body_size and keepalive_timeout use these, which circuits does not document
+    port, url, controller = web_app(max_body_size="100", keepalive_timeout="5")
+    assert isinstance(controller.service.http._clients, dict)
+    assert isinstance(controller.service.http._buffers, dict)
+
+
+def test_max_concurrent_requests(web_app):
+    port, url, controller = web_app(request_workers="2", max_concurrent_requests="1")
+    slow = []
+    thread = threading.Thread(target=lambda: slow.append(requests.get(url + "/slow")))
+    thread.start()
+    time.sleep(0.2)
+
+    response = requests.get(url + "/fast", timeout=2)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    controller.release.set()
+    thread.join()
+    assert slow[0].status_code == 200
+    assert requests.get(url + "/fast").status_code == 200
+
+
+def test_max_concurrent_requests_disconnect(web_app):
+    port, url, controller = web_app(request_workers="2", max_concurrent_requests="1")
+    sock = socket.create_connection(("localhost", port))
+    sock.sendall(b"GET /limits/slow HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    time.sleep(0.2)
+    assert len(controller.service._in_flight) == 1
+
+    # the client goes away before its request is handled, which releases its slot
+    sock.close()
+    time.sleep(0.2)
+    assert not controller.service._in_flight
+    assert requests.get(url + "/fast", timeout=2).status_code == 200
+    controller.release.set()
+
+
+def test_last_active_without_keepalive_timeout(web_app):
+    port, url, controller = web_app()
+    assert requests.get(url + "/fast").status_code == 200
+    assert not controller.service._last_active
+
+
+def test_keepalive_timeout(web_app):
+    port, url, controller = web_app(keepalive_timeout="0.5")
+    sock = socket.create_connection(("localhost", port))
+    sock.settimeout(5)
+    start = time.time()
+    # the server closes the idle connection
+    assert sock.recv(1) == b""
+    assert time.time() - start < 3
+    sock.close()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    codegen_reload.py
+    -----------------
+
+    Time for ``resilient-sdk codegen --reload`` on a package with many
+    functions, and how many of its files it rewrites. The package is generated
+    from the mock playbook export of the ``resilient-sdk`` tests with its function
+    and playbook copied ``--functions`` times.
+
+    * ``--no-cache``: every file that ``--reload`` regenerates is rendered and
+      written again, like it did before
+    * ``unchanged``: reloading again with the same export
+    * ``one changed``: reloading after changing the description of one function
+
+    Usage:
+        python codegen_reload.py
+        python codegen_reload.py --functions 500
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from resilient_sdk.cmds.codegen import CmdCodegen
+from resilient_sdk.util import sdk_helpers
+
+from export_index import MOCK_EXPORT, make_export
+
+PACKAGE_NAME = "fn_bench_reload"
+
+
+def get_modified_times(path_package):
+    """ the modified time of each file in the package """
+    modified_times = {}
+    for root, dirs, files in os.walk(path_package):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for f in files:
+            path_file = os.path.join(root, f)
+            modified_times[path_file] = os.path.getmtime(path_file)
+    return modified_times
+
+
+def codegen(argv):
+    parser = argparse.ArgumentParser()
+    cmd_codegen = CmdCodegen(parser.add_subparsers(dest="cmd"))
+    cmd_codegen.execute_command(cmd_codegen.parser.parse_args(argv))
+
+
+def timed_reload(path_package, path_export, *flags):
+    """ reload the package, return the seconds it took and how many files it rewrote or added """
+    before = get_modified_times(path_package)
+    start = time.perf_counter()
+    codegen(["-p", path_package, "--reload", "-e", path_export] + list(flags))
+    seconds = time.perf_counter() - start
+    after = get_modified_times(path_package)
+    return seconds, len([f for f, t in after.items() if before.get(f) != t])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark codegen --reload of a package with many functions")
+    parser.add_argument("--functions", type=int, default=100, help="functions, and playbooks, in the package")
+    args = parser.parse_args()
+
+    logging.getLogger("resilient_sdk_log").setLevel(logging.ERROR)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        export = make_export(MOCK_EXPORT, args.functions)
+        export["functions"], export["playbooks"] = export["functions"][1:], export["playbooks"][1:]
+        path_export = os.path.join(temp_dir, "export.res")
+        sdk_helpers.write_file(path_export, json.dumps(export))
+
+        fn_names = [fn["export_key"] for fn in export["functions"]]
+        pb_names = [pb["export_key"] for pb in export["playbooks"]]
+        codegen(["-p", PACKAGE_NAME, "-o", temp_dir, "-e", path_export, "-f"] + fn_names + ["-pb"] + pb_names)
+        path_package = os.path.join(temp_dir, PACKAGE_NAME)
+
+        # the first reload writes the reload params of the package and saves the hashes
+        timed_reload(path_package, path_export)
+
+        print("{0:<12} {1:>10} {2:>12} {3:>16}".format("reload", "functions", "seconds", "files written"))
+        for name, flags in (("--no-cache", ("--no-cache",)), ("unchanged", ())):
+            # wait so the modified times of rewritten files differ
+            time.sleep(0.01)
+            seconds, written = timed_reload(path_package, path_export, *flags)
+            print("{0:<12} {1:>10} {2:>12.3f} {3:>16}".format(name, args.functions, seconds, written))
+
+        export["functions"][0]["description"] = {"format": "text", "content": "changed"}
+        sdk_helpers.write_file(path_export, json.dumps(export))
+        time.sleep(0.01)
+        seconds, written = timed_reload(path_package, path_export)
+        print("{0:<12} {1:>10} {2:>12.3f} {3:>16}".format("one changed", args.functions, seconds, written))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    comment_sync.py
+    ---------------
+
+    Time for ``SOARCommon._filter_comments`` to find the comments of an
+    endpoint's entity that are not yet synced to a SOAR case, with
+    ``--comments`` entity comments and as many SOAR comments.
+
+    * ``beautifulsoup``: each comment cleaned with a BeautifulSoup tree, the
+      SOAR header cleaned again for each comment and the cleaned SOAR comments
+      searched as a list, which is how ``_filter_comments`` used to work
+    * ``cold``: the first poll, with the cache of cleaned comments empty
+    * ``warm``: the next poll, with the same comments
+
+    Usage:
+        python comment_sync.py
+        python comment_sync.py --comments 20000
+"""
+
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+from resilient_lib import SOARCommon, unescape
+from resilient_lib.components import poller_common
+
+SOAR_HEADER = "<b>Created by SOAR</b>"
+
+
+def bs4_clean_html(html_fragment):
+    return " ".join(BeautifulSoup(unescape(html_fragment), "html.parser").strings)
+
+
+def bs4_filter_comments(soar_comment_list, entity_comments, filter_soar_header):
+    staged_entity_comments = [comment for comment in entity_comments
+                              if bs4_clean_html(filter_soar_header) not in bs4_clean_html(comment)]
+    already_synced = [bs4_clean_html(soar_comment) for soar_comment in soar_comment_list]
+    return [comment for comment in staged_entity_comments if bs4_clean_html(comment) not in already_synced]
+
+
+def make_comments(count):
+    """ SOAR comments and entity comments: a third synced from SOAR, a third synced to SOAR and a third new """
+    soar_comments, entity_comments = [], []
+    for i in range(count):
+        text = "<div class=\"rte\"><div>Comment <strong>{0}</strong> about host-{0}.example.com &amp; user{0}</div></div>".format(i)
+        if i % 3 == 0:
+            soar_comments.append(text)
+            entity_comments.append("<p>{0}</p><p>{1}</p>".format(SOAR_HEADER, text))
+        elif i % 3 == 1:
+            soar_comments.append(text)
+            entity_comments.append("<div>Comment <strong>{0}</strong> about host-{0}.example.com &amp; user{0}</div>".format(i))
+        else:
+            soar_comments.append("<div>Case note {0}</div>".format(i))
+            entity_comments.append("<div>New entity comment {0}</div>".format(i))
+    return soar_comments, entity_comments
+
+
+def timed(filter_comments, soar_comments, entity_comments):
+    start = time.perf_counter()
+    new_comments = filter_comments(soar_comments, entity_comments, SOAR_HEADER)
+    return time.perf_counter() - start, new_comments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark filtering the comments already synced to SOAR")
+    parser.add_argument("--comments", type=int, default=5000, help="entity comments, and SOAR comments, to compare")
+    args = parser.parse_args()
+
+    soar_comments, entity_comments = make_comments(args.comments)
+    soar_common = SOARCommon(None)
+
+    baseline, expected = timed(bs4_filter_comments, soar_comments, entity_comments)
+
+    poller_common._clean_comment.cache.clear()
+    cold, new_comments = timed(soar_common._filter_comments, soar_comments, entity_comments)
+    assert new_comments == expected
+
+    warm, new_comments = timed(soar_common._filter_comments, soar_comments, entity_comments)
+    assert new_comments == expected
+
+    print("{0} entity comments, {1} SOAR comments, {2} new".format(len(entity_comments), len(soar_comments), len(expected)))
+    print("{0:<14} {1:>10} {2:>10}".format("", "seconds", "speedup"))
+    for name, elapsed in (("beautifulsoup", baseline), ("cold", cold), ("warm", warm)):
+        print("{0:<14} {1:>10.3f} {2:>9.1f}x".format(name, elapsed, baseline / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    cts_load.py
+    -----------
+
+    Requests per second through the ``/cts`` endpoints of ``rc-cts`` served by
+    the ``rc-webserver`` ``WebService``, with concurrent clients that POST an
+    artifact and GET its result. The ``SearcherExample`` answers the lookups.
+
+    * ``inline``: the handlers run on the circuits event loop, like they did before
+    * ``workers``: the handlers run in ``request_workers`` threads
+
+    each with a new connection for each request and with keep-alive connections.
+    ``loop p95 ms`` is how late an event fired every 10ms is handled on the event
+    loop, which is how long function messages would wait. ``--handler-ms`` adds
+    a delay to each POST, like a large multipart upload or a slow searcher
+    dispatch would.
+
+    Usage:
+        python cts_load.py
+        python cts_load.py --clients 20 --requests 200 --handler-ms 20
+"""
+
+import argparse
+import logging
+import socket
+import threading
+import time
+
+import requests
+from circuits import Event, Manager, BaseComponent, handler
+from resilient_circuits.actions_test_replay import percentile
+from rc_cts.components.searcher_example import SearcherExample
+from rc_cts.components.threat_webservice import CustomThreatService
+from rc_webserver.components.webservice import WebService
+
+
+class SlowThreatService(CustomThreatService):
+    """ CustomThreatService that takes handler_ms more for each POST """
+
+    handler_ms = 0
+
+    def _handle_post_request(self, event, *args, **kwargs):
+        time.sleep(self.handler_ms / 1000.0)
+        return super(SlowThreatService, self)._handle_post_request(event, *args, **kwargs)
+
+
+class LoopProbe(BaseComponent):
+    """ records how late the probe events fired from another thread are handled """
+
+    channel = "loop_probe"
+
+    def __init__(self):
+        super(LoopProbe, self).__init__()
+        self.delays = []
+
+    @handler("probe")
+    def _on_probe(self, fired):
+        self.delays.append(time.perf_counter() - fired)
+
+
+def get_free_port():
+    sock = socket.socket()
+    sock.bind(("localhost", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def run_client(url, requests_count, keep_alive, client, latencies):
+    session = requests.Session() if keep_alive else None
+    get = session.get if keep_alive else requests.get
+    post = session.post if keep_alive else requests.post
+    headers = {} if keep_alive else {"Connection": "close"}
+
+    for i in range(requests_count):
+        artifact = '{{"type": "net.uri", "value": "http://{0}.{1}.example.org"}}'.format(client, i)
+        start = time.perf_counter()
+        request_id = post(url, data=artifact, headers=headers).json()["id"]
+        get("{0}/{1}".format(url, request_id), headers=headers)
+        latencies.append(time.perf_counter() - start)
+
+
+def run_load(workers, keep_alive, args):
+    """ start an app with the web service and run the clients, return requests/s, p95 ms and loop p95 ms """
+    port = get_free_port()
+    opts = {"webserver": {"port": str(port), "request_workers": str(workers)},
+            "custom_threat_service": {}}
+
+    app = Manager()
+    WebService(opts).register(app)
+    SlowThreatService.handler_ms = args.handler_ms
+    SlowThreatService(opts).register(app)
+    SearcherExample().register(app)
+    probe = LoopProbe().register(app)
+    app.start()
+    time.sleep(0.5)
+
+    stop = threading.Event()
+
+    def fire_probes():
+        while not stop.is_set():
+            app.fire(Event.create("probe", time.perf_counter()), "loop_probe")
+            time.sleep(0.01)
+
+    latencies = []
+    clients = [threading.Thread(target=run_client, args=("http://localhost:{0}/cts/example".format(port),
+                                                         args.requests, keep_alive, i, latencies))
+               for i in range(args.clients)]
+    prober = threading.Thread(target=fire_probes)
+    prober.start()
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    seconds = time.perf_counter() - start
+    stop.set()
+    prober.join()
+
+    app.stop()
+
+    # each iteration is a POST and a GET
+    return (2 * len(latencies) / seconds,
+            percentile(latencies, 95) * 1000,
+            (percentile(probe.delays, 95) or 0) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark requests/second of the /cts endpoints")
+    parser.add_argument("--clients", type=int, default=10, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=100, help="POST and GET pairs for each client")
+    parser.add_argument("--workers", type=int, default=4, help="request_workers of the web server")
+    parser.add_argument("--handler-ms", type=float, default=0, help="delay added to each POST handler")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    print("{0:<10} {1:<12} {2:>10} {3:>12} {4:>14}".format("mode", "connection", "req/s", "p95 ms", "loop p95 ms"))
+    for mode, workers in (("inline", 0), ("workers", args.workers)):
+        for connection, keep_alive in (("new", False), ("keep-alive", True)):
+            rps, p95, loop_p95 = run_load(workers, keep_alive, args)
+            print("{0:<10} {1:<12} {2:>10.1f} {3:>12.1f} {4:>14.1f}".format(mode, connection, rps, p95, loop_p95))
+
+
+if __name__ == "__main__":
+    main()
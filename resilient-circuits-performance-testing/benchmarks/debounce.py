@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    debounce.py
+    -----------
+
+    Cost of the ``@debounce`` decorator during an incident storm: ``--keys``
+    incidents each get ``--events-per-key`` events, which are all held back
+    for ``--delay`` seconds and then handled.
+
+    Two implementations are compared:
+
+    * ``timers``: one circuits ``Timer`` component registered for each held
+      back event, with every pending timer of a key reset on each new event,
+      which is how ``@debounce`` used to work
+    * ``queue``: the ``DebounceQueue`` of ``@debounce``, with one timer
+      component and one heap entry for each key
+
+    For each, it reports the time to take in all the events, the memory
+    held while they wait, the number of components registered and the
+    time from when the events are due until they have all been handled.
+
+    The ``timers`` implementation slows down with every pending timer, so at
+    the default 10000 keys it takes a long time. Compare the two at fewer
+    ``--keys``, or run ``--only queue``.
+
+    Usage:
+        python debounce.py --only queue
+        python debounce.py --keys 2000 --events-per-key 5 --delay 2
+"""
+
+import argparse
+import functools
+import gc
+import time
+import tracemalloc
+
+from circuits import Component, Event, Manager, Timer
+from resilient_circuits import debounce, handler
+
+
+class StormEvent(Event):
+    def __init__(self, incident_id):
+        super(StormEvent, self).__init__()
+        self.name = "storm_event"
+        self.message = {"incident": {"id": incident_id}}
+        self.deferred = False
+
+
+class timers_debounce(object):
+    """ ``@debounce`` with a circuits Timer for each event """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.debouncedata = {}
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def decorated(itself, event, *args, **kwargs):
+            key = "{0} for {1}".format(event.name, event.message["incident"]["id"])
+            if event.deferred:
+                event.deferred = False
+                self.debouncedata.pop(key, None)
+                return func(itself, event, *args, **kwargs)
+            if key not in self.debouncedata:
+                self.debouncedata[key] = []
+            else:
+                for timer in self.debouncedata[key]:
+                    timer.reset(interval=self.delay)
+            timer = Timer(self.delay, event)
+            timer.register(itself)
+            event.deferred = True
+            self.debouncedata[key].append(timer)
+        return decorated
+
+
+def counted(func):
+    """ count the calls to a handler, before it is debounced """
+    @functools.wraps(func)
+    def decorated(itself, event, *args, **kwargs):
+        itself.calls += 1
+        return func(itself, event, *args, **kwargs)
+    return decorated
+
+
+def make_component(kind, delay):
+    debouncer = timers_debounce(delay) if kind == "timers" else debounce(delay=delay, max_keys=0)
+
+    class StormComponent(Component):
+        def __init__(self):
+            super(StormComponent, self).__init__()
+            self.calls = 0
+            self.handled = 0
+
+        @counted
+        @debouncer
+        @handler("storm_event")
+        def _on_storm_event(self, event, *args, **kwargs):
+            self.handled += 1
+
+    return StormComponent()
+
+
+def count_components(component):
+    return 1 + sum(count_components(child) for child in component.components)
+
+
+def wait_for(condition, timeout):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise RuntimeError("timed out")
+        time.sleep(0.001)
+
+
+def run(kind, keys, events_per_key, delay):
+    gc.collect()
+    manager = Manager()
+    component = make_component(kind, delay).register(manager)
+    manager.start()
+    total = keys * events_per_key
+
+    try:
+        tracemalloc.start()
+        start = time.monotonic()
+        for _ in range(events_per_key):
+            for incident_id in range(keys):
+                manager.fire(StormEvent(incident_id))
+        wait_for(lambda: component.calls >= total, timeout=600)
+        ingest = time.monotonic() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        components = count_components(manager)
+
+        # the last events are due "delay" after they were taken in
+        due = start + ingest + delay
+        wait_for(lambda: component.handled >= total, timeout=600 + delay)
+        drain = max(time.monotonic() - due, 0)
+    finally:
+        manager.stop()
+
+    return {"ingest_rate": total / ingest, "memory_mb": memory / 1e6, "components": components, "drain_s": drain}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the @debounce decorator with many incidents")
+    parser.add_argument("--keys", type=int, default=10000, help="distinct incidents")
+    parser.add_argument("--events-per-key", type=int, default=3, help="events for each incident")
+    parser.add_argument("--delay", type=float, default=1.0, help="debounce delay in seconds")
+    parser.add_argument("--only", choices=("timers", "queue"), help="run one implementation")
+    args = parser.parse_args()
+
+    print("{0} keys, {1} events each, {2}s delay".format(args.keys, args.events_per_key, args.delay))
+    print("{0:<8} {1:>14} {2:>12} {3:>12} {4:>10}".format("", "events/s in", "memory MB", "components", "drain s"))
+    for kind in ("timers", "queue"):
+        if args.only and args.only != kind:
+            continue
+        result = run(kind, args.keys, args.events_per_key, args.delay)
+        print("{0:<8} {1:>14.0f} {2:>12.1f} {3:>12} {4:>10.2f}".format(
+            kind, result["ingest_rate"], result["memory_mb"], result["components"], result["drain_s"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    docgen_parallel.py
+    ------------------
+
+    Time for ``resilient-sdk docgen`` to generate the READMEs of many apps,
+    like our mono-repo, and to read many ``.resz`` exports.
+
+    * ``packages``: ``--packages`` with copies of the mock app of the
+      ``resilient-sdk`` tests, with ``--workers 1`` vs one per CPU
+    * ``exports``: ``--exportfile`` with copies of the mock ``.resz`` export,
+      with ``--workers 1`` vs one per CPU
+    * ``zip``: reading the export of a ``.resz`` by extracting it to a temp
+      directory, like ``get_export_from_zip`` used to, vs in memory
+
+    Usage:
+        python docgen_parallel.py
+        python docgen_parallel.py --apps 60 --exports 60
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+from resilient_sdk.cmds.docgen import CmdDocgen
+from resilient_sdk.util import package_file_helpers as package_helpers
+
+MOCK_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "resilient-sdk", "tests", "shared_mock_data")
+MOCK_APP = os.path.join(MOCK_DATA, "mock_package_files", "mock_integrations", "fn_main_mock_integration")
+MOCK_RESZ = os.path.join(MOCK_DATA, "mock_export.resz")
+
+
+def get_export_from_zip_extracted(path_zip):
+    """ how ``get_export_from_zip`` read the export before """
+    temp_dir = tempfile.mkdtemp()
+    try:
+        with zipfile.ZipFile(path_zip, "r") as myzip:
+            myzip.extractall(temp_dir)
+        for file_path in os.listdir(temp_dir):
+            if file_path.endswith(".res"):
+                with open(os.path.join(temp_dir, file_path)) as export_file:
+                    return json.load(export_file)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def timed(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def docgen(argv):
+    parser = argparse.ArgumentParser()
+    cmd_docgen = CmdDocgen(parser.add_subparsers(dest="cmd"))
+    return lambda: cmd_docgen.execute_command(cmd_docgen.parser.parse_args(argv))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark docgen for many apps and exports")
+    parser.add_argument("--apps", type=int, default=20, help="copies of the mock app to run docgen for")
+    parser.add_argument("--exports", type=int, default=20, help="copies of the mock .resz export to run docgen for")
+    args = parser.parse_args()
+
+    logging.getLogger("resilient_sdk_log").setLevel(logging.ERROR)
+    workers = str(os.cpu_count() or 1)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        apps = []
+        for i in range(args.apps):
+            path_app = os.path.join(temp_dir, "app_{0}".format(i))
+            shutil.copytree(MOCK_APP, path_app)
+            apps.append(path_app)
+
+        exports = []
+        for i in range(args.exports):
+            path_export = os.path.join(temp_dir, "export_{0}.resz".format(i))
+            shutil.copy(MOCK_RESZ, path_export)
+            exports.append(path_export)
+        path_readme = os.path.join(temp_dir, "README.md")
+
+        print("CPUs: {0}".format(workers))
+        print("{0:<10} {1:>8} {2:>14} {3:>16}".format("benchmark", "count", "before s", "after s"))
+
+        before = timed(docgen(["--packages"] + apps + ["--workers", "1"]))
+        after = timed(docgen(["--packages"] + apps + ["--workers", workers]))
+        print("{0:<10} {1:>8} {2:>14.3f} {3:>16.3f}".format("packages", args.apps, before, after))
+
+        before = timed(docgen(["-e"] + exports + ["-o", path_readme, "--workers", "1"]))
+        after = timed(docgen(["-e"] + exports + ["-o", path_readme, "--workers", workers]))
+        print("{0:<10} {1:>8} {2:>14.3f} {3:>16.3f}".format("exports", args.exports, before, after))
+
+        before = timed(lambda: [get_export_from_zip_extracted(path) for path in exports])
+        after = timed(lambda: [package_helpers.get_export_from_zip(path) for path in exports])
+        print("{0:<10} {1:>8} {2:>14.3f} {3:>16.3f}".format("zip", args.exports, before, after))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    export_index.py
+    ---------------
+
+    Time for ``resilient-sdk`` to get the objects of an app from a large
+    export, like ``codegen`` and ``docgen`` do. The export is the mock
+    playbook export of the ``resilient-sdk`` tests with its function and
+    playbook copied ``--functions`` times.
+
+    * ``lookups``: finding each function by its ``export_key`` by building a
+      dict of the functions for each one, which is how ``get_res_obj`` used
+      to work, vs an ``ExportIndex``
+    * ``get_from_export``: all the functions and playbooks
+    * ``docgen``: the details and example scripts of all the functions
+
+    Usage:
+        python export_index.py
+        python export_index.py --functions 500 2000
+"""
+
+import argparse
+import copy
+import logging
+import os
+import time
+import uuid
+
+from resilient_sdk.cmds.docgen import CmdDocgen
+from resilient_sdk.util import sdk_helpers
+
+MOCK_EXPORT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "resilient-sdk", "tests",
+                           "shared_mock_data", "mock_package_files", "mock_export_w_playbook_w_scripts.res")
+
+
+def make_export(path, count):
+    """ the export at ``path`` with its first function, and the playbook that uses it, copied ``count`` times """
+    export = sdk_helpers.read_json_file(path)
+    function, playbook = export["functions"][0], export["playbooks"][0]
+
+    for i in range(count):
+        fn = copy.deepcopy(function)
+        fn_name = "fn_mock_{0}".format(i)
+        fn.update({"uuid": str(uuid.uuid4()), "export_key": fn_name, "name": fn_name, "display_name": fn_name})
+        export["functions"].append(fn)
+
+        pb = copy.deepcopy(playbook)
+        pb_name = "pb_mock_{0}".format(i)
+        pb.update({"uuid": str(uuid.uuid4()), "export_key": pb_name, "name": pb_name, "display_name": pb_name})
+        pb["content"]["xml"] = pb["content"]["xml"].replace(function["uuid"], fn["uuid"])
+        export["playbooks"].append(pb)
+
+    return export
+
+
+def timed(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark getting the objects of an app from a large export")
+    parser.add_argument("--functions", type=int, nargs="+", default=[200, 1000], help="functions, and playbooks, in the export")
+    parser.add_argument("--export", default=MOCK_EXPORT, help="path of the export to copy the function and playbook of")
+    args = parser.parse_args()
+
+    logging.getLogger("resilient_sdk_log").setLevel(logging.ERROR)
+
+    print("{0:<10} {1:>16} {2:>16} {3:>18} {4:>10}".format("functions", "lookups dict s", "lookups index s", "get_from_export s", "docgen s"))
+    for count in args.functions:
+        export = make_export(args.export, count)
+        fn_names = [fn["export_key"] for fn in export["functions"]]
+        pb_names = [pb["export_key"] for pb in export["playbooks"]]
+
+        dict_lookups = timed(lambda: [sdk_helpers.get_obj_from_list("export_key", export["functions"])[name] for name in fn_names])
+
+        def index_lookups():
+            export_index = sdk_helpers.ExportIndex(export)
+            return [export_index.find("functions", "export_key", name) for name in fn_names]
+
+        index = timed(index_lookups)
+        from_export = timed(lambda: sdk_helpers.get_from_export(export, functions=fn_names, playbooks=pb_names))
+        docgen = timed(lambda: CmdDocgen._get_function_details(export))
+
+        print("{0:<10} {1:>16.3f} {2:>16.3f} {3:>18.3f} {4:>10.3f}".format(count, dict_lookups, index, from_export, docgen))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    html_to_markdown.py
+    -------------------
+
+    Throughput and peak memory of ``MarkdownParser`` converting large
+    synthetic HTML documents, like the body of a long email or note.
+
+    * ``previous``: ``MarkdownParser`` with its previous buffer handling: a
+      regex for each text node, ``insert(0, ...)`` for each closing markdown,
+      the buffers flattened into a new list on each flush and the trailing new
+      lines removed one at a time
+    * ``convert``: ``MarkdownParser.convert`` of the whole document
+    * ``convert_chunks``: ``MarkdownParser.convert_chunks`` of the document
+      fed in 64 KB chunks, with the markdown written out as it is converted
+
+    Usage:
+        python html_to_markdown.py
+        python html_to_markdown.py --sizes-mb 1 10 --nesting 200
+"""
+
+import argparse
+import io
+import logging
+import re
+import time
+import tracemalloc
+
+from resilient_lib import MarkdownParser
+
+CHUNK_SIZE = 64 * 1024
+
+
+class InsertingList(list):
+    def appendleft(self, item):
+        self.insert(0, item)
+
+
+class PreviousMarkdownParser(MarkdownParser):
+    """ ``MarkdownParser`` with its previous buffer handling """
+
+    def init_buffers(self):
+        super(PreviousMarkdownParser, self).init_buffers()
+        self.data_post = InsertingList()
+
+    def handle_data(self, data):
+        cleaned = re.search(r"^[\n\t\r]*(.*)", data, re.S)
+        cleaned and self.data.append(cleaned.group(1))
+
+    def push_data(self, data_only=False):
+        if data_only:
+            self.buffer.extend(self.data)
+            self.data = []
+        else:
+            self.buffer.extend([item for sublist in [self.data_pre, self.data, self.data_post] for item in sublist])
+            self.data = []
+            self.data_pre = []
+            self.data_post = InsertingList()
+
+    def toString(self):
+        self.push_data()
+        result = "".join(self.buffer)
+        while result[-1:] == "\n":
+            result = result[:-1]
+        return result
+
+
+def make_document(size, nesting):
+    """ html of about ``size`` bytes: paragraphs, lists, links and ``nesting`` deep runs of styled text """
+    section = (
+        "<div><strong>Alert {0}</strong> from <a href=\"https://alerts.example.com/{0}\">the console</a></div>"
+        "<div style=\"color: rgb(255, 0, 0);\">Severity <em>high</em>, <u>user{0}</u> on <s>host-{0}</s></div>"
+        "<ul><li>first step</li><li>second step<ol><li>detail a</li><li>detail b</li></ol></li></ul>"
+        "<p>\n\tPlease review the attached log &amp; reply.\n</p>"
+        "<div>" + "<span><strong>" * nesting + "deeply styled" + "</strong></span>" * nesting + "</div>"
+    )
+    parts = ["<div class=\"rte\">"]
+    length, i = 0, 0
+    while length < size:
+        part = section.format(i)
+        parts.append(part)
+        length += len(part)
+        i += 1
+    parts.append("</div>" + "<div><br/></div>" * 1000)
+    return "".join(parts)
+
+
+def chunked(document):
+    for start in range(0, len(document), CHUNK_SIZE):
+        yield document[start:start + CHUNK_SIZE]
+
+
+def measure(convert, document):
+    start = time.perf_counter()
+    convert(document)
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc slows it down, so the memory is measured separately
+    tracemalloc.start()
+    convert(document)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(document) / elapsed / 1e6, peak / 1e6
+
+
+def convert_chunks(document):
+    out = io.StringIO()
+    for markdown in MarkdownParser().convert_chunks(chunked(document)):
+        out.write(markdown)
+        # written out, so no longer held in memory
+        out.seek(0)
+        out.truncate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark converting large html documents to markdown")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 5], help="sizes of the documents in MB")
+    parser.add_argument("--nesting", type=int, default=50, help="depth of the nested styled text")
+    args = parser.parse_args()
+
+    logging.getLogger("resilient_lib").propagate = False
+    logging.getLogger("resilient_lib").addHandler(logging.NullHandler())
+
+    cases = (
+        ("previous", lambda document: PreviousMarkdownParser().convert(document)),
+        ("convert", lambda document: MarkdownParser().convert(document)),
+        ("convert_chunks", convert_chunks)
+    )
+
+    print("{0:<16} {1:>8} {2:>10} {3:>14}".format("", "MB", "MB/s", "peak mem MB"))
+    for size_mb in args.sizes_mb:
+        document = make_document(int(size_mb * 1e6), args.nesting)
+        assert PreviousMarkdownParser().convert(document) == MarkdownParser().convert(document)
+        for name, convert in cases:
+            rate, peak = measure(convert, document)
+            print("{0:<16} {1:>8.1f} {2:>10.2f} {3:>14.1f}".format(name, len(document) / 1e6, rate, peak))
+
+
+if __name__ == "__main__":
+    main()
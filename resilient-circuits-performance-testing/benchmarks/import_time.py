@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    import_time.py
+    --------------
+
+    Measure the cold import time of our packages using ``python -X importtime``.
+
+    Each module is imported in a fresh interpreter ``--runs`` times and the
+    median cumulative import time is reported, along with the slowest
+    dependencies pulled in by that import.
+
+    Results can be saved to a JSON baseline with ``--save`` and later runs
+    compared against it with ``--compare`` (exits non-zero on a regression
+    larger than ``--threshold`` percent).
+
+    Usage:
+        python import_time.py
+        python import_time.py -m resilient_lib resilient_circuits --runs 10
+        python import_time.py --save baseline.json
+        python import_time.py --compare baseline.json --threshold 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = ["resilient", "resilient_lib", "resilient_circuits", "resilient_circuits.app"]
+
+
+def import_time(module):
+    """
+    Import ``module`` in a fresh interpreter and parse the ``-X importtime`` output
+
+    :return: (cumulative time of ``module`` in microseconds, dict of every imported module to its cumulative time)
+    :rtype: tuple
+    """
+    # run from the root directory so local source folders do not shadow installed packages
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-W", "ignore", "-c", "import {0}".format(module)],
+                          cwd=os.path.abspath(os.sep), capture_output=True, text=True, check=True)
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        entries.append((name.strip(), int(cumulative), depth))
+
+    # importtime prints children before their parent with a deeper indent,
+    # so walk back from the module's own line to collect what it pulled in
+    timings = {}
+    for i, (name, cumulative, depth) in enumerate(entries):
+        if name == module:
+            timings[name] = cumulative
+            for child, child_cumulative, child_depth in reversed(entries[:i]):
+                if child_depth <= depth:
+                    break
+                timings[child] = child_cumulative
+            break
+
+    return timings.get(module, 0), timings
+
+
+def run(modules, runs, top):
+    results = {}
+    for module in modules:
+        totals = []
+        all_timings = []
+        for _ in range(runs):
+            total, timings = import_time(module)
+            totals.append(total)
+            all_timings.append(timings)
+
+        median_timings = {}
+        for name in all_timings[0]:
+            median_timings[name] = statistics.median(t.get(name, 0) for t in all_timings)
+
+        slowest = sorted(((t, n) for n, t in median_timings.items() if n != module), reverse=True)[:top]
+        results[module] = {
+            "median_us": statistics.median(totals),
+            "min_us": min(totals),
+            "modules_imported": len(median_timings),
+            "slowest": [{"module": n, "cumulative_us": t} for t, n in slowest]
+        }
+    return results
+
+
+def print_results(results):
+    for module, result in results.items():
+        print("{0:<30} median {1:>8.1f} ms   min {2:>8.1f} ms   {3} modules".format(
+            module, result["median_us"] / 1000.0, result["min_us"] / 1000.0, result["modules_imported"]))
+        for s in result["slowest"]:
+            print("    {0:<50} {1:>8.1f} ms".format(s["module"], s["cumulative_us"] / 1000.0))
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for module, result in results.items():
+        if module not in baseline:
+            continue
+        before = baseline[module]["median_us"]
+        after = result["median_us"]
+        change = (after - before) * 100.0 / before if before else 0.0
+        print("{0:<30} {1:>8.1f} ms -> {2:>8.1f} ms ({3:+.1f}%)".format(module, before / 1000.0, after / 1000.0, change))
+        if change > threshold:
+            regressions.append(module)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cold import time of resilient packages")
+    parser.add_argument("-m", "--modules", nargs="+", default=DEFAULT_MODULES, help="modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest dependencies to list")
+    parser.add_argument("--save", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results with this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=25.0, help="percent slower than the baseline that counts as a regression")
+    args = parser.parse_args()
+
+    results = run(args.modules, args.runs, args.top)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=4)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print("Import time regressions: {0}".format(", ".join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
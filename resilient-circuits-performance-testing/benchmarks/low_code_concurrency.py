@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    low_code_concurrency.py
+    -----------------------
+
+    Compare the throughput of I/O bound low code invocations dispatched as
+    ``task`` events to the ``FunctionWorker`` thread-pool and to the
+    ``AsyncFunctionWorker`` event loop, like ``Actions`` does.
+
+    Each invocation makes a GET request to a local endpoint that answers after
+    ``--latency`` ms:
+
+    * ``FunctionWorker``: ``RequestsCommon.execute`` on ``--num-workers`` threads
+    * ``async, default executor``: ``execute_async`` without ``aiohttp`` in the
+      loop's default executor of min(32, CPUs + 4) threads, like it was before
+    * ``async, executor``: ``execute_async`` without ``aiohttp`` in the
+      executor of ``--max-concurrency`` threads of the ``AsyncFunctionWorker``
+    * ``async, aiohttp``: ``execute_async`` with ``aiohttp``, if it is installed
+
+    Usage:
+        python low_code_concurrency.py
+        python low_code_concurrency.py --invocations 5000 --latency 100 --num-workers 25 --max-concurrency 1000
+"""
+
+import argparse
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from circuits import Event, Manager
+from resilient_circuits import async_requests
+from resilient_circuits.actions_component import AsyncFunctionWorker, FunctionWorker
+from resilient_circuits.async_requests import execute_async
+from resilient_lib import RequestsCommon
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\nConnection: close\r\n\r\n{}"
+
+
+def start_endpoint(latency):
+    """ start a HTTP endpoint that answers each request after latency seconds, return its url """
+    started = threading.Event()
+    endpoint = {}
+
+    async def answer(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        await asyncio.sleep(latency)
+        writer.write(RESPONSE)
+        await writer.drain()
+        writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(answer, "127.0.0.1", 0, backlog=4096)
+        endpoint["url"] = "http://127.0.0.1:{0}/api".format(server.sockets[0].getsockname()[1])
+        started.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    started.wait()
+    return endpoint["url"]
+
+
+def run_tasks(app, channel, task, invocations):
+    """ fire invocations task events at the worker and wait for all of them to finish """
+    done = threading.Event()
+    finished = []
+    lock = threading.Lock()
+
+    def count():
+        with lock:
+            finished.append(1)
+            if len(finished) == invocations:
+                done.set()
+
+    if asyncio.iscoroutinefunction(task):
+        async def f():
+            await task()
+            count()
+    else:
+        def f():
+            task()
+            count()
+
+    start = time.perf_counter()
+    for _ in range(invocations):
+        app.fire(Event.create("task", f), channel)
+    done.wait()
+    return time.perf_counter() - start
+
+
+def run_function_worker(url, rc, args):
+    app = Manager()
+    FunctionWorker(process=False, channel="functionworker", workers=args.num_workers).register(app)
+    app.start()
+    try:
+        return run_tasks(app, "functionworker", lambda: rc.execute("GET", url), args.invocations)
+    finally:
+        app.stop()
+
+
+def run_async_function_worker(url, rc, args, executor=None):
+    app = Manager()
+    worker = AsyncFunctionWorker(max_concurrency=args.max_concurrency).register(app)
+    worker._start_loop()
+    if executor:
+        worker.loop.set_default_executor(executor)
+    app.start()
+
+    async def task():
+        await execute_async(rc, "GET", url)
+
+    try:
+        return run_tasks(app, worker.channel, task, args.invocations)
+    finally:
+        worker.stop_loop()
+        app.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark I/O bound low code invocations on threads vs an event loop")
+    parser.add_argument("--invocations", type=int, default=2000, help="number of low code invocations")
+    parser.add_argument("--latency", type=float, default=50, help="latency of the endpoint in ms")
+    parser.add_argument("--num-workers", type=int, default=25, help="size of the FunctionWorker thread-pool")
+    parser.add_argument("--max-concurrency", type=int, default=500, help="low_code_max_concurrency of the AsyncFunctionWorker")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    url = start_endpoint(args.latency / 1000.0)
+    rc = RequestsCommon(opts={}, function_opts={})
+    aiohttp = async_requests.aiohttp
+
+    print("{0:<26} {1:>10} {2:>16}".format("executor", "time (s)", "invocations/s"))
+
+    def show(name, elapsed):
+        print("{0:<26} {1:>10.2f} {2:>16.1f}".format(name, elapsed, args.invocations / elapsed))
+
+    show("FunctionWorker", run_function_worker(url, rc, args))
+
+    async_requests.aiohttp = None
+    try:
+        show("async, default executor", run_async_function_worker(url, rc, args, executor=ThreadPoolExecutor()))
+        show("async, executor", run_async_function_worker(url, rc, args))
+    finally:
+        async_requests.aiohttp = aiohttp
+
+    if aiohttp:
+        show("async, aiohttp", run_async_function_worker(url, rc, args))
+    else:
+        print("{0:<26} {1:>27}".format("async, aiohttp", "not installed"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    mock_dispatch.py
+    ----------------
+
+    Throughput of requests answered by a ``ResilientMock`` with the endpoints
+    of ``pytest_resilient_circuits.BasicResilientMock``, plus ``--extra-endpoints``
+    like the ones app specific mocks add. Every endpoint returns an empty
+    response, so the time measured is the time spent finding the endpoint.
+
+    The same mix of REST calls is sent to the mock's ``requests_mock.Adapter``
+    with three ways of finding the endpoint:
+
+    * ``linear``: every endpoint registered as its own matcher running ``re.search``
+      on the URL, which is how ``ResilientMock`` used to match requests
+    * ``indexed``: the route table, with its cache of matched routes turned off
+    * ``cached``: the route table as the mock uses it
+
+    Usage:
+        python mock_dispatch.py
+        python mock_dispatch.py --requests 20000 --distinct-urls 1000 --extra-endpoints 200
+"""
+
+import argparse
+import functools
+import itertools
+import time
+
+import requests
+import requests_mock
+from pytest_resilient_circuits import BasicResilientMockNoRegisterLog
+from resilient.resilient_rest_mock import ResilientMock, resilient_endpoint
+
+MOCK_URL = "https://soar.example.com/rest/orgs/201"
+
+REQUESTS = [
+    ("GET", "/incidents/{0}?handle_format=names"),
+    ("PATCH", "/incidents/{0}"),
+    ("GET", "/tasks/{0}"),
+    ("GET", "/incidents/{0}/attachments"),
+    ("GET", "/incidents/{0}/attachments/1/contents"),
+    ("POST", "/incidents/{0}/table_data/mock_table/row_data"),
+    ("GET", "/types/incident/fields"),
+    ("GET", "/functions/fn_{0}?handle_format=names"),
+    ("GET", "/wikis/{0}"),
+    ("GET", "/connectors/queues"),
+]
+
+
+def make_mock_class(extra_endpoints):
+    """ a ``ResilientMock`` with the endpoints of ``BasicResilientMock`` plus ``extra_endpoints`` more """
+    def empty_response(self, request):
+        return requests_mock.create_response(request, status_code=200)
+
+    endpoints = [(e.type, e.uri) for e in BasicResilientMockNoRegisterLog.registered_endpoints]
+    endpoints.extend(("GET", "/app_endpoint_{0}/[0-9]+$".format(i)) for i in range(extra_endpoints))
+
+    namespace = {}
+    for i, (method, uri) in enumerate(endpoints):
+        # resilient_endpoint marks the function it is given, so give it a new one for each endpoint
+        namespace["endpoint_{0}".format(i)] = resilient_endpoint(method, uri)(functools.partial(empty_response))
+    return type("BenchmarkResilientMock", (ResilientMock,), namespace)
+
+
+def make_requests(count, distinct_urls):
+    """ ``count`` prepared requests, cycling through ``distinct_urls`` URLs """
+    body = b'{"version": 1, "changes": []}'
+    prepared = []
+    for i, (method, path) in zip(range(distinct_urls), itertools.cycle(REQUESTS)):
+        prepared.append(requests.Request(method, MOCK_URL + path.format(1000 + i % 90),
+                                         data=body if method != "GET" else None).prepare())
+    return list(itertools.islice(itertools.cycle(prepared), count))
+
+
+def linear_adapter(mock):
+    """ register every endpoint of ``mock`` as its own matcher """
+    adapter = requests_mock.Adapter()
+    for endpoint, handler in mock.registered_endpoints.items():
+        adapter.add_matcher(functools.partial(ResilientMock._custom_matcher, endpoint.type, endpoint.uri,
+                                              functools.partial(handler, mock)))
+    return adapter
+
+
+def indexed_adapter(mock):
+    """ use the route table without its cache """
+    table = mock.route_table
+
+    def matcher(request):
+        for route in table._get_routes(request.method, request.url):
+            response = route.handler(mock, request)
+            if response is not None:
+                return response
+        return None
+
+    adapter = requests_mock.Adapter()
+    adapter.add_matcher(matcher)
+    return adapter
+
+
+def run(adapter, prepared):
+    start = time.perf_counter()
+    for request in prepared:
+        adapter.send(request)
+    return len(prepared) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the request throughput of BasicResilientMock")
+    parser.add_argument("--requests", type=int, default=10000, help="requests per measurement")
+    parser.add_argument("--distinct-urls", type=int, default=100, help="number of different URLs requested")
+    parser.add_argument("--extra-endpoints", type=int, default=50, help="endpoints to add to those of BasicResilientMock")
+    args = parser.parse_args()
+
+    mock = make_mock_class(args.extra_endpoints)(log_registration=False)
+    prepared = make_requests(args.requests, args.distinct_urls)
+    print("{0} endpoints, {1} requests, {2} distinct URLs".format(len(mock.registered_endpoints), args.requests, args.distinct_urls))
+
+    results = [("linear", run(linear_adapter(mock), prepared)),
+               ("indexed", run(indexed_adapter(mock), prepared)),
+               ("cached", run(mock.adapter, prepared))]
+
+    baseline = results[0][1]
+    for name, rate in results:
+        print("{0:<10} {1:>10.0f} requests/s {2:>6.2f}x".format(name, rate, rate / baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    secret_substitution.py
+    ----------------------
+
+    Microbenchmark of ``resilient_circuits.helpers.sub_fn_inputs_from_protected_secrets``,
+    which is called on every ``@app_function`` and ``@low_code_function`` invocation.
+
+    Function inputs of increasing size are generated, both with and without
+    secret markers, and the mean time per call is reported. The cost of a plain
+    ``copy.deepcopy`` of the same inputs is shown for reference.
+
+    Usage:
+        python secret_substitution.py
+        python secret_substitution.py --sizes 1 100 10000 --iterations 500
+"""
+
+import argparse
+import copy
+import os
+import timeit
+
+from resilient_circuits import helpers
+
+from resilient.app_config import AppConfigManager
+
+MOCK_SECRET_NAME = "BENCHMARK_SECRET"
+
+
+def make_inputs(size, with_secret):
+    """
+    Build mock function inputs with ``size`` text inputs, plus a
+    low code style ``request_payload`` with a body of ``size`` KB
+    """
+    fn_inputs = {"fn_input_{0}".format(i): "value {0}".format(i) for i in range(size)}
+    fn_inputs["fn_input_number"] = 1234
+    fn_inputs["fn_input_multiselect"] = ["A", "B", "C"]
+    fn_inputs["request_payload"] = {
+        "method": "POST",
+        "url": "https://example.com/api",
+        "headers": {"Content-Type": "application/json"},
+        "body": "x" * 1024 * size
+    }
+    if with_secret:
+        fn_inputs["fn_input_secret"] = "${{{0}}}".format(MOCK_SECRET_NAME)
+    return fn_inputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark secret substitution in function inputs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="number of inputs (and KB of request body)")
+    parser.add_argument("--iterations", type=int, default=200, help="calls per measurement")
+    args = parser.parse_args()
+
+    os.environ[MOCK_SECRET_NAME] = "mock secret value"
+    opts = AppConfigManager({})
+
+    print("{0:>8} {1:>10} {2:>16} {3:>16}".format("size", "secrets", "substitute (us)", "deepcopy (us)"))
+    for size in args.sizes:
+        for with_secret in (False, True):
+            fn_inputs = make_inputs(size, with_secret)
+
+            sub_time = timeit.timeit(lambda: helpers.sub_fn_inputs_from_protected_secrets(fn_inputs, opts), number=args.iterations)
+            copy_time = timeit.timeit(lambda: copy.deepcopy(fn_inputs), number=args.iterations)
+
+            print("{0:>8} {1:>10} {2:>16.1f} {3:>16.1f}".format(
+                size, str(with_secret), sub_time * 1e6 / args.iterations, copy_time * 1e6 / args.iterations))
+
+
+if __name__ == "__main__":
+    main()
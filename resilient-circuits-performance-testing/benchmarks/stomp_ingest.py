@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    stomp_ingest.py
+    ---------------
+
+    Frames per second through ``Actions.on_stomp_message``: the time from a
+    STOMP ``MESSAGE`` frame being received to its ``FunctionMessage`` event
+    being fired, for a small and a large function message.
+
+    ``on_stomp_message`` is called on a stand-in for the ``Actions`` component
+    that does not fire the events, so nothing else is measured. Run with
+    ``--debug`` to measure it with DEBUG logging turned on (logged to nowhere).
+
+    Usage:
+        python stomp_ingest.py
+        python stomp_ingest.py --frames 20000 --large-kb 1024 --debug
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from resilient_circuits.actions_component import Actions
+from resilient_circuits.helpers import get_queue
+from stomp.utils import Frame
+
+DESTINATION = "/queue/actions.201.fn_bench"
+
+
+class ActionsStandIn(object):
+    """ the attributes of ``Actions`` that ``on_stomp_message`` uses """
+
+    def __init__(self):
+        self._resilient_ack_delivery_failures = {}
+        self._stomp_ack_delivery_failures = {}
+        self._current_msgs_processing = {}
+        self._all_acks = {}
+        self._idempotency_store = None
+        self.logging_directory = None
+        self.ignore_message_failure = False
+        self.fired = 0
+
+    def fire(self, event, *channels):
+        self.fired += 1
+
+
+class StompMessageEvent(object):
+    def __init__(self, frame):
+        self.frame = frame
+
+
+def make_message(input_size):
+    """ a function message like SOAR sends, with ``input_size`` bytes of input text """
+    return {
+        "function": {"id": 101, "name": "fn_bench", "display_name": "Bench Function", "uuid": "6b6f1e8c-1d9e-4d4c-9f1a-3c0b7a4f0d11"},
+        "inputs": {"bench_text": "x" * input_size, "bench_number": 42, "incident_id": 2095},
+        "workflow": {"programmatic_name": "wf_bench", "object_type": "incident", "name": "Bench Workflow"},
+        "workflow_instance": {"workflow_instance_id": 1234},
+        "principal": {"id": 1, "type": "user", "name": "admin@example.com", "display_name": "Admin"},
+        "object": {"id": 2095, "name": "incident", "type_name": "incident"},
+        "action_id": None
+    }
+
+
+def make_frames(count, input_size):
+    body = json.dumps(make_message(input_size)).encode("utf-8")
+    frames = []
+    for i in range(count):
+        headers = {
+            "message-id": "ID:bench-{0}".format(i),
+            "destination": DESTINATION,
+            "reply-to": "/queue/acks.201.fn_bench",
+            "correlation-id": "invid:{0}".format(i),
+            "timestamp": str(int(time.time() * 1000)),
+            "Co3ContextToken": "token",
+            "Co3MessagePayload": "FunctionDataDTO",
+            "subscription": DESTINATION,
+            "ack": "ID:bench-ack-{0}".format(i)
+        }
+        frames.append(Frame(cmd="MESSAGE", headers=headers, body=body))
+    return frames, len(body)
+
+
+def run(frames):
+    stand_in = ActionsStandIn()
+    queue = get_queue(DESTINATION)
+    on_stomp_message = Actions.on_stomp_message
+
+    start = time.perf_counter()
+    for frame in frames:
+        on_stomp_message(stand_in, StompMessageEvent(frame), frame.headers, frame.body, queue)
+        stand_in._current_msgs_processing.clear()
+    elapsed = time.perf_counter() - start
+
+    assert stand_in.fired == len(frames)
+    return len(frames) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the frames per second through Actions.on_stomp_message")
+    parser.add_argument("--frames", type=int, default=20000, help="frames of the small message to send")
+    parser.add_argument("--small-bytes", type=int, default=200, help="size of the input text of the small message")
+    parser.add_argument("--large-kb", type=int, default=512, help="size of the input text of the large message")
+    parser.add_argument("--debug", action="store_true", help="turn on DEBUG logging")
+    args = parser.parse_args()
+
+    logging.getLogger().addHandler(logging.NullHandler())
+    logging.getLogger().setLevel(logging.DEBUG if args.debug else logging.INFO)
+    logging.getLogger("resilient_circuits").propagate = False
+    logging.getLogger("resilient_circuits").addHandler(logging.NullHandler())
+
+    large_frames = max(args.frames // 200, 20)
+    for name, count, size in (("small", args.frames, args.small_bytes), ("large", large_frames, args.large_kb * 1024)):
+        frames, body_size = make_frames(count, size)
+        run(frames[:min(100, count)])
+        rate = run(frames)
+        print("{0:<6} {1:>9} bytes {2:>10.0f} frames/s {3:>10.1f} MB/s".format(name, body_size, rate, rate * body_size / 1e6))
+
+
+if __name__ == "__main__":
+    main()
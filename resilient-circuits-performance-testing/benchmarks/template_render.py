@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    template_render.py
+    ------------------
+
+    Records per second through ``resilient_lib.render_json`` and
+    ``make_payload_from_template`` with a case create template like a poller uses.
+
+    * ``cold``: the template cache is cleared before each record, so the
+      template is read and compiled by Jinja every time, as it used to be
+    * ``warm``: the compiled template (and template file) are cached
+
+    Then the records per second through ``render_json_batch``, in this
+    process and in ``--processes`` worker processes.
+
+    Usage:
+        python template_render.py
+        python template_render.py --records 50000 --processes 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from resilient_lib import (clear_template_cache, make_payload_from_template,
+                           render_json, render_json_batch)
+
+CASE_TEMPLATE = """{
+  "name": "{{ alert.title | e }} - {{ alert.id }}",
+  "description": {"format": "text", "content": "{{ alert.description | js }}"},
+  "discovered_date": {{ alert.created | soar_datetimeformat(split_at='.') }},
+  "start_date": {{ alert.created | soar_datetimeformat(split_at='.') }},
+  "severity_code": "{{ alert.severity | soar_substitute('{\\"1\\": \\"Low\\", \\"2\\": \\"Medium\\", \\"3\\": \\"High\\"}') }}",
+  "incident_type_ids": [{% for category in alert.categories %}"{{ category }}"{% if not loop.last %}, {% endif %}{% endfor %}],
+  "plan_status": "{{ 'C' if alert.status == 'closed' else 'A' }}",
+  "properties": {
+    "alert_id": "{{ alert.id }}",
+    "alert_source": "{{ alert.source | e }}",
+    "alert_assignee": "{{ alert.assignee | default('unassigned') }}",
+    "alert_tags": "{{ alert.tags | join(', ') }}",
+    "alert_url": "https://alerts.example.com/{{ alert.id | url }}"
+  }
+}"""
+
+
+def make_record(i):
+    return {"alert": {
+        "id": "AL-{0}".format(i),
+        "title": "Suspicious login <{0}>".format(i),
+        "description": "User logged in from a \"new\" country\nat 03:00",
+        "created": "2025-02-21T07:36:17.124Z",
+        "severity": str(i % 3 + 1),
+        "categories": ["Malware", "Phishing"],
+        "status": "open" if i % 5 else "closed",
+        "source": "Firewall",
+        "assignee": None if i % 2 else "analyst@example.com",
+        "tags": ["login", "geo"],
+    }}
+
+
+def run(render_one, records, cold):
+    start = time.perf_counter()
+    for record in records:
+        if cold:
+            clear_template_cache()
+        render_one(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendering JSON templates for many records")
+    parser.add_argument("--records", type=int, default=5000, help="records to render")
+    parser.add_argument("--processes", type=int, default=4, help="worker processes for render_json_batch")
+    args = parser.parse_args()
+
+    records = [make_record(i) for i in range(args.records)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        template_path = os.path.join(temp_dir, "case_create.jinja2")
+        with open(template_path, "w") as f:
+            f.write(CASE_TEMPLATE)
+
+        cases = (
+            ("render_json", lambda record: render_json(CASE_TEMPLATE, record)),
+            ("make_payload_from_template", lambda record: make_payload_from_template(template_path, None, record))
+        )
+
+        print("{0:<28} {1:>14} {2:>14} {3:>8}".format("", "cold rec/s", "warm rec/s", "speedup"))
+        for name, render_one in cases:
+            cold = run(render_one, records[:max(len(records) // 10, 1)], cold=True)
+            warm = run(render_one, records, cold=False)
+            print("{0:<28} {1:>14.0f} {2:>14.0f} {3:>7.1f}x".format(name, cold, warm, warm / cold))
+
+    print()
+    print("{0:<28} {1:>14}".format("render_json_batch", "rec/s"))
+    for processes in (None, args.processes):
+        start = time.perf_counter()
+        for _ in render_json_batch(CASE_TEMPLATE, (make_record(i) for i in range(args.records)), processes=processes):
+            pass
+        rate = args.records / (time.perf_counter() - start)
+        print("{0:<28} {1:>14.0f}".format("{0} process(es)".format(processes or 1), rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+# pragma pylint: disable=unused-argument, no-self-use
+"""Function implementation loaded from the ``componentsdir`` of the load test"""
+
+import time
+
+from resilient_circuits import AppFunctionComponent, FunctionResult, app_function
+
+PACKAGE_NAME = "load_test"
+FN_NAME = "load_test_fn"
+
+
+class FunctionComponent(AppFunctionComponent):
+    """Component that implements function 'load_test_fn'"""
+
+    def __init__(self, opts):
+        super(FunctionComponent, self).__init__(opts, PACKAGE_NAME)
+
+    @app_function(FN_NAME)
+    def _app_function(self, fn_inputs):
+        """
+        Function: sleeps for ``load_test_sleep_ms`` to simulate calling an endpoint,
+        then returns the size of ``load_test_payload``
+        """
+        sleep_ms = getattr(fn_inputs, "load_test_sleep_ms", 0) or 0
+        if sleep_ms:
+            time.sleep(sleep_ms / 1000.0)
+
+        payload = getattr(fn_inputs, "load_test_payload", "") or ""
+        yield FunctionResult({"payload_size": len(payload)})
@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    run_load_test.py
+    ----------------
+
+    End-to-end load test of resilient-circuits without a SOAR server.
+
+    A local stand-in for the SOAR REST API (:mod:`soar_stand_in`) and a local
+    STOMP broker (:mod:`stomp_broker`) are started with a self-signed
+    certificate, then an unmodified ``resilient-circuits`` process is started
+    against them with the function in ``components/`` loaded from its
+    ``componentsdir``.
+
+    Function messages are published to the function's message destination at
+    ``--rate`` messages per second with a ``--payload-size`` byte input, and
+    the final (``complete``) reply of each is matched by its ``correlation-id``.
+    The report has:
+
+    * throughput: completed messages per second over the measured run
+    * end-to-end latency: from publishing a message to receiving its final reply
+    * ack latency: from delivering a message to resilient-circuits to receiving its ``ACK``
+    * the REST calls resilient-circuits made to the stand-in
+
+    Usage:
+        python run_load_test.py
+        python run_load_test.py --messages 5000 --rate 200 --payload-size 10240
+        python run_load_test.py --rate 0 --num-workers 50 --sleep-ms 100 --save results.json
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from resilient_circuits.actions_test_replay import percentile
+from soar_stand_in import ORG_ID, LoadTestResilientMock, SOARStandIn, server_ssl_context
+from stomp_broker import StompBroker
+
+LOG = logging.getLogger(__name__)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FN_NAME = "load_test_fn"
+DESTINATION = "load_test"
+EMAIL = "load.test@example.com"
+PASSWORD = "load-test-password"
+
+APP_CONFIG = u"""[resilient]
+host = 127.0.0.1
+port = {rest_port}
+stomp_port = {stomp_port}
+org = Test Org
+email = {email}
+password = {password}
+cafile = false
+componentsdir = {componentsdir}
+logdir = {logdir}
+loglevel = {loglevel}
+num_workers = {num_workers}
+stomp_prefetch_limit = {prefetch}
+
+[load_test]
+"""
+
+
+def make_certificate(directory):
+    """
+    Write a self-signed certificate for 127.0.0.1 to ``directory``
+
+    :return: (certfile, keyfile)
+    :rtype: tuple
+    """
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    try:
+        import ipaddress
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.x509.oid import NameOID
+    except ImportError:
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                        "-subj", "/CN=127.0.0.1", "-keyout", keyfile, "-out", certfile],
+                       check=True, capture_output=True)
+        return certfile, keyfile
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, u"127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (x509.CertificateBuilder()
+            .subject_name(name).issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(minutes=5))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address(u"127.0.0.1"))]), critical=False)
+            .sign(key, hashes.SHA256()))
+
+    with open(keyfile, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                                  serialization.NoEncryption()))
+    with open(certfile, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    return certfile, keyfile
+
+
+def summarize(values):
+    """ summary of a list of latencies in seconds, in milliseconds """
+    if not values:
+        return {}
+    return {
+        "count": len(values),
+        "mean_ms": statistics.mean(values) * 1000,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": max(values) * 1000
+    }
+
+
+class LoadTest(object):
+    """ Publish function messages and match up their replies and acks """
+
+    def __init__(self, broker, payload_size, sleep_ms):
+        self.broker = broker
+        self.payload = "x" * payload_size
+        self.sleep_ms = sleep_ms
+        self.queue = "actions.{0}.{1}".format(ORG_ID, DESTINATION)
+
+        self._lock = threading.Lock()
+        self._all_done = threading.Condition(self._lock)
+        # correlation id -> time published
+        self._in_flight = {}
+        self.measuring = False
+        self.e2e_latencies = []
+        self.ack_latencies = []
+        self.errors = 0
+        self.completed = 0
+
+        broker.on_send = self.on_send
+        broker.on_ack = self.on_ack
+
+    def publish(self):
+        correlation_id = str(uuid.uuid4())
+        message = {
+            "function": {"name": FN_NAME},
+            "inputs": {"load_test_payload": self.payload, "load_test_sleep_ms": self.sleep_ms},
+            "workflow_instance": {"workflow_instance_id": 1},
+            "object": {"type_name": "incident", "id": 2314}
+        }
+        headers = {"correlation-id": correlation_id,
+                   "reply-to": "/queue/acks.{0}.{1}".format(ORG_ID, DESTINATION),
+                   "persistent": "true"}
+        with self._lock:
+            self._in_flight[correlation_id] = time.monotonic()
+        self.broker.publish(self.queue, json.dumps(message).encode("utf-8"), headers)
+
+    def on_send(self, destination, headers, body):
+        reply = json.loads(body.decode("utf-8"))
+        if not reply.get("complete"):
+            return
+        now = time.monotonic()
+        with self._lock:
+            published = self._in_flight.pop(headers.get("correlation-id"), None)
+            if published is None:
+                return
+            if self.measuring:
+                self.e2e_latencies.append(now - published)
+                self.completed += 1
+                if reply.get("message_type") != 0:
+                    self.errors += 1
+            if not self._in_flight:
+                self._all_done.notify_all()
+
+    def on_ack(self, message_id, since_delivered, since_published):
+        with self._lock:
+            if self.measuring:
+                self.ack_latencies.append(since_delivered)
+
+    def run(self, count, rate):
+        """ publish ``count`` messages at ``rate`` per second (``0`` for as fast as possible) """
+        start = time.monotonic()
+        for i in range(count):
+            if rate:
+                delay = start + float(i) / rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            self.publish()
+        return time.monotonic() - start
+
+    def wait(self, timeout):
+        """ wait for the final reply of every message published so far """
+        with self._all_done:
+            return self._all_done.wait_for(lambda: not self._in_flight, timeout)
+
+    @property
+    def outstanding(self):
+        with self._lock:
+            return len(self._in_flight)
+
+
+def start_resilient_circuits(workdir, app_config):
+    """ Start resilient-circuits in a new process using ``app_config`` """
+    config_path = os.path.join(workdir, "app.config")
+    with open(config_path, "w") as f:
+        f.write(app_config)
+
+    env = dict(os.environ,
+               APP_CONFIG_FILE=config_path,
+               APP_LOCK_FILE=os.path.join(workdir, "resilient_circuits_lockfile"))
+    # run in the work dir so local source folders do not shadow installed packages
+    return subprocess.Popen([sys.executable, "-c", "from resilient_circuits.app import run; run()"],
+                            cwd=workdir, env=env,
+                            stdout=open(os.path.join(workdir, "stdout.log"), "wb"), stderr=subprocess.STDOUT)
+
+
+def print_results(results):
+    print("")
+    print("messages             {0} ({1} errors, {2} not completed)".format(results["messages"], results["errors"], results["not_completed"]))
+    print("payload size         {0} bytes".format(results["payload_size"]))
+    print("target rate          {0}".format("{0}/s".format(results["rate"]) if results["rate"] else "unlimited"))
+    print("publish rate         {0:.1f}/s".format(results["publish_rate"]))
+    print("throughput           {0:.1f}/s".format(results["throughput"]))
+    for name in ("end_to_end", "ack"):
+        summary = results[name]
+        if summary:
+            print("{0:<20} p50 {1:8.1f} ms   p95 {2:8.1f} ms   p99 {3:8.1f} ms   max {4:8.1f} ms".format(
+                name.replace("_", "-") + " latency", summary["p50_ms"], summary["p95_ms"], summary["p99_ms"], summary["max_ms"]))
+    print("")
+    print("REST calls to the SOAR stand-in:")
+    for endpoint, stats in sorted(results["rest_calls"].items()):
+        print("    {0:<60} {1:>6}  {2:8.2f} ms".format(endpoint, stats["count"], stats["mean_ms"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test resilient-circuits against a local SOAR REST and STOMP stand-in")
+    parser.add_argument("--messages", type=int, default=1000, help="number of messages to measure")
+    parser.add_argument("--warmup", type=int, default=50, help="messages to process before measuring")
+    parser.add_argument("--rate", type=float, default=100.0, help="messages published per second, 0 for as fast as possible")
+    parser.add_argument("--payload-size", type=int, default=1024, help="bytes in the function input of each message")
+    parser.add_argument("--sleep-ms", type=int, default=0, help="time the function sleeps for, to simulate calling an endpoint")
+    parser.add_argument("--num-workers", type=int, default=10, help="resilient-circuits num_workers")
+    parser.add_argument("--prefetch", type=int, default=20, help="resilient-circuits stomp_prefetch_limit")
+    parser.add_argument("--startup-timeout", type=float, default=60.0, help="seconds to wait for resilient-circuits to subscribe")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for the last replies")
+    parser.add_argument("--loglevel", default="WARNING", help="resilient-circuits log level")
+    parser.add_argument("--keep", action="store_true", help="keep the work directory with the app.config and logs")
+    parser.add_argument("--save", help="save the results to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    workdir = tempfile.mkdtemp(prefix="resilient_load_test_")
+    certfile, keyfile = make_certificate(workdir)
+    ssl_context = server_ssl_context(certfile, keyfile)
+
+    mock = LoadTestResilientMock({FN_NAME: DESTINATION}, email=EMAIL)
+    rest = SOARStandIn(mock, ssl_context).start()
+    broker = StompBroker(ssl_context=ssl_context).start()
+    load_test = LoadTest(broker, args.payload_size, args.sleep_ms)
+
+    app_config = APP_CONFIG.format(rest_port=rest.port, stomp_port=broker.port, email=EMAIL, password=PASSWORD,
+                                   componentsdir=os.path.join(HERE, "components"), logdir=workdir,
+                                   loglevel=args.loglevel, num_workers=args.num_workers, prefetch=args.prefetch)
+    proc = start_resilient_circuits(workdir, app_config)
+
+    try:
+        LOG.info("Waiting for resilient-circuits to subscribe to %s", load_test.queue)
+        if not broker.wait_for_subscription(load_test.queue, args.startup_timeout):
+            LOG.error("resilient-circuits did not subscribe to %s. See the logs in %s", load_test.queue, workdir)
+            args.keep = True
+            sys.exit(1)
+
+        if args.warmup:
+            LOG.info("Warming up with %s messages", args.warmup)
+            load_test.run(args.warmup, args.rate)
+            load_test.wait(args.timeout)
+
+        LOG.info("Publishing %s messages", args.messages)
+        load_test.measuring = True
+        start = time.monotonic()
+        publish_time = load_test.run(args.messages, args.rate)
+        finished = load_test.wait(args.timeout)
+        elapsed = time.monotonic() - start
+        if not finished:
+            LOG.warning("%s messages were not completed within %s seconds", load_test.outstanding, args.timeout)
+
+        rest_calls = {}
+        for endpoint, (count, total) in rest.requests.items():
+            rest_calls[endpoint] = {"count": count, "mean_ms": total * 1000 / count}
+
+        results = {
+            "messages": args.messages,
+            "payload_size": args.payload_size,
+            "rate": args.rate,
+            "sleep_ms": args.sleep_ms,
+            "num_workers": args.num_workers,
+            "prefetch": args.prefetch,
+            "errors": load_test.errors,
+            "not_completed": load_test.outstanding,
+            "publish_rate": args.messages / publish_time if publish_time else 0.0,
+            "throughput": load_test.completed / elapsed if elapsed else 0.0,
+            "end_to_end": summarize(load_test.e2e_latencies),
+            "ack": summarize(load_test.ack_latencies),
+            "broker": dict(broker.stats),
+            "rest_calls": rest_calls
+        }
+        print_results(results)
+
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(results, f, indent=4)
+
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        broker.stop()
+        rest.stop()
+        if args.keep:
+            print("app.config and logs are in {0}".format(workdir))
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
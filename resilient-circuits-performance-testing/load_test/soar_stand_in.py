@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    soar_stand_in.py
+    ----------------
+
+    Serve a :class:`resilient.resilient_rest_mock.ResilientMock` over real
+    HTTPS so an unmodified resilient-circuits process can use it as its SOAR
+    server.
+
+    Each incoming request is turned into a ``requests.PreparedRequest`` and
+    answered by the mock's ``requests_mock.Adapter``, so the same endpoint
+    definitions that the unit tests use also serve the load test.
+"""
+
+import collections
+import copy
+import logging
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+import requests_mock
+from pytest_resilient_circuits.mocks import BasicResilientMock, test_data
+from resilient.resilient_rest_mock import resilient_endpoint
+
+LOG = logging.getLogger(__name__)
+
+ORG_ID = 201
+
+
+class LoadTestResilientMock(BasicResilientMock):
+    """
+    :class:`BasicResilientMock` with a function definition for each of the load test functions
+
+    :param functions: function name -> message destination
+    :type functions: dict
+    """
+
+    def __init__(self, functions, *args, **kwargs):
+        kwargs.setdefault("log_registration", False)
+        super(LoadTestResilientMock, self).__init__(*args, **kwargs)
+        template = test_data("200_JSON_GET__functions.json")["entities"][0]
+        self.functions = {}
+        for i, (fn_name, destination) in enumerate(sorted(functions.items()), start=1):
+            fn_def = copy.deepcopy(template)
+            fn_def.update({"id": i, "name": fn_name, "display_name": fn_name,
+                           "destination_handle": destination, "view_items": []})
+            self.functions[fn_name] = fn_def
+
+    @resilient_endpoint("GET", "/functions/.*$")
+    def functions_get_xxx(self, request):
+        """ Callback for GET to /orgs/<org_id>/functions/<fn_name> """
+        fn_name = request.path.rstrip("/").split("/")[-1]
+        if fn_name not in self.functions:
+            return requests_mock.create_response(request, status_code=404)
+        return requests_mock.create_response(request, status_code=200, json=self.functions[fn_name])
+
+    @resilient_endpoint("GET", "/message_destinations")
+    def message_destinations_get(self, request):
+        """ Callback for GET to /orgs/<org_id>/message_destinations """
+        destinations = sorted(set(fn_def["destination_handle"] for fn_def in self.functions.values()))
+        entities = [{"id": i, "name": d, "programmatic_name": d, "destination_type": 0, "expect_ack": True,
+                     "users": [], "tags": [], "uuid": None}
+                    for i, d in enumerate(destinations, start=1)]
+        return requests_mock.create_response(request, status_code=200, json={"entities": entities})
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """ Answer every request with the ``requests_mock.Adapter`` of ``server.mock`` """
+
+    # keep-alive, like the real server
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        start = time.monotonic()
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        url = "https://{0}:{1}{2}".format(self.server.server_address[0], self.server.server_address[1], self.path)
+        prepared = requests.Request(self.command, url, headers=dict(self.headers.items()), data=body).prepare()
+
+        try:
+            response = self.server.mock.adapter.send(prepared)
+            status, content = response.status_code, response.content or b""
+            headers = [(k, v) for k, v in response.headers.items()
+                       if k.lower() not in ("content-length", "transfer-encoding", "connection")]
+            headers.extend(("Set-Cookie", "{0}={1}; Path=/".format(c.name, c.value)) for c in response.cookies)
+        except requests_mock.exceptions.NoMockAddress:
+            LOG.warning("No mock endpoint for %s %s", self.command, self.path)
+            status, content, headers = 404, b"", []
+
+        self.send_response(status)
+        for key, value in headers:
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+        self.server.record(self.command, prepared.path_url.split("?")[0], time.monotonic() - start)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        LOG.debug(format, *args)
+
+
+class SOARStandIn(ThreadingHTTPServer):
+    """
+    HTTPS server for a :class:`resilient.resilient_rest_mock.ResilientMock`
+
+    :param mock: the mock that answers the requests
+    :type mock: :class:`resilient.resilient_rest_mock.ResilientMock`
+    :param ssl_context: server side ``ssl.SSLContext`` with the certificate to use
+    :type ssl_context: ssl.SSLContext
+    :param host: address to listen on
+    :type host: str
+    :param port: port to listen on. ``0`` picks a free port, see :attr:`port`
+    :type port: int
+    """
+
+    daemon_threads = True
+
+    def __init__(self, mock, ssl_context, host="127.0.0.1", port=0):
+        super(SOARStandIn, self).__init__((host, port), _Handler)
+        self.mock = mock
+        self.socket = ssl_context.wrap_socket(self.socket, server_side=True)
+        self.port = self.server_address[1]
+        self._lock = threading.Lock()
+        self._thread = None
+        # "METHOD /path" -> [count, total seconds]
+        self.requests = collections.defaultdict(lambda: [0, 0.0])
+
+    def record(self, method, path, elapsed):
+        # the org id is in most paths, so group on the endpoint rather than the full path
+        key = u"{0} {1}".format(method, path.replace("/orgs/{0}".format(ORG_ID), ""))
+        with self._lock:
+            entry = self.requests[key]
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="SOARStandIn", daemon=True)
+        self._thread.start()
+        LOG.info("SOAR REST stand-in listening on https://%s:%s", self.server_address[0], self.port)
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join(5)
+
+
+def server_ssl_context(certfile, keyfile):
+    """ A server side ``ssl.SSLContext`` for the broker and the REST stand-in """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile, keyfile)
+    return context
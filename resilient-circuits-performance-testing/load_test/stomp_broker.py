@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+    stomp_broker.py
+    ---------------
+
+    A minimal, in-process STOMP 1.2 broker that stands in for the SOAR
+    message broker when load testing resilient-circuits.
+
+    It supports the frames resilient-circuits uses:
+    ``CONNECT``/``STOMP``, ``SUBSCRIBE`` (with ``ack:client-individual`` and
+    ``activemq.prefetchSize``), ``UNSUBSCRIBE``, ``SEND``, ``ACK``, ``NACK``
+    and ``DISCONNECT``. Messages that are not acknowledged when a connection
+    closes are redelivered, like ActiveMQ does.
+
+    The broker does not authenticate and does not send heart-beats.
+"""
+
+import collections
+import itertools
+import logging
+import socket
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+QUEUE_PREFIX = "/queue/"
+
+# STOMP 1.2 header escaping
+_ESCAPES = (("\\", "\\\\"), ("\r", "\\r"), ("\n", "\\n"), (":", "\\c"))
+
+
+def _escape(value):
+    value = str(value)
+    for char, escaped in _ESCAPES:
+        value = value.replace(char, escaped)
+    return value
+
+
+def _unescape(value):
+    if "\\" not in value:
+        return value
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            char = {"\\": "\\", "r": "\r", "n": "\n", "c": ":"}.get(next(chars, ""), "")
+        result.append(char)
+    return "".join(result)
+
+
+def normalize_destination(destination):
+    """ ``/queue/actions.201.x`` and ``actions.201.x`` are the same queue """
+    if destination.startswith(QUEUE_PREFIX):
+        return destination[len(QUEUE_PREFIX):]
+    return destination
+
+
+class Frame(object):
+    """ A STOMP frame """
+
+    def __init__(self, command, headers=None, body=b""):
+        self.command = command
+        self.headers = headers or {}
+        self.body = body
+
+    def encode(self):
+        lines = [self.command]
+        lines.extend(u"{0}:{1}".format(_escape(k), _escape(v)) for k, v in self.headers.items())
+        head = u"\n".join(lines).encode("utf-8")
+        body = self.body if isinstance(self.body, bytes) else self.body.encode("utf-8")
+        return head + u"\ncontent-length:{0}\n\n".format(len(body)).encode("utf-8") + body + b"\x00"
+
+
+class FrameReader(object):
+    """ Incrementally parse frames out of the bytes read from a socket """
+
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, data):
+        """
+        :return: the complete frames in the buffer
+        :rtype: list
+        """
+        self._buffer += data
+        frames = []
+        while True:
+            # skip heart-beat EOLs between frames
+            self._buffer = self._buffer.lstrip(b"\r\n")
+            end_of_headers = self._buffer.find(b"\n\n")
+            if end_of_headers < 0:
+                return frames
+
+            lines = self._buffer[:end_of_headers].decode("utf-8").split("\n")
+            headers = {}
+            for line in lines[1:]:
+                key, _, value = line.rstrip("\r").partition(":")
+                # the first occurrence of a repeated header wins
+                headers.setdefault(_unescape(key), _unescape(value))
+
+            body_start = end_of_headers + 2
+            if "content-length" in headers:
+                body_end = body_start + int(headers["content-length"])
+                if len(self._buffer) < body_end + 1:
+                    return frames
+            else:
+                body_end = self._buffer.find(b"\x00", body_start)
+                if body_end < 0:
+                    return frames
+
+            frames.append(Frame(lines[0].strip(), headers, self._buffer[body_start:body_end]))
+            self._buffer = self._buffer[body_end + 1:]
+
+
+class _Delivery(object):
+    """ A message waiting on a queue, or delivered and waiting to be acknowledged """
+
+    __slots__ = ("message_id", "destination", "headers", "body", "published", "delivered", "redelivered")
+
+    def __init__(self, message_id, destination, headers, body):
+        self.message_id = message_id
+        self.destination = destination
+        self.headers = headers
+        self.body = body
+        self.published = time.monotonic()
+        self.delivered = None
+        self.redelivered = False
+
+
+class _Subscription(object):
+
+    def __init__(self, connection, sub_id, destination, prefetch):
+        self.connection = connection
+        self.sub_id = sub_id
+        self.destination = destination
+        self.prefetch = prefetch
+        # ack id -> _Delivery
+        self.unacked = collections.OrderedDict()
+
+    @property
+    def has_credit(self):
+        return self.prefetch <= 0 or len(self.unacked) < self.prefetch
+
+
+class _Connection(object):
+
+    def __init__(self, broker, sock, address):
+        self.broker = broker
+        self.sock = sock
+        self.address = address
+        self.subscriptions = {}
+        self.closed = False
+        self._send_lock = threading.Lock()
+
+    def send_frame(self, frame):
+        data = frame.encode()
+        with self._send_lock:
+            if self.closed:
+                return False
+            try:
+                self.sock.sendall(data)
+                return True
+            except (OSError, socket.error):
+                LOG.debug("Failed to send %s to %s", frame.command, self.address)
+                return False
+
+    def close(self):
+        with self._send_lock:
+            if self.closed:
+                return
+            self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except (OSError, socket.error):
+            pass
+        self.sock.close()
+
+    def serve(self):
+        reader = FrameReader()
+        try:
+            while not self.closed:
+                data = self.sock.recv(65536)
+                if not data:
+                    break
+                for frame in reader.feed(data):
+                    if not self.broker._on_frame(self, frame):
+                        return
+        except (OSError, socket.error) as err:
+            if not self.closed:
+                LOG.debug("Connection %s failed: %s", self.address, err)
+        finally:
+            self.broker._on_disconnect(self)
+            self.close()
+
+
+class StompBroker(object):
+    """
+    Listen for STOMP connections on ``host``:``port`` in background threads.
+
+    Use :meth:`publish` to put messages on a queue, and ``on_send`` / ``on_ack``
+    to observe the frames the clients send back:
+
+    .. code-block:: python
+
+        broker = StompBroker(ssl_context=context, on_send=lambda dest, headers, body: ...)
+        broker.start()
+        broker.publish("actions.201.fn_main", b'{"function": ...}', {"reply-to": "acks.201.fn_main", ...})
+
+    :param host: address to listen on
+    :type host: str
+    :param port: port to listen on. ``0`` picks a free port, see :attr:`port`
+    :type port: int
+    :param ssl_context: (Optional) a server side ``ssl.SSLContext`` used to wrap every connection
+    :type ssl_context: ssl.SSLContext
+    :param on_send: (Optional) called with ``(destination, headers, body)`` for each ``SEND`` frame
+    :type on_send: callable
+    :param on_ack: (Optional) called with ``(message_id, seconds since delivery, seconds since publish)`` for each ``ACK``
+    :type on_ack: callable
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, ssl_context=None, on_send=None, on_ack=None):
+        self.host = host
+        self.ssl_context = ssl_context
+        self.on_send = on_send
+        self.on_ack = on_ack
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self.port = self._server.getsockname()[1]
+
+        self._lock = threading.RLock()
+        self._subscribed = threading.Condition(self._lock)
+        self._connections = set()
+        # destination -> deque of _Delivery not yet delivered
+        self._queues = collections.defaultdict(collections.deque)
+        # destination -> list of _Subscription
+        self._subscriptions = collections.defaultdict(list)
+        self._message_ids = itertools.count(1)
+        self._ack_ids = itertools.count(1)
+        self._thread = None
+        self._running = False
+
+        self.stats = collections.Counter()
+
+    def start(self):
+        self._server.listen(128)
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, name="StompBroker", daemon=True)
+        self._thread.start()
+        LOG.info("STOMP broker listening on %s:%s", self.host, self.port)
+        return self
+
+    def stop(self):
+        self._running = False
+        try:
+            self._server.close()
+        except (OSError, socket.error):
+            pass
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            connection.close()
+        if self._thread:
+            self._thread.join(5)
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                sock, address = self._server.accept()
+            except (OSError, socket.error):
+                break
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve, args=(sock, address), name="StompBroker-{0}".format(address[1]), daemon=True).start()
+
+    def _serve(self, sock, address):
+        if self.ssl_context:
+            try:
+                sock = self.ssl_context.wrap_socket(sock, server_side=True)
+            except (OSError, socket.error) as err:
+                LOG.warning("TLS handshake with %s failed: %s", address, err)
+                sock.close()
+                return
+        connection = _Connection(self, sock, address)
+        with self._lock:
+            self._connections.add(connection)
+        connection.serve()
+
+    def wait_for_subscription(self, destination, timeout=None):
+        """
+        Block until a client subscribes to ``destination``
+
+        :return: ``True`` if there is a subscription
+        :rtype: bool
+        """
+        destination = normalize_destination(destination)
+        with self._subscribed:
+            return self._subscribed.wait_for(lambda: self._subscriptions.get(destination), timeout)
+
+    def publish(self, destination, body, headers=None):
+        """
+        Put a message on the ``destination`` queue
+
+        :return: the ``message-id`` of the message
+        :rtype: str
+        """
+        destination = normalize_destination(destination)
+        message_id = "ID:load-test-{0}".format(next(self._message_ids))
+        delivery = _Delivery(message_id, destination, dict(headers or {}), body)
+        with self._lock:
+            self.stats["published"] += 1
+            self._queues[destination].append(delivery)
+            self._dispatch(destination)
+        return message_id
+
+    def pending(self, destination):
+        """ Number of messages on ``destination`` that have not been delivered """
+        with self._lock:
+            return len(self._queues.get(normalize_destination(destination), ()))
+
+    def _dispatch(self, destination):
+        """ Deliver queued messages to subscriptions that have prefetch credit, round robin """
+        queue = self._queues.get(destination)
+        subscriptions = self._subscriptions.get(destination)
+        while queue and subscriptions:
+            ready = [s for s in subscriptions if s.has_credit]
+            if not ready:
+                return
+            for subscription in ready:
+                if not queue:
+                    return
+                self._deliver(subscription, queue.popleft())
+
+    def _deliver(self, subscription, delivery):
+        ack_id = str(next(self._ack_ids))
+        headers = dict(delivery.headers)
+        headers.update({
+            "message-id": delivery.message_id,
+            "destination": QUEUE_PREFIX + delivery.destination,
+            "subscription": subscription.sub_id,
+            "ack": ack_id
+        })
+        if delivery.redelivered:
+            headers["redelivered"] = "true"
+        delivery.delivered = time.monotonic()
+        subscription.unacked[ack_id] = delivery
+        self.stats["delivered"] += 1
+        subscription.connection.send_frame(Frame("MESSAGE", headers, delivery.body))
+
+    def _on_frame(self, connection, frame):
+        """
+        Handle a frame from a client
+
+        :return: ``False`` if the connection should be closed
+        :rtype: bool
+        """
+        command = frame.command
+        headers = frame.headers
+
+        if command in ("CONNECT", "STOMP"):
+            connection.send_frame(Frame("CONNECTED", {"version": "1.2", "heart-beat": "0,0", "server": "load-test-broker"}))
+
+        elif command == "SUBSCRIBE":
+            destination = normalize_destination(headers["destination"])
+            sub_id = headers.get("id", destination)
+            prefetch = int(headers.get("activemq.prefetchSize", 0) or 0)
+            with self._lock:
+                subscription = _Subscription(connection, sub_id, destination, prefetch)
+                connection.subscriptions[sub_id] = subscription
+                self._subscriptions[destination].append(subscription)
+                self._subscribed.notify_all()
+                self._dispatch(destination)
+            LOG.info("%s subscribed to %s (prefetch %s)", connection.address, destination, prefetch)
+
+        elif command == "UNSUBSCRIBE":
+            with self._lock:
+                subscription = connection.subscriptions.pop(headers.get("id"), None)
+                if subscription:
+                    self._remove_subscription(subscription)
+
+        elif command == "SEND":
+            destination = normalize_destination(headers.get("destination", ""))
+            self.stats["sent"] += 1
+            if self.on_send:
+                self.on_send(destination, headers, frame.body)
+            with self._lock:
+                if self._subscriptions.get(destination):
+                    self._queues[destination].append(_Delivery("ID:load-test-{0}".format(next(self._message_ids)),
+                                                               destination, {k: v for k, v in headers.items() if k not in ("destination", "content-length")},
+                                                               frame.body))
+                    self._dispatch(destination)
+
+        elif command in ("ACK", "NACK"):
+            ack_id = headers.get("id")
+            now = time.monotonic()
+            delivery = None
+            with self._lock:
+                for subscription in connection.subscriptions.values():
+                    delivery = subscription.unacked.pop(ack_id, None)
+                    if delivery:
+                        if command == "NACK":
+                            delivery.redelivered = True
+                            self._queues[subscription.destination].appendleft(delivery)
+                        self._dispatch(subscription.destination)
+                        break
+            if delivery is None:
+                LOG.warning("%s for unknown ack id %s", command, ack_id)
+            elif command == "ACK":
+                self.stats["acked"] += 1
+                if self.on_ack:
+                    self.on_ack(delivery.message_id, now - delivery.delivered, now - delivery.published)
+            else:
+                self.stats["nacked"] += 1
+
+        elif command == "DISCONNECT":
+            if "receipt" in headers:
+                connection.send_frame(Frame("RECEIPT", {"receipt-id": headers["receipt"]}))
+            return False
+
+        else:
+            connection.send_frame(Frame("ERROR", {"message": "Unsupported command {0}".format(command)}))
+            return False
+
+        if "receipt" in headers:
+            connection.send_frame(Frame("RECEIPT", {"receipt-id": headers["receipt"]}))
+        return True
+
+    def _remove_subscription(self, subscription):
+        """ Requeue the unacknowledged messages of ``subscription``. Must hold the lock """
+        subscriptions = self._subscriptions.get(subscription.destination, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+        queue = self._queues[subscription.destination]
+        for delivery in reversed(list(subscription.unacked.values())):
+            delivery.redelivered = True
+            queue.appendleft(delivery)
+            self.stats["redelivered"] += 1
+        subscription.unacked.clear()
+        self._dispatch(subscription.destination)
+
+    def _on_disconnect(self, connection):
+        with self._lock:
+            self._connections.discard(connection)
+            for subscription in list(connection.subscriptions.values()):
+                self._remove_subscription(subscription)
+            connection.subscriptions.clear()
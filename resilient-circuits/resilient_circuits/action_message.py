@@ -9,6 +9,7 @@ import json
 import re
 import os.path
 import random
+import time
 from datetime import datetime, timezone
 import logging
 import traceback
@@ -17,6 +18,11 @@ from circuits import Event, Timer
 
 LOG = logging.getLogger(__name__)
 
+RE_NON_WORD = re.compile(r'\W+')
+
+# the value of ActionMessageBase._timestamp until the timestamp header is parsed
+_UNPARSED = object()
+
 
 class ActionMessageBase(Event):
     """Superclass for :class:`ActionMessage` and :class:`FunctionMessage`.
@@ -31,9 +37,11 @@ class ActionMessageBase(Event):
             headers = {}
         if message is None:
             message = {}
-        LOG.debug("Source: %s", source)
-        LOG.debug("Headers: %s", json.dumps(headers, indent=2))
-        LOG.debug("Message: %s", json.dumps(message, indent=2))
+        if LOG.isEnabledFor(logging.DEBUG):
+            # only serialize the message when it is logged, large messages take a long time
+            LOG.debug("Source: %s", source)
+            LOG.debug("Headers: %s", json.dumps(headers, indent=2))
+            LOG.debug("Message: %s", json.dumps(message, indent=2))
 
         self.deferred = False
         self.message = message
@@ -45,10 +53,11 @@ class ActionMessageBase(Event):
         self.test = test
         self.test_msg_id = test_msg_id
 
-        self.timestamp = None
-        ts = headers.get("timestamp")
-        if ts is not None:
-            self.timestamp = datetime.fromtimestamp(float(ts)/1000, timezone.utc)
+        # time.monotonic() value of when this message was received, used for queue wait metrics
+        self.received_time = time.monotonic()
+
+        # parsed from the "timestamp" header when it is first used
+        self._timestamp = _UNPARSED
 
         self.name = "_unknown_"
         self.displayname = "Unknown"
@@ -58,6 +67,18 @@ class ActionMessageBase(Event):
         # Fire a {name}_success event when this event is successfully processed
         self.success = True
 
+    @property
+    def timestamp(self):
+        """The time the message was sent, from its ``timestamp`` header (datetime or None)"""
+        if self._timestamp is _UNPARSED:
+            ts = self.headers.get("timestamp")
+            self._timestamp = datetime.fromtimestamp(float(ts)/1000, timezone.utc) if ts is not None else None
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = value
+
     def __repr__(self):
         "x.__repr__() <==> repr(x)"
         if len(self.channels) > 1:
@@ -185,7 +206,7 @@ class ActionMessage(ActionMessageBase):
         # is determined from the name of the action.
         # In future, this should be the action's "programmatic name",
         # but for now it's the downcased displayname with underscores.
-        self.name = re.sub(r'\W+', '_', self.displayname.strip().lower())
+        self.name = RE_NON_WORD.sub('_', self.displayname.strip().lower())
 
         if message and log_dir:
             self._log_message(log_dir)
@@ -4,12 +4,15 @@
 
 """Circuits component for Action Module subscription and message handling"""
 
+import asyncio
 import base64
 import json
 import os.path
 import ssl
 import sys
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from signal import SIGINT, SIGTERM
 
 if sys.version_info.major < 3:
@@ -18,7 +21,7 @@ else:
     from collections.abc import Callable
 
 import resilient
-from circuits import BaseComponent, Worker
+from circuits import BaseComponent, Event, Timer, Worker
 from circuits.core.manager import ExceptionWrapper
 from requests.utils import DEFAULT_CA_BUNDLE_PATH
 from resilient import ensure_unicode
@@ -27,7 +30,7 @@ from six import string_types
 from cachetools import TTLCache
 
 import resilient_circuits.actions_test_component as actions_test_component
-from resilient_circuits import constants, helpers
+from resilient_circuits import async_requests, constants, helpers
 from resilient_circuits.action_message import (ActionMessage,
                                                ActionMessageBase,
                                                BaseFunctionError,
@@ -35,6 +38,7 @@ from resilient_circuits.action_message import (ActionMessage,
                                                InboundMessage, LowCodeMessage,
                                                StatusMessage)
 from resilient_circuits.decorators import *  # for back-compatibility, these were previously declared here
+from resilient_circuits.idempotency_store import IdempotencyStore
 from resilient_circuits.rest_helper import (get_resilient_client,
                                             reset_resilient_client)
 from resilient_circuits.stomp_component import StompClient
@@ -96,45 +100,143 @@ class FunctionWorker(Worker):
         try:
             yield result.get()
         except Exception as e:
-            str_traceback = traceback.format_exc()
-            ignore_exception = False
+            for r in _handle_task_exception(self, e, args):
+                yield r
 
-            if isinstance(self.parent, Actions):
-                app_configs = self.parent.opts
-                ignore_exception = app_configs.get(constants.APP_CONFIG_TRAP_EXCEPTION, False)
 
-            if ignore_exception:
+class AsyncFunctionWorker(BaseComponent):
+    """
+    Runs ``async`` functions on a single asyncio event loop in a dedicated thread.
 
-                err = str(e)
+    Unlike the :class:`FunctionWorker`, a task that is waiting on I/O does not
+    hold a thread, so the number of tasks that can run concurrently is only
+    limited by ``max_concurrency``. Used by ``async`` ``@low_code_function`` handlers.
+    """
 
-                # Handle strs as unicode if Python 2
-                if sys.version_info.major == 2:
-                    err = unicode(err, "utf-8")
-                    str_traceback = unicode(str_traceback, "utf-8")
+    channel = "asyncfunctionworker"
+
+    def __init__(self, channel=channel, max_concurrency=constants.DEFAULT_LOW_CODE_MAX_CONCURRENCY):
+        super(AsyncFunctionWorker, self).__init__(channel=channel)
+        self.max_concurrency = max_concurrency
+        self.loop = None
+        self._thread = None
+        self._semaphore = None
+        self._executor = None
+
+    def _start_loop(self):
+        """ The event loop and its thread are only started when the first task arrives """
+        self.loop = asyncio.new_event_loop()
+        # blocking calls made with run_in_executor, like execute_async without aiohttp,
+        # get as many threads as tasks can run at once. The threads are only created when needed
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="AsyncFunctionWorker")
+        self.loop.set_default_executor(self._executor)
+        self._thread = threading.Thread(target=self._run_loop, name="AsyncFunctionWorker", daemon=True)
+        self._thread.start()
+        LOG.debug("AsyncFunctionWorker started with max_concurrency %s", self.max_concurrency)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _run(self, f, *args, **kwargs):
+        # created here so the semaphore belongs to our loop on all versions of python
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await f(*args, **kwargs)
+
+    @handler("task")
+    def _on_task(self, f, *args, **kwargs):
+        LOG.debug("Async Task: %s", f)
+        if self.loop is None:
+            self._start_loop()
 
-                fn_name = constants.DEFAULT_UNKNOWN_STR
+        future = asyncio.run_coroutine_threadsafe(self._run(f, *args, **kwargs), self.loop)
+        while not future.done():
+            yield
+        try:
+            yield future.result()
+        except Exception as e:
+            for r in _handle_task_exception(self, e, args):
+                yield r
 
-                # args being the parameters of the decorator
-                if isinstance(args, tuple) and hasattr(args[0], "name"):
-                    fn_name = args[0].name
+    @handler("stopped", channel="*")
+    def _on_stopped(self, manager):
+        self.stop_loop()
 
-                status_message = u"Error running '{0}'. Config '{1}' set to 'True' so ignoring exception\nERROR:\n{2}".format(fn_name, constants.APP_CONFIG_TRAP_EXCEPTION, err)
+    def stop_loop(self):
+        """ Close any shared HTTP sessions and stop the event loop """
+        if self.loop is None:
+            return
+        loop, self.loop = self.loop, None
+        try:
+            asyncio.run_coroutine_threadsafe(async_requests.close_sessions(), loop).result(timeout=5)
+        except Exception as err:
+            LOG.debug("Error closing async sessions: %s", err)
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        self._semaphore = None
 
-                # If the loglevel is DEBUG, the full stacktrace will be added to the StatusMessage
-                if logging.getLogger().getEffectiveLevel() == logging.DEBUG:
-                    status_message = u"{0}\n{1}".format(status_message, str_traceback)
 
-                log_message = u"{0}\n{1}".format(status_message, str_traceback)
+def _handle_task_exception(worker, e, args):
+    """
+    Shared by the :class:`FunctionWorker` and :class:`AsyncFunctionWorker`.
+    Either trap the exception and yield a failed result, or yield the
+    exception so circuits fires an ``exception`` event
+    """
+    str_traceback = traceback.format_exc()
+    ignore_exception = False
 
-                yield StatusMessage(status_message)
+    if isinstance(worker.parent, Actions):
+        app_configs = worker.parent.opts
+        ignore_exception = app_configs.get(constants.APP_CONFIG_TRAP_EXCEPTION, False)
 
-                LOG.warning(log_message)
+    if ignore_exception:
 
-                yield FunctionResult({"success": False, "reason": err})
+        err = str(e)
 
-            else:
-                LOG.error(str_traceback)
-                yield ExceptionWrapper(e)
+        # Handle strs as unicode if Python 2
+        if sys.version_info.major == 2:
+            err = unicode(err, "utf-8")
+            str_traceback = unicode(str_traceback, "utf-8")
+
+        fn_name = constants.DEFAULT_UNKNOWN_STR
+
+        # args being the parameters of the decorator
+        if isinstance(args, tuple) and hasattr(args[0], "name"):
+            fn_name = args[0].name
+
+        status_message = u"Error running '{0}'. Config '{1}' set to 'True' so ignoring exception\nERROR:\n{2}".format(fn_name, constants.APP_CONFIG_TRAP_EXCEPTION, err)
+
+        # If the loglevel is DEBUG, the full stacktrace will be added to the StatusMessage
+        if logging.getLogger().getEffectiveLevel() == logging.DEBUG:
+            status_message = u"{0}\n{1}".format(status_message, str_traceback)
+
+        log_message = u"{0}\n{1}".format(status_message, str_traceback)
+
+        yield StatusMessage(status_message)
+
+        LOG.warning(log_message)
+
+        yield FunctionResult({"success": False, "reason": err})
+
+    else:
+        LOG.error(str_traceback)
+        yield ExceptionWrapper(e)
+
+
+def _is_success(function_result):
+    """
+    If a function succeeded: its :class:`FunctionResult` is not a failure,
+    and its results do not have ``"success": False``
+    """
+    if function_result is None:
+        return True
+    if isinstance(function_result.value, dict) and function_result.value.get("success") is False:
+        return False
+    return bool(function_result.success)
 
 
 class ResilientComponent(BaseComponent):
@@ -405,6 +507,10 @@ class Actions(ResilientComponent):
         # has not; the client will fail to ack the original item, but will succeed in acking
         # the new ack ID
         self._all_acks = TTLCache(maxsize=1000, ttl=60*60) # 1 hour should be more than enough
+        # optionally, the replies to function messages are saved on disk too, so a
+        # message re-delivered after a restart (or after it has left _all_acks)
+        # gets the same reply without running the function again
+        self._idempotency_store = IdempotencyStore.from_opts(opts)
 
         # Read the action definitions, into a dict indexed by id
         # we'll refer to them later when dispatching
@@ -430,6 +536,11 @@ class Actions(ResilientComponent):
         LOG.info("num_workers set to %s", opts.get("num_workers"))
         self._functionworker.register(self.root)
 
+        # async low code functions run on an event loop instead of the FunctionWorker thread-pool
+        self._low_code_max_concurrency = int(opts.get(constants.APP_CONFIG_LOW_CODE_MAX_CONCURRENCY) or constants.DEFAULT_LOW_CODE_MAX_CONCURRENCY)
+        self._asyncfunctionworker = AsyncFunctionWorker(max_concurrency=self._low_code_max_concurrency)
+        self._asyncfunctionworker.register(self.root)
+
         if opts.get("test_actions", False):
             # Let user submit test actions from the command line for testing
             LOG.info("Action Tests enabled. Run 'resilient-circuits test' for the interactive action test tool.")
@@ -610,17 +721,8 @@ class Actions(ResilientComponent):
 
             try:
                 # Expect the message payload to always be UTF8 JSON.
-                # However, it may contain surrogate pairs, and in Python 3 that causes problems:
-                # - surrogate pairs are not allowed by the default (strict) utf8 decoder,
-                # - if we pass them, it will cause downstream issues, so we should re-encode.
-                if hasattr(message, "decode"):
-                    try:
-                        message = message.decode('utf-8')
-                    except UnicodeDecodeError:
-                        LOG.debug("Failed utf8 decode, trying surrogate")
-                        message = message.decode('utf-8', "surrogatepass").encode("utf-16", "surrogatepass").decode("utf-16")
-
-                message = json.loads(message)
+                # However, it may contain surrogate pairs, which load_message_body re-encodes
+                message = helpers.load_message_body(message)
 
                 if headers.get(constants.SUBSCRIBE_QUEUE_HEADER) == constants.SUBSCRIBE_DTO:
                     # New connector queue information - either need to subscribe or unsubscribe
@@ -658,6 +760,10 @@ class Actions(ResilientComponent):
                                             frame=event.frame,
                                             log_dir=self.logging_directory)
                     elif message.get("function"):
+                        if self._idempotency_store is not None:
+                            # the FunctionMessage is fired by _on_saved_reply, if there is no saved reply
+                            self._find_saved_reply(event, headers, message)
+                            return
                         channel = "functions." + message["function"]["name"]
                         event = FunctionMessage(source=self,
                                                 headers=headers,
@@ -690,6 +796,46 @@ class Actions(ResilientComponent):
                                           log_dir=self.logging_directory)
                     self.fire(event, channel)
 
+    def _find_saved_reply(self, event, headers, message):
+        """
+        Look for a reply to this function message in the idempotency store on the
+        thread of the store, then fire ``saved_reply`` on the circuits loop with it
+        """
+        def fire_saved_reply(reply):
+            # called on the thread of the store. fire() queues the event for the circuits loop
+            self.fire(Event.create("saved_reply", event, headers, message, reply))
+
+        self._idempotency_store.find_reply(headers.get("message-id"), message["function"]["name"],
+                                           message.get("inputs"), fire_saved_reply)
+
+    @handler("saved_reply")
+    def _on_saved_reply(self, stomp_event, headers, message, reply):
+        """
+        If a reply to this function message was found in the idempotency store,
+        ack the message and send the saved reply instead of running the function again.
+        Otherwise fire the FunctionMessage to run the function
+        """
+        msg_id = headers.get("message-id")
+        if reply is None:
+            channel = "functions." + message["function"]["name"]
+            function_event = FunctionMessage(source=self,
+                                             headers=headers,
+                                             message=message,
+                                             frame=stomp_event.frame,
+                                             log_dir=self.logging_directory)
+            LOG.info("Event: %s Channel: %s", function_event, channel)
+            self.fire(function_event, channel)
+            return
+
+        LOG.info("Function '%s' already ran for message '%s'. Sending saved reply now.", message["function"]["name"], msg_id)
+        self._current_msgs_processing.pop(msg_id, None)
+        self.fire(Ack(stomp_event.frame, message_id=msg_id))
+        self._all_acks[msg_id] = True
+        self.fire(Send(headers={"correlation-id": headers["correlation-id"]},
+                       body=reply,
+                       destination=headers["reply-to"],
+                       message_id=msg_id))
+
     # Circuits event handlers
 
     @handler("idle_reset_rest")
@@ -1423,6 +1569,10 @@ class Actions(ResilientComponent):
                                    body=reply_message,
                                    destination=reply_to,
                                    message_id=message_id))
+                    if self._idempotency_store is not None and isinstance(event.parent, FunctionMessage):
+                        self._idempotency_store.save_reply(message_id, reply_message,
+                                                           fevent.message["function"]["name"], fevent.message.get("inputs"),
+                                                           success=_is_success(function_result))
                 else:
                     # Test action, nothing to Ack
                     if isinstance(event.parent, FunctionMessage):
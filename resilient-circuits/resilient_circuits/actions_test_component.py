@@ -24,6 +24,16 @@ DEFAULT_WORKFLOW_INSTANCE_ID = 999
 LOG = logging.getLogger(__name__)
 
 
+def is_low_code_message(message):
+    """
+    :param message: the message of an event
+    :type message: dict
+    :return: True if ``message`` is a Low Code (``RestAPIExecutionEventDTO``) message
+    :rtype: bool
+    """
+    return "request_payload" in message and "request_originator" in message
+
+
 class SubmitTestAction(Event):
     """ Circuits event to insert a test Action Message """
     def __init__(self, queue, msg_id, message):
@@ -75,9 +85,9 @@ class SubmitTestInboundApp(Event):
 
 class SubmitTestLowCodeApp(Event):
 
-    def __init__(self, queue_name, message=None):
+    def __init__(self, queue_name, message=None, msg_id=None):
 
-        msg_id = str(uuid.uuid4())
+        msg_id = msg_id or str(uuid.uuid4())
 
         # TODO: mock out values
         if not message:
@@ -252,6 +262,8 @@ class ResilientTestActions(Component):
 
     @handler("SubmitTestLowCodeApp")
     def _submit_low_code_message(self, event, queue_name, msg_id, message):
+        # set if the message came from a test client, which gets the responses
+        sock = self.actions_sent.get(msg_id)
         try:
             message_id = "ID:resilient-54199-{msg_id}-6:2:12:1:1".format(msg_id=msg_id)
             # TODO: might change depending on queue name
@@ -288,52 +300,64 @@ class ResilientTestActions(Component):
             action_event = LowCodeMessage(source=self,
                                     queue_name=queue_name,
                                     headers=headers,
-                                    message=message)
+                                    message=message,
+                                    test=sock is not None,
+                                    test_msg_id=msg_id)
 
             action_event.parent = event
             self.fire(action_event, channel)
+            if sock:
+                self.fire_message(sock, "Action Submitted<action %d>" % msg_id)
 
         except Exception as e:
             LOG.exception("Failed to SubmitTestLowCodeApp <message_id: %s>", msg_id)
+            if sock:
+                self.fire_message(sock, "Action Failed<action %d>: %s" % (msg_id, str(e)))
+                return
             raise e
 
     @handler("read")
     def process_data(self, sock, data):
         """ Process data received from TCP stream """
+        # A read can end part way through a message or hold several messages,
+        # so keep what is left over until the rest of it arrives
+        buffer = self.messages_in_progress.pop(sock, None) or bytearray()
+        buffer.extend(data)
+        while len(buffer) >= 4:
+            msg_size = struct.unpack('>I', buffer[:4])[0]
+            if len(buffer) < msg_size + 4:
+                break
+            message = buffer[4:msg_size + 4]
+            del buffer[:msg_size + 4]
+            self._process_message(sock, message)
+        if buffer:
+            self.messages_in_progress[sock] = buffer
+
+    def _process_message(self, sock, data):
+        """ Submit a message: its msg_id, then ``<queue> <message json>`` """
         msg_id = -1  # default
         try:
-            data_as_bytes = bytearray(data)
-            if sock not in self.messages_in_progress:
-                # New message, parse size out
-                msg_size = struct.unpack('>I', data_as_bytes[:4])[0]
-                partial_msg = data_as_bytes[4:msg_size + 4]
-            else:
-                # Retrieve what we had so far
-                msg_size, partial_msg = self.messages_in_progress.pop(sock)
-                partial_msg = partial_msg + data_as_bytes
-
-            if len(partial_msg) < msg_size:
-                # Store what we have so far and wait for more
-                self.messages_in_progress[sock] = msg_size, partial_msg
-                return
-
             # Complete message, parse out msg_id, queue, and msg
-            msg_id = struct.unpack('>I', partial_msg[:4])[0]
-            data = partial_msg[4:msg_size]
-            remainder = partial_msg[msg_size:]
-            data = data.strip().decode('utf-8')
+            msg_id = struct.unpack('>I', data[:4])[0]
+            data = bytes(data[4:]).strip().decode('utf-8')
             if ' ' not in data or len(data) < 2:
                 # Bad Command
                 msg = ("<action %d>: " % msg_id) + self.usage()
                 self.fire_message(sock, msg)
+                return
+
+            queue, message = data.split(' ', 1)
+            self.actions_sent[msg_id] = sock
+            try:
+                message = json.loads(message)
+            except ValueError:
+                # reported as a Bad Message by SubmitTestAction
+                pass
+
+            if isinstance(message, dict) and is_low_code_message(message):
+                self.fire(SubmitTestLowCodeApp(queue, message, msg_id=msg_id))
             else:
-                queue, message = data.split(' ', 1)
-                self.actions_sent[msg_id] = sock
                 self.fire(SubmitTestAction(queue, msg_id, message))
-
-            if remainder:
-                # Process remainder
-                self.process_data(sock, remainder)
         except Exception as e:
             LOG.exception("Action Failed<action %d>", msg_id)
             msg = "Action Failed<action %d>: %s" % (msg_id, str(e))
@@ -343,6 +367,12 @@ class ResilientTestActions(Component):
         """Triggered for new connecting TCP clients"""
         pass
 
+    def disconnect(self, sock):
+        """Triggered when a TCP client disconnects"""
+        self.messages_in_progress.pop(sock, None)
+        for msg_id in [msg_id for msg_id, sent_by in self.actions_sent.items() if sent_by is sock]:
+            self.actions_sent.pop(msg_id)
+
     def test_response(self, msg_id, message):
         """ If action orginated from test client, send response"""
         LOG.debug("Received message for test client")
@@ -350,6 +380,12 @@ class ResilientTestActions(Component):
         if sock:
             msg = "RESPONSE<action %d>: %s" % (msg_id, message)
             self.fire_message(sock, msg)
+            try:
+                if json.loads(message).get("complete"):
+                    # the last response for this message
+                    self.actions_sent.pop(msg_id, None)
+            except (ValueError, AttributeError):
+                pass
 
     def done(self, event):
         """Handler when done"""
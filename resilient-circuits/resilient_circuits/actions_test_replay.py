@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+# pragma pylint: disable=line-too-long
+
+"""
+Replay recorded Action, Function and Low Code messages to the test server
+of a resilient-circuits app running with ``--test-actions`` and measure how
+long each takes to complete.
+
+Messages are sent over the same TCP protocol as the interactive
+``res-action-test`` tool, so they go through the full dispatch path of the
+app, and its results come back as ``test_response`` replies instead of
+STOMP acks.
+"""
+
+import json
+import logging
+import os
+import re
+import socket
+import statistics
+import struct
+import threading
+import time
+from collections import Counter, namedtuple
+
+from resilient_circuits.actions_test_component import is_low_code_message
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_REPLAY_CONCURRENCY = 10
+DEFAULT_REPLAY_TIMEOUT = 60
+# queue used for Function messages that were recorded without one. It is only used in the message headers
+DEFAULT_FUNCTION_QUEUE = "replay"
+
+# "RESPONSE<action 12>: {...}", "Action Failed<action 12>: ...", "Bad Message<action 12>! ..."
+# and "<action 12>: <usage>" for a message the test server could not read
+RE_TEST_SERVER_REPLY = re.compile(r"^(?P<kind>[^<]*)<action (?P<msg_id>\d+)>[:!]?\s*(?P<text>.*)$", re.DOTALL)
+
+ReplayMessage = namedtuple("ReplayMessage", ["queue", "message", "label"])
+
+
+def get_message_label(queue, message):
+    """
+    Name to group the results of ``message`` under: the function name
+    of a Function or Low Code message, or the queue of an Action message
+
+    :param queue: queue the message is sent to
+    :type queue: str
+    :param message: the message
+    :type message: dict
+    :rtype: str
+    """
+    if message.get("function"):
+        return message["function"].get("name") or queue
+    if is_low_code_message(message):
+        return (message.get("request_originator") or {}).get("function_programmatic_name") or queue
+    return "actions.{0}".format(queue)
+
+
+def _to_replay_message(obj, queue, source):
+    """
+    Convert a ``{"queue": ..., "message": {...}}`` record, or a message
+    as written by ``ActionMessageBase._log_message``, to a :class:`ReplayMessage`
+    """
+    if not isinstance(obj, dict):
+        raise ValueError(u"Expected a JSON object in {0}".format(source))
+
+    if isinstance(obj.get("message"), dict) and set(obj).issubset(("queue", "message")):
+        message = obj["message"]
+        queue = obj.get("queue") or queue
+    else:
+        message = obj
+
+    if not queue:
+        if not message.get("function"):
+            raise ValueError(u"No queue for the message in {0}. Add a 'queue' to the record or set the default queue".format(source))
+        queue = DEFAULT_FUNCTION_QUEUE
+
+    return ReplayMessage(queue, json.dumps(message), get_message_label(queue, message))
+
+
+def load_replay_messages(path, queue=None):
+    """
+    Read the messages to replay from ``path``, which can be:
+
+    - a directory of JSON files, like those written to ``log_http_responses``
+      by ``ActionMessageBase._log_message``. They are read in the order they were written
+    - a JSON file with one record or a list of records
+    - a JSON Lines file with one record on each line
+
+    A record is either a message or ``{"queue": <queue>, "message": <message>}``.
+    Action and Low Code messages need a queue: for Low Code messages it
+    is the connector queue the ``@low_code_function`` handles
+
+    :param path: path of the file or directory
+    :type path: str
+    :param queue: queue of the records that do not have one
+    :type queue: str
+    :return: the messages, in order
+    :rtype: list of ReplayMessage
+    """
+    if os.path.isdir(path):
+        files = [os.path.join(path, name) for name in os.listdir(path)]
+        files = sorted((f for f in files if os.path.isfile(f)), key=lambda f: (os.path.getmtime(f), f))
+        messages = []
+        for filename in files:
+            messages.extend(load_replay_messages(filename, queue=queue))
+        return messages
+
+    with open(path, "r") as replay_file:
+        contents = replay_file.read()
+
+    try:
+        records = json.loads(contents)
+    except ValueError:
+        # JSON Lines
+        records = [json.loads(line) for line in contents.splitlines() if line.strip()]
+
+    if not isinstance(records, list):
+        records = [records]
+
+    return [_to_replay_message(record, queue, path) for record in records]
+
+
+def percentile(values, pct):
+    """ nearest-rank percentile of ``values`` """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class ReplayStats(object):
+    """ Latencies and errors of replayed messages, for each label """
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = Counter()
+        self.timeouts = Counter()
+        self.error_samples = {}
+        self.sent = 0
+        self.start = None
+        self.end = None
+
+    def add(self, label, latency, error=None):
+        self.latencies.setdefault(label, []).append(latency)
+        if error is not None:
+            self.errors[label] += 1
+            self.error_samples.setdefault(label, error)
+
+    def add_timeout(self, label):
+        self.timeouts[label] += 1
+
+    @property
+    def completed(self):
+        return sum(len(latencies) for latencies in self.latencies.values())
+
+    @property
+    def throughput(self):
+        """ completed messages per second """
+        if not self.start or not self.end or self.end <= self.start:
+            return 0.0
+        return self.completed / (self.end - self.start)
+
+    def summarize(self):
+        """
+        :return: ``{label: {"count", "errors", "timeouts", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}}``
+        :rtype: dict
+        """
+        summary = {}
+        for label in sorted(set(self.latencies).union(self.timeouts)):
+            latencies = self.latencies.get(label, [])
+            summary[label] = {
+                "count": len(latencies),
+                "errors": self.errors[label],
+                "timeouts": self.timeouts[label]
+            }
+            if latencies:
+                summary[label].update({
+                    "mean_ms": statistics.mean(latencies) * 1000,
+                    "p50_ms": percentile(latencies, 50) * 1000,
+                    "p95_ms": percentile(latencies, 95) * 1000,
+                    "p99_ms": percentile(latencies, 99) * 1000,
+                    "max_ms": max(latencies) * 1000
+                })
+        return summary
+
+    def as_dict(self):
+        return {
+            "sent": self.sent,
+            "completed": self.completed,
+            "errors": sum(self.errors.values()),
+            "timeouts": sum(self.timeouts.values()),
+            "duration": (self.end or 0) - (self.start or 0),
+            "throughput": self.throughput,
+            "functions": self.summarize(),
+            "error_samples": self.error_samples
+        }
+
+    def print_report(self, out=None):
+        """ Print the latency of each label and the totals """
+        write = out or print
+        write(u"{0:<40} {1:>7} {2:>7} {3:>8} {4:>10} {5:>10} {6:>10} {7:>10}".format(
+            "function", "count", "errors", "timeouts", "p50 ms", "p95 ms", "p99 ms", "max ms"))
+        for label, stats in self.summarize().items():
+            if stats["count"]:
+                write(u"{0:<40} {1:>7} {2:>7} {3:>8} {4:>10.1f} {5:>10.1f} {6:>10.1f} {7:>10.1f}".format(
+                    label, stats["count"], stats["errors"], stats["timeouts"],
+                    stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["max_ms"]))
+            else:
+                write(u"{0:<40} {1:>7} {2:>7} {3:>8}".format(label, 0, stats["errors"], stats["timeouts"]))
+        write(u"")
+        write(u"sent {0}, completed {1}, errors {2}, timeouts {3} in {4:.2f}s: {5:.1f} messages/s".format(
+            self.sent, self.completed, sum(self.errors.values()), sum(self.timeouts.values()),
+            (self.end or 0) - (self.start or 0), self.throughput))
+        for label, error in sorted(self.error_samples.items()):
+            write(u"first error of {0}: {1}".format(label, " ".join(error.split())[:200]))
+
+
+class ActionReplay(object):
+    """
+    Send ``messages`` to the test server at ``host``:``port`` and wait for
+    each of them to complete.
+
+    **Example:**
+
+    .. code-block:: python
+
+        messages = load_replay_messages("/tmp/logged_messages", queue="fn_my_app")
+        stats = ActionReplay("localhost", 8008, messages, rate=50, concurrency=20).run()
+        stats.print_report()
+
+    :param host: host of the test server
+    :type host: str
+    :param port: port of the test server
+    :type port: int
+    :param messages: messages to send
+    :type messages: list of ReplayMessage
+    :param rate: messages to send per second. ``None`` or ``0`` sends them as fast as ``concurrency`` allows
+    :type rate: float
+    :param concurrency: most messages waiting to complete at one time
+    :type concurrency: int
+    :param timeout: seconds to wait for a message to complete
+    :type timeout: float
+    """
+
+    def __init__(self, host, port, messages, rate=None, concurrency=DEFAULT_REPLAY_CONCURRENCY,
+                 timeout=DEFAULT_REPLAY_TIMEOUT):
+        if int(concurrency) < 1:
+            raise ValueError("concurrency must be 1 or more")
+        self.host = host
+        self.port = port
+        self.messages = messages
+        self.rate = float(rate) if rate else None
+        self.concurrency = int(concurrency)
+        self.timeout = float(timeout)
+        self.stats = ReplayStats()
+
+        # msg_id -> (label, time sent)
+        self._in_flight = {}
+        self._lock = threading.Condition()
+        self._closed = threading.Event()
+        self._sock = None
+
+    def run(self):
+        """
+        Send every message and wait for them to complete
+
+        :return: the latencies and errors
+        :rtype: ReplayStats
+        """
+        self._sock = socket.create_connection((self.host, self.port))
+        receiver = threading.Thread(target=self._receive, name="ActionReplayReceiver", daemon=True)
+        receiver.start()
+
+        try:
+            self.stats.start = time.monotonic()
+            for index, replay_message in enumerate(self.messages):
+                if self.rate:
+                    delay = self.stats.start + index / self.rate - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                msg_id = index + 1
+                if not self._wait_for_slot():
+                    break
+                self._send(msg_id, replay_message)
+            self._wait_for_all()
+        finally:
+            self.stats.end = time.monotonic()
+            self._closed.set()
+            self._sock.close()
+            receiver.join(timeout=1)
+
+        return self.stats
+
+    def _wait_for_slot(self):
+        """ wait until fewer than ``concurrency`` messages are in flight """
+        with self._lock:
+            while len(self._in_flight) >= self.concurrency:
+                self._expire()
+                if self._closed.is_set():
+                    return False
+                self._lock.wait(0.1)
+        return not self._closed.is_set()
+
+    def _wait_for_all(self):
+        with self._lock:
+            while self._in_flight and not self._closed.is_set():
+                self._expire()
+                self._lock.wait(0.1)
+            for label, sent in self._in_flight.values():
+                self.stats.add_timeout(label)
+            self._in_flight.clear()
+
+    def _expire(self):
+        """ count the messages that have not completed in ``timeout`` seconds as timed out """
+        deadline = time.monotonic() - self.timeout
+        for msg_id, (label, sent) in list(self._in_flight.items()):
+            if sent < deadline:
+                self._in_flight.pop(msg_id)
+                self.stats.add_timeout(label)
+
+    def _send(self, msg_id, replay_message):
+        data = u"{0} {1}\n".format(replay_message.queue, replay_message.message).encode("utf-8")
+        data = struct.pack(">I", msg_id) + data
+        with self._lock:
+            self._in_flight[msg_id] = (replay_message.label, time.monotonic())
+            self.stats.sent += 1
+        self._sock.sendall(struct.pack(">I", len(data)) + data)
+
+    def _complete(self, msg_id, error=None):
+        with self._lock:
+            in_flight = self._in_flight.pop(msg_id, None)
+            if in_flight:
+                label, sent = in_flight
+                self.stats.add(label, time.monotonic() - sent, error=error)
+            self._lock.notify_all()
+
+    def _receive(self):
+        try:
+            while not self._closed.is_set():
+                header = self._recv_exact(4)
+                if header is None:
+                    break
+                data = self._recv_exact(struct.unpack(">I", header)[0])
+                if data is None:
+                    break
+                self.handle_reply(data.decode("utf-8"))
+        except (OSError, ValueError) as err:
+            if not self._closed.is_set():
+                LOG.error("Lost connection to the test server: %s", err)
+        finally:
+            if not self._closed.is_set():
+                self._closed.set()
+                with self._lock:
+                    self._lock.notify_all()
+
+    def _recv_exact(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                return None
+            data.extend(chunk)
+        return bytes(data)
+
+    def handle_reply(self, reply):
+        """
+        Complete the message a reply from the test server is for, if it is
+        the last reply for that message
+
+        :param reply: a reply from the test server like ``RESPONSE<action 1>: {...}``
+        :type reply: str
+        """
+        match = RE_TEST_SERVER_REPLY.match(reply)
+        if not match:
+            LOG.debug("Unexpected reply from the test server: %s", reply)
+            return
+
+        kind = match.group("kind").strip()
+        msg_id = int(match.group("msg_id"))
+        text = match.group("text")
+
+        if kind == "RESPONSE":
+            response = json.loads(text)
+            if response.get("complete"):
+                error = (response.get("message") or "error") if response.get("message_type") else None
+                self._complete(msg_id, error=error)
+        elif kind in ("Action Submitted", "Action Completed"):
+            return
+        else:
+            # "Action Failed", "Bad Message" or a message the test server could not read
+            self._complete(msg_id, error=u"{0}: {1}".format(kind or "Bad Command", text))
@@ -33,6 +33,7 @@ class AppArgumentParser(keyring_arguments.ArgumentParser):
     DEFAULT_APP_EXCEPTION = False
     DEFAULT_HEARTBEAT_TIMEOUT_THRESHOLD = None
     DEFAULT_RC_USE_PERSISTENT_SESSIONS = True
+    DEFAULT_INCLUDE_EXTENDED_METRICS = False
 
     def __init__(self, config_file=None):
 
@@ -76,6 +77,16 @@ class AppArgumentParser(keyring_arguments.ArgumentParser):
 
         default_heartbeat_timeout_threshold = self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_HEARTBEAT_TIMEOUT_THRESHOLD) or self.DEFAULT_HEARTBEAT_TIMEOUT_THRESHOLD
         default_rc_use_persistent_sessions = self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_RC_USE_PERSISTENT_SESSIONS) or self.DEFAULT_RC_USE_PERSISTENT_SESSIONS
+        default_include_extended_metrics = self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_INCLUDE_EXTENDED_METRICS) or self.DEFAULT_INCLUDE_EXTENDED_METRICS
+        default_include_extended_metrics = self._is_true(default_include_extended_metrics)
+
+        default_low_code_max_concurrency = self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_LOW_CODE_MAX_CONCURRENCY) or constants.DEFAULT_LOW_CODE_MAX_CONCURRENCY
+
+        default_idempotency_store = self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_IDEMPOTENCY_STORE) or None
+        default_idempotency_retention = self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_IDEMPOTENCY_RETENTION) or constants.DEFAULT_IDEMPOTENCY_RETENTION
+        default_idempotency_max_entries = self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_IDEMPOTENCY_MAX_ENTRIES) or constants.DEFAULT_IDEMPOTENCY_MAX_ENTRIES
+        default_idempotency_match_inputs = self._is_true(self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_IDEMPOTENCY_MATCH_INPUTS)) or False
+        default_idempotency_save_failures = self._is_true(self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_IDEMPOTENCY_SAVE_FAILURES)) or False
 
         default_selftest_timeout = self.getopt(self.DEFAULT_APP_SECTION, constants.APP_CONFIG_SELFTEST_TIMEOUT) or constants.DEFAULT_SELFTEST_TIMEOUT_VALUE
 
@@ -190,6 +201,35 @@ class AppArgumentParser(keyring_arguments.ArgumentParser):
                           type=str,
                           default=default_rc_use_persistent_sessions,
                           help=("Set to False to disable the use of persistent sessions with RequestsCommon in app functions"))
+        self.add_argument("--{0}".format(constants.APP_CONFIG_INCLUDE_EXTENDED_METRICS),
+                          type=bool,
+                          default=default_include_extended_metrics,
+                          help=("If set to 'True' the metrics of app and low code function results include queue wait and CPU time. "
+                                "Async low code functions share a thread, so they do not include CPU time"))
+        self.add_argument("--{0}".format(constants.APP_CONFIG_LOW_CODE_MAX_CONCURRENCY),
+                          type=int,
+                          default=default_low_code_max_concurrency,
+                          help=("MAX number of async low code functions that can run in parallel"))
+        self.add_argument("--{0}".format(constants.APP_CONFIG_IDEMPOTENCY_STORE),
+                          type=str,
+                          default=default_idempotency_store,
+                          help=("Path of a file to save function replies in, so re-delivered function messages are not run again"))
+        self.add_argument("--{0}".format(constants.APP_CONFIG_IDEMPOTENCY_RETENTION),
+                          type=int,
+                          default=default_idempotency_retention,
+                          help=("Number of seconds that a saved function reply is kept"))
+        self.add_argument("--{0}".format(constants.APP_CONFIG_IDEMPOTENCY_MAX_ENTRIES),
+                          type=int,
+                          default=default_idempotency_max_entries,
+                          help=("MAX number of function replies to keep. The oldest are removed first"))
+        self.add_argument("--{0}".format(constants.APP_CONFIG_IDEMPOTENCY_MATCH_INPUTS),
+                          type=res_helpers.str_to_bool,
+                          default=default_idempotency_match_inputs,
+                          help=("If set to 'True' a saved reply is also returned for a message to the same function with the same inputs"))
+        self.add_argument("--{0}".format(constants.APP_CONFIG_IDEMPOTENCY_SAVE_FAILURES),
+                          type=res_helpers.str_to_bool,
+                          default=default_idempotency_save_failures,
+                          help=("If set to 'True' the replies of functions that failed are saved too, so they are not run again"))
         self.add_argument("--{0}".format(constants.APP_CONFIG_SELFTEST_TIMEOUT),
                           type=int,
                           default=default_selftest_timeout,
@@ -4,8 +4,8 @@
 
 """Implementation of AppFunctionComponent"""
 
+import contextvars
 import logging
-import threading
 
 from resilient_circuits import (ResilientComponent, StatusMessage, constants,
                                 handler)
@@ -72,6 +72,9 @@ class AppFunctionComponent(ResilientComponent):
 
         self.rc = requests_common_type(opts=opts, function_opts=self._app_configs_as_dict)
 
+        # If True, the metrics of each result include queue wait and CPU time
+        self.include_extended_metrics = str_to_bool(opts.get(constants.APP_CONFIG_INCLUDE_EXTENDED_METRICS, AppArgumentParser.DEFAULT_INCLUDE_EXTENDED_METRICS))
+
         # NOTE: self.app_configs used to be a namedtuple.
         # Since v49 this is no longer a namedtuple.
         # It behaves the same way that a namedtuple would, but
@@ -79,7 +82,9 @@ class AppFunctionComponent(ResilientComponent):
         # This allows for pluggable PAM connectors/plugins
         self.app_configs = self._app_configs_as_dict
 
-        self._local_storage = threading.local()
+        # a ContextVar is local to each thread, and to each task of the
+        # event loop that async low code functions run on
+        self._fn_msg = contextvars.ContextVar("fn_msg")
 
         self.LOG = logging.getLogger(__name__)
         self.LOG.addFilter(RedactingFilter())
@@ -120,14 +125,14 @@ class AppFunctionComponent(ResilientComponent):
 
     def set_fn_msg(self, message_dict):
         """
-        Uses threading.local() to store the message received
-        locally for this Thread. Is accessed using the
+        Uses a ``contextvars.ContextVar`` to store the message received
+        locally for this Thread (or asyncio Task). Is accessed using the
         `get_fn_msg()` method below
 
         :param message_dict: Message received from SOAR
         :type message: dict
         """
-        self._local_storage.fn_msg = message_dict
+        self._fn_msg.set(message_dict)
 
     def get_fn_msg(self):
         """
@@ -181,8 +186,8 @@ class AppFunctionComponent(ResilientComponent):
         fn_msg = {}
 
         try:
-            fn_msg = self._local_storage.fn_msg
-        except AttributeError as err:
+            fn_msg = self._fn_msg.get()
+        except LookupError as err:
             self.LOG.warning("fn_msg could not be found\n%s", err)
 
         return fn_msg
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+Async HTTP requests for ``async`` low code functions.
+
+If ``aiohttp`` is installed (``pip install resilient-circuits[async]``), every
+request made on an event loop shares one ``aiohttp.ClientSession`` (and so one
+connection pool) and no thread is held while waiting on the endpoint. Otherwise
+the request is made with
+:meth:`RequestsCommon.execute <resilient_lib.components.requests_common.RequestsCommon.execute>`
+in the loop's default thread-pool executor. On the loop of the
+:class:`AsyncFunctionWorker <resilient_circuits.actions_component.AsyncFunctionWorker>`
+that executor has ``low_code_max_concurrency`` threads.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import ssl
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+LOG = logging.getLogger(__name__)
+
+# one aiohttp.ClientSession per event loop
+_SESSIONS = {}
+
+
+class AsyncResponse(object):
+    """
+    The parts of a ``requests.Response`` that low code functions use,
+    so results look the same whether or not ``aiohttp`` is installed
+    """
+
+    def __init__(self, status_code, headers, content, url=None, reason=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.reason = reason
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace") if self.content else u""
+
+    def json(self):
+        return json.loads(self.text)
+
+    @classmethod
+    def from_requests_response(cls, response):
+        return cls(response.status_code, dict(response.headers), response.content, url=response.url, reason=response.reason)
+
+
+def _get_session():
+    """ Get (or create) the shared ``aiohttp.ClientSession`` of the running loop """
+    loop = asyncio.get_running_loop()
+    session = _SESSIONS.get(loop)
+    if session is None or session.closed:
+        # the concurrency is capped by the AsyncFunctionWorker, so the pool itself is unbounded
+        connector = aiohttp.TCPConnector(limit=0, ttl_dns_cache=300)
+        session = aiohttp.ClientSession(connector=connector)
+        _SESSIONS[loop] = session
+    return session
+
+
+async def close_sessions():
+    """ Close the shared session of the running loop """
+    session = _SESSIONS.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+def _get_ssl(verify, clientauth):
+    if verify is False:
+        return False
+
+    if verify in (None, True) and not clientauth:
+        return None
+
+    ssl_context = ssl.create_default_context(cafile=verify if isinstance(verify, str) else None)
+    if clientauth:
+        if isinstance(clientauth, (tuple, list)):
+            ssl_context.load_cert_chain(*clientauth)
+        else:
+            ssl_context.load_cert_chain(clientauth)
+    return ssl_context
+
+
+def _get_timeout(timeout):
+    if isinstance(timeout, (tuple, list)):
+        return aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+async def execute_async(rc, method, url, timeout=None, proxies=None, clientauth=None, verify=None, **kwargs):
+    """
+    Make a HTTP request from an ``async`` function without blocking the event loop.
+    The proxies, timeout and verify settings default to those of ``rc``, as they
+    do with :meth:`RequestsCommon.execute <resilient_lib.components.requests_common.RequestsCommon.execute>`.
+    Unlike ``execute``, no exception is raised for an unsuccessful status code
+    and the request is not retried.
+
+    **Example:**
+
+    .. code-block:: python
+
+        @low_code_function()
+        async def _run_low_code(self, low_code_request):
+            response = await execute_async(self.rc, low_code_request.get("method"), low_code_request.get("url"))
+            yield LowCodeResult({"status_code": response.status_code, "content": response.json()})
+
+    :param rc: used for the default settings and, if ``aiohttp`` is not installed, to make the request
+    :type rc: :class:`resilient_lib.RequestsCommon`
+    :param method: Rest method to execute (``GET``, ``POST``, etc.)
+    :type method: str
+    :param url: URL to execute request at
+    :type url: str
+    :param timeout: (Optional) seconds to wait, or a (connect timeout, read timeout) tuple
+    :type timeout: float or tuple
+    :param proxies: (Optional) Dictionary mapping protocol to the URL of the proxy
+    :type proxies: dict
+    :param clientauth: (Optional) path to a client certificate, or a (cert, key) tuple
+    :type clientauth: str or tuple
+    :param verify: (Optional) ``False`` or the path to a CA bundle to use
+    :type verify: bool or str
+    :param kwargs: (Optional) ``headers``, ``params``, ``data``, ``json`` and ``auth``
+    :return: the response from the endpoint
+    :rtype: :class:`AsyncResponse`
+    """
+    method = method.upper()
+
+    if not proxies:
+        proxies = rc.get_proxies()
+
+    if not timeout:
+        timeout = rc.get_timeout()
+
+    if verify is None:
+        verify = rc.get_verify()
+
+    if aiohttp is None:
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(None, functools.partial(
+            rc.execute, method, url, timeout=timeout, proxies=proxies, clientauth=clientauth,
+            verify=verify, callback=AsyncResponse.from_requests_response, **kwargs))
+        return response
+
+    auth = kwargs.pop("auth", None)
+    if isinstance(auth, (tuple, list)):
+        kwargs["auth"] = aiohttp.BasicAuth(*auth)
+
+    proxy = None
+    if proxies:
+        proxy = proxies.get("https") if url.lower().startswith("https") else proxies.get("http")
+
+    LOG.debug("async %s %s", method, url)
+    async with _get_session().request(method, url, timeout=_get_timeout(timeout), proxy=proxy,
+                                      ssl=_get_ssl(verify, clientauth), **kwargs) as response:
+        content = await response.read()
+        return AsyncResponse(response.status, dict(response.headers), content, url=str(response.url), reason=response.reason)
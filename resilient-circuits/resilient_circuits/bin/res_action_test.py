@@ -6,6 +6,7 @@ from __future__ import print_function
 #
 # Usage:
 #  $ res-action-test
+#  $ res-action-test --replay <file or directory> [--rate N] [--concurrency N]
 #
 
 import cmd
@@ -22,6 +23,8 @@ import shlex
 import resilient
 from resilient_circuits.app import AppArgumentParser
 from resilient_circuits.actions_test_component import DEFAULT_TEST_HOST, DEFAULT_TEST_PORT
+from resilient_circuits.actions_test_replay import (DEFAULT_REPLAY_CONCURRENCY, DEFAULT_REPLAY_TIMEOUT,
+                                                    ActionReplay, load_replay_messages)
 
 try:
     from queue import Queue, Empty
@@ -282,9 +285,57 @@ def main():
     parser.add_argument('--port', dest='port', type=int, default=DEFAULT_TEST_PORT,
                         help=("port where resilient_circuits action "
                               "test server is listening. defaults to 8008"))
+    parser.add_argument('--replay', dest='replay', default=None,
+                        help=("replay the messages in this file or directory of "
+                              "logged messages, and report how long they took"))
+    parser.add_argument('--queue', dest='queue', default=None,
+                        help=("for use with --replay. Queue of the Action and "
+                              "Low Code messages that are not recorded with one"))
+    parser.add_argument('--rate', dest='rate', type=float, default=None,
+                        help=("for use with --replay. Messages to send per second. "
+                              "Defaults to as fast as --concurrency allows"))
+    parser.add_argument('--concurrency', dest='concurrency', type=int, default=DEFAULT_REPLAY_CONCURRENCY,
+                        help=("for use with --replay. Most messages waiting to complete "
+                              "at one time. Defaults to {0}".format(DEFAULT_REPLAY_CONCURRENCY)))
+    parser.add_argument('--repeat', dest='repeat', type=int, default=1,
+                        help="for use with --replay. Times to send the messages. Defaults to 1")
+    parser.add_argument('--timeout', dest='timeout', type=float, default=DEFAULT_REPLAY_TIMEOUT,
+                        help=("for use with --replay. Seconds to wait for a message "
+                              "to complete. Defaults to {0}".format(DEFAULT_REPLAY_TIMEOUT)))
+    parser.add_argument('--save', dest='save', default=None,
+                        help="for use with --replay. Write the results as JSON to this file")
     args = parser.parse_args()
+
+    if args.replay:
+        sys.exit(replay(args))
+
     ResilientTestProcessor(host=args.host, port=args.port).cmdloop()
 
 
+def replay(args):
+    """ Replay the messages in args.replay and print the results """
+    messages = load_replay_messages(args.replay, queue=args.queue) * max(args.repeat, 1)
+    if not messages:
+        print("No messages found in {0}".format(args.replay))
+        return 1
+
+    print("Replaying {0} messages to {1}:{2}".format(len(messages), args.host, args.port))
+    try:
+        stats = ActionReplay(args.host, args.port, messages, rate=args.rate,
+                             concurrency=args.concurrency, timeout=args.timeout).run()
+    except socket.error:
+        print("ERROR: Unable to connect.\n"
+              "Replaying requires resilient-circuits already running, with the '--test-actions' option.\n")
+        return 1
+
+    print("")
+    stats.print_report()
+
+    if args.save:
+        with open(args.save, "w") as results_file:
+            json.dump(stats.as_dict(), results_file, indent=2)
+    return 0
+
+
 if __name__ == '__main__':
     main()
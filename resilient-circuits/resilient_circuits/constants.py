@@ -20,6 +20,12 @@ MAX_NUM_WORKERS = 2000
 MIN_LOG_BYTES = 100000
 MIN_BACKUP_COUNT = 0
 DEFAULT_SELFTEST_TIMEOUT_VALUE = 10
+DEFAULT_LOW_CODE_MAX_CONCURRENCY = 1000
+DEFAULT_DEBOUNCE_MAX_KEYS = 10000
+DEFAULT_IDEMPOTENCY_RETENTION = 86400
+DEFAULT_IDEMPOTENCY_MAX_ENTRIES = 10000
+DEFAULT_FUNCTION_CACHE_MAXSIZE = 1000
+DEFAULT_FUNCTION_CACHE_WAIT_TIMEOUT = 600
 
 APP_LOG_DIR = os.environ.get("APP_LOG_DIR", "logs")
 CMDS_LOGGER_NAME = "resilient_circuits_cmd_logger"
@@ -42,8 +48,15 @@ APP_CONFIG_TRAP_EXCEPTION = "trap_exception"
 APP_CONFIG_SELFTEST_TIMEOUT = "selftest_timeout"
 APP_CONFIG_HEARTBEAT_TIMEOUT_THRESHOLD = "heartbeat_timeout_threshold"
 APP_CONFIG_RC_USE_PERSISTENT_SESSIONS = "rc_use_persistent_sessions"
+APP_CONFIG_INCLUDE_EXTENDED_METRICS = "include_extended_metrics"
+APP_CONFIG_LOW_CODE_MAX_CONCURRENCY = "low_code_max_concurrency"
 APP_CONFIG_LOG_MAX_BYTES = "log_max_bytes"
 APP_CONFIG_LOG_BACKUP_COUNT = "log_backup_count"
+APP_CONFIG_IDEMPOTENCY_STORE = "idempotency_store"
+APP_CONFIG_IDEMPOTENCY_RETENTION = "idempotency_retention"
+APP_CONFIG_IDEMPOTENCY_MAX_ENTRIES = "idempotency_max_entries"
+APP_CONFIG_IDEMPOTENCY_MATCH_INPUTS = "idempotency_match_inputs"
+APP_CONFIG_IDEMPOTENCY_SAVE_FAILURES = "idempotency_save_failures"
 
 # Headers
 HEADER_CIRCUITS_VER_KEY = "Resilient-Circuits-Version"
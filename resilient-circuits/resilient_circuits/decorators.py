@@ -3,15 +3,19 @@
 
 """Circuits component for Action Module subscription and message handling"""
 
+import asyncio
+import heapq
 import inspect as _inspect
+import itertools
 import logging
 import threading
-from collections import namedtuple
+import time
+from collections import Counter, namedtuple
 from functools import wraps
 from types import GeneratorType
 
 import circuits.core.handlers
-from circuits import Event, Timer, task
+from circuits import BaseComponent, Event, task
 from resilient_circuits import constants, helpers
 from resilient_circuits.action_message import (FunctionError_,
                                                FunctionErrorEvent,
@@ -19,6 +23,8 @@ from resilient_circuits.action_message import (FunctionError_,
                                                StatusMessage,
                                                StatusMessageEvent)
 from resilient_circuits.filters import RedactingFilter
+from resilient_circuits.function_cache import get_function_cache
+from resilient_circuits.idempotency_store import get_input_key
 from resilient_lib import LowCodePayload, ResultPayload, validate_fields
 
 LOG = logging.getLogger(__name__)
@@ -221,6 +227,23 @@ class app_function(object):
     Specify the function's API name as parameter to the decorator. **It only accepts 1** ``api_name`` **as an argument.**
 
     The function handler will automatically be subscribed to the function's ``message destination``.
+
+    If the function always returns the same results for the same inputs (e.g. a reputation lookup),
+    set ``cache_ttl`` to cache its results for that many seconds. Calls with the same validated
+    ``fn_inputs`` then return the cached results instead of running the function, and calls that
+    arrive while one with the same inputs is running wait for its results, for up to
+    ``cache_wait_timeout`` seconds (default 600) before they run the function too:
+
+    .. code-block::
+
+        @app_function(FN_NAME, cache_ttl=300)
+        def _app_function(self, fn_inputs):
+            ...
+
+    The results are kept in memory, up to ``cache_size`` of them (default 1000). Set ``cache_path``
+    to keep them in a file instead, so they are still there after a restart. Only successful
+    results are cached. The hits and hit ratio of the cache are logged, and available from
+    ``cache_info()`` of the ``cache`` attribute of the decorated method.
     """
 
     def __init__(self, *args, **kwargs):
@@ -229,6 +252,12 @@ class app_function(object):
         self.names = args
         self.kwargs = kwargs
 
+        cache_ttl = kwargs.get("cache_ttl")
+        self.cache = get_function_cache(self.names[0], cache_ttl,
+                                        maxsize=kwargs.get("cache_size"),
+                                        path=kwargs.get("cache_path"),
+                                        wait_timeout=kwargs.get("cache_wait_timeout")) if cache_ttl else None
+
     def __call__(self, fn):
         """
         Called at decoration time, with the bare function being decorated
@@ -287,19 +316,27 @@ class app_function(object):
 
                 rp = ResultPayload(itself.PACKAGE_NAME, version=constants.APP_FUNCTION_PAYLOAD_VERSION, **fn_inputs)
 
+                if getattr(itself, "include_extended_metrics", False):
+                    rp.metrics.enable_extended_metrics(queued_time=getattr(evt, "received_time", None))
+
                 # make sure to sub AFTER the ResultPayload is instantiated so that any subbed values
                 # won't be logged or included in the returned inputs.
                 # substitute any secrets denoted with $, ^, ${}, or ^{} in the function inputs.
                 # NOTE: it is crucial to first "validate_fields" as that function will convert any
                 # non-string fields that should be strings to strings (like select)
+                # the results are cached by the inputs before any secrets are substituted in
+                cache_key = get_input_key(self.names[0], fn_inputs) if self.cache is not None else None
                 fn_inputs = helpers.sub_fn_inputs_from_protected_secrets(fn_inputs, itself.opts)
                 fn_inputs_tuple = namedtuple("fn_inputs", fn_inputs.keys())(*fn_inputs.values())
 
                 # Set evt.message in local thread storage
                 itself.set_fn_msg(evt.message)
 
-                # Invoke the actual Function
-                fn_results = fn(itself, fn_inputs_tuple)
+                # Invoke the actual Function, or get its cached results
+                if self.cache is not None:
+                    fn_results = self.cache.results(cache_key, lambda: fn(itself, fn_inputs_tuple))
+                else:
+                    fn_results = fn(itself, fn_inputs_tuple)
 
                 for r in fn_results:
                     if isinstance(r, StatusMessage):
@@ -330,6 +367,7 @@ class app_function(object):
             fn_result = yield itself.call(invoke_app_function, "functionworker")
             yield fn_result.value
 
+        app_function_decorator.cache = self.cache
         return app_function_decorator
 
 
@@ -360,6 +398,19 @@ class low_code_function(object):
                 ...
                 yield FunctionResult({"results": "value"})
 
+    The decorated function can also be ``async``. It then runs on a shared
+    asyncio event loop rather than a ``FunctionWorker`` thread, so many more
+    invocations can wait on I/O at the same time (see ``low_code_max_concurrency``).
+    Use :func:`resilient_circuits.async_requests.execute_async` to make requests from it:
+
+    .. code-block::
+
+            @low_code_function()
+            async def _run_low_code(self, low_code_request):
+                yield self.status_message("Low Code execution started")
+                response = await execute_async(self.rc, low_code_request.get("method"), low_code_request.get("url"))
+                yield LowCodeResult({"status_code": response.status_code, "content": response.json()})
+
     :param object: _description_
     :type object: _type_
     """
@@ -390,20 +441,33 @@ class low_code_function(object):
         fn.override = self.kwargs.get("override", False)
         fn.event = True
 
+        if _inspect.isasyncgenfunction(fn) or _inspect.iscoroutinefunction(fn):
+            # async functions do not need a thread of their own while they wait on I/O,
+            # so run them on the AsyncFunctionWorker's event loop
+            invoke_fn, worker_channel = _ainvoke_low_code_function, "asyncfunctionworker"
+        else:
+            invoke_fn, worker_channel = _invoke_low_code_function, "functionworker"
+
         @wraps(fn)
         def low_code_decorator(itself, event, *args, **kwargs):
             low_code_message = event.message    # {"request_originator": {}, "request_payload": {}}
-            invoke_low_code_function = task(_invoke_low_code_function, event, itself, fn, **low_code_message)
-            fn_result = yield itself.call(invoke_low_code_function, "functionworker")
+            invoke_low_code_function = task(invoke_fn, event, itself, fn, **low_code_message)
+            fn_result = yield itself.call(invoke_low_code_function, worker_channel)
             yield fn_result.value
 
         return low_code_decorator
 
-def _invoke_low_code_function(event, app_fn_component_obj, the_function, **kwds):
-    LOG.debug("Running _invoke_low_code_function in Thread: %s", threading.current_thread().name)
-
-    result_list = []
-
+def _prepare_low_code_function(event, app_fn_component_obj, cpu_time=True, **kwds):
+    """
+    Validate the inputs of a low code message and get it ready to be handled.
+    The secrets in its inputs are not substituted yet, see :func:`_sub_low_code_secrets`
+
+    :param cpu_time: if ``True`` the extended metrics include the CPU time of the current thread.
+        Only set it if the function runs on a thread of its own
+    :type cpu_time: bool
+    :return: the ``LowCodePayload`` to build results with and the validated inputs of the message
+    :rtype: tuple
+    """
     # Validate the fn_inputs in the Message
     connector_inputs = validate_fields(["request_originator","request_payload"], kwds)
     LOG.info("[%s] Validated connector inputs", event.name)
@@ -411,47 +475,98 @@ def _invoke_low_code_function(event, app_fn_component_obj, the_function, **kwds)
 
     lc_payload = LowCodePayload(app_fn_component_obj.PACKAGE_NAME, version=constants.LOW_CODE_PAYLOAD_VERSION, **connector_inputs)
 
-    connector_inputs = helpers.sub_fn_inputs_from_protected_secrets(connector_inputs, app_fn_component_obj.opts)
+    if getattr(app_fn_component_obj, "include_extended_metrics", False):
+        lc_payload.metrics.enable_extended_metrics(queued_time=getattr(event, "received_time", None), cpu_time=cpu_time)
 
     # Set evt.message in local thread storage
     app_fn_component_obj.set_fn_msg(event.message)
 
-    # Pull out the request_payload, this is all we need to execute the request
-    low_code_request = connector_inputs.get("request_payload")
+    return lc_payload, connector_inputs
+
+def _sub_low_code_secrets(app_fn_component_obj, connector_inputs):
+    """
+    Substitute the secrets in the inputs of a low code message. Getting them from
+    a PAM makes requests, so this blocks
+
+    :return: the ``request_payload`` of the message, all we need to execute the request
+    :rtype: dict
+    """
+    connector_inputs = helpers.sub_fn_inputs_from_protected_secrets(connector_inputs, app_fn_component_obj.opts)
+    return connector_inputs.get("request_payload")
+
+def _handle_low_code_result(event, app_fn_component_obj, lc_payload, low_code_request, result, result_list):
+    """ Handle one item yielded by a low code function, adding it to ``result_list`` if it is a result """
+    # if a FunctionResult comes through, convert it to a LowCodeResult
+    # first before continuing with the rest of the result processing
+    if isinstance(result, FunctionResult):
+        result = LowCodeResult.from_function_result(result)
+
+    # handle the result as necessary; send status message, or ack result
+    if isinstance(result, StatusMessage):
+        LOG.info("[%s] StatusMessage: %s", event.name, result)
+        app_fn_component_obj.fire(StatusMessageEvent(parent=event, message=result.text))
+
+    elif isinstance(result, LowCodeResult):
+        result.name = event.name
+        if not result.custom_results:
+            result.value = lc_payload.done(
+                content=result.value.get("content"),
+                success=result.success,
+                reason=result.reason,
+                content_type=low_code_request.get("response_content_type", None),
+                status_code=result.value.get("status_code"))
+        LOG.info("[%s] Returning results", result.name)
+        result_list.append(result)
+
+    elif isinstance(result, Exception):
+        raise result
+
+    else:
+        # Whatever this is, add it to the results
+        LOG.debug(result)
+        result_list.append(result)
+
+def _invoke_low_code_function(event, app_fn_component_obj, the_function, **kwds):
+    LOG.debug("Running _invoke_low_code_function in Thread: %s", threading.current_thread().name)
+
+    result_list = []
+
+    lc_payload, connector_inputs = _prepare_low_code_function(event, app_fn_component_obj, **kwds)
+    low_code_request = _sub_low_code_secrets(app_fn_component_obj, connector_inputs)
 
     # Invoke the actual Function
     fn_results = the_function(app_fn_component_obj, low_code_request)
 
     for result in fn_results:
-        # if a FunctionResult comes through, convert it to a LowCodeResult
-        # first before continuing with the rest of the result processing
-        if isinstance(result, FunctionResult):
-            result = LowCodeResult.from_function_result(result)
-
-        # handle the result as necessary; send status message, or ack result
-        if isinstance(result, StatusMessage):
-            LOG.info("[%s] StatusMessage: %s", event.name, result)
-            app_fn_component_obj.fire(StatusMessageEvent(parent=event, message=result.text))
-
-        elif isinstance(result, LowCodeResult):
-            result.name = event.name
-            if not result.custom_results:
-                result.value = lc_payload.done(
-                    content=result.value.get("content"),
-                    success=result.success,
-                    reason=result.reason,
-                    content_type=low_code_request.get("response_content_type", None),
-                    status_code=result.value.get("status_code"))
-            LOG.info("[%s] Returning results", result.name)
-            result_list.append(result)
-
-        elif isinstance(result, Exception):
-            raise result
+        _handle_low_code_result(event, app_fn_component_obj, lc_payload, low_code_request, result, result_list)
 
-        else:
-            # Whatever this is, add it to the results
-            LOG.debug(result)
-            result_list.append(result)
+    return result_list
+
+async def _ainvoke_low_code_function(event, app_fn_component_obj, the_function, **kwds):
+    """
+    The same as :func:`_invoke_low_code_function` for ``async`` functions. Runs
+    on the event loop of the :class:`AsyncFunctionWorker`. The function can
+    either be an async generator that yields results, or a coroutine
+    that returns one result
+    """
+    LOG.debug("Running _ainvoke_low_code_function in Thread: %s", threading.current_thread().name)
+
+    result_list = []
+
+    # the event loop thread is shared by every async invocation, so its CPU time is not this invocation's
+    lc_payload, connector_inputs = _prepare_low_code_function(event, app_fn_component_obj, cpu_time=False, **kwds)
+    # run the blocking substitution in the loop's executor, so it does not hold up the other invocations
+    low_code_request = await asyncio.get_running_loop().run_in_executor(None, _sub_low_code_secrets,
+                                                                        app_fn_component_obj, connector_inputs)
+
+    # Invoke the actual Function
+    if _inspect.isasyncgenfunction(the_function):
+        async for result in the_function(app_fn_component_obj, low_code_request):
+            _handle_low_code_result(event, app_fn_component_obj, lc_payload, low_code_request, result, result_list)
+    else:
+        result = await the_function(app_fn_component_obj, low_code_request)
+        if result is not None:
+            _handle_low_code_result(event, app_fn_component_obj, lc_payload, low_code_request, result, result_list)
 
     return result_list
 
@@ -531,6 +646,123 @@ def debounce_get_incident_key(event):
     return key
 
 
+class DebounceQueue(object):
+    """The events a :class:`debounce` decorator is holding back, by key.
+
+       Each key has one deadline, kept in a heap, so a new event for a key
+       moves the deadline of all its pending events without touching them.
+       The heap holds one entry for each key: when an entry comes up whose
+       key has since been given a later deadline, it is pushed back with
+       that deadline.
+
+       :param delay: (seconds).  Time to hold back the events for a key
+                  after the most recent one.
+       :param discard: (Boolean, optional).  If true, only the most recent
+                  event for a key is kept.
+       :param max_keys: (int, optional).  Most keys to hold events for.
+                  When a new key would go over this, the events of the key
+                  that is due first are released early.
+    """
+    def __init__(self, delay, discard=False, max_keys=constants.DEFAULT_DEBOUNCE_MAX_KEYS):
+        self.delay = delay
+        self.discard = discard
+        self.max_keys = max_keys
+        # key -> [deadline, [events]]
+        self._pending = {}
+        # (deadline, sequence, key)
+        self._heap = []
+        self._sequence = itertools.count()
+        # deferred, discarded, released and evicted event counts, and peak_keys
+        self.stats = Counter()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, key):
+        return key in self._pending
+
+    def add(self, key, event, now):
+        """Hold back ``event`` until ``delay`` seconds after ``now``, with the other events for ``key``
+
+           :return: (discarded, evicted): the events of ``key`` that ``event`` replaces
+                    in discard mode, and the events of another key released early
+                    to stay within ``max_keys``
+           :rtype: tuple
+        """
+        discarded, evicted = [], []
+        entry = self._pending.get(key)
+        if entry is None:
+            if self.max_keys and len(self._pending) >= self.max_keys:
+                evicted = self._evict()
+            entry = self._pending[key] = [now + self.delay, []]
+            heapq.heappush(self._heap, (entry[0], next(self._sequence), key))
+            self.stats["peak_keys"] = max(self.stats["peak_keys"], len(self._pending))
+        else:
+            # the heap entry is moved when it comes up
+            entry[0] = now + self.delay
+            if self.discard:
+                discarded, entry[1] = entry[1], []
+                self.stats["discarded"] += len(discarded)
+        entry[1].append(event)
+        self.stats["deferred"] += 1
+        return discarded, evicted
+
+    def pop_due(self, now):
+        """:return: the events of every key whose deadline is ``now`` or earlier, in order
+           :rtype: list
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _deadline, _sequence, key = heapq.heappop(self._heap)
+            entry = self._pending.get(key)
+            if entry is None:
+                continue
+            if entry[0] > now:
+                heapq.heappush(self._heap, (entry[0], next(self._sequence), key))
+                continue
+            del self._pending[key]
+            due.extend(entry[1])
+        self.stats["released"] += len(due)
+        return due
+
+    def next_due(self):
+        """:return: time of the next deadline to check, or None if there are no pending events"""
+        return self._heap[0][0] if self._heap else None
+
+    def _evict(self):
+        while self._heap:
+            _deadline, _sequence, key = heapq.heappop(self._heap)
+            entry = self._pending.pop(key, None)
+            if entry is not None:
+                if not self.stats["evicted"]:
+                    LOG.warning("@debounce is holding events for %s keys. Handling the events for %s early",
+                                self.max_keys, key)
+                self.stats["evicted"] += len(entry[1])
+                return entry[1]
+        return []
+
+
+class DebounceTimer(BaseComponent):
+    """Fires the events of a :class:`DebounceQueue` when they are due"""
+
+    def __init__(self, queue):
+        super(DebounceTimer, self).__init__()
+        self.queue = queue
+
+    @circuits.core.handlers.handler("generate_events")
+    def _on_generate_events(self, event):
+        now = time.time()
+        due = self.queue.pop_due(now)
+        for evt in due:
+            self.fire(evt)
+        next_due = self.queue.next_due()
+        if due:
+            # handle the events just fired without waiting
+            event.reduce_time_left(0)
+        elif next_due is not None:
+            event.reduce_time_left(max(next_due - now, 0))
+
+
 class debounce(object):
     """Decorator for an event handler, debounces multiple occurrences.
 
@@ -540,6 +772,9 @@ class debounce(object):
        :param discard: (Boolean, optional).  If true, when there are multiple
                   events before the delay expires, only the most recent one
                   is processed, and the previous ones are discarded.
+       :param max_keys: (int, optional).  Most keys to hold back events for.
+                  When there are more, the events for the key that is due
+                  first are processed early.  Defaults to 10000.
 
        Usage:
        Decorate a Resilient Circuits handler.
@@ -554,15 +789,31 @@ class debounce(object):
                 # handle the event
                 pass
 
+       The counts of deferred, discarded, released and evicted events are
+       in ``_my_action_handler.debounce.stats``.
     """
     def __init__(self, *args, **kwargs):
         self.delay = kwargs.get("delay", 1)
         self.discard = kwargs.get("discard", False)
         self.get_key = kwargs.get("get_key_func", debounce_get_incident_key)
-        self.debouncedata = {}
+        self.queue = DebounceQueue(self.delay, discard=self.discard,
+                                   max_keys=kwargs.get("max_keys", constants.DEFAULT_DEBOUNCE_MAX_KEYS))
+        self._timer = None
         if len(args) > 0:
             raise Exception("Usage: @debounce(delay=<seconds>, [discard=True])")
 
+    @property
+    def stats(self):
+        return self.queue.stats
+
+    def _get_timer(self, component):
+        """The timer for the pending events, registered with the app of ``component``"""
+        if self._timer is None or self._timer.root is not component.root:
+            # first use, or the component it was registered with has been unregistered
+            self._timer = DebounceTimer(self.queue)
+            self._timer.register(component)
+        return self._timer
+
     def __call__(self, func):
         """Called at decoration time, with function"""
         LOG.debug("@debounce %s", func)
@@ -575,56 +826,37 @@ class debounce(object):
             # (key is the incident-id, by default):
             # - Don't handle the message immediately.
             #   - Note that we have a deferred event.
-            #   - Defer it for <<delay>>.
-            # - If an event arrives and there is any deferred message,
-            #   - Reset the timer interval to <<delay>>
-            #   - Optionally: throw away the new message.
-            #     Otherwise: defer this one too (to be processed
+            #   - Hold it back for <<delay>>.
+            # - If an event arrives and there are held back messages,
+            #   - Move their deadline to <<delay>> from now
+            #   - Optionally: throw away the held back messages.
+            #     Otherwise: hold this one back too (to be processed
             #     immediately after the first deferred message).
             key = self.get_key(event)
             if event.deferred:
                 # We deferred this event earlier,
                 # and now it has fired without being reset in the meantime.
-                # All the pending events are OK to go!  Forget their timers!
                 LOG.info("Handling deferred %s", key)
                 event.deferred = False
-                self.debouncedata.pop(key, None)
-            else:
-                # This is a new event.
-                # Are there any other deferred events for this [action+incident]?
-                if key not in self.debouncedata:
-                    # We'll keep a list of all the timers
-                    self.debouncedata[key] = []
-                else:
-                    # Duplicate event
-                    if self.discard:
-                        # Unregister all the previous timers so they don't fire
-                        for timer in self.debouncedata[key]:
-                            evt = timer.event
-                            LOG.debug("Unregister timer")
-                            timer.unregister()
-                            if evt:
-                                # The timer's event will not fire now.
-                                # Mark it as not 'deferred' and fire a 'success' child event
-                                # so that it gets ack'd to the message queue.
-                                LOG.debug("Fire success")
-                                evt.deferred = False
-                                channels = getattr(evt, "success_channels", evt.channels)
-                                itself.fire(evt.child("success", evt, evt.value.value), *channels)
-                        # Now we can get rid of the list of timers
-                        self.debouncedata[key] = []
-                    else:
-                        # Reset all the pending timers
-                        for timer in self.debouncedata[key]:
-                            timer.reset(interval=self.delay)
-                # Defer this new event with a timer.
-                LOG.info("Deferring %s", key)
-                timer = Timer(self.delay, event)
-                timer.register(itself)
-                event.deferred = True
-                # Remember the new timer so that we can reset it if necessary
-                self.debouncedata[key].append(timer)
-                # We're done until the timer fires
-                return
-            return func(itself, event, *args, **kwargs)
+                return func(itself, event, *args, **kwargs)
+
+            timer = self._get_timer(itself)
+            discarded, evicted = self.queue.add(key, event, time.time())
+            for evt in discarded:
+                # The discarded event will not fire now.
+                # Mark it as not 'deferred' and fire a 'success' child event
+                # so that it gets ack'd to the message queue.
+                LOG.debug("Fire success")
+                evt.deferred = False
+                channels = getattr(evt, "success_channels", evt.channels)
+                itself.fire(evt.child("success", evt, evt.value.value), *channels)
+            for evt in evicted:
+                timer.fire(evt)
+
+            LOG.info("Deferring %s", key)
+            event.deferred = True
+            # We're done until the timer fires
+            return
+
+        decorated.debounce = self
         return decorated
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+Caches of the results of app functions, used by
+``@app_function(api_name, cache_ttl=300)``.
+
+The results are cached by the validated inputs of the function, so a
+function that is called again with the same inputs within ``cache_ttl``
+seconds returns the same results without running again. Calls with the
+same inputs that arrive while the first is still running wait for it,
+rather than running too. If it takes longer than ``wait_timeout`` seconds,
+they stop waiting and run the function themselves.
+
+Only successful results are cached. A call that yields a ``FunctionResult``
+with ``success=False`` or raises an error is not cached.
+"""
+
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from cachetools import TTLCache
+from resilient_circuits import constants
+from resilient_circuits.action_message import FunctionResult
+
+LOG = logging.getLogger(__name__)
+
+
+class FunctionCache(ABC):
+    """
+    Base class of the caches. Subclasses store the cached results with
+    :meth:`_get` and :meth:`_set`
+
+    :param name: the api name of the function, for logging
+    :type name: str
+    :param ttl: number of seconds to keep results
+    :type ttl: int
+    :param maxsize: max number of results to keep. The least recently used are removed first
+    :type maxsize: int
+    :param wait_timeout: max number of seconds a call waits for a running call with the same inputs
+    :type wait_timeout: float
+    """
+
+    def __init__(self, name, ttl, maxsize=constants.DEFAULT_FUNCTION_CACHE_MAXSIZE,
+                 wait_timeout=constants.DEFAULT_FUNCTION_CACHE_WAIT_TIMEOUT):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.wait_timeout = wait_timeout
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._running = {}
+
+    @property
+    def hit_ratio(self):
+        """ fraction of calls that did not run the function """
+        calls = self.stats["hits"] + self.stats["coalesced"] + self.stats["misses"]
+        return (self.stats["hits"] + self.stats["coalesced"]) / calls if calls else 0.0
+
+    def cache_info(self):
+        """
+        :return: the hits, misses, calls that waited for another one (coalesced),
+            hit ratio and number of cached results
+        :rtype: dict
+        """
+        info = {"hits": self.stats["hits"], "misses": self.stats["misses"], "coalesced": self.stats["coalesced"],
+                "hit_ratio": round(self.hit_ratio, 4), "size": len(self)}
+        return info
+
+    def results(self, key, run):
+        """
+        Generator of the items a function yields: the cached results for ``key``,
+        or the items of ``run()`` which are then cached
+
+        :param key: the key of the inputs
+        :type key: str
+        :param run: callable that runs the function, returning the generator of its items
+        :type run: callable
+        """
+        future = None
+        with self._lock:
+            cached = self._get(key)
+            if cached is not None:
+                self.stats["hits"] += 1
+            elif key in self._running:
+                self.stats["coalesced"] += 1
+                waiting_for = self._running[key]
+            else:
+                self.stats["misses"] += 1
+                future = self._running[key] = Future()
+
+        if cached is None and future is None:
+            # another call is running the function, so wait for its results
+            LOG.info("[%s] Waiting for a running call with the same inputs", self.name)
+            try:
+                cached = waiting_for.result(timeout=self.wait_timeout)
+            except FutureTimeoutError:
+                LOG.warning("[%s] The running call with the same inputs took more than %s seconds, running this one too",
+                            self.name, self.wait_timeout)
+                self.stats["wait_timeouts"] += 1
+                cached = None
+            if cached is None:
+                # it failed or is taking too long, so run this one too
+                for item in run():
+                    yield item
+                return
+
+        if cached is not None:
+            LOG.info("[%s] Returning cached results. Cache hit ratio: %.1f%%", self.name, self.hit_ratio * 100)
+            for value, success, reason, custom_results in cached:
+                yield FunctionResult(copy.deepcopy(value), success=success, reason=reason, custom_results=custom_results)
+            return
+
+        recorded = []
+        completed = False
+        try:
+            for item in run():
+                if isinstance(item, FunctionResult):
+                    if item.success:
+                        recorded.append((copy.deepcopy(item.value), item.success, item.reason, item.custom_results))
+                    else:
+                        recorded = None
+                elif isinstance(item, Exception):
+                    recorded = None
+                yield item
+            completed = True
+        finally:
+            if not (completed and recorded):
+                recorded = None
+            with self._lock:
+                self._running.pop(key, None)
+                if recorded:
+                    self._set(key, recorded)
+            future.set_result(recorded)
+
+    @abstractmethod
+    def _get(self, key):
+        """ :return: the results cached for ``key``, or ``None``. Called with ``_lock`` held """
+
+    @abstractmethod
+    def _set(self, key, results):
+        """ Cache ``results`` for ``key``. Called with ``_lock`` held """
+
+    @abstractmethod
+    def __len__(self):
+        """ :return: the number of cached results """
+
+
+class MemoryFunctionCache(FunctionCache):
+    """ Results kept in memory, in a ``TTLCache`` """
+
+    def __init__(self, name, ttl, maxsize=constants.DEFAULT_FUNCTION_CACHE_MAXSIZE, **kwargs):
+        super(MemoryFunctionCache, self).__init__(name, ttl, maxsize, **kwargs)
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _get(self, key):
+        return self._cache.get(key)
+
+    def _set(self, key, results):
+        self._cache[key] = results
+
+    def __len__(self):
+        with self._lock:
+            self._cache.expire()
+            return len(self._cache)
+
+
+class DiskFunctionCache(FunctionCache):
+    """
+    Results kept in a SQLite database at ``path``, so they are still there
+    after a restart. The results must be JSON serializable to be cached.
+    The database is opened when the function is first called, not when
+    it is decorated
+    """
+
+    def __init__(self, name, ttl, maxsize=constants.DEFAULT_FUNCTION_CACHE_MAXSIZE, path=None, **kwargs):
+        super(DiskFunctionCache, self).__init__(name, ttl, maxsize, **kwargs)
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self._conn = None
+
+    def _connect(self):
+        """ :return: the connection to the database, opened on first use. Called with ``_lock`` held """
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS results (function TEXT NOT NULL, key TEXT NOT NULL, "
+                         "results TEXT NOT NULL, saved REAL NOT NULL, used REAL NOT NULL, PRIMARY KEY (function, key))")
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute("SELECT results FROM results WHERE key = ? AND function = ? AND saved >= ?",
+                           (key, self.name, now - self.ttl)).fetchone()
+        if not row:
+            return None
+        conn.execute("UPDATE results SET used = ? WHERE function = ? AND key = ?", (now, self.name, key))
+        return json.loads(row[0])
+
+    def _set(self, key, results):
+        try:
+            data = json.dumps(results)
+        except (TypeError, ValueError) as err:
+            LOG.warning("[%s] Results not cached, they are not JSON serializable: %s", self.name, err)
+            return
+
+        conn = self._connect()
+        now = time.time()
+        conn.execute("INSERT OR REPLACE INTO results (key, function, results, saved, used) VALUES (?, ?, ?, ?, ?)",
+                     (key, self.name, data, now, now))
+        conn.execute("DELETE FROM results WHERE function = ? AND saved < ?", (self.name, now - self.ttl))
+        conn.execute("DELETE FROM results WHERE function = ? AND key IN (SELECT key FROM results WHERE function = ? "
+                     "ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.name, self.name, self.maxsize))
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM results WHERE function = ? AND saved >= ?",
+                                           (self.name, time.time() - self.ttl)).fetchone()[0]
+
+
+def get_function_cache(name, ttl, maxsize=None, path=None, wait_timeout=None):
+    """
+    Get the cache for ``@app_function(name, cache_ttl=ttl)``
+
+    :param name: the api name of the function
+    :type name: str
+    :param ttl: number of seconds to keep results
+    :type ttl: int
+    :param maxsize: max number of results to keep, defaults to ``DEFAULT_FUNCTION_CACHE_MAXSIZE``
+    :type maxsize: int
+    :param path: path of a file to keep the results in. If not set, they are kept in memory
+    :type path: str
+    :param wait_timeout: max number of seconds a call waits for a running call with the same inputs,
+        defaults to ``DEFAULT_FUNCTION_CACHE_WAIT_TIMEOUT``
+    :type wait_timeout: float
+    :return: the cache
+    :rtype: FunctionCache
+    """
+    maxsize = maxsize or constants.DEFAULT_FUNCTION_CACHE_MAXSIZE
+    wait_timeout = wait_timeout or constants.DEFAULT_FUNCTION_CACHE_WAIT_TIMEOUT
+    if path:
+        return DiskFunctionCache(name, ttl, maxsize, path=path, wait_timeout=wait_timeout)
+    return MemoryFunctionCache(name, ttl, maxsize, wait_timeout=wait_timeout)
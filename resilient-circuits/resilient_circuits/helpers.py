@@ -4,7 +4,8 @@
 # pragma pylint: disable=line-too-long, wrong-import-order
 
 """Common Helper Functions for resilient-circuits"""
-import copy
+import functools
+import json
 import logging
 import re
 import sys
@@ -13,6 +14,7 @@ import time
 from collections.abc import Iterable
 from importlib.metadata import entry_points, distribution
 from importlib.util import find_spec, module_from_spec
+from resilient_app_config_plugins.constants import PAM_SECRET_PREFIX
 from resilient_circuits import constants
 from six import string_types
 
@@ -23,6 +25,12 @@ from resilient.app_config import AppConfigManager
 
 LOG = logging.getLogger("__name__")
 
+# everything up to and including the second "/" of a destination like "/queue/actions.201.fn_x"
+RE_DESTINATION_PREFIX = re.compile(r'\/.+\/')
+
+# UTF-8 encoded surrogates (U+D800 to U+DFFF) start with this byte
+UTF8_SURROGATE_LEAD_BYTE = b"\xed"
+
 
 def get_fn_names(component):
     """If `component` has a `function` attribute and it is True,
@@ -282,8 +290,7 @@ def get_queue(destination):
         assert isinstance(destination_str, str)
 
         # regex.sub to remove any /queue/ in the start
-        regex = re.compile(r'\/.+\/')
-        destination_str = re.sub(regex, "", destination_str, count=1)
+        destination_str = RE_DESTINATION_PREFIX.sub("", destination_str, count=1)
 
         # split on periods to get the type, org_id, and queue name
         # use maxsplit=2 to only split on the first two periods,
@@ -300,6 +307,30 @@ def get_queue(destination):
         return None
 
 
+def load_message_body(body):
+    """
+    Parse the JSON body of a STOMP message, which is expected to be UTF-8.
+
+    Bytes are parsed as they are, without decoding them to a str first.
+    Only when the body has bytes that could be encoded surrogates is it
+    checked: SOAR can send surrogate pairs, which the strict UTF-8 decoder
+    does not allow, so they are joined into the characters they stand for.
+
+    :param body: body of the message
+    :type body: bytes or str
+    :return: the parsed message
+    :rtype: dict
+    """
+    if isinstance(body, (bytes, bytearray)) and UTF8_SURROGATE_LEAD_BYTE in body:
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            LOG.debug("Failed utf8 decode, trying surrogate")
+            body = body.decode("utf-8", "surrogatepass").encode("utf-16", "surrogatepass").decode("utf-16")
+
+    return json.loads(body)
+
+
 def is_this_a_selftest(component):
     """
     Return ``True`` or ``False`` if this instantiation of
@@ -404,20 +435,39 @@ def sub_fn_inputs_from_protected_secrets(fn_inputs, opts):
     :type fn_inputs: dict
     :param opts: app configs from AppFunctionComponent (usually self.opts)
     :type opts: AppConfigManager | dict
-    :return: fn_inputs unchanged except where secrets referenced are replaced
+    :return: a copy of fn_inputs unchanged except where secrets referenced are replaced.
+        Only the top level dict is copied, values that are not substituted are shared with ``fn_inputs``
     :rtype: dict
     """
-    fn_inputs = copy.deepcopy(fn_inputs)
-
     # find the pam_plugin type if necessary
     if isinstance(opts, AppConfigManager) and opts.pam_plugin:
         pam_plugin = type(opts.pam_plugin)
     else:
         pam_plugin = None
 
+    # NOTE: some inputs might not be strings. in that case,
+    # they will not be substituted, they will remain their
+    # original value and structure. This applies to ints,
+    # multiselects, booleans, and date time pickers.
+    # All text, text with string, and select (single) inputs
+    # will attempt to substitute if applicable.
+    # Only string values that contain a secret marker can be
+    # substituted, so find those first and leave everything else alone
+    inputs_with_secrets = {}
+    for key, value in fn_inputs.items():
+        if isinstance(value, string_types) and (res_constants.PROTECTED_SECRET_PREFIX in value or (pam_plugin and PAM_SECRET_PREFIX in value)):
+            inputs_with_secrets[key] = value
+
+    # always return a new dict so the original object is not modified.
+    # values that are not substituted are not copied
+    fn_inputs = dict(fn_inputs)
+
+    if not inputs_with_secrets:
+        return fn_inputs
+
     # use a AppConfigManager temporarily to take advantage of its
     # protected secrets and PAM secrets substitution capabilities
-    fn_inputs_manager = AppConfigManager(fn_inputs, pam_plugin)
+    fn_inputs_manager = AppConfigManager(inputs_with_secrets, pam_plugin)
 
     # since the value for fn_inputs will quickly be translated
     # to a namedtuple anyway, we simply set the values to the
@@ -429,18 +479,30 @@ def sub_fn_inputs_from_protected_secrets(fn_inputs, opts):
     # will be used relatively quickly within a function so we can
     # statically save the found value here and we assume it will
     # be used quickly enough in the function to be up to date.
-    # NOTE: some inputs might not be strings. in that case,
-    # they will not be substituted, they will remain their
-    # original value and structure. This applies to ints,
-    # multiselects, booleans, and date time pickers.
-    # All text, text with string, and select (single) inputs
-    # will attempt to substitute if applicable
-    for key in fn_inputs_manager:
-        if isinstance(fn_inputs[key], string_types):
-            fn_inputs[key] = fn_inputs_manager[key]
+    for key in inputs_with_secrets:
+        fn_inputs[key] = fn_inputs_manager[key]
 
     return fn_inputs
 
+@functools.lru_cache(maxsize=None)
+def get_entry_point_index():
+    """Scan the installed distributions once and build an index of all
+    their entry points by group. The result is cached for the lifetime of the
+    process so that the component loader, ``selftest`` and ``config``
+    commands share a single scan of ``sys.path``.
+
+    Call ``get_entry_point_index.cache_clear()`` to force a rescan
+    (for example, after installing a new app into a running environment).
+
+    :return: dictionary of group name to a tuple of EntryPoint objects
+    :rtype: dict
+    """
+    eps = entry_points()
+    if sys.version_info.major == 3 and sys.version_info.minor > 9:
+        return {group: tuple(eps.select(group=group)) for group in eps.groups}
+    else:
+        return {group: tuple(group_eps) for group, group_eps in eps.items()}
+
 def get_entry_points(group):
     """get the importlib EntryPoint objects for a given group
 
@@ -449,11 +511,7 @@ def get_entry_points(group):
     :return: list of entrypoints found
     :rtype: list
     """
-    if sys.version_info.major == 3 and sys.version_info.minor > 9:
-        return entry_points(group=group)
-    else:
-        eps = entry_points()
-        return eps.get(group, [])
+    return list(get_entry_point_index().get(group, ()))
 
 def get_entry_point_name(ep):
     """ find the name of the app from the importlib EntryPoint
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+Persistent store of the replies sent for function messages, so a function
+message that SOAR delivers again (for example after a restart of
+resilient-circuits) is answered with the saved reply instead of running
+the function again.
+
+Replies are saved in a SQLite database, keyed by the STOMP ``message-id`` and,
+if ``match_inputs`` is set, by a hash of the function name and its inputs.
+Only the replies of functions that succeeded are saved, unless
+``save_failures`` is set.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from resilient_circuits import constants
+
+LOG = logging.getLogger(__name__)
+
+# Remove expired replies after this many replies are saved
+PRUNE_INTERVAL = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS replies (
+    message_id TEXT PRIMARY KEY,
+    input_key TEXT,
+    reply TEXT NOT NULL,
+    saved REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS replies_input_key ON replies (input_key);
+CREATE INDEX IF NOT EXISTS replies_saved ON replies (saved);
+"""
+
+
+def get_input_key(function_name, inputs):
+    """
+    Get the key of a function and its inputs: a sha256 of the function
+    name and the inputs as JSON, with the keys sorted.
+
+    :param function_name: the ``programmatic_name`` of the function
+    :type function_name: str
+    :param inputs: the ``inputs`` of the function message
+    :type inputs: dict
+    :return: the hex digest of the hash
+    :rtype: str
+    """
+    data = json.dumps({"function": function_name, "inputs": inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore(object):
+    """
+    Replies sent for function messages, saved in a SQLite database
+    at ``path``.
+
+    The replies have the results of the functions, so the database is
+    created readable only by its owner. Replies are written by a
+    background thread, so saving a reply does not block the circuits loop.
+    :meth:`find_reply` looks a reply up on that thread too.
+    A reply is found as soon as it is saved.
+
+    :param path: path of the database file. Created if it does not exist
+    :type path: str
+    :param retention: number of seconds to keep a reply
+    :type retention: int
+    :param max_entries: max number of replies to keep. The oldest are removed first
+    :type max_entries: int
+    :param match_inputs: if ``True`` a reply is also found for a message to the
+        same function with the same inputs, as well as one with the same ``message-id``
+    :type match_inputs: bool
+    :param save_failures: if ``True`` the replies of functions that failed are saved too.
+        Otherwise a function that failed runs again when its message is delivered again
+    :type save_failures: bool
+    """
+
+    def __init__(self, path,
+                 retention=constants.DEFAULT_IDEMPOTENCY_RETENTION,
+                 max_entries=constants.DEFAULT_IDEMPOTENCY_MAX_ENTRIES,
+                 match_inputs=False,
+                 save_failures=False):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.retention = int(retention)
+        self.max_entries = int(max_entries)
+        self.match_inputs = match_inputs
+        self.save_failures = save_failures
+        self.stats = Counter()
+        self._saves_since_prune = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # message_id -> (input_key, reply, saved) of the replies not written yet
+        self._pending = {}
+        self._queue = queue.Queue()
+        self._closed = False
+
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        # SQLite creates the -wal and -shm files with the permissions of the database
+        os.close(os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600))
+        os.chmod(self.path, 0o600)
+
+        self._conn = self._connect()
+        self._conn.executescript(SCHEMA)
+        self._write_conn = self._connect()
+        self.prune()
+
+        self._thread = threading.Thread(target=self._write_replies, name="IdempotencyStore", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+        LOG.info("Saving function replies in %s for %s seconds (max %s replies, match inputs: %s, save failures: %s)",
+                 self.path, self.retention, self.max_entries, self.match_inputs, self.save_failures)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @classmethod
+    def from_opts(cls, opts):
+        """
+        Get the store configured in the ``[resilient]`` section of the app.config
+
+        :param opts: all the app configs
+        :type opts: dict
+        :return: the store, or ``None`` if ``idempotency_store`` is not set
+        :rtype: IdempotencyStore
+        """
+        path = opts.get(constants.APP_CONFIG_IDEMPOTENCY_STORE)
+        if not path:
+            return None
+
+        return cls(path,
+                   retention=opts.get(constants.APP_CONFIG_IDEMPOTENCY_RETENTION) or constants.DEFAULT_IDEMPOTENCY_RETENTION,
+                   max_entries=opts.get(constants.APP_CONFIG_IDEMPOTENCY_MAX_ENTRIES) or constants.DEFAULT_IDEMPOTENCY_MAX_ENTRIES,
+                   match_inputs=opts.get(constants.APP_CONFIG_IDEMPOTENCY_MATCH_INPUTS, False),
+                   save_failures=opts.get(constants.APP_CONFIG_IDEMPOTENCY_SAVE_FAILURES, False))
+
+    def _get_pending_reply(self, message_id, input_key, oldest):
+        pending = self._pending.get(message_id)
+        if pending and pending[2] >= oldest:
+            return pending[1], "message_id_hits"
+
+        if input_key:
+            matches = [p for p in self._pending.values() if p[0] == input_key and p[2] >= oldest]
+            if matches:
+                return max(matches, key=lambda p: p[2])[1], "input_hits"
+        return None, None
+
+    def get_reply(self, message_id, function_name=None, inputs=None):
+        """
+        Get the reply saved for a message
+
+        :param message_id: the ``message-id`` header of the message
+        :type message_id: str
+        :param function_name: the function of the message. Only used if ``match_inputs`` is set
+        :type function_name: str
+        :param inputs: the inputs of the message. Only used if ``match_inputs`` is set
+        :type inputs: dict
+        :return: the body of the reply, or ``None`` if there is no unexpired reply
+        :rtype: str
+        """
+        oldest = time.time() - self.retention
+        input_key = get_input_key(function_name, inputs) if self.match_inputs and function_name else None
+
+        with self._lock:
+            # a reply is only removed from the pending replies once it is written
+            reply, hit = self._get_pending_reply(message_id, input_key, oldest)
+            if reply is not None:
+                self.stats[hit] += 1
+                return reply
+
+            row = self._conn.execute("SELECT reply FROM replies WHERE message_id = ? AND saved >= ?",
+                                     (message_id, oldest)).fetchone()
+            if row:
+                self.stats["message_id_hits"] += 1
+                return row[0]
+
+            if input_key:
+                row = self._conn.execute("SELECT reply FROM replies WHERE input_key = ? AND saved >= ? ORDER BY saved DESC LIMIT 1",
+                                         (input_key, oldest)).fetchone()
+                if row:
+                    self.stats["input_hits"] += 1
+                    return row[0]
+
+            self.stats["misses"] += 1
+            return None
+
+    def find_reply(self, message_id, function_name, inputs, callback):
+        """
+        Queue a :meth:`get_reply` of a message on the thread of the store, so
+        the read from the database does not block the circuits loop.
+        ``callback`` is called on that thread with the reply, or ``None``
+        if there is no unexpired reply or the read failed
+
+        :param message_id: the ``message-id`` header of the message
+        :type message_id: str
+        :param function_name: the function of the message
+        :type function_name: str
+        :param inputs: the inputs of the message
+        :type inputs: dict
+        :param callback: called with the reply
+        :type callback: function
+        """
+        with self._lock:
+            closed = self._closed
+        if closed:
+            callback(None)
+            return
+        self._queue.put((self._find_reply, (message_id, function_name, inputs, callback)))
+
+    def _find_reply(self, message_id, function_name, inputs, callback):
+        try:
+            reply = self.get_reply(message_id, function_name, inputs)
+        except Exception as err:
+            LOG.error("Failed to read the function reply of %s from %s: %s", message_id, self.path, err)
+            reply = None
+        callback(reply)
+
+    def save_reply(self, message_id, reply, function_name=None, inputs=None, success=True):
+        """
+        Queue the reply sent for a message to be saved
+
+        :param message_id: the ``message-id`` header of the message
+        :type message_id: str
+        :param reply: the body of the reply
+        :type reply: str
+        :param function_name: the function of the message, to save the reply by its inputs too
+        :type function_name: str
+        :param inputs: the inputs of the message
+        :type inputs: dict
+        :param success: if the function succeeded. If not, the reply is only saved if
+            ``save_failures`` is set
+        :type success: bool
+        """
+        if not success and not self.save_failures:
+            return
+
+        input_key = get_input_key(function_name, inputs) if function_name else None
+        pending = (input_key, reply, time.time())
+
+        with self._lock:
+            if self._closed:
+                return
+            self._pending[message_id] = pending
+        self._queue.put((self._write_reply, (message_id, pending)))
+
+    def _write_replies(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                func, args = item
+                func(*args)
+            except Exception as err:
+                LOG.error("Failed to save the function reply of %s in %s: %s", args[0], self.path, err)
+            finally:
+                self._queue.task_done()
+
+    def _write_reply(self, message_id, pending):
+        input_key, reply, saved = pending
+        with self._write_lock:
+            self._write_conn.execute("INSERT OR REPLACE INTO replies (message_id, input_key, reply, saved) VALUES (?, ?, ?, ?)",
+                                     (message_id, input_key, reply, saved))
+            self.stats["saved"] += 1
+            self._saves_since_prune += 1
+            prune = self._saves_since_prune >= PRUNE_INTERVAL
+
+        with self._lock:
+            if self._pending.get(message_id) is pending:
+                del self._pending[message_id]
+
+        if prune:
+            self.prune()
+
+    def flush(self):
+        """ Wait until the queued replies are written """
+        self._queue.join()
+
+    def prune(self):
+        """
+        Remove the replies older than ``retention`` seconds, then the oldest
+        replies past ``max_entries``
+
+        :return: the number of replies removed
+        :rtype: int
+        """
+        with self._write_lock:
+            self._saves_since_prune = 0
+            removed = self._write_conn.execute("DELETE FROM replies WHERE saved < ?",
+                                               (time.time() - self.retention,)).rowcount
+            removed += self._write_conn.execute("DELETE FROM replies WHERE message_id IN "
+                                                "(SELECT message_id FROM replies ORDER BY saved DESC LIMIT -1 OFFSET ?)",
+                                                (self.max_entries,)).rowcount
+            self.stats["pruned"] += removed
+
+        if removed:
+            LOG.debug("Removed %s saved function replies from %s", removed, self.path)
+        return removed
+
+    def __len__(self):
+        """ The number of replies written """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM replies").fetchone()[0]
+
+    def close(self):
+        """ Write the queued replies, then close the database """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+        with self._write_lock:
+            self._write_conn.close()
+        with self._lock:
+            self._conn.close()
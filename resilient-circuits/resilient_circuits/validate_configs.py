@@ -2,8 +2,10 @@
 # -*- coding: utf-8 -*-
 # (c) Copyright IBM Corp. 2010, 2020. All Rights Reserved.
 
-from .constants import (APP_CONFIG_LOG_BACKUP_COUNT, APP_CONFIG_LOG_MAX_BYTES,
-                        MAX_NUM_WORKERS, MIN_BACKUP_COUNT, MIN_LOG_BYTES,
+from .constants import (APP_CONFIG_IDEMPOTENCY_MAX_ENTRIES,
+                        APP_CONFIG_IDEMPOTENCY_RETENTION,
+                        APP_CONFIG_LOG_BACKUP_COUNT, APP_CONFIG_LOG_MAX_BYTES,
+                        APP_CONFIG_LOW_CODE_MAX_CONCURRENCY, MAX_NUM_WORKERS, MIN_BACKUP_COUNT, MIN_LOG_BYTES,
                         MIN_NUM_WORKERS)
 
 """Contains a dict to validate the app configs"""
@@ -19,6 +21,11 @@ VALIDATE_DICT = {
         "valid_condition": lambda c: True if c >= MIN_NUM_WORKERS and c <= MAX_NUM_WORKERS else False,
         "invalid_msg": "stomp_prefetch_limit must be in the range {} <= {}".format(MIN_NUM_WORKERS, MAX_NUM_WORKERS)
     },
+    APP_CONFIG_LOW_CODE_MAX_CONCURRENCY: {
+        "required": False,
+        "valid_condition": lambda c: True if c >= 1 else False,
+        "invalid_msg": "{} must be >= 1".format(APP_CONFIG_LOW_CODE_MAX_CONCURRENCY)
+    },
     APP_CONFIG_LOG_MAX_BYTES: {
         "required": False,
         "valid_condition": lambda c: True if c == 0 or c >= MIN_LOG_BYTES else False,
@@ -28,5 +35,15 @@ VALIDATE_DICT = {
         "required": False,
         "valid_condition": lambda c: True if c >= MIN_BACKUP_COUNT else False,
         "invalid_msg": "{} must be a positive value".format(APP_CONFIG_LOG_BACKUP_COUNT)
+    },
+    APP_CONFIG_IDEMPOTENCY_RETENTION: {
+        "required": False,
+        "valid_condition": lambda c: True if c >= 1 else False,
+        "invalid_msg": "{} must be >= 1".format(APP_CONFIG_IDEMPOTENCY_RETENTION)
+    },
+    APP_CONFIG_IDEMPOTENCY_MAX_ENTRIES: {
+        "required": False,
+        "valid_condition": lambda c: True if c >= 1 else False,
+        "invalid_msg": "{} must be >= 1".format(APP_CONFIG_IDEMPOTENCY_MAX_ENTRIES)
     }
 }
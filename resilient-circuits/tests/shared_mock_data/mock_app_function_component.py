@@ -11,6 +11,8 @@ REQUIRED_APP_CONFIGS = mock_constants.MOCK_REQUIRED_APP_CONFIGS
 
 class AppFunctionMockComponent(AppFunctionComponent):
 
+    cached_calls = 0
+
     def __init__(self, opts, package_name="", required_app_configs=[]):
         if not package_name:
             package_name = PACKAGE_NAME
@@ -35,6 +37,11 @@ class AppFunctionMockComponent(AppFunctionComponent):
     def _app_function_mock_custom_result(self, fn_inputs):
         yield FunctionResult({"custom_key": "custom_value"}, custom_results=True)
 
+    @app_function(mock_constants.MOCK_APP_FN_NAME_CACHED, cache_ttl=60)
+    def _app_function_mock_cached(self, fn_inputs):
+        AppFunctionMockComponent.cached_calls += 1
+        yield FunctionResult({"input_one": fn_inputs.input_one, "calls": AppFunctionMockComponent.cached_calls})
+
     @app_function(mock_constants.MOCK_APP_FN_NAME_EX)
     def _app_function_mock_raise_exception(self, fn_inputs):
         raise IntegrationError(u"mock error message with unicode զ է ը թ ժ ի լ խ")
\ No newline at end of file
@@ -26,9 +26,12 @@ MOCK_APP_FUNCTION_PREFIX = "app_function_mock"
 MOCK_APP_FN_NAME_ONE = u"{0}_{1}".format(MOCK_APP_FUNCTION_PREFIX, "one")
 MOCK_APP_FN_NAME_CUSTOM_RESULT = u"{0}_{1}".format(MOCK_APP_FUNCTION_PREFIX, "custom_result")
 MOCK_APP_FN_NAME_EX = u"{0}_{1}".format(MOCK_APP_FUNCTION_PREFIX, "raise_exception")
+MOCK_APP_FN_NAME_CACHED = u"{0}_{1}".format(MOCK_APP_FUNCTION_PREFIX, "cached")
 
 MOCK_LOW_CODEAPP_FUNCTION_PREFIX = "low_code_mock"
 MOCK_LOW_CODE_APP_FN_NAME_EX = u"{0}_{1}".format(MOCK_LOW_CODEAPP_FUNCTION_PREFIX, "raise_exception")
+MOCK_LOW_CODE_ASYNC_APP_FN_NAME = u"{0}_{1}".format(MOCK_LOW_CODEAPP_FUNCTION_PREFIX, "async")
+MOCK_LOW_CODE_ASYNC_APP_FN_NAME_EX = u"{0}_{1}".format(MOCK_LOW_CODEAPP_FUNCTION_PREFIX, "async_raise_exception")
 
 RESILIENT_MOCK = u"pytest_resilient_circuits.BasicResilientMockNoRegisterLog"
 
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*
 
+import asyncio
+import threading
+
 from resilient_circuits import (AppFunctionComponent, LowCodeResult, low_code_function)
 from resilient_lib import IntegrationError
 from tests import mock_constants
@@ -33,4 +36,17 @@ class LowCodeMockComponent(AppFunctionComponent):
     @low_code_function(mock_constants.MOCK_LOW_CODE_APP_FN_NAME_EX)
     def _app_function_mock_raise_exception(self, low_code_request):
         raise IntegrationError(u"mock error message with unicode զ է ը թ ժ ի լ խ")
-    
\ No newline at end of file
+    
+    @low_code_function(mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME)
+    async def _low_code_function_mock_async(self, low_code_request):
+        yield self.status_message(u"Mock async StatusMessage")
+        await asyncio.sleep(0)
+        fn_msg = self.get_fn_msg()
+        yield LowCodeResult({"status_code": 200, "content": {"thread": threading.current_thread().name,
+                                                             "server_url": low_code_request.get("server_url"),
+                                                             "request_uuid": fn_msg.get("request_originator", {}).get("request_uuid")}})
+
+    @low_code_function(mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME_EX)
+    async def _low_code_function_mock_async_raise_exception(self, low_code_request):
+        await asyncio.sleep(0)
+        raise IntegrationError(u"mock async error message")
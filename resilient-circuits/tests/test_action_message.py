@@ -2,8 +2,10 @@
 # -*- coding: utf-8 -*-
 # (c) Copyright IBM Corp. 2010, 2021. All Rights Reserved.
 
+from datetime import datetime, timezone
+
 import pytest
-from resilient_circuits.action_message import ActionMessageBase, InboundMessage, FunctionResult
+from resilient_circuits.action_message import ActionMessageBase, FunctionMessage, InboundMessage, FunctionResult
 from tests import mock_constants
 
 
@@ -54,3 +56,15 @@ class TestInboundMessage:
     def test_queue_not_tuple(self):
         with pytest.raises(AssertionError):
             InboundMessage(queue="no queue")
+
+
+class TestFunctionMessage:
+
+    def test_timestamp(self):
+        mock_event = FunctionMessage(headers={"timestamp": "1700000000000"}, message={"function": {"name": "mock_fn"}})
+        assert mock_event.timestamp == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+        assert "2023-11-14" in repr(mock_event)
+
+    def test_no_timestamp(self):
+        mock_event = FunctionMessage(headers={}, message={"function": {"name": "mock_fn"}})
+        assert mock_event.timestamp is None
@@ -2,10 +2,15 @@
 # -*- coding: utf-8 -*-
 # (c) Copyright IBM Corp. 2010, 2021. All Rights Reserved.
 
+import asyncio
+import threading
+import time
+
 import pytest
 from mock import patch
 from resilient_circuits import helpers, SubmitTestFunction
-from resilient_circuits.actions_component import Actions
+from resilient_circuits import FunctionResult
+from resilient_circuits.actions_component import Actions, AsyncFunctionWorker, _is_success
 from resilient_circuits.stomp_events import HeartbeatTimeout
 from resilient_circuits.constants import LOW_CODE_MSG_DEST_PREFIX, SUBSCRIBE_DTO, REST_REQUEST_DTO
 from resilient_lib import IntegrationError
@@ -97,3 +102,101 @@ def test_on_stomp_message(circuits_app, fx_simple_client, caplog, message_header
 
         for l in expected_log:
             assert l in caplog.text
+
+
+def test_async_function_worker_max_concurrency():
+    worker = AsyncFunctionWorker(max_concurrency=2)
+    worker._start_loop()
+
+    running = []
+    max_running = []
+
+    async def mock_io(i):
+        running.append(i)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(i)
+        return i
+
+    try:
+        futures = [asyncio.run_coroutine_threadsafe(worker._run(mock_io, i), worker.loop) for i in range(10)]
+        assert [f.result(timeout=5) for f in futures] == list(range(10))
+        assert max(max_running) == 2
+    finally:
+        worker.stop_loop()
+
+    assert worker.loop is None
+    assert not worker._thread.is_alive()
+
+
+def test_async_function_worker_executor_max_concurrency():
+    # blocking calls of async functions get as many threads as tasks can run at once
+    worker = AsyncFunctionWorker(max_concurrency=50)
+    worker._start_loop()
+
+    def mock_blocking_io(i):
+        time.sleep(0.2)
+        return threading.current_thread().name
+
+    async def mock_io(i):
+        return await asyncio.get_running_loop().run_in_executor(None, mock_blocking_io, i)
+
+    try:
+        start = time.time()
+        futures = [asyncio.run_coroutine_threadsafe(worker._run(mock_io, i), worker.loop) for i in range(50)]
+        names = [f.result(timeout=5) for f in futures]
+        assert time.time() - start < 1
+        assert all(name.startswith("AsyncFunctionWorker") for name in names)
+    finally:
+        worker.stop_loop()
+
+
+@patch("resilient_circuits.actions_component.helpers.get_fn_names", new=lambda x: [])
+def test_on_stomp_message_saved_reply(circuits_app, fx_simple_client, tmpdir):
+    mock_configs = helpers.get_configs(path_config_file=mock_paths.MOCK_APP_CONFIG)
+    mock_configs["idempotency_store"] = tmpdir.join("replies.db").strpath
+    with patch("resilient_circuits.actions_component.ResilientComponent.rest_client") as mock_client:
+        mock_client.return_value = fx_simple_client[0]
+        mock_actions_cmp = Actions(opts=mock_configs)
+
+    fired = []
+
+    def mock_fire(event, *channels):
+        fired.append((event, threading.current_thread().name))
+    mock_actions_cmp.fire = mock_fire
+
+    message = json.dumps({"function": {"name": "mock_function"}, "inputs": {"mock_input": 1}})
+    message_headers = {"message-id": "ID:1", "correlation-id": "invid:1", "reply-to": "/queue/acks.202.mock_queue"}
+    evt = Event("Message")
+    evt.frame = Frame(cmd="MESSAGE", headers=message_headers, body=message)
+
+    def mock_deliver():
+        # the store is read on its own thread, which fires saved_reply back to the loop
+        del fired[:]
+        mock_actions_cmp.on_stomp_message(evt, message_headers, message, ["actions", "202", "mock_queue"])
+        mock_actions_cmp._idempotency_store.flush()
+        assert [(e.name, name) for e, name in fired] == [("saved_reply", "IdempotencyStore")]
+        saved_reply = fired.pop()[0]
+        mock_actions_cmp._on_saved_reply(*saved_reply.args)
+        return [e for e, name in fired]
+
+    # not run before, so the FunctionMessage is fired
+    assert [type(e).__name__ for e in mock_deliver()] == ["FunctionMessage"]
+
+    # re-delivered after it ran, so the saved reply is sent instead
+    mock_actions_cmp._idempotency_store.save_reply("ID:1", '{"complete": true}', "mock_function", {"mock_input": 1})
+    mock_actions_cmp._current_msgs_processing.clear()
+    events = mock_deliver()
+    assert [type(e).__name__ for e in events] == ["Ack", "Send"]
+    assert events[1].kwargs["body"] == '{"complete": true}'
+    assert events[1].kwargs["destination"] == "/queue/acks.202.mock_queue"
+    assert "ID:1" not in mock_actions_cmp._current_msgs_processing
+    mock_actions_cmp._idempotency_store.close()
+
+
+def test_is_success():
+    assert _is_success(None)
+    assert _is_success(FunctionResult({"success": True}))
+    assert _is_success(FunctionResult({"value": 1}))
+    assert not _is_success(FunctionResult({"success": False}))
+    assert not _is_success(FunctionResult({}, success=False))
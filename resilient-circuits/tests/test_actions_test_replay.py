@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+import json
+import os
+import socket
+import struct
+import threading
+
+import pytest
+from resilient_circuits.actions_test_component import (ResilientTestActions,
+                                                       SubmitTestAction,
+                                                       SubmitTestLowCodeApp)
+from resilient_circuits.actions_test_replay import (ActionReplay,
+                                                    ReplayMessage, ReplayStats,
+                                                    load_replay_messages)
+
+FUNCTION_MESSAGE = {"function": {"name": "fn_mock"}, "inputs": {"input_one": "a"}}
+ACTION_MESSAGE = {"action_id": 10, "object_type": "incident"}
+LOW_CODE_MESSAGE = {"request_originator": {"function_programmatic_name": "getUser"}, "request_payload": {"method": "GET"}}
+
+
+def _frame(msg_id, text):
+    data = struct.pack(">I", msg_id) + text.encode("utf-8")
+    return struct.pack(">I", len(data)) + data
+
+
+class MockTestServer(threading.Thread):
+    """ answers messages like ResilientTestActions does, failing those for fn_fail """
+
+    def __init__(self):
+        super(MockTestServer, self).__init__(daemon=True)
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+
+    def _reply(self, conn, text):
+        data = text.encode("utf-8")
+        conn.sendall(struct.pack(">I", len(data)) + data)
+
+    def run(self):
+        conn, _ = self.server.accept()
+        buffer = b""
+        while True:
+            data = conn.recv(65536)
+            if not data:
+                break
+            buffer += data
+            while len(buffer) >= 4 and len(buffer) >= struct.unpack(">I", buffer[:4])[0] + 4:
+                size = struct.unpack(">I", buffer[:4])[0]
+                msg_id = struct.unpack(">I", buffer[4:8])[0]
+                queue, message = buffer[8:size + 4].decode("utf-8").strip().split(" ", 1)
+                buffer = buffer[size + 4:]
+
+                self._reply(conn, "Action Submitted<action %d>" % msg_id)
+                if json.loads(message)["function"]["name"] == "fn_fail":
+                    self._reply(conn, "RESPONSE<action %d>: %s" % (msg_id, json.dumps({"message_type": 1, "message": "mock error", "complete": True})))
+                else:
+                    self._reply(conn, "RESPONSE<action %d>: %s" % (msg_id, json.dumps({"message_type": 0, "message": "Running", "complete": False})))
+                    self._reply(conn, "RESPONSE<action %d>: %s" % (msg_id, json.dumps({"message_type": 0, "message": "Completed", "complete": True})))
+        conn.close()
+
+
+def test_load_replay_messages_records(tmpdir):
+    path = os.path.join(tmpdir.strpath, "messages.json")
+    with open(path, "w") as f:
+        json.dump([FUNCTION_MESSAGE,
+                   {"queue": "my_queue", "message": ACTION_MESSAGE},
+                   {"queue": "connectors.201.my_queue", "message": LOW_CODE_MESSAGE}], f)
+
+    messages = load_replay_messages(path)
+    assert [(m.queue, m.label) for m in messages] == [("replay", "fn_mock"),
+                                                      ("my_queue", "actions.my_queue"),
+                                                      ("connectors.201.my_queue", "getUser")]
+    assert json.loads(messages[0].message) == FUNCTION_MESSAGE
+
+
+def test_load_replay_messages_json_lines(tmpdir):
+    path = os.path.join(tmpdir.strpath, "messages.jsonl")
+    with open(path, "w") as f:
+        f.write(json.dumps(FUNCTION_MESSAGE) + "\n\n" + json.dumps(ACTION_MESSAGE) + "\n")
+
+    messages = load_replay_messages(path, queue="default_queue")
+    assert [m.label for m in messages] == ["fn_mock", "actions.default_queue"]
+
+
+def test_load_replay_messages_logged_directory(tmpdir):
+    # files as written by ActionMessageBase._log_message
+    for i, fn_name in enumerate(("fn_b", "fn_a")):
+        path = os.path.join(tmpdir.strpath, "FunctionMessage_{0}_2025-01-01T00-00-0{1}".format(fn_name, i))
+        with open(path, "w") as f:
+            json.dump({"function": {"name": fn_name}, "inputs": {}}, f, indent=2)
+        os.utime(path, (1000 + i, 1000 + i))
+
+    assert [m.label for m in load_replay_messages(tmpdir.strpath)] == ["fn_b", "fn_a"]
+
+
+def test_load_replay_messages_no_queue(tmpdir):
+    path = os.path.join(tmpdir.strpath, "messages.json")
+    with open(path, "w") as f:
+        json.dump(ACTION_MESSAGE, f)
+
+    with pytest.raises(ValueError, match="No queue"):
+        load_replay_messages(path)
+
+
+def test_replay_stats():
+    stats = ReplayStats()
+    for latency in range(1, 101):
+        stats.add("fn_mock", latency / 1000.0)
+    stats.add("fn_fail", 0.5, error="mock error")
+    stats.add_timeout("fn_slow")
+
+    summary = stats.summarize()
+    assert summary["fn_mock"]["count"] == 100
+    assert summary["fn_mock"]["p50_ms"] == pytest.approx(50)
+    assert summary["fn_mock"]["p99_ms"] == pytest.approx(99)
+    assert summary["fn_fail"]["errors"] == 1
+    assert summary["fn_slow"] == {"count": 0, "errors": 0, "timeouts": 1}
+    assert stats.error_samples == {"fn_fail": "mock error"}
+
+
+def test_replay():
+    server = MockTestServer()
+    server.start()
+
+    messages = [ReplayMessage("replay", json.dumps({"function": {"name": name}}), name)
+                for name in ["fn_mock"] * 20 + ["fn_fail"] * 5]
+
+    stats = ActionReplay("127.0.0.1", server.port, messages, concurrency=4, timeout=5).run()
+
+    assert stats.sent == 25
+    summary = stats.summarize()
+    assert summary["fn_mock"]["count"] == 20
+    assert summary["fn_mock"]["errors"] == 0
+    assert summary["fn_fail"]["errors"] == 5
+    assert sum(s["timeouts"] for s in summary.values()) == 0
+
+
+def test_process_data_split_and_batched_messages():
+    test_actions = ResilientTestActions(201, port=0)
+    fired = []
+    test_actions.fire = lambda event, *channels: fired.append(event)
+
+    data = (_frame(1, "my_queue " + json.dumps(ACTION_MESSAGE) + "\n") +
+            _frame(2, "connectors.201.my_queue " + json.dumps(LOW_CODE_MESSAGE) + "\n") +
+            _frame(3, "my_queue " + json.dumps(FUNCTION_MESSAGE) + "\n"))
+
+    # several messages in one read, and messages split across reads
+    test_actions.process_data("sock", data[:10])
+    test_actions.process_data("sock", data[10:-3])
+    assert len(fired) == 2
+    test_actions.process_data("sock", data[-3:])
+
+    assert [type(event) for event in fired] == [SubmitTestAction, SubmitTestLowCodeApp, SubmitTestAction]
+    assert fired[1].kwargs["msg_id"] == 2
+    assert fired[1].kwargs["queue_name"] == "connectors.201.my_queue"
+    assert not test_actions.messages_in_progress
+
+    test_actions.test_response(1, json.dumps({"message_type": 0, "complete": True}))
+    assert 1 not in test_actions.actions_sent
+    assert 3 in test_actions.actions_sent
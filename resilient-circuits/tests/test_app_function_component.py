@@ -44,6 +44,17 @@ def test_basic_instantiation_rc_without_session(circuits_app):
     assert isinstance(mock_cmp.rc, RequestsCommonWithoutSession)
     assert mock_cmp.app_configs.url == "https://www.mockexample.com"
     assert mock_cmp.options == mock_cmp._app_configs_as_dict
+    assert mock_cmp.include_extended_metrics is False
+
+def test_basic_instantiation_include_extended_metrics(circuits_app):
+    opts = AppConfigManager(mock_constants.MOCK_OPTS)
+    opts[constants.APP_CONFIG_INCLUDE_EXTENDED_METRICS] = "True"
+    mock_cmp = AppFunctionMockComponent(
+        opts=opts,
+        package_name=mock_constants.MOCK_PACKAGE_NAME,
+        required_app_configs=mock_constants.MOCK_REQUIRED_APP_CONFIGS)
+
+    assert mock_cmp.include_extended_metrics is True
 
 
 def test_status_message(circuits_app):
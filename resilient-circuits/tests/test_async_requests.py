@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+import asyncio
+
+from mock import MagicMock, patch
+from resilient_circuits import async_requests
+from resilient_circuits.async_requests import AsyncResponse, execute_async
+
+
+def mock_rc():
+    rc = MagicMock()
+    rc.get_proxies.return_value = None
+    rc.get_timeout.return_value = 30
+    rc.get_verify.return_value = True
+
+    def mock_execute(method, url, callback=None, **kwargs):
+        response = MagicMock(status_code=201, headers={"Content-Type": "application/json"},
+                             content=b'{"malware": true}', url=url, reason="Created")
+        return callback(response)
+
+    rc.execute.side_effect = mock_execute
+    return rc
+
+
+def test_async_response():
+    response = AsyncResponse(404, {}, u"not found զ".encode("utf-8"))
+    assert response.ok is False
+    assert response.text == u"not found զ"
+
+    assert AsyncResponse(200, {}, b'{"a": 1}').json() == {"a": 1}
+    assert AsyncResponse(200, {}, b"").text == u""
+
+
+@patch.object(async_requests, "aiohttp", new=None)
+def test_execute_async_without_aiohttp():
+    rc = mock_rc()
+
+    response = asyncio.run(execute_async(rc, "post", "https://example.com/api", json={"a": 1}))
+
+    assert isinstance(response, AsyncResponse)
+    assert response.status_code == 201
+    assert response.json() == {"malware": True}
+
+    args, kwargs = rc.execute.call_args
+    assert args == ("POST", "https://example.com/api")
+    assert kwargs["timeout"] == 30
+    assert kwargs["verify"] is True
+    assert kwargs["json"] == {"a": 1}
+
+
+@patch.object(async_requests, "aiohttp", new=None)
+def test_execute_async_without_aiohttp_explicit_settings():
+    rc = mock_rc()
+
+    asyncio.run(execute_async(rc, "GET", "https://example.com/api", timeout=5, verify=False,
+                              proxies={"https": "https://proxy:3128"}))
+
+    rc.get_timeout.assert_not_called()
+    rc.get_verify.assert_not_called()
+    rc.get_proxies.assert_not_called()
+    kwargs = rc.execute.call_args[1]
+    assert kwargs["timeout"] == 5
+    assert kwargs["verify"] is False
+    assert kwargs["proxies"] == {"https": "https://proxy:3128"}
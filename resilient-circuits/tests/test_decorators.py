@@ -2,11 +2,18 @@
 # -*- coding: utf-8 -*-
 # (c) Copyright IBM Corp. 2010, 2022. All Rights Reserved.
 
+import asyncio
 import logging
 import os
+import threading
+import time
+from types import SimpleNamespace
+
 import pytest
+from circuits import Component, Event, Manager
 from resilient_circuits import (ResilientComponent, app_function, constants,
-                                inbound_app, LowCodeResult)
+                                inbound_app, LowCodeResult, SubmitTestLowCodeApp, decorators,
+                                debounce, handler)
 from resilient_circuits.action_message import FunctionException_
 from resilient_lib import IntegrationError
 
@@ -112,11 +119,71 @@ class TestLowCodeFunctionDecorator:
         mock_results = mock_result_obj.value
         assert mock_results["content"]["malware"] is True
 
+    def test_async_low_code_app_mock_runs_on_event_loop(self, circuits_app):
+        """
+        An async low code function runs on the AsyncFunctionWorker and
+        returns the same LowCodePayload results as a regular one
+        """
+        LowCodeMockComponent(opts=mock_constants.MOCK_OPTS).register(circuits_app.app.component_loader)
+        mock_result_obj = helpers.call_low_code_function(circuits_app, mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME)[1][0]
+
+        assert mock_result_obj.name == mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME
+        assert mock_result_obj.success is True
+
+        mock_results = mock_result_obj.value
+        assert mock_results["status_code"] == 200
+        assert mock_results["content"]["thread"] == "AsyncFunctionWorker"
+        assert mock_results["content"]["server_url"] == "https://petstore.swagger.io/v2/user/createWithList"
+        assert mock_results["content"]["request_uuid"]
+        assert mock_results["metrics"]["version"] == "2.0"
+
     def test_low_code_app_mock_handles_Exception(self, circuits_app):
         LowCodeMockComponent(opts=mock_constants.MOCK_OPTS).register(circuits_app.app.component_loader)
         with pytest.raises(IntegrationError, match=r"mock error message with unicode"):
             helpers.call_low_code_function(circuits_app, mock_constants.MOCK_LOW_CODE_APP_FN_NAME_EX)
 
+    def test_async_low_code_app_mock_handles_Exception(self, circuits_app):
+        # invoke directly on a new event loop, as exceptions from other tests can still be queued in circuits_app
+        component = LowCodeMockComponent(opts=mock_constants.MOCK_OPTS)
+        message = SubmitTestLowCodeApp(mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME_EX).kwargs["message"]
+        evt = SimpleNamespace(name=mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME_EX, message=message)
+        the_function = LowCodeMockComponent._low_code_function_mock_async_raise_exception.__wrapped__
+
+        with pytest.raises(IntegrationError, match=r"mock async error message"):
+            asyncio.run(decorators._ainvoke_low_code_function(evt, component, the_function, **evt.message))
+
+    def test_async_low_code_extended_metrics(self, circuits_app):
+        # the event loop thread is shared, so the CPU time of an async function is not included
+        component = LowCodeMockComponent(opts=mock_constants.MOCK_OPTS)
+        component.include_extended_metrics = True
+        message = SubmitTestLowCodeApp(mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME).kwargs["message"]
+        evt = SimpleNamespace(name=mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME, message=message, received_time=time.monotonic())
+        the_function = LowCodeMockComponent._low_code_function_mock_async.__wrapped__
+
+        results = asyncio.run(decorators._ainvoke_low_code_function(evt, component, the_function, **evt.message))
+        metrics = results[0].value["metrics"]
+        assert metrics["queue_wait_ms"] >= 0
+        assert "cpu_time_ms" not in metrics
+
+    def test_async_low_code_secrets_off_event_loop(self, circuits_app, monkeypatch):
+        # substituting secrets can block on a PAM, so it is not done on the event loop thread
+        sub_threads = []
+        sub_secrets = decorators.helpers.sub_fn_inputs_from_protected_secrets
+
+        def mock_sub_secrets(fn_inputs, opts):
+            sub_threads.append(threading.current_thread())
+            return sub_secrets(fn_inputs, opts)
+
+        monkeypatch.setattr(decorators.helpers, "sub_fn_inputs_from_protected_secrets", mock_sub_secrets)
+        component = LowCodeMockComponent(opts=mock_constants.MOCK_OPTS)
+        message = SubmitTestLowCodeApp(mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME).kwargs["message"]
+        evt = SimpleNamespace(name=mock_constants.MOCK_LOW_CODE_ASYNC_APP_FN_NAME, message=message)
+        the_function = LowCodeMockComponent._low_code_function_mock_async.__wrapped__
+
+        results = asyncio.run(decorators._ainvoke_low_code_function(evt, component, the_function, **evt.message))
+        assert results[0].value["content"]["server_url"] == "https://petstore.swagger.io/v2/user/createWithList"
+        assert sub_threads and threading.current_thread() not in sub_threads
+
 
 class TestAppFunctionDecorator:
 
@@ -161,6 +228,14 @@ class TestAppFunctionDecorator:
         assert secret_value not in caplog.text # secret, if found, should never be logged
         assert mock_results["content"]["malware"] is True
 
+    def test_metrics(self, circuits_app):
+        AppFunctionMockComponent(opts=mock_constants.MOCK_OPTS).register(circuits_app.app.component_loader)
+        mock_results = helpers.call_app_function(mock_constants.MOCK_APP_FN_NAME_ONE, {"input_one": "abc"}, circuits_app)
+
+        assert mock_results["metrics"]["execution_time_ms"] >= 0
+        assert "queue_wait_ms" not in mock_results["metrics"]
+        assert "cpu_time_ms" not in mock_results["metrics"]
+
     def test_handles_StatusMessage(self, circuits_app):
         AppFunctionMockComponent(opts=mock_constants.MOCK_OPTS).register(circuits_app.app.component_loader)
         mock_status_message = helpers.call_app_function(mock_constants.MOCK_APP_FN_NAME_ONE, {"input_one": "abc"}, circuits_app, status_message_only=True)
@@ -200,3 +275,127 @@ def test_app_custom_result_True(circuits_app):
     AppFunctionMockComponent(opts=mock_constants.MOCK_OPTS).register(circuits_app.app)
     results = helpers.call_app_function(mock_constants.MOCK_APP_FN_NAME_CUSTOM_RESULT, {"input_one": "abc"}, circuits_app)
     assert results.get("custom_key", "") == "custom_value"
+
+
+def test_app_function_cache_ttl(circuits_app):
+    AppFunctionMockComponent(opts=mock_constants.MOCK_OPTS).register(circuits_app.app)
+    cache = AppFunctionMockComponent._app_function_mock_cached.cache
+    calls = AppFunctionMockComponent.cached_calls
+
+    results = [helpers.call_app_function(mock_constants.MOCK_APP_FN_NAME_CACHED, {"input_one": input_one}, circuits_app)
+               for input_one in ("abc", "abc", "def", "abc")]
+
+    assert AppFunctionMockComponent.cached_calls == calls + 2
+    assert [r["content"]["input_one"] for r in results] == ["abc", "abc", "def", "abc"]
+    assert results[1]["content"] == results[0]["content"] == results[3]["content"]
+    # each call gets its own payload around the cached content
+    assert results[1]["inputs"] == {"input_one": "abc"}
+    assert results[1]["metrics"]["execution_time_ms"] >= 0
+    assert cache.stats["hits"] >= 2
+    assert cache.cache_info()["size"] >= 2
+
+
+class MockDebounceEvent(Event):
+    def __init__(self, incident_id, number):
+        super(MockDebounceEvent, self).__init__(number=number)
+        self.name = "mock_debounce_event"
+        self.message = {"incident": {"id": incident_id}}
+        self.deferred = False
+
+
+class MockDebounceComponent(Component):
+    def __init__(self):
+        super(MockDebounceComponent, self).__init__()
+        self.handled = []
+
+    @debounce(delay=0.2)
+    @handler("mock_debounce_event")
+    def _handle(self, event, *args, **kwargs):
+        self.handled.append((event.message["incident"]["id"], kwargs["number"]))
+
+
+class MockDebounceDiscardComponent(Component):
+    def __init__(self):
+        super(MockDebounceDiscardComponent, self).__init__()
+        self.handled = []
+
+    @debounce(delay=0.2, discard=True)
+    @handler("mock_debounce_event")
+    def _handle(self, event, *args, **kwargs):
+        self.handled.append((event.message["incident"]["id"], kwargs["number"]))
+
+
+class TestDebounceDecorator:
+
+    def test_queue_resets_deadline(self):
+        queue = decorators.DebounceQueue(delay=1)
+        queue.add("key", "event_1", now=0)
+        queue.add("key", "event_2", now=0.5)
+        queue.add("other_key", "event_3", now=0.2)
+
+        assert queue.pop_due(1.1) == []
+        assert queue.pop_due(1.2) == ["event_3"]
+        assert queue.pop_due(1.5) == ["event_1", "event_2"]
+        assert len(queue) == 0
+        assert queue.next_due() is None
+
+    def test_queue_one_heap_entry_per_key(self):
+        queue = decorators.DebounceQueue(delay=1)
+        for i in range(1000):
+            queue.add("key", i, now=i / 1000.0)
+        assert len(queue._heap) == 1
+        assert queue.pop_due(1.5) == []
+        assert len(queue._heap) == 1
+        assert len(queue.pop_due(2)) == 1000
+
+    def test_queue_discard(self):
+        queue = decorators.DebounceQueue(delay=1, discard=True)
+        assert queue.add("key", "event_1", now=0) == ([], [])
+        assert queue.add("key", "event_2", now=0.5) == (["event_1"], [])
+        assert queue.pop_due(2) == ["event_2"]
+        assert queue.stats["discarded"] == 1
+
+    def test_queue_max_keys(self):
+        queue = decorators.DebounceQueue(delay=1, max_keys=2)
+        queue.add("key_1", "event_1", now=0)
+        queue.add("key_2", "event_2", now=0.1)
+        # key_1 is due first, so it is released to make room for key_3
+        assert queue.add("key_3", "event_3", now=0.2) == ([], ["event_1"])
+        assert len(queue) == 2
+        assert "key_1" not in queue
+        assert queue.stats["evicted"] == 1
+        assert queue.stats["peak_keys"] == 2
+
+    def test_debounce(self):
+        manager = Manager()
+        component = MockDebounceComponent().register(manager)
+        manager.start()
+        try:
+            for number in range(5):
+                manager.fire(MockDebounceEvent(100, number))
+                manager.fire(MockDebounceEvent(number, number))
+            time.sleep(0.05)
+            assert component.handled == []
+
+            time.sleep(0.5)
+            assert sorted(component.handled) == sorted([(100, number) for number in range(5)] + [(number, number) for number in range(5)])
+            # the events for one key are handled in the order they arrived
+            assert [number for incident_id, number in component.handled if incident_id == 100] == list(range(5))
+            assert MockDebounceComponent._handle.debounce.stats["deferred"] == 10
+        finally:
+            manager.stop()
+
+    def test_debounce_discard(self):
+        manager = Manager()
+        component = MockDebounceDiscardComponent().register(manager)
+        manager.start()
+        try:
+            for number in range(5):
+                manager.fire(MockDebounceEvent(100, number))
+                time.sleep(0.01)
+            time.sleep(0.5)
+            # only the most recent event is handled
+            assert component.handled == [(100, 4)]
+            assert MockDebounceDiscardComponent._handle.debounce.stats["discarded"] == 4
+        finally:
+            manager.stop()
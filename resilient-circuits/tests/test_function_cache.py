@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+import os
+import threading
+import time
+
+import pytest
+from resilient_circuits import FunctionResult, StatusMessage
+from resilient_circuits.function_cache import (DiskFunctionCache,
+                                               FunctionCache,
+                                               MemoryFunctionCache,
+                                               get_function_cache)
+
+
+class MockFunction(object):
+    """ a function that yields a status message and a result, counting its calls """
+
+    def __init__(self, success=True, delay=0):
+        self.calls = 0
+        self.success = success
+        self.delay = delay
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        yield StatusMessage("running")
+        yield FunctionResult({"calls": self.calls}, success=self.success)
+
+
+def _results(cache, key, fn):
+    return [r for r in cache.results(key, fn) if isinstance(r, FunctionResult)]
+
+
+def test_get_function_cache(tmpdir):
+    assert isinstance(get_function_cache("fn_mock", 60), MemoryFunctionCache)
+    cache = get_function_cache("fn_mock", 60, path=os.path.join(tmpdir.strpath, "cache", "results.db"))
+    assert isinstance(cache, DiskFunctionCache)
+    assert cache.maxsize == 1000
+    assert cache.wait_timeout == 600
+    # the database is not opened until the function is called
+    assert not os.path.exists(cache.path)
+
+    with pytest.raises(TypeError):
+        FunctionCache("fn_mock", 60)
+
+
+def test_memory_cache():
+    cache = MemoryFunctionCache("fn_mock", ttl=60, maxsize=2)
+    fn = MockFunction()
+
+    assert _results(cache, "a", fn)[0].value == {"calls": 1}
+    # the cached results do not have the status messages
+    assert [type(r) for r in cache.results("a", fn)] == [FunctionResult]
+    assert _results(cache, "b", fn)[0].value == {"calls": 2}
+    _results(cache, "c", fn)
+
+    assert fn.calls == 3
+    assert cache.cache_info() == {"hits": 1, "misses": 3, "coalesced": 0, "hit_ratio": 0.25, "size": 2}
+
+
+def test_cached_results_are_copies():
+    cache = MemoryFunctionCache("fn_mock", ttl=60)
+    _results(cache, "a", MockFunction())[0].value["calls"] = 100
+    first = _results(cache, "a", MockFunction())[0]
+    first.value["calls"] = 200
+    assert _results(cache, "a", MockFunction())[0].value == {"calls": 1}
+
+
+def test_failures_are_not_cached():
+    cache = MemoryFunctionCache("fn_mock", ttl=60)
+    fn = MockFunction(success=False)
+    _results(cache, "a", fn)
+    _results(cache, "a", fn)
+    assert fn.calls == 2
+
+    def raises():
+        yield StatusMessage("running")
+        raise ValueError("mock error")
+
+    with pytest.raises(ValueError):
+        list(cache.results("b", raises))
+    assert len(cache) == 0
+    assert not cache._running
+
+
+def test_coalesced_calls():
+    cache = MemoryFunctionCache("fn_mock", ttl=60)
+    fn = MockFunction(delay=0.2)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(_results(cache, "a", fn)[0].value)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fn.calls == 1
+    assert results == [{"calls": 1}] * 5
+    assert cache.stats["coalesced"] == 4
+
+
+def test_coalesced_call_wait_timeout():
+    cache = MemoryFunctionCache("fn_mock", ttl=60, wait_timeout=0.1)
+    fn = MockFunction(delay=0.5)
+    results = []
+
+    first = threading.Thread(target=lambda: results.append(_results(cache, "a", fn)[0].value))
+    first.start()
+    time.sleep(0.05)
+    # the running call takes too long, so this one runs the function too
+    results.append(_results(cache, "a", MockFunction())[0].value)
+    first.join()
+
+    assert results == [{"calls": 1}, {"calls": 1}]
+    assert fn.calls == 1
+    assert cache.stats["coalesced"] == 1
+    assert cache.stats["wait_timeouts"] == 1
+
+
+def test_disk_cache(tmpdir):
+    path = os.path.join(tmpdir.strpath, "results.db")
+    fn = MockFunction()
+    _results(DiskFunctionCache("fn_mock", 60, path=path), "a", fn)
+
+    # still cached when opened again, like after a restart, but only for the same function
+    assert _results(DiskFunctionCache("fn_mock", 60, path=path), "a", fn)[0].value == {"calls": 1}
+    assert _results(DiskFunctionCache("fn_other", 60, path=path), "a", fn)[0].value == {"calls": 2}
+    assert fn.calls == 2
+
+    cache = DiskFunctionCache("fn_mock", 60, maxsize=2, path=path)
+    for key in "bcd":
+        _results(cache, key, fn)
+    assert len(cache) == 2
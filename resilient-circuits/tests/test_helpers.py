@@ -2,12 +2,13 @@
 # -*- coding: utf-8 -*-
 # (c) Copyright IBM Corp. 2010, 2022. All Rights Reserved.
 
+import json
 import os
 import time
 
 from mock import patch
 import pytest
-from importlib.metadata import distributions
+from importlib.metadata import EntryPoint, EntryPoints, distributions
 from resilient_app_config_plugins.plugin_base import PAMPluginInterface
 from resilient_circuits import ResilientComponent, constants, function, helpers
 from resilient_circuits.stomp_events import HeartbeatTimeout
@@ -172,6 +173,26 @@ def test_get_queue(caplog):
         assert "Could not get queue name from destination: '{}'".format(queue_name) in caplog.text
 
 
+def test_load_message_body():
+    message = {"inputs": {"text": u"unicode: ล ฦ ว 😀"}}
+    assert helpers.load_message_body(json.dumps(message, ensure_ascii=False).encode("utf-8")) == message
+    assert helpers.load_message_body(json.dumps(message, ensure_ascii=False)) == message
+    assert helpers.load_message_body(bytearray(json.dumps(message).encode("utf-8"))) == message
+
+
+def test_load_message_body_surrogate_pair():
+    # 😀 as a surrogate pair, each half encoded as UTF-8, which the strict decoder does not allow
+    body = u'{"text": "\ud83d\ude00"}'.encode("utf-8", "surrogatepass")
+    with pytest.raises(UnicodeDecodeError):
+        body.decode("utf-8")
+    assert helpers.load_message_body(body) == {"text": u"😀"}
+
+
+def test_load_message_body_not_json():
+    with pytest.raises(ValueError):
+        helpers.load_message_body(b"not json")
+
+
 class TestIsASelftestActionsComponent:
     @pytest.mark.parametrize("circuits_app", [{"IS_SELFTEST": True}], indirect=True)
     def test_is_this_a_selftest_action_component(self, circuits_app):
@@ -305,3 +326,67 @@ def test_sub_fn_inputs_from_protected_secrets(fx_reset_environmental_variables):
     }
     assert fn_inputs != subbed_inputs # assert not modified original object
 
+
+
+
+def test_sub_fn_inputs_from_protected_secrets_no_secrets():
+    fn_inputs = {
+        "fn_test_app_input_1": "Normal",
+        "fn_test_app_input_2": "No secret markers here",
+        "multiselect": ["A", "B"],
+        "number": 1234,
+    }
+
+    with patch.object(AppConfigManager, "__init__", return_value=None) as mock_app_config_manager_init:
+        subbed_inputs = helpers.sub_fn_inputs_from_protected_secrets(fn_inputs, {})
+        mock_app_config_manager_init.assert_not_called()
+
+    assert subbed_inputs == fn_inputs
+    assert subbed_inputs is not fn_inputs
+
+
+def test_sub_fn_inputs_from_protected_secrets_no_pam_plugin(fx_reset_environmental_variables):
+    os.environ["STANDARD_SECRET"] = "standard secret found"
+
+    fn_inputs = {
+        "fn_test_app_input_1": "$STANDARD_SECRET",
+        "fn_test_app_input_2": "^PAM_SECRET",
+        "fn_test_app_input_3": "Normal"
+    }
+
+    subbed_inputs = helpers.sub_fn_inputs_from_protected_secrets(fn_inputs, AppConfigManager())
+
+    assert subbed_inputs == {
+        "fn_test_app_input_1": "standard secret found",
+        "fn_test_app_input_2": "^PAM_SECRET",
+        "fn_test_app_input_3": "Normal"
+    }
+    assert fn_inputs["fn_test_app_input_1"] == "$STANDARD_SECRET"
+
+def test_get_entry_points_uses_cached_index():
+    helpers.get_entry_point_index.cache_clear()
+
+    with patch("resilient_circuits.helpers.entry_points", wraps=helpers.entry_points) as mock_entry_points:
+        helpers.get_entry_points("resilient.circuits.components")
+        helpers.get_entry_points("resilient.circuits.selftest")
+        helpers.get_entry_points("resilient.lib.configsection")
+
+        assert mock_entry_points.call_count == 1
+
+    helpers.get_entry_point_index.cache_clear()
+
+
+def test_get_entry_points_returns_copy():
+    mock_ep = EntryPoint(name="mock_gen_config", value="mock_package.util.config:config_section_data",
+                         group="mock.group.configsection")
+    helpers.get_entry_point_index.cache_clear()
+
+    with patch("resilient_circuits.helpers.entry_points", return_value=EntryPoints([mock_ep])):
+        eps = helpers.get_entry_points("mock.group.configsection")
+        assert [ep.name for ep in eps] == ["mock_gen_config"]
+
+        eps.clear()
+        assert len(helpers.get_entry_points("mock.group.configsection")) == 1
+        assert helpers.get_entry_points("mock.group.that.does.not.exist") == []
+
+    helpers.get_entry_point_index.cache_clear()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+import os
+import stat
+import threading
+
+from mock import patch
+from resilient_circuits import constants
+from resilient_circuits.idempotency_store import IdempotencyStore, get_input_key
+
+INPUTS = {"incident_id": 2095, "text": "abc"}
+
+
+def _store(tmpdir, **kwargs):
+    return IdempotencyStore(os.path.join(tmpdir.strpath, "store", "replies.db"), **kwargs)
+
+
+def test_get_input_key():
+    assert get_input_key("fn_mock", {"a": 1, "b": 2}) == get_input_key("fn_mock", {"b": 2, "a": 1})
+    assert get_input_key("fn_mock", INPUTS) != get_input_key("fn_other", INPUTS)
+
+
+def test_from_opts(tmpdir):
+    assert IdempotencyStore.from_opts({}) is None
+
+    store = IdempotencyStore.from_opts({constants.APP_CONFIG_IDEMPOTENCY_STORE: os.path.join(tmpdir.strpath, "replies.db"),
+                                        constants.APP_CONFIG_IDEMPOTENCY_RETENTION: 60,
+                                        constants.APP_CONFIG_IDEMPOTENCY_MATCH_INPUTS: True})
+    assert store.retention == 60
+    assert store.max_entries == constants.DEFAULT_IDEMPOTENCY_MAX_ENTRIES
+    assert store.match_inputs
+
+
+def test_reply_by_message_id(tmpdir):
+    store = _store(tmpdir)
+    store.save_reply("ID:1", '{"complete": true}', "fn_mock", INPUTS)
+
+    assert store.get_reply("ID:1", "fn_mock", INPUTS) == '{"complete": true}'
+    # without match_inputs, another message with the same inputs runs again
+    assert store.get_reply("ID:2", "fn_mock", INPUTS) is None
+    assert store.stats["message_id_hits"] == 1
+    assert store.stats["misses"] == 1
+
+    # the replies are still there when opened again, like after a restart
+    store.close()
+    assert stat.S_IMODE(os.stat(store.path).st_mode) == 0o600
+    assert _store(tmpdir).get_reply("ID:1") == '{"complete": true}'
+
+
+def test_reply_by_inputs(tmpdir):
+    store = _store(tmpdir, match_inputs=True)
+    store.save_reply("ID:1", "first", "fn_mock", INPUTS)
+    store.save_reply("ID:2", "second", "fn_mock", INPUTS)
+
+    assert store.get_reply("ID:3", "fn_mock", dict(INPUTS)) == "second"
+    assert store.get_reply("ID:3", "fn_mock", {"incident_id": 2096}) is None
+    assert store.get_reply("ID:3", "fn_other", INPUTS) is None
+    assert store.stats["input_hits"] == 1
+
+
+def test_failed_reply_not_saved(tmpdir):
+    store = _store(tmpdir, match_inputs=True)
+    store.save_reply("ID:1", "failed", "fn_mock", INPUTS, success=False)
+    store.flush()
+
+    # a failed function runs again
+    assert store.get_reply("ID:1", "fn_mock", INPUTS) is None
+    assert store.get_reply("ID:2", "fn_mock", INPUTS) is None
+    assert len(store) == 0
+
+
+def test_save_failures(tmpdir):
+    store = _store(tmpdir, match_inputs=True, save_failures=True)
+    store.save_reply("ID:1", "failed", "fn_mock", INPUTS, success=False)
+
+    assert store.get_reply("ID:1") == "failed"
+    assert store.get_reply("ID:2", "fn_mock", INPUTS) == "failed"
+
+
+def test_find_reply(tmpdir):
+    store = _store(tmpdir)
+    store.save_reply("ID:1", "first", "fn_mock", INPUTS)
+
+    found = []
+    store.find_reply("ID:1", "fn_mock", INPUTS, lambda reply: found.append((reply, threading.current_thread().name)))
+    store.find_reply("ID:2", "fn_mock", INPUTS, lambda reply: found.append((reply, threading.current_thread().name)))
+    store.flush()
+    # read on the thread of the store, after the reply queued before it is written
+    assert found == [("first", "IdempotencyStore"), (None, "IdempotencyStore")]
+    assert store.stats["message_id_hits"] == 1
+    assert store.stats["misses"] == 1
+
+    # a closed store finds nothing
+    store.close()
+    store.find_reply("ID:1", "fn_mock", INPUTS, found.append)
+    assert found[-1] is None
+
+
+def test_retention(tmpdir):
+    store = _store(tmpdir, retention=60)
+    with patch("resilient_circuits.idempotency_store.time.time", return_value=1000):
+        store.save_reply("ID:1", "old")
+    store.save_reply("ID:2", "new")
+    store.flush()
+
+    assert store.get_reply("ID:1") is None
+    assert store.prune() == 1
+    assert len(store) == 1
+
+
+def test_max_entries(tmpdir):
+    store = _store(tmpdir, max_entries=5)
+    for i in range(8):
+        with patch("resilient_circuits.idempotency_store.time.time", return_value=1e10 + i):
+            store.save_reply("ID:{0}".format(i), str(i))
+    store.flush()
+
+    assert store.prune() == 3
+    assert len(store) == 5
+    # the oldest are removed first
+    with patch("resilient_circuits.idempotency_store.time.time", return_value=1e10 + 8):
+        assert store.get_reply("ID:2") is None
+        assert store.get_reply("ID:3") == "3"
+
+
+def test_save_reply_does_not_wait_for_write(tmpdir):
+    store = _store(tmpdir, match_inputs=True)
+    # hold the writer, the reply is found before it is written
+    with store._write_lock:
+        store.save_reply("ID:1", "first", "fn_mock", INPUTS)
+        assert store.get_reply("ID:1") == "first"
+        assert store.get_reply("ID:2", "fn_mock", INPUTS) == "first"
+        assert len(store) == 0
+
+    store.flush()
+    assert len(store) == 1
+    assert not store._pending
+    assert store.stats["saved"] == 1
@@ -1,20 +1,102 @@
 #!/usr/bin/env python
 
+from importlib import import_module as _import_module
+
 try:
-    from importlib.metadata import distribution, PackageNotFoundError
+    from importlib.metadata import distribution as _distribution, PackageNotFoundError as _PackageNotFoundError
 except ImportError:
-    from importlib_metadata import distribution, PackageNotFoundError
+    from importlib_metadata import distribution as _distribution, PackageNotFoundError as _PackageNotFoundError
 try:
-    __version__ = distribution(__name__).version
-except PackageNotFoundError:
+    __version__ = _distribution(__name__).version
+except _PackageNotFoundError:
     __version__ = None
 
+# Lightweight modules with no third party dependencies are imported eagerly
 from resilient_lib.components.function_result import ResultPayload, LowCodePayload
-from resilient_lib.components.html2markdown import MarkdownParser
-from resilient_lib.components.requests_common import RequestsCommon, RequestsCommonWithoutSession
-from resilient_lib.components.resilient_common import *
+from resilient_lib.components.html2markdown import HTMLTextParser, MarkdownParser
 from resilient_lib.components.workflow_status import get_workflow_status
-from resilient_lib.components.oauth2_client_credentials_session import OAuth2ClientCredentialsSession
 from resilient_lib.components.integration_errors import IntegrationError
-from resilient_lib.components.templates_common import *
-from resilient_lib.components.poller_common import *
+
+# Heavy modules (requests, resilient, jinja2, ...) are only
+# imported the first time one of their attributes is accessed on this package.
+# This keeps ``import resilient_lib`` cheap for processes that never use them.
+_LAZY_ATTRIBUTES = {
+    "RequestsCommon": "resilient_lib.components.requests_common",
+    "RequestsCommonWithoutSession": "resilient_lib.components.requests_common",
+    "OAuth2ClientCredentialsSession": "resilient_lib.components.oauth2_client_credentials_session",
+}
+
+# The public names of the modules that were historically exported with ``from <module> import *``,
+# including the names they import. test_lazy_imports checks this matches the modules.
+# The order matters: as with the original star imports, later modules win
+# when the same name is defined in more than one of them.
+_LAZY_STAR_ATTRIBUTES = (
+    ("resilient_lib.components.resilient_common", (
+        "CASE_FRAGMENT", "CP4S_PREFIX", "CP4S_RESOURCE_PREFIX", "HTMLTextParser", "INCIDENT_FRAGMENT", "LOG",
+        "PAYLOAD_VERSION", "TASK_DETAILS_FRAGMENT", "TASK_FRAGMENT", "TTLCache", "build_incident_url",
+        "build_resilient_url", "build_task_url", "cached", "clean_html", "close_incident", "constants", "datetime",
+        "get_artifacts", "get_file_attachment", "get_file_attachment_metadata", "get_file_attachment_name", "io",
+        "logging", "mimetypes", "os", "quote", "readable_datetime", "resilient", "str_to_bool", "string_types",
+        "sys", "tempfile", "unescape", "validate_fields", "write_file_attachment", "write_to_tmp_file"
+    )),
+    ("resilient_lib.components.templates_common", (
+        "DEFAULT_RENDER_CHUNKSIZE", "Environment", "JINJA_FILTERS", "LOG", "LRUCache", "TEMPLATE_CACHE_SIZE",
+        "TemplateError", "TemplateSyntaxError", "UNDEFINED_LABEL", "Undefined", "b64encode", "base64_filter",
+        "calendar", "camel_filter", "clear_template_cache", "datetime", "environment", "global_jinja_env",
+        "html_escape", "html_filter", "idna_filter", "iso8601", "js_filter", "json", "json_filter", "ldap_filter",
+        "logging", "make_payload_from_template", "make_payloads_from_template", "multiprocessing", "os", "pprint",
+        "pretty_filter", "ps_filter", "punycode_filter", "pytz", "quote", "random", "re", "readable_datetime",
+        "render", "render_json", "render_json_batch", "sample_filter", "select_autoescape", "sh_filter",
+        "soar_datetimeformat", "soar_splitpart", "soar_substitute", "soar_trimlist", "sys", "threading", "time",
+        "timestamp", "uniq", "url_filter"
+    )),
+    ("resilient_lib.components.poller_common", (
+        "ARTIFACTS_URI", "ARTIFACT_FILE_URI", "BULK_RETRY_STATUS_CODES", "BULK_STATUS_CREATED",
+        "BULK_STATUS_FAILED", "BULK_STATUS_SKIPPED", "BasicHTTPException", "CLEAN_COMMENT_CACHE_SIZE",
+        "DEFAULT_BULK_MAX_WORKERS", "DEFAULT_BULK_RETRY_DELAY", "DEFAULT_BULK_RETRY_TRIES",
+        "DEFAULT_CASES_QUERY_FILTER", "Event", "INCIDENTS_URI", "IntegrationError", "LOG", "LRUCache", "Patch",
+        "SOARCommon", "SimpleHTTPException", "TYPES_URI", "ThreadPoolExecutor", "b_to_s", "base64", "cached",
+        "clean_html", "copy", "datetime", "eval_mapping", "functools", "get_file_attachment",
+        "get_file_attachment_name", "get_last_poller_date", "literal_eval", "logging", "poller", "raise_from",
+        "requests", "s_to_b", "time", "traceback"
+    )),
+)
+
+# name -> the modules of _LAZY_STAR_ATTRIBUTES that export it, the last one first
+_LAZY_STAR_MODULES = {}
+for _module_name, _names in _LAZY_STAR_ATTRIBUTES:
+    for _name in _names:
+        _LAZY_STAR_MODULES.setdefault(_name, []).insert(0, _module_name)
+del _module_name, _names, _name
+
+
+def __getattr__(name):
+    """
+    PEP 562 module level ``__getattr__``. Import the module that provides ``name``
+    the first time it is asked for and cache the attribute on this package so
+    subsequent lookups are plain attribute access.
+    """
+    if name == "__all__":
+        # ``from resilient_lib import *`` should continue to export everything
+        return sorted(set(n for n in globals() if not n.startswith("_")) | set(_LAZY_ATTRIBUTES) | set(_LAZY_STAR_MODULES))
+
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name:
+        value = getattr(_import_module(module_name), name)
+        globals()[name] = value
+        return value
+
+    # A module still being imported, like poller_common importing clean_html
+    # from this package, does not have its names yet, so the next one is used
+    for module_name in _LAZY_STAR_MODULES.get(name, ()):
+        module = _import_module(module_name)
+        if hasattr(module, name):
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_STAR_MODULES))
@@ -3,47 +3,96 @@
 # pragma pylint: disable=unused-argument, no-self-use
 
 from datetime import datetime
+import functools
 import platform
-import importlib
+import importlib.metadata
+import time
 
 METRICS_VERSION = "1.0"
 LOW_CODE_METRICS_VERSION = "2.0"
 
+
+@functools.lru_cache(maxsize=None)
+def get_package_info(package_name):
+    """
+    Look up the project name and version of an installed package.
+    Looking up a distribution scans every entry on ``sys.path`` so the
+    result is cached for the lifetime of the process.
+
+    :param package_name: name of the package. Ex: ``fn_my_app``
+    :type package_name: str
+    :return: (project_name, version). Both are ``"unknown"`` if the package is not installed
+    :rtype: tuple
+    """
+    try:
+        dist = importlib.metadata.Distribution.from_name(package_name)
+        return dist.name, dist.version
+    except (importlib.metadata.PackageNotFoundError, ValueError):
+        pkg = MissingPkg()
+        return pkg.project_name, pkg.version
+
+
+@functools.lru_cache(maxsize=1)
+def get_host():
+    """ the host name does not change while we are running, so only look it up once """
+    return platform.node()
+
+
 class FunctionMetrics:
     """
     Use this function to track metrics on the function's operation. It tracks information on the package,
-    it's environment and the execution time
+    it's environment and the execution time.
+
+    Optionally, call :meth:`enable_extended_metrics` to also track the time the message waited
+    before this invocation started (``queue_wait_ms``) and the CPU time used by the invocation (``cpu_time_ms``)
     """
 
     def finish(self):
         """ build out the final metrics data structure """
         self.end_time = datetime.now()
+        end_monotonic = time.monotonic()
 
-        total_time = self.end_time - self.start_time
-
-        try:
-            # get information about the package we're running
-            pkg_version = importlib.metadata.version(self.func)
-            pkg_project_name = importlib.metadata.Distribution.from_name(self.func).name
-        except importlib.metadata.PackageNotFoundError:
-            pkg = MissingPkg()
-            pkg_version = pkg.version
-            pkg_project_name = pkg.project_name
+        pkg_project_name, pkg_version = get_package_info(self.func)
 
-        return {
+        metrics = {
             "version": self.version,
             "package": pkg_project_name,
             "package_version": pkg_version,
-            "host": platform.node(),
-            "execution_time_ms": int(total_time.total_seconds() * 1000),
+            "host": get_host(),
+            "execution_time_ms": int((end_monotonic - self._start_monotonic) * 1000),
             "timestamp": self.end_time.strftime("%Y-%m-%d %H:%M:%S")
         }
 
+        if self.queued_time is not None:
+            metrics["queue_wait_ms"] = max(int((self._start_monotonic - self.queued_time) * 1000), 0)
+
+        if self._start_cpu_time is not None:
+            metrics["cpu_time_ms"] = int((time.thread_time() - self._start_cpu_time) * 1000)
+
+        return metrics
+
+    def enable_extended_metrics(self, queued_time=None, cpu_time=True):
+        """
+        Include extra metrics in the result of :meth:`finish`
+
+        :param queued_time: ``time.monotonic()`` value of when the message for this invocation was received.
+            If set, ``queue_wait_ms`` is included in the metrics
+        :type queued_time: float
+        :param cpu_time: if ``True``, ``cpu_time_ms`` (the CPU time used by the current thread
+            between now and :meth:`finish`) is included in the metrics
+        :type cpu_time: bool
+        """
+        self.queued_time = queued_time
+        self._start_cpu_time = time.thread_time() if cpu_time else None
+
     def __init__(self, func):
         self.func = func
         self.start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
         self.end_time = None
         self.version = METRICS_VERSION
+        self.queued_time = None
+        self._start_cpu_time = None
 
 
 class LowCodeMetrics(FunctionMetrics):
@@ -4,15 +4,217 @@
 
 import re
 import logging
-from six import string_types
+from abc import ABCMeta, abstractmethod
+from collections import Counter, deque
+from six import add_metaclass, string_types, unichr
 
 try:
     from HTMLParser import HTMLParser
 except:
     from html.parser import HTMLParser
 
+try:
+    from html.entities import html5
+except ImportError:
+    from htmlentitydefs import name2codepoint
+    html5 = dict((name, unichr(code)) for name, code in name2codepoint.items())
+
+
+@add_metaclass(ABCMeta)
+class HTMLConverter(HTMLParser):
+    """
+    Base class of the parsers that convert HTML text in one pass over it.
+    Subclasses set up their buffers in ``init_buffers``, fill them in the
+    ``handle_*`` methods of `html.parser.HTMLParser <https://docs.python.org/3.6/library/html.parser.html#html.parser.HTMLParser>`_
+    and return the converted text from ``toString``
+    """
+
+    @abstractmethod
+    def init_buffers(self):
+        """ Set up the buffers for a new conversion """
+
+    @abstractmethod
+    def toString(self):
+        """ :return: the text converted from the buffers """
+
+    def convert(self, data):
+        """
+        Converts html ``data`` and returns the converted string
+
+        :param data: html text to convert
+        :type data: str
+        :return: converted text
+        :rtype: str
+        """
+
+        self.reset()
+        self.init_buffers()
+
+        if not data or not isinstance(data, string_types):
+            return data
+
+        self.feed(data)
+        self.close()
+        return self.toString()
+
+
+class HTMLTextParser(HTMLConverter):
+    """
+    Get the text of HTML, without the tags. The runs of text between tags
+    are joined with a space, as ``" ".join(BeautifulSoup(data, "html.parser").strings)``
+    does, without building a tree of the HTML. Like ``BeautifulSoup``:
+
+    * comments and the content of ``<script>``, ``<style>``, ``<template>``,
+      ``<rt>`` and ``<rp>`` are left out
+    * a run of only whitespace becomes a single ``"\\n"`` if it has a newline,
+      or a single space, except inside ``<pre>`` and ``<textarea>``
+    * an unknown entity such as ``&x;`` or ``&x`` is kept as ``&x``
+
+    **Example:**
+
+    .. code-block:: python
 
-class MarkdownParser(HTMLParser):
+        from resilient_lib import HTMLTextParser
+
+        parser = HTMLTextParser()
+        text = parser.convert("<div><ul><li>abc</li><li>def</li></ul></div>")
+        self.assertEqual(text, "abc def")
+    """
+
+    SKIPPED_TAGS = ("script", "style", "template", "rt", "rp")
+    PRESERVE_WHITESPACE_TAGS = ("pre", "textarea")
+    # tags without an end tag, which are closed as soon as they are opened
+    VOID_TAGS = ("area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta",
+                 "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex",
+                 "nextid", "spacer")
+    ASCII_SPACES = " \n\t\f\r"
+
+    def __init__(self):
+        HTMLConverter.__init__(self)
+        # entities are converted by handle_entityref and handle_charref
+        self.convert_charrefs = False
+
+    def init_buffers(self):
+        self.strings = []       # the runs of text found so far
+        self.data = []          # the pieces of the current run of text
+        self.open_tags = []     # the names of the tags not closed yet
+        self.skipping = 0       # number of open tags whose content is left out
+        self.preserving = 0     # number of open tags whose whitespace is kept
+        self.closed_void_tags = Counter()  # void tags closed at their start tag, whose end tag is ignored
+
+    def end_string(self, cdata=False):
+        """
+        the current run of text ends at a tag, comment, etc.
+        :param cdata: ``True`` if the run is a ``<![CDATA[...]]>`` section, which is kept in any tag
+        :return: None
+        """
+        if not self.data:
+            return
+
+        string = "".join(self.data)
+        self.data = []
+
+        if not self.preserving and not string.strip(HTMLTextParser.ASCII_SPACES):
+            string = "\n" if "\n" in string else " "
+
+        if cdata or not self.skipping:
+            self.strings.append(string)
+
+    def open_tag(self, tag):
+        self.open_tags.append(tag)
+        if tag in HTMLTextParser.SKIPPED_TAGS:
+            self.skipping += 1
+        if tag in HTMLTextParser.PRESERVE_WHITESPACE_TAGS:
+            self.preserving += 1
+
+    def close_tag(self, tag):
+        """
+        close the last open ``tag``, and the tags opened after it
+        :return: None
+        """
+        if tag not in self.open_tags:
+            return
+
+        while True:
+            closed = self.open_tags.pop()
+            if closed in HTMLTextParser.SKIPPED_TAGS:
+                self.skipping -= 1
+            if closed in HTMLTextParser.PRESERVE_WHITESPACE_TAGS:
+                self.preserving -= 1
+            if closed == tag:
+                return
+
+    def handle_starttag(self, tag, attrs):
+        self.end_string()
+        self.open_tag(tag)
+        if tag in HTMLTextParser.VOID_TAGS:
+            self.close_tag(tag)
+            self.closed_void_tags[tag] += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.end_string()
+        self.open_tag(tag)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.closed_void_tags[tag]:
+            # the end tag of a void tag that was closed already, like </br> after <br>
+            self.closed_void_tags[tag] -= 1
+            return
+        self.end_string()
+        self.close_tag(tag)
+
+    def handle_data(self, data):
+        self.data.append(data)
+
+    def handle_entityref(self, name):
+        char = html5.get(name + ";") or html5.get(name)
+        self.data.append(char if char else "&" + name)
+
+    def handle_charref(self, name):
+        try:
+            num = int(name[1:], 16) if name[:1] in ("x", "X") else int(name)
+        except ValueError:
+            self.data.append(u"&#" + name)
+            return
+
+        if num == 0 or num > 0x10ffff or 0xd800 <= num <= 0xdfff:
+            char = u"\ufffd"
+        elif 0x80 <= num <= 0x9f:
+            # references to the Windows-1252 code of a character, as browsers read them
+            try:
+                char = bytearray([num]).decode("cp1252")
+            except UnicodeDecodeError:
+                char = unichr(num)
+        else:
+            char = unichr(num)
+        self.data.append(char)
+
+    def handle_comment(self, data):
+        self.end_string()
+
+    def handle_decl(self, decl):
+        self.end_string()
+
+    def handle_pi(self, data):
+        self.end_string()
+
+    def unknown_decl(self, data):
+        self.end_string()
+        # <![CDATA[...]]> is text
+        if data.upper().startswith("CDATA["):
+            self.data.append(data[len("CDATA["):])
+            self.end_string(cdata=True)
+
+    def toString(self):
+        """
+        :return: the runs of text joined with a space
+        """
+        self.end_string()
+        return " ".join(self.strings)
+
+
+class MarkdownParser(HTMLConverter):
     """
     Convert HTML text into Markdown. A wrapper for
     `html.parser.HTMLParser <https://docs.python.org/3.6/library/html.parser.html#html.parser.HTMLParser>`_
@@ -44,7 +246,7 @@ class MarkdownParser(HTMLParser):
 
     def __init__(self, bold="**", italic="*", underline="__", strikeout="~~", bullets=DEFAULT_LIST, number=0, indent=4,
                  monospace=["{{", "}}"], headers=['h1.', 'h2.', 'h3.', 'h4.', 'h5.', 'h6.'], blockquote="```"):
-        HTMLParser.__init__(self)
+        HTMLConverter.__init__(self)
         self.log = logging.getLogger(__name__)
 
         # customizable attributes
@@ -66,9 +268,12 @@ class MarkdownParser(HTMLParser):
         self.curr_list = []   # stack of embedded ordered and unordered list symbols
         self.data = []        # buffer for a given tag, cleared when and ending tag is found (ex. </p>)
         self.data_pre = []    # markdown data to prefix the data
-        self.data_post = []   # markdown data to follow the data
+        self.data_post = deque()  # markdown data to follow the data, in the order it is closed
         self.prev_tag = None
         self.prev_attrs = []
+        self.unknown_tags = set()  # unknown tags already logged
+        self.newlines = ""    # trailing new lines held back by convert_chunks
+        self.in_text = False  # True once the text since the last tag has started
 
     def convert(self, data):
         """
@@ -80,14 +285,7 @@ class MarkdownParser(HTMLParser):
         :return: converted text to markdown
         :rtype: str
         """
-
-        self.init_buffers()
-
-        if not data or not isinstance(data, string_types):
-            return data
-
-        self.feed(data)
-        return self.toString()
+        return super(MarkdownParser, self).convert(data)
 
     def handle_starttag(self, tag, attrs):
         """
@@ -97,6 +295,8 @@ class MarkdownParser(HTMLParser):
         :return: None
         """
 
+        self.in_text = False
+
         # flush any data accumulated
         if tag in ('ol', 'ul'):
             self.push_data(False)
@@ -113,19 +313,19 @@ class MarkdownParser(HTMLParser):
 
         if tag == "strong":
             self.data_pre.append(self.bold)
-            self.data_post.insert(0, self.bold)
+            self.data_post.appendleft(self.bold)
 
         elif tag == "em":
             self.data_pre.append(self.italic)
-            self.data_post.insert(0, self.italic)
+            self.data_post.appendleft(self.italic)
 
         elif tag == "s":
             self.data_pre.append(self.strikeout)
-            self.data_post.insert(0, self.strikeout)
+            self.data_post.appendleft(self.strikeout)
 
         elif tag == "u":
             self.data_pre.append(self.underscore)
-            self.data_post.insert(0, self.underscore)
+            self.data_post.appendleft(self.underscore)
 
         elif tag == "ol":
             self.curr_list.append(self.list_number)  # number to be incremented with every <li>
@@ -153,7 +353,7 @@ class MarkdownParser(HTMLParser):
         elif tag == "a":
             href = self.get_attr(attrs, 'href')
             self.data_pre.extend(["[{}]".format(href), '('])
-            self.data_post.insert(0, ")")
+            self.data_post.appendleft(")")
 
         elif tag in ('h', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
             if tag == 'h':
@@ -167,11 +367,13 @@ class MarkdownParser(HTMLParser):
 
         elif tag == "blockquote":
             self.data_pre.append(self.blockquote)
-            self.data_post.insert(0, self.blockquote)
+            self.data_post.appendleft(self.blockquote)
 
         elif tag not in MarkdownParser.SUPPORTED_TAGS:
-            self.log.warning("Unknown html tag: {}".format(tag))
-            self.data_post.insert(0, MarkdownParser.MARKDOWN_NEWLINE)
+            if tag not in self.unknown_tags:
+                self.unknown_tags.add(tag)
+                self.log.warning("Unknown html tag: {}".format(tag))
+            self.data_post.appendleft(MarkdownParser.MARKDOWN_NEWLINE)
 
         # determine if styling is needed
         style = self.get_attr(attrs, 'style')
@@ -180,17 +382,17 @@ class MarkdownParser(HTMLParser):
             if rgb:
                 rgb_hex = self.convert_rgb(self.get_rgb(rgb))
                 self.data_pre.append("{{color:{0}}}".format(rgb_hex))
-                self.data_post.insert(0, "{color}")
+                self.data_post.appendleft("{color}")
 
             # format monospace data blocks
             font_family = self.get_style_attr(style, 'font-family')
             if font_family and font_family == "monospace":
                 if isinstance(self.monospace, list):
                     self.data_pre.append(self.monospace[0])
-                    self.data_post.insert(0, self.monospace[1])
+                    self.data_post.appendleft(self.monospace[1])
                 else:
                     self.data_pre.append(self.monospace)
-                    self.data_post.insert(0, self.monospace)
+                    self.data_post.appendleft(self.monospace)
 
 
     def handle_data(self, data):
@@ -199,9 +401,17 @@ class MarkdownParser(HTMLParser):
         :param data:
         :return: None
         """
-        # clean data of prefix whitespace
-        cleaned = re.search(r"^[\n\t\r]*(.*)", data, re.S)
-        cleaned and self.data.append(cleaned.group(1))
+        # clean data of prefix whitespace. The text between two tags can come in
+        # more than one piece when the html is fed in chunks, so only the first is cleaned
+        if not self.in_text:
+            data = data.lstrip("\n\t\r")
+            self.in_text = bool(data)
+        self.data.append(data)
+
+    def handle_comment(self, data):
+        self.in_text = False
+
+    handle_decl = handle_pi = unknown_decl = handle_comment
 
 
     def handle_endtag(self, tag):
@@ -211,6 +421,8 @@ class MarkdownParser(HTMLParser):
         :return: None
         """
 
+        self.in_text = False
+
         # remove existing tag from stack
         self.prev_tag = self.curr_tag.pop()
         self.prev_attrs = self.curr_attrs.pop()
@@ -247,12 +459,14 @@ class MarkdownParser(HTMLParser):
             self.buffer.extend(self.data)
             self.data = []
         else:
-            self.buffer.extend([item for sublist in [self.data_pre, self.data, self.data_post] for item in sublist])
+            self.buffer.extend(self.data_pre)
+            self.buffer.extend(self.data)
+            self.buffer.extend(self.data_post)
 
             # clean up
             self.data = []
             self.data_pre = []
-            self.data_post = []
+            self.data_post.clear()
 
 
     def convert_rgb(self, rgb):
@@ -317,9 +531,59 @@ class MarkdownParser(HTMLParser):
         """
         self.push_data()
 
-        result = ''.join(self.buffer)
         # clean up ending new line characters
-        while result[-1:] == '\n':
-            result = result[:-1]
+        result = self.newlines + ''.join(self.buffer)
+        result = result.rstrip('\n')
+        self.buffer = [result]
+        self.newlines = ""
 
         return result
+
+    def convert_chunks(self, chunks):
+        """
+        Converts html fed in ``chunks``, such as the lines of a large email
+        body, yielding the markdown converted from each chunk as it is fed.
+        Joined together the markdown is the same as ``convert()`` returns
+        for the whole html, without holding all of it in memory.
+
+        **Example:**
+
+        .. code-block:: python
+
+            parser = MarkdownParser()
+            with open("email_body.html") as html_file:
+                for markdown in parser.convert_chunks(html_file):
+                    out_file.write(markdown)
+
+        :param chunks: pieces of html text to convert
+        :type chunks: iterable of str
+        :return: generator of the converted markdown
+        :rtype: generator of str
+        """
+        self.reset()
+        self.init_buffers()
+
+        for chunk in chunks:
+            self.feed(chunk)
+            markdown = self.flush_buffer()
+            if markdown:
+                yield markdown
+
+        self.close()
+        markdown = self.toString()
+        self.buffer = []
+        if markdown:
+            yield markdown
+
+    def flush_buffer(self):
+        """
+        Remove the markdown converted so far from the buffer.
+        New lines at its end are held back, as new lines at the end of all the markdown are removed
+        :return: the converted markdown
+        """
+        markdown = self.newlines + ''.join(self.buffer)
+        self.buffer = []
+
+        stripped = markdown.rstrip('\n')
+        self.newlines = markdown[len(stripped):]
+        return stripped
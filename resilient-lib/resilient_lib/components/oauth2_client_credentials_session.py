@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 # (c) Copyright IBM Corp. 2010, 2021. All Rights Reserved.
 import time
+import hashlib
 import logging
+import threading
 import requests
 
 log = logging.getLogger(__name__)
@@ -10,6 +12,52 @@ DEFAULT_HEADERS = {
     "Content-type": "application/x-www-form-urlencoded"
 }
 
+# renew the token in the background once this fraction of ``expires_in`` has passed
+DEFAULT_REFRESH_FRACTION = 0.8
+
+
+class _TokenCacheEntry(object):
+    """
+    A token shared by all the sessions in this process with the same (url, client_id, scope).
+    ``generation`` goes up each time the token is replaced, so a session can tell
+    if the token it holds is stale without comparing tokens
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.generation = 0
+        self.oauth_token_data = None
+        self.access_token = None
+        self.token_type = None
+        self.expires_in = None
+        self.expiration_time = None
+        self.refresh_time = None
+        self.refreshing = False
+
+        # metrics
+        self.token_requests = 0
+        self.token_request_failures = 0
+        self.background_refreshes = 0
+        self.last_token_request_ms = None
+        self.total_token_request_ms = 0.0
+
+    def has_valid_token(self):
+        if not self.generation:
+            return False
+        return self.expiration_time is None or self.expiration_time > time.time()
+
+
+_TOKEN_CACHE = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+
+def _get_token_cache_entry(key):
+    with _TOKEN_CACHE_LOCK:
+        entry = _TOKEN_CACHE.get(key)
+        if entry is None:
+            entry = _TOKEN_CACHE[key] = _TokenCacheEntry()
+        return entry
+
+
 class OAuth2ClientCredentialsSession(requests.Session):
     """
     Wrapper around `requests.Session <https://docs.python-requests.org/en/latest/api/#requests.Session>`_
@@ -18,6 +66,11 @@ class OAuth2ClientCredentialsSession(requests.Session):
     It also attempts to keep track of the token and refresh it as needed.
 
     * If proxies are defined, every request will use them.
+    * Sessions in the same process with the same ``url``, ``client_id`` and ``scope`` share one token.
+    * When the token has expired, or a request gets a 401/403, only one thread requests a new token.
+      The other threads wait for it and then use the new token.
+    * Once ``refresh_fraction`` of the token's ``expires_in`` has passed, a new token is requested
+      in a background thread, so requests do not wait for it.
 
     This session does not request authorization from the user first. The scope should be pre-authorized.
 
@@ -56,11 +109,17 @@ class OAuth2ClientCredentialsSession(requests.Session):
                     "http_proxy": "http://localhost:8080
                 }
     :type proxies: dict
+    :param refresh_fraction: (optional) fraction of ``expires_in`` after which the token is renewed
+        in the background. Set to ``None`` to only renew the token once it has expired. Default ``0.8``
+    :type refresh_fraction: float
+    :param share_token: (optional) if ``False`` this session will not share its token with other sessions
+    :type share_token: bool
     """
 
     AUTHORIZATION_ERROR_CODES = [401, 403]
 
-    def __init__(self, url=None, client_id=None, client_secret=None, scope=None, proxies=None):
+    def __init__(self, url=None, client_id=None, client_secret=None, scope=None, proxies=None,
+                 refresh_fraction=DEFAULT_REFRESH_FRACTION, share_token=True):
         """
         Get OAuth2 tokens and save them to be used in session requests.
         """
@@ -91,9 +150,26 @@ class OAuth2ClientCredentialsSession(requests.Session):
         self.access_token = None
         self.token_type = None
         self.expiration_time = None
+        self.refresh_time = None
+        self.refresh_fraction = refresh_fraction
         self.proxies = proxies if proxies is not None else {}
 
-        self.authenticate(url, client_id, client_secret, scope, proxies)
+        # the digest of the secret is part of the key, so a session with a wrong or
+        # rotated secret authenticates for itself rather than using another session's token.
+        # So is the class, as a subclass may get or handle its tokens differently
+        token_key = (type(self).__module__, type(self).__qualname__, url, client_id,
+                     hashlib.sha256(client_secret.encode("utf-8")).hexdigest(), repr(scope))
+        if not share_token:
+            token_key += (id(self),)
+        self._token_cache = _get_token_cache_entry(token_key)
+        self._token_generation = 0
+
+        with self._token_cache.lock:
+            if self._token_cache.has_valid_token():
+                log.debug("Using cached OAuth2 token.")
+                self._load_token()
+            else:
+                self.authenticate(url, client_id, client_secret, scope, proxies)
 
     def authenticate(self, url, 
                      client_id, client_secret, 
@@ -106,25 +182,138 @@ class OAuth2ClientCredentialsSession(requests.Session):
         token_url = url
 
         log.debug("Requesting token from {0}".format(url))
-        r = self.get_token(token_url, client_id, client_secret, scope, proxies, headers=headers)
+        start = time.monotonic()
+        try:
+            r = self.get_token(token_url, client_id, client_secret, scope, proxies, headers=headers)
 
-        log.info("Response status code: {}".format(r.status_code))
-        r.raise_for_status()
+            log.info("Response status code: {}".format(r.status_code))
+            r.raise_for_status()
+        except Exception:
+            self._record_token_request(start, failed=True)
+            raise
+        self._record_token_request(start)
 
         self.oauth_token_data = r.json()
         log.debug("Received oauth token.")
 
         self.expires_in = self.oauth_token_data.get("expires_in", None)
         if self.expires_in is not None:
-            self.expiration_time = time.time() + int(self.expires_in)
+            now = time.time()
+            self.expiration_time = now + int(self.expires_in)
+            self.refresh_time = now + int(self.expires_in) * self.refresh_fraction if self.refresh_fraction else None
         else:
             self.expiration_time = None
+            self.refresh_time = None
 
         self.access_token = self.oauth_token_data["access_token"]
         self.token_type = self.oauth_token_data.get("token_type", None)
 
+        self._publish_token()
+
         return True
 
+    def _record_token_request(self, start, failed=False):
+        entry = getattr(self, "_token_cache", None)
+        if entry is None:
+            return
+        elapsed_ms = (time.monotonic() - start) * 1000
+        entry.token_requests += 1
+        entry.last_token_request_ms = elapsed_ms
+        entry.total_token_request_ms += elapsed_ms
+        if failed:
+            entry.token_request_failures += 1
+
+    def _publish_token(self):
+        """ Share the token this session just received with the other sessions """
+        entry = getattr(self, "_token_cache", None)
+        if entry is None:
+            return
+        entry.oauth_token_data = self.oauth_token_data
+        entry.access_token = self.access_token
+        entry.token_type = self.token_type
+        entry.expires_in = self.expires_in
+        entry.expiration_time = self.expiration_time
+        entry.refresh_time = self.refresh_time
+        entry.generation += 1
+        self._token_generation = entry.generation
+
+    def _load_token(self):
+        """ Use the token in the shared cache """
+        entry = self._token_cache
+        self._token_generation = entry.generation
+        self.oauth_token_data = entry.oauth_token_data
+        self.expires_in = entry.expires_in
+        self.expiration_time = entry.expiration_time
+        self.refresh_time = entry.refresh_time
+        self.token_type = entry.token_type
+        self.access_token = entry.access_token
+
+    def _sync_token(self):
+        """ Pick up a token that another thread or session has already received """
+        if self._token_cache.generation != self._token_generation:
+            self._load_token()
+
+    def _update_stale_token(self, generation):
+        """
+        Replace the token of ``generation``. Threads that were waiting while another
+        thread (or session) got a new token use that token instead of requesting another one
+        """
+        with self._token_cache.lock:
+            if self._token_cache.generation != generation:
+                self._load_token()
+            else:
+                self.update_token()
+
+    def _refresh_in_background(self):
+        """ Start renewing the token before it expires, unless a renewal has already started """
+        entry = self._token_cache
+        with _TOKEN_CACHE_LOCK:
+            if entry.refreshing:
+                return
+            entry.refreshing = True
+
+        generation = entry.generation
+
+        def _refresh():
+            try:
+                with entry.lock:
+                    if entry.generation == generation:
+                        self.authenticate(self.authorization_url, self.client_id,
+                                          self.client_secret, self.scope, self.proxies)
+                        entry.background_refreshes += 1
+            except Exception as err:
+                # the current token is still valid, so the next request will try again
+                log.warning("Failed to renew OAuth2 token in the background: %s", err)
+            finally:
+                entry.refreshing = False
+
+        threading.Thread(target=_refresh, name="OAuth2TokenRefresh", daemon=True).start()
+
+    def get_token_metrics(self):
+        """
+        Get metrics on the token requests made for the token this session uses.
+        The token is shared by all sessions with the same ``url``, ``client_id`` and ``scope``,
+        so these include the requests made by those sessions too.
+
+        :return: ``token_requests``, ``token_request_failures``, ``background_refreshes``,
+            ``last_token_request_ms`` and ``avg_token_request_ms``
+        :rtype: dict
+        """
+        entry = self._token_cache
+        return {
+            "token_requests": entry.token_requests,
+            "token_request_failures": entry.token_request_failures,
+            "background_refreshes": entry.background_refreshes,
+            "last_token_request_ms": entry.last_token_request_ms,
+            "avg_token_request_ms": entry.total_token_request_ms / entry.token_requests if entry.token_requests else None
+        }
+
+    @staticmethod
+    def clear_token_cache():
+        """ Forget all the tokens shared between sessions. New sessions will request a new token """
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE.clear()
+
     def get_token(self, token_url, client_id, client_secret, scope=None, proxies=None, headers=None):
         """
         **Override this method if the request needs specific information in the
@@ -171,16 +360,19 @@ class OAuth2ClientCredentialsSession(requests.Session):
         """
         Institutes a request for a new access token.
 
+        Only one thread requests a new token at a time.
+
         :raises ValueError: If it cannot update the token
         :return: True if could get a new token
         :rtype: bool
         """
-        try:
-            self.authenticate(self.authorization_url, self.client_id,
-                              self.client_secret, self.scope, self.proxies)
-        except ValueError:
-            raise ValueError("Can't update the token, did the credentials for {0} change?"
-                             .format(self.authorization_url))
+        with self._token_cache.lock:
+            try:
+                self.authenticate(self.authorization_url, self.client_id,
+                                  self.client_secret, self.scope, self.proxies)
+            except ValueError:
+                raise ValueError("Can't update the token, did the credentials for {0} change?"
+                                 .format(self.authorization_url))
         return True
 
     def request(self, method, url, *args, **kwargs):
@@ -197,20 +389,28 @@ class OAuth2ClientCredentialsSession(requests.Session):
         """
 
         # Don't check expiration if attempting to refresh authorization - would cause infinite recursion loop
-        if self.expiration_time is not None and url != self.authorization_url:
-            if self.expiration_time < time.time():
-                self.update_token()
+        if url != self.authorization_url:
+            self._sync_token()
+            if self.expiration_time is not None:
+                now = time.time()
+                if self.expiration_time < now:
+                    self._update_stale_token(self._token_generation)
+                elif self.refresh_time is not None and self.refresh_time < now:
+                    self._refresh_in_background()
 
         headers = kwargs.pop("headers") if "headers" in kwargs else {}
         proxies = kwargs.pop("proxies") if "proxies" in kwargs else self.proxies
+        token_generation = self._token_generation
         self.add_authorization_header(headers)
 
         resp = super(OAuth2ClientCredentialsSession, self).request(method, url, *args, headers=headers, proxies=proxies,
                                                                    **kwargs)
 
         # If the error anything other than Authorization issue, the problem is in user's request
-        if resp.status_code in self.AUTHORIZATION_ERROR_CODES:
-            self.update_token()
+        if resp.status_code in self.AUTHORIZATION_ERROR_CODES and url != self.authorization_url:
+            # if the token was replaced while this request was being made, just retry with the new one
+            self._update_stale_token(token_generation)
+            self.add_authorization_header(headers)
             resp = super(OAuth2ClientCredentialsSession, self).request(method, url, *args, headers=headers,
                                                                         proxies=proxies, **kwargs)
 
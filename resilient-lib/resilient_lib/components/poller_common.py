@@ -3,15 +3,19 @@
 # (c) Copyright IBM Corp. 2010, 2022. All Rights Reserved.
 
 import base64
+import copy
 import datetime
 import functools
 import logging
+import time
 import traceback
 from ast import literal_eval
+from concurrent.futures import ThreadPoolExecutor
 from threading import Event
 
+import requests
 from cachetools import LRUCache, cached
-from resilient import Patch, SimpleHTTPException
+from resilient import BasicHTTPException, Patch, SimpleHTTPException
 from resilient_lib import (IntegrationError, clean_html, get_file_attachment,
                            get_file_attachment_name)
 from six import raise_from
@@ -25,6 +29,19 @@ ARTIFACT_FILE_URI = "/".join([ARTIFACTS_URI, "files"])
 
 DEFAULT_CASES_QUERY_FILTER = "return_level=normal"
 
+# bulk creation of artifacts, comments and datatable rows
+DEFAULT_BULK_MAX_WORKERS = 5
+DEFAULT_BULK_RETRY_TRIES = 3
+DEFAULT_BULK_RETRY_DELAY = 1
+BULK_STATUS_CREATED = "created"
+BULK_STATUS_SKIPPED = "skipped"
+BULK_STATUS_FAILED = "failed"
+# HTTP errors of requests that SOAR did not act on, so they can be tried again
+BULK_RETRY_STATUS_CODES = (429,)
+
+# cleaned comments kept, as the same SOAR comments are compared on every poll
+CLEAN_COMMENT_CACHE_SIZE = 20000
+
 # P O L L E R   L O G I C
 def poller(named_poller_interval, named_last_poller_time):
     """
@@ -264,16 +281,17 @@ class SOARCommon():
 
         if filter_soar_header:
             # Filter entity comments with our SOAR header
+            soar_header = _clean_comment(filter_soar_header)
             staged_entity_comments = [comment for comment in entity_comments \
-                                        if clean_html(filter_soar_header) not in clean_html(comment)]
+                                        if soar_header not in _clean_comment(comment)]
         else:
             staged_entity_comments = entity_comments.copy()
 
         # filter out the comments already sync'd to SOAR
         if soar_comment_list:
-            already_synced = [clean_html(soar_comment) for soar_comment in soar_comment_list]
+            already_synced = set(_clean_comment(soar_comment) for soar_comment in soar_comment_list)
             new_entity_comments = [comment for comment in staged_entity_comments\
-                if clean_html(comment) not in already_synced]
+                if _clean_comment(comment) not in already_synced]
         else:
             new_entity_comments = staged_entity_comments
 
@@ -526,6 +544,230 @@ class SOARCommon():
 
         return self.rest_client.post(uri=uri, payload=formatted_cells)
 
+    def _get_single_try_common(self):
+        """
+        A :class:`SOARCommon` with a copy of ``rest_client`` that makes each request only once.
+        The client otherwise sends a request again after any error status or a dropped connection,
+        so :meth:`_bulk_create` could not decide which creates are tried again.
+        """
+        rest_client = copy.copy(self.rest_client)
+        rest_client.request_max_retries = 1
+        return SOARCommon(rest_client)
+
+    def _bulk_create(self, items, create_fn, max_workers, retry_tries, retry_delay, skipped=None, find_fn=None):
+        """
+        Call ``create_fn`` for each item with up to ``max_workers`` at a time,
+        trying each one up to ``retry_tries`` times if the error can be retried.
+
+        Creating an object is not idempotent, so an error after which the object may have
+        been created (a timeout, a dropped connection or a ``5xx``) is only tried again if
+        ``find_fn`` is set and does not find it. ``create_fn`` must make each request only
+        once, with a client from :meth:`_get_single_try_common`.
+
+        :param skipped: for the index of any items not to create, the existing object to return for it
+        :type skipped: dict
+        :param find_fn: called with an item, returns the object created for it or ``None``
+        :type find_fn: callable
+        :return: the outcome of each item, in the order of ``items``
+        :rtype: list(dict)
+        """
+        skipped = skipped or {}
+
+        def _create(item):
+            delay = retry_delay
+            for attempt in range(1, retry_tries + 1):
+                try:
+                    return {"status": BULK_STATUS_CREATED, "item": item, "result": create_fn(item), "error": None}
+                except Exception as err:
+                    retry = _is_retryable(err)
+                    if not retry and find_fn and _may_have_been_created(err):
+                        try:
+                            created = find_fn(item)
+                        except Exception as find_err:
+                            LOG.warning("Could not check if %s was created: %s", item, find_err)
+                        else:
+                            if created is not None:
+                                LOG.info("Creating %s failed, but it was created: %s", item, err)
+                                return {"status": BULK_STATUS_CREATED, "item": item, "result": created, "error": None}
+                            retry = True
+
+                    if attempt == retry_tries or not retry:
+                        LOG.error("Failed to create %s: %s", item, err)
+                        return {"status": BULK_STATUS_FAILED, "item": item, "result": None, "error": str(err)}
+                    LOG.warning("Attempt %s of %s to create %s failed, retrying in %ss: %s",
+                                attempt, retry_tries, item, delay, err)
+                    time.sleep(delay)
+                    delay *= 2
+
+        outcomes = [None] * len(items)
+        to_create = []
+        for index, item in enumerate(items):
+            if index in skipped:
+                outcomes[index] = {"status": BULK_STATUS_SKIPPED, "item": item, "result": skipped[index], "error": None}
+            else:
+                to_create.append(index)
+
+        if to_create:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_create)))) as executor:
+                for index, outcome in zip(to_create, executor.map(_create, [items[i] for i in to_create])):
+                    outcomes[index] = outcome
+
+        LOG.info("Bulk create: %s created, %s skipped, %s failed", *[
+            sum(1 for outcome in outcomes if outcome["status"] == status)
+            for status in (BULK_STATUS_CREATED, BULK_STATUS_SKIPPED, BULK_STATUS_FAILED)])
+        return outcomes
+
+    def _artifact_key(self, artifact, artifact_types):
+        """ the (type label, value) of an artifact, to find duplicates with """
+        artifact_type = artifact.get("type")
+        if isinstance(artifact_type, dict):
+            artifact_type = artifact_type.get("name") or artifact_type.get("id")
+        return artifact_types.get(artifact_type, artifact_type), artifact.get("value")
+
+    def create_case_artifacts(self, case_id, artifacts, skip_existing=True,
+                              max_workers=DEFAULT_BULK_MAX_WORKERS,
+                              retry_tries=DEFAULT_BULK_RETRY_TRIES,
+                              retry_delay=DEFAULT_BULK_RETRY_DELAY):
+        """
+        Create many artifacts in a SOAR case, with up to ``max_workers`` requests at a time.
+
+        If ``skip_existing`` is ``True``, the artifacts of the case are read once and any artifact
+        with the same type and value as an existing one (or one earlier in ``artifacts``) is skipped.
+
+        Each artifact that fails with a ``429`` is tried up to ``retry_tries`` times, waiting
+        ``retry_delay`` seconds and doubling that each time. After a connection error, timeout
+        or ``5xx`` the artifact may have been created, so if ``skip_existing`` is ``True`` the
+        artifacts of the case are read again: it is tried again only if it is not there.
+
+        **Example:**
+
+        .. code-block:: python
+
+            from resilient_lib import SOARCommon
+
+            soar_common = SOARCommon(res_client)
+
+            artifacts = [{"type": {"name": "IP Address"}, "value": ip, "description": "Seen by the firewall"}
+                         for ip in found_ips]
+
+            outcomes = soar_common.create_case_artifacts(case_id, artifacts)
+            failed = [outcome["item"] for outcome in outcomes if outcome["status"] == "failed"]
+
+        :param case_id: SOAR case ID
+        :type case_id: str|int
+        :param artifacts: the artifacts to create. The ``type`` of each can be its id, its name or a dict with either
+        :type artifacts: list(dict)
+        :param skip_existing: if ``True`` do not create artifacts that are already in the case, defaults to ``True``
+        :type skip_existing: bool
+        :param max_workers: max number of requests at the same time, defaults to ``5``
+        :type max_workers: int
+        :param retry_tries: max number of attempts for each artifact, defaults to ``3``
+        :type retry_tries: int
+        :param retry_delay: seconds to wait before the first retry, defaults to ``1``
+        :type retry_delay: int|float
+        :return: for each artifact, in order, a dict with its ``status`` (``created``, ``skipped`` or ``failed``),
+            the ``item``, the ``result`` (the created or existing artifact) and the ``error`` if it failed
+        :rtype: list(dict)
+        """
+        uri = "/".join([INCIDENTS_URI, str(case_id), "artifacts"])
+
+        artifact_types = {}
+        if artifacts:
+            try:
+                artifact_types = self._get_artifact_types()
+            except Exception as err:
+                LOG.warning("Could not get the artifact types, so only artifacts with the same type are matched: %s", err)
+
+        def find_artifact(artifact):
+            key = self._artifact_key(artifact, artifact_types)
+            for existing in self.get_case_artifacts(case_id) or []:
+                if self._artifact_key(existing, artifact_types) == key:
+                    return existing
+            return None
+
+        skipped = {}
+        if skip_existing and artifacts:
+            existing = dict((self._artifact_key(artifact, artifact_types), artifact)
+                            for artifact in self.get_case_artifacts(case_id) or [])
+            for index, artifact in enumerate(artifacts):
+                key = self._artifact_key(artifact, artifact_types)
+                if key in existing:
+                    skipped[index] = existing[key]
+                else:
+                    existing[key] = artifact
+
+        single_try = self._get_single_try_common()
+        return self._bulk_create(artifacts, lambda artifact: single_try.rest_client.post(uri=uri, payload=artifact),
+                                 max_workers, retry_tries, retry_delay, skipped=skipped,
+                                 find_fn=find_artifact if skip_existing else None)
+
+    def create_case_comments(self, case_id, notes, entity_comment_header=None,
+                             max_workers=DEFAULT_BULK_MAX_WORKERS,
+                             retry_tries=DEFAULT_BULK_RETRY_TRIES,
+                             retry_delay=DEFAULT_BULK_RETRY_DELAY):
+        """
+        Add many comments to a SOAR case, with up to ``max_workers`` requests at a time.
+        Each comment that fails with a ``429`` is tried up to ``retry_tries`` times, waiting
+        ``retry_delay`` seconds and doubling that each time. Other errors are not tried again,
+        as the comment may have been added.
+
+        .. note::
+
+            The comments are created at the same time, so they may not be in the order of ``notes`` in SOAR.
+            Set ``max_workers=1`` to keep the order. To skip comments that were already synced to the case,
+            filter them first with :meth:`filter_soar_comments`.
+
+        :param case_id: SOAR case ID
+        :type case_id: str|int
+        :param notes: content of each comment
+        :type notes: list(str)
+        :param entity_comment_header: (Optional) header to place in bold at the top of each note
+        :type entity_comment_header: str
+        :param max_workers: max number of requests at the same time, defaults to ``5``
+        :type max_workers: int
+        :param retry_tries: max number of attempts for each comment, defaults to ``3``
+        :type retry_tries: int
+        :param retry_delay: seconds to wait before the first retry, defaults to ``1``
+        :type retry_delay: int|float
+        :return: for each note, in order, a dict with its ``status`` (``created`` or ``failed``),
+            the ``item``, the ``result`` (the created comment) and the ``error`` if it failed
+        :rtype: list(dict)
+        """
+        single_try = self._get_single_try_common()
+        return self._bulk_create(notes,
+                                 lambda note: single_try.create_case_comment(case_id, note, entity_comment_header=entity_comment_header),
+                                 max_workers, retry_tries, retry_delay)
+
+    def create_datatable_rows(self, case_id, datatable, rows,
+                              max_workers=DEFAULT_BULK_MAX_WORKERS,
+                              retry_tries=DEFAULT_BULK_RETRY_TRIES,
+                              retry_delay=DEFAULT_BULK_RETRY_DELAY):
+        """
+        Create many rows in a SOAR datatable, with up to ``max_workers`` requests at a time.
+        Each row is formatted as in :meth:`create_datatable_row`.
+        See :meth:`create_case_comments` for how failures are retried.
+
+        :param case_id: case containing the datatable
+        :type case_id: str|int
+        :param datatable: API name of datatable
+        :type datatable: str
+        :param rows: the columns and values of each row
+        :type rows: list(dict)
+        :param max_workers: max number of requests at the same time, defaults to ``5``
+        :type max_workers: int
+        :param retry_tries: max number of attempts for each row, defaults to ``3``
+        :type retry_tries: int
+        :param retry_delay: seconds to wait before the first retry, defaults to ``1``
+        :type retry_delay: int|float
+        :return: for each row, in order, a dict with its ``status`` (``created`` or ``failed``),
+            the ``item``, the ``result`` (the created row) and the ``error`` if it failed
+        :rtype: list(dict)
+        """
+        single_try = self._get_single_try_common()
+        return self._bulk_create(rows,
+                                 lambda rowdata: single_try.create_datatable_row(case_id, datatable, rowdata),
+                                 max_workers, retry_tries, retry_delay)
+
     def get_case(self, case_id):
         """
         Get a SOAR case based on the case id
@@ -682,6 +924,50 @@ class SOARCommon():
 
         return tasks
 
+def _get_cause(err):
+    """ the cause of an error wrapped in an ``IntegrationError`` """
+    if isinstance(err, IntegrationError) and err.__cause__ is not None:
+        return err.__cause__
+    return err
+
+
+def _is_retryable(err):
+    """
+    If creating an object in SOAR failed before SOAR acted on the request, so it
+    can be tried again: the connection could not be made, or a ``429`` response.
+    """
+    err = _get_cause(err)
+
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return True
+
+    if isinstance(err, (BasicHTTPException, SimpleHTTPException)):
+        return getattr(err.response, "status_code", None) in BULK_RETRY_STATUS_CODES
+
+    return False
+
+
+def _may_have_been_created(err):
+    """
+    If creating an object in SOAR failed with an error after which it may
+    have been created anyway: a connection error, a timeout or a ``5xx`` response.
+    """
+    err = _get_cause(err)
+
+    if isinstance(err, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+
+    if isinstance(err, (BasicHTTPException, SimpleHTTPException)):
+        return (getattr(err.response, "status_code", None) or 0) >= 500
+
+    return False
+
+
+@cached(cache=LRUCache(maxsize=CLEAN_COMMENT_CACHE_SIZE))
+def _clean_comment(comment):
+    """ ``clean_html`` of a comment, remembered for the next polls """
+    return clean_html(comment)
+
 @cached(cache=LRUCache(maxsize=100))
 def eval_mapping(eval_value, wrapper=None):
     """
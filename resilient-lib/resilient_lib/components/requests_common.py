@@ -3,13 +3,20 @@
 # pragma pylint: disable=unused-argument, no-self-use
 
 import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
 import requests
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
 from deprecated import deprecated
 from resilient_lib.components.integration_errors import IntegrationError
 from resilient_lib.components.resilient_common import str_to_bool
 from retry.api import retry_call
 from six import PY2
+from six.moves.urllib.parse import urlsplit
 
 from resilient import constants as res_constants
 from resilient import get_and_parse_proxy_env_var, is_env_proxies_set
@@ -18,6 +25,15 @@ LOG = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 30
 
+# app.config settings for the connection pool and per host limits.
+# Can be set in ``[integrations]`` or the function section, which takes precedence
+POOL_CONNECTIONS = "pool_connections"
+POOL_MAXSIZE = "pool_maxsize"
+POOL_BLOCK = "pool_block"
+MAX_CONCURRENT_REQUESTS_PER_HOST = "max_concurrent_requests_per_host"
+RATE_LIMIT_PER_HOST = "rate_limit_per_host"
+RATE_LIMIT_BURST = "rate_limit_burst"
+
 
 class RequestsCommon(object):
     """
@@ -48,6 +64,151 @@ class RequestsCommon(object):
         # base class requests object (i.e. with persistent sessions):
         self.request_obj = requests.Session()
 
+        # size the connection pools of the session. The session is shared by all the
+        # FunctionWorker threads, so the requests default of 10 connections per host
+        # can be too small. pool_block=True waits for a free connection instead of
+        # opening (and then discarding) an extra one
+        adapter = HTTPAdapter(pool_connections=self._get_pool_size_option(POOL_CONNECTIONS),
+                              pool_maxsize=self._get_pool_size_option(POOL_MAXSIZE),
+                              pool_block=self.get_pool_option(POOL_BLOCK, DEFAULT_POOLBLOCK, str_to_bool))
+        self.request_obj.mount("https://", adapter)
+        self.request_obj.mount("http://", adapter)
+
+        self.host_limiter = HostLimiter(
+            max_concurrent=self._get_limit_option(MAX_CONCURRENT_REQUESTS_PER_HOST, int),
+            rate=self._get_limit_option(RATE_LIMIT_PER_HOST, float),
+            burst=self._get_limit_option(RATE_LIMIT_BURST, int))
+
+    def _get_pool_size_option(self, name):
+        """A connection pool size setting, or the requests default if it is not a number greater than 0"""
+        try:
+            value = self.get_pool_option(name, DEFAULT_POOLSIZE, int)
+        except (TypeError, ValueError):
+            value = 0
+
+        if value <= 0:
+            LOG.warning("'%s' must be a number greater than 0, not '%s'. The default of %s is used",
+                        name, self.get_pool_option(name), DEFAULT_POOLSIZE)
+            return DEFAULT_POOLSIZE
+        return value
+
+    def _get_limit_option(self, name, convert):
+        """A per host limit setting, or ``None`` for no limit if it is not a number greater than 0"""
+        value = self.get_pool_option(name)
+        try:
+            value = convert(value) if value is not None else None
+        except (TypeError, ValueError):
+            value = 0
+
+        if value is not None and value <= 0:
+            LOG.warning("'%s' must be a number greater than 0, not '%s'. No limit is used", name, self.get_pool_option(name))
+            return None
+        return value
+
+    def get_pool_option(self, name, default=None, convert=None):
+        """
+        Get a connection pool or per host limit setting from the **Function Section** (``[my_function]``)
+        of your app.config file, or from the **Integrations Section** (``[integrations]``).
+        ``[my_function]`` section takes precedence over ``[integrations]`` section value.
+
+        The settings are:
+
+        * ``pool_connections``: number of hosts to keep a pool of connections for. Default ``10``
+        * ``pool_maxsize``: number of connections to keep open to each host. Default ``10``
+        * ``pool_block``: if ``True``, wait for a free connection when all ``pool_maxsize`` are in use. Default ``False``
+        * ``max_concurrent_requests_per_host``: number of requests that can be made to a host at the same time. Default unlimited
+        * ``rate_limit_per_host``: number of requests per second that can be made to a host. Default unlimited
+        * ``rate_limit_burst``: number of requests that can be made to a host at once before ``rate_limit_per_host`` applies.
+          Default ``rate_limit_per_host`` rounded up
+
+        Example:
+
+          .. code-block::
+
+            [fn_my_app]
+            ...
+            pool_maxsize = 50
+            max_concurrent_requests_per_host = 20
+            rate_limit_per_host = 5
+
+        :param name: name of the setting
+        :type name: str
+        :param default: value if the setting is not in either section
+        :param convert: (Optional) function to convert the value with. Ex: ``int``
+        :type convert: function
+        :return: value of the setting
+        """
+        value = None
+
+        if self.integration_options and self.integration_options.get(name) not in (None, ""):
+            value = self.integration_options.get(name)
+
+        if self.function_opts and self.function_opts.get(name) not in (None, ""):
+            value = self.function_opts.get(name)
+
+        if value is None:
+            return default
+
+        return convert(value) if convert else value
+
+    def get_pool_stats(self):
+        """
+        Get the utilization of the connection pool of each host that requests have been made to.
+
+        ``connections_created`` and ``requests`` are totals since the pool was created,
+        ``idle_connections`` are open connections waiting to be reused.
+        ``in_flight``, ``throttled`` and ``throttled_seconds`` are from the per host limits:
+        the requests running now and how many requests had to wait (and for how long in total)
+        because of ``max_concurrent_requests_per_host`` or ``rate_limit_per_host``.
+
+        **Example:**
+
+        .. code-block:: python
+
+            {
+                "https://example.com:443": {
+                    "pool_maxsize": 10,
+                    "connections_created": 4,
+                    "requests": 120,
+                    "idle_connections": 3,
+                    "in_flight": 1,
+                    "throttled": 12,
+                    "throttled_seconds": 2.4
+                }
+            }
+
+        :return: stats of each host, keyed by ``<scheme>://<host>:<port>``
+        :rtype: dict
+        """
+        stats = {}
+
+        # RequestsCommonWithoutSession uses the requests module, which has no pools to report
+        adapters = self.request_obj.adapters.values() if isinstance(self.request_obj, requests.Session) else []
+
+        for adapter in set(adapters):
+            pool_manager = getattr(adapter, "poolmanager", None)
+            if not pool_manager:
+                continue
+
+            for pool_key in pool_manager.pools.keys():
+                pool = pool_manager.pools.get(pool_key)
+                if pool is None:
+                    continue
+                host_key = u"{0}://{1}:{2}".format(pool.scheme, pool.host, pool.port)
+                # the queue of a pool is pre-filled with None for connections not yet made
+                idle = sum(1 for conn in list(pool.pool.queue) if conn) if pool.pool else 0
+                stats[host_key] = {
+                    "pool_maxsize": pool.pool.maxsize if pool.pool else 0,
+                    "connections_created": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "idle_connections": idle
+                }
+
+        for host_key, limiter_stats in self.host_limiter.get_stats().items():
+            stats.setdefault(host_key, {}).update(limiter_stats)
+
+        return stats
+
     def get_proxies(self):
         """
         Proxies can be specified globally for all integrations or specifically per function.
@@ -334,8 +495,10 @@ class RequestsCommon(object):
             # can call it directly because the args are available
             # from the outer function
             def __execute_request_retriable():
-                # Pass request to requests.request() function
-                response = self.request_obj.request(method, url, timeout=timeout, proxies=proxies, cert=clientauth, verify=verify, **kwargs)
+                # Pass request to requests.request() function,
+                # waiting first if a limit for this host has been reached
+                with self.host_limiter.limit(url):
+                    response = self.request_obj.request(method, url, timeout=timeout, proxies=proxies, cert=clientauth, verify=verify, **kwargs)
 
                 # Debug logging
                 LOG.debug(response.status_code)
@@ -491,6 +654,185 @@ class RequestsCommonWithoutSession(RequestsCommon):
         self.request_obj = requests
 
 
+class TokenBucket(object):
+    """
+    Thread-safe token bucket rate limiter. Tokens are added at ``rate`` per second,
+    up to ``burst`` tokens. Each call to :meth:`acquire` takes a token, waiting if there is none.
+
+    :param rate: tokens added per second
+    :type rate: float
+    :param burst: (Optional) the most tokens the bucket can hold. Defaults to ``rate`` rounded up
+    :type burst: int
+    """
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst else float(max(1, math.ceil(rate)))
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a token, sleeping until one is available
+
+        :return: the number of seconds waited
+        :rtype: float
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+
+# The semaphore, TokenBucket and stats of each host, keyed by the host and the limits.
+# Apps usually create a RequestsCommon for each function invocation,
+# so the limits are shared by all the HostLimiters of the process.
+# Ordered from the least recently used, which are removed first past MAX_HOST_LIMITS
+_HOST_LIMITS = OrderedDict()
+_HOST_LIMITS_LOCK = threading.Lock()
+MAX_HOST_LIMITS = 1000
+
+
+class HostLimiter(object):
+    """
+    Per host concurrency and rate limits for :class:`RequestsCommon`. Each host
+    gets its own semaphore and :class:`TokenBucket`, created the first time a request is made to it
+    and shared by every ``HostLimiter`` of the process with the same limits.
+    If neither limit is set, :meth:`limit` does nothing.
+
+    :param max_concurrent: (Optional) number of requests that can be made to each host at the same time
+    :type max_concurrent: int
+    :param rate: (Optional) requests per second that can be made to each host
+    :type rate: float
+    :param burst: (Optional) burst size of the token bucket of each host
+    :type burst: int
+    """
+    def __init__(self, max_concurrent=None, rate=None, burst=None):
+        self.max_concurrent = max_concurrent
+        self.rate = rate
+        self.burst = burst
+        self.enabled = bool(max_concurrent or rate)
+        self._limits = (max_concurrent, rate, burst)
+
+    def _get_host(self, host_key):
+        """Get the limits of a host and count it as in use, until :meth:`limit` is done with it"""
+        key = (host_key,) + self._limits
+        with _HOST_LIMITS_LOCK:
+            host = _HOST_LIMITS.get(key)
+            if host is None:
+                host = {
+                    "semaphore": threading.BoundedSemaphore(self.max_concurrent) if self.max_concurrent else None,
+                    "bucket": TokenBucket(self.rate, self.burst) if self.rate else None,
+                    "users": 0,
+                    "in_flight": 0,
+                    "throttled": 0,
+                    "throttled_seconds": 0.0
+                }
+                _HOST_LIMITS[key] = host
+            else:
+                _HOST_LIMITS.move_to_end(key)
+            host["users"] += 1
+            _remove_unused_host_limits()
+        return host
+
+    @contextmanager
+    def limit(self, url):
+        """
+        Context manager that waits until a request to the host of ``url`` is allowed
+
+        :param url: URL the request is made to
+        :type url: str
+        """
+        if not self.enabled:
+            yield
+            return
+
+        host = self._get_host(get_host_key(url))
+        waited = 0.0
+
+        try:
+            if host["semaphore"]:
+                if not host["semaphore"].acquire(blocking=False):
+                    start = time.monotonic()
+                    host["semaphore"].acquire()
+                    waited += time.monotonic() - start
+
+            try:
+                if host["bucket"]:
+                    waited += host["bucket"].acquire()
+
+                with _HOST_LIMITS_LOCK:
+                    host["in_flight"] += 1
+                    if waited:
+                        host["throttled"] += 1
+                        host["throttled_seconds"] += waited
+
+                try:
+                    yield
+                finally:
+                    with _HOST_LIMITS_LOCK:
+                        host["in_flight"] -= 1
+            finally:
+                if host["semaphore"]:
+                    host["semaphore"].release()
+        finally:
+            with _HOST_LIMITS_LOCK:
+                host["users"] -= 1
+
+    def get_stats(self):
+        """
+        :return: ``in_flight``, ``throttled`` and ``throttled_seconds`` for each host
+        :rtype: dict
+        """
+        with _HOST_LIMITS_LOCK:
+            return dict((key[0], {"in_flight": host["in_flight"],
+                                  "throttled": host["throttled"],
+                                  "throttled_seconds": round(host["throttled_seconds"], 3)})
+                        for key, host in _HOST_LIMITS.items() if key[1:] == self._limits)
+
+
+def _remove_unused_host_limits():
+    """
+    Remove the least recently used limits past ``MAX_HOST_LIMITS``.
+    Limits still in use by a request are kept, so their semaphore is not replaced.
+    Called with ``_HOST_LIMITS_LOCK`` held
+    """
+    excess = len(_HOST_LIMITS) - MAX_HOST_LIMITS
+    if excess <= 0:
+        return
+
+    for key in [key for key, host in _HOST_LIMITS.items() if not host["users"]][:excess]:
+        del _HOST_LIMITS[key]
+
+
+def get_host_key(url):
+    """
+    Get the ``<scheme>://<host>:<port>`` of a URL, using the default port of the scheme if there is none
+
+    :param url: a URL. Ex: ``https://example.com/api``
+    :type url: str
+    :return: Ex: ``https://example.com:443``
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower() or "http"
+    port = parts.port or (443 if scheme == "https" else 80)
+    return u"{0}://{1}:{2}".format(scheme, (parts.hostname or "").lower(), port)
+
+
 def is_payload_in_json(content_type):
     """
     Verify the content_type.
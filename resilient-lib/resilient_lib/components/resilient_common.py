@@ -16,10 +16,10 @@ else:
     from urllib import quote
 
 import resilient
-from bs4 import BeautifulSoup
 from cachetools import TTLCache, cached
 from six import string_types
 
+from resilient_lib.components.html2markdown import HTMLTextParser
 from resilient_lib.util import constants
 
 CP4S_PREFIX = "cases-rest."
@@ -176,6 +176,7 @@ def clean_html(html_fragment):
     """
     SOAR textarea fields return HTML fragments. This routine removes the
     HTML and inserts any code within ``<div></div>`` with a linefeed.
+    The text is found with :class:`.HTMLTextParser` in one pass over the HTML.
 
     .. note::
         The string returned from this method may not format well as no presentation of line feeds are preserved,
@@ -191,9 +192,7 @@ def clean_html(html_fragment):
     if not html_fragment or not isinstance(html_fragment, string_types):
         return html_fragment
 
-    s = BeautifulSoup(unescape(html_fragment), "html.parser")
-
-    return " ".join(s.strings)
+    return HTMLTextParser().convert(unescape(html_fragment))
 
 
 def unescape(data):
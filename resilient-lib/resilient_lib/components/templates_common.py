@@ -102,14 +102,17 @@ import calendar
 import datetime
 import json
 import logging
+import multiprocessing
 import os
 import pprint
 import random
 import re
 import sys
+import threading
 import time
 
 import pytz
+from cachetools import LRUCache
 from jinja2 import Undefined, select_autoescape
 from jinja2.sandbox import SandboxedEnvironment as Environment
 from jinja2.exceptions import TemplateError, TemplateSyntaxError
@@ -137,11 +140,64 @@ LOG = logging.getLogger(__name__)
 
 UNDEFINED_LABEL = "[undefined]"
 
+# Max number of compiled templates and of template files to keep
+TEMPLATE_CACHE_SIZE = 256
+
+# Compiled templates by the text of the template, so a template rendered
+# over and over is only parsed and compiled by Jinja once
+_COMPILED_TEMPLATES = LRUCache(maxsize=TEMPLATE_CACHE_SIZE)
+# Contents of template files by their path, with the mtime and size they had when read
+_TEMPLATE_FILES = LRUCache(maxsize=TEMPLATE_CACHE_SIZE)
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+
+# Records sent to each worker process at a time by the batch render functions
+DEFAULT_RENDER_CHUNKSIZE = 100
+
+# Control characters replaced with spaces in rendered templates
+_CTL_CHARS = "".join(chr(n) for n in range(1, 32))
+_CTL_CHARS_TABLE = bytes.maketrans(_CTL_CHARS.encode("ascii"), b" " * len(_CTL_CHARS))
+
+
+def _compile_template(stringtemplate):
+    """
+    Get the compiled Jinja template for ``stringtemplate``, compiling it
+    the first time with our environment
+
+    :param stringtemplate: the text of the template
+    :type stringtemplate: str
+    :return: the compiled template
+    :rtype: jinja2.Template
+    """
+    env = environment()
+    key = (id(env), stringtemplate)
+    with _TEMPLATE_CACHE_LOCK:
+        jtemplate = _COMPILED_TEMPLATES.get(key)
+    if jtemplate is None:
+        jtemplate = env.from_string(stringtemplate)
+        with _TEMPLATE_CACHE_LOCK:
+            _COMPILED_TEMPLATES[key] = jtemplate
+    return jtemplate
+
+
+def clear_template_cache():
+    """
+    Remove all the compiled templates and template files cached by
+    :func:`render` and :func:`make_payload_from_template`.
+
+    Not needed after a template file is changed, as the file is read again
+    when its modification time or size changes
+    """
+    with _TEMPLATE_CACHE_LOCK:
+        _COMPILED_TEMPLATES.clear()
+        _TEMPLATE_FILES.clear()
+
 
 def render(template, data):
     """
     Render data into a template, producing a string result. All the additional custom filters are available.
 
+    The compiled template is cached, so rendering the same template again does not parse it again.
+
     :param template: Path to or a dict of the Jinja template
     :type template: str or dict
     :param data: JSON data to apply to the template
@@ -190,22 +246,33 @@ def render(template, data):
         u'template=1436918400000'
     """
 
-    stringtemplate = template
+    return _render_compiled(_get_compiled_template(template), data)
+
+
+def _get_template_text(template):
+    """ the text of a template string or dict """
     if isinstance(template, dict):
-        stringtemplate = json.dumps(template, sort_keys=True)
+        return json.dumps(template, sort_keys=True)
+    return template
+
 
+def _get_compiled_template(template):
+    """ the compiled Jinja template of a template string or dict """
+    stringtemplate = _get_template_text(template)
     try:
-        jtemplate = environment().from_string(stringtemplate)
+        return _compile_template(stringtemplate)
     except TemplateSyntaxError as err:
         LOG.error("Render failed: %s, with template: %s", str(err), stringtemplate)
         raise
 
+
+def _render_compiled(jtemplate, data):
+    """ render data into a compiled template """
     try:
-        stringvalue = jtemplate.render(data)
+        return jtemplate.render(data)
     except TemplateError:
         LOG.error("Render failed, with data: %s", data)
         raise
-    return stringvalue
 
 
 def render_json(template, data):
@@ -232,15 +299,85 @@ def render_json(template, data):
        >>> render_json('{"result":"{{value}}"}', d)
        {u'result': u'the new thing'}
     """
-    result = render(template, data)
+    return _render_compiled_json(_get_compiled_template(template), data)
+
+
+def _render_compiled_json(jtemplate, data):
+    """ render data into a compiled template, producing a JSON result """
+    result = _render_compiled(jtemplate, data)
     result = _remove_ctl_chars(result)
     return _convert_to_json(result)
 
 
+def render_json_batch(template, records, processes=None, chunksize=DEFAULT_RENDER_CHUNKSIZE):
+    """
+    Render each record of ``records`` into a template, producing a JSON result
+    for each, like :func:`render_json`. The template is compiled once for all the records.
+
+    The results are yielded as they are rendered, so ``records`` can be a generator
+    and the results do not all have to be held in memory.
+
+    For very large batches, set ``processes`` to render the records in that many
+    worker processes, ``chunksize`` records at a time. The records and results must
+    then be picklable (e.g. from JSON) and any custom filters must have been added to
+    :func:`global_jinja_env` before this is called. The results are still yielded in the
+    order of ``records``.
+
+    :param template: the Jinja template
+    :type template: str or dict
+    :param records: the data of each record to apply to the template
+    :type records: iterable of dict
+    :param processes: number of worker processes to render with. Default is ``None``, to render in this process
+    :type processes: int
+    :param chunksize: number of records to send to a worker process at a time. Default is ``100``
+    :type chunksize: int
+    :return: a generator of the rendered template of each record as a dictionary
+    :rtype: generator(dict)
+    :raises ValueError: if a rendered template is not valid JSON
+
+    **Example:**
+
+    .. code-block:: python
+
+        from resilient_lib import render_json_batch
+
+        for case_payload in render_json_batch(case_template, alerts, processes=4):
+            soar_common.create_soar_case(case_payload)
+    """
+    stringtemplate = _get_template_text(template)
+    jtemplate = _get_compiled_template(stringtemplate)
+
+    if processes and processes > 1:
+        with multiprocessing.Pool(processes, initializer=_init_render_worker, initargs=(stringtemplate,)) as pool:
+            for result in pool.imap(_render_json_worker, records, chunksize):
+                yield result
+    else:
+        for record in records:
+            yield _render_compiled_json(jtemplate, record)
+
+
+# The compiled template of a worker process of render_json_batch
+_WORKER_TEMPLATE = None
+
+
+def _init_render_worker(stringtemplate):
+    global _WORKER_TEMPLATE
+    _WORKER_TEMPLATE = _get_compiled_template(stringtemplate)
+
+
+def _render_json_worker(record):
+    return _render_compiled_json(_WORKER_TEMPLATE, record)
+
+
 def _remove_ctl_chars(result):
     # replace any control characters with spaces
-    for n in range(1, 32):
-        result = result.replace(chr(n), " ")
+    if result.isascii():
+        # one pass through a translation table
+        return result.encode("ascii").translate(_CTL_CHARS_TABLE).decode("ascii")
+
+    # str.translate is slow for text that is not ASCII, but searching it for each character is fast
+    for char in _CTL_CHARS:
+        result = result.replace(char, " ")
     return result
 
 
@@ -284,9 +421,45 @@ def make_payload_from_template(template_override, default_template, payload, ret
 
     return rendered_payload
 
+def make_payloads_from_template(template_override, default_template, payloads, return_json=True,
+                                processes=None, chunksize=DEFAULT_RENDER_CHUNKSIZE):
+    """
+    Convert each payload of ``payloads`` into a new format based on a specified template,
+    like :func:`make_payload_from_template`. The template file is read and compiled once
+    and the results are yielded as they are rendered, so it suits pollers that sync
+    many records each time they run.
+
+    :param template_override: Path to the specified template
+    :type template_override: str
+    :param default_template: Path to the default template
+    :type default_template: str
+    :param payloads: the ``dict`` of each record to pass to the Jinja template
+    :type payloads: iterable of dict
+    :param return_json: False if template should be render as a ``str``
+        and results returned as a ``str``
+    :type return_json: bool
+    :param processes: number of worker processes to render with if ``return_json`` is ``True``.
+        See :func:`render_json_batch`. Default is ``None``, to render in this process
+    :type processes: int
+    :param chunksize: number of records to send to a worker process at a time. Default is ``100``
+    :type chunksize: int
+    :return: a generator of the rendered template of each payload
+    :rtype: generator(str|dict)
+    :raises ValueError: if ``return_json`` is ``True`` and a rendered template is not valid JSON
+    """
+    template_data = _get_template(template_override, default_template)
+
+    if return_json:
+        for rendered_payload in render_json_batch(template_data, payloads, processes=processes, chunksize=chunksize):
+            yield rendered_payload
+    else:
+        jtemplate = _get_compiled_template(template_data)
+        for payload in payloads:
+            yield _remove_ctl_chars(_render_compiled(jtemplate, payload))
+
 def _get_template(specified_template, default_template):
     """return the contents of a jinja template, either from the default location or from a customer specified
-        custom path
+        custom path. The contents are cached until the file's modification time or size changes
 
     Args:
         specified_template ([str]): [customer specified template path]
@@ -297,7 +470,7 @@ def _get_template(specified_template, default_template):
     """
     template_file_path = specified_template
     if template_file_path:
-        if not (os.path.exists(template_file_path) and os.path.isfile(template_file_path)):
+        if not os.path.isfile(template_file_path):
             LOG.error(u"Template file: %s doesn't exist, using default template",
                         template_file_path)
             template_file_path = None
@@ -310,8 +483,18 @@ def _get_template(specified_template, default_template):
                             )
 
     LOG.debug(u"template file used: %s", template_file_path)
+    stat = os.stat(template_file_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _TEMPLATE_CACHE_LOCK:
+        cached = _TEMPLATE_FILES.get(template_file_path)
+    if cached and cached[0] == version:
+        return cached[1]
+
     with open(template_file_path, "r") as definition:
-        return definition.read()
+        contents = definition.read()
+    with _TEMPLATE_CACHE_LOCK:
+        _TEMPLATE_FILES[template_file_path] = (version, contents)
+    return contents
 
 # C U S T O M   J I N J A   F I L T E R S
 
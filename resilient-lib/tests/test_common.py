@@ -155,6 +155,8 @@ class TestFunctionMetrics(unittest.TestCase):
         self.assertEqual(clean_html("<div>abc</div>"), "abc")
         self.assertEqual(clean_html("<div><ul><li>abc</li><li>def</li></ul></div>"), "abc def")
         self.assertEqual(clean_html("abc"), "abc")
+        # whitespace between tags and unknown entities are kept as BeautifulSoup keeps them
+        self.assertEqual(clean_html("<div>a</div>\n  <div>&amp;x;</div>"), "a \n &x")
         self.assertIsNone(clean_html(None))
 
     def test_build_incident_url(self):
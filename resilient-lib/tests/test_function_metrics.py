@@ -1,5 +1,9 @@
+import importlib.metadata
+import time
 import unittest
-from resilient_lib.components.function_metrics import FunctionMetrics
+
+from mock import patch
+from resilient_lib.components.function_metrics import FunctionMetrics, LowCodeMetrics, get_package_info
 
 
 class TestFunctionMetrics(unittest.TestCase):
@@ -29,3 +33,38 @@ class TestFunctionMetrics(unittest.TestCase):
         self.assertIsNotNone(result['execution_time_ms'])
         self.assertIsNotNone(result['timestamp'])
 
+
+    def test_package_info_is_cached(self):
+        get_package_info.cache_clear()
+
+        with patch("importlib.metadata.Distribution.from_name", wraps=importlib.metadata.Distribution.from_name) as mock_from_name:
+            for _ in range(5):
+                result = FunctionMetrics("requests").finish()
+                self.assertEqual(result['package'], 'requests')
+
+            self.assertEqual(mock_from_name.call_count, 1)
+
+    def test_extended_metrics_not_included_by_default(self):
+        result = FunctionMetrics("requests").finish()
+
+        self.assertNotIn('queue_wait_ms', result)
+        self.assertNotIn('cpu_time_ms', result)
+
+    def test_extended_metrics(self):
+        queued_time = time.monotonic() - 0.25
+
+        fm = FunctionMetrics("requests")
+        fm.enable_extended_metrics(queued_time=queued_time)
+        result = fm.finish()
+
+        self.assertGreaterEqual(result['queue_wait_ms'], 250)
+        self.assertGreaterEqual(result['cpu_time_ms'], 0)
+
+    def test_extended_metrics_no_cpu_time(self):
+        fm = LowCodeMetrics("requests")
+        fm.enable_extended_metrics(queued_time=time.monotonic(), cpu_time=False)
+        result = fm.finish()
+
+        self.assertIn('queue_wait_ms', result)
+        self.assertNotIn('cpu_time_ms', result)
+        self.assertNotIn('timestamp', result)
@@ -1,5 +1,5 @@
 import unittest
-from resilient_lib.components.html2markdown import MarkdownParser
+from resilient_lib.components.html2markdown import HTMLConverter, HTMLTextParser, MarkdownParser
 
 class TestFunctionMetrics(unittest.TestCase):
     """ Tests for the attachment_hash function"""
@@ -308,3 +308,58 @@ this is line 3</blockquote></div>"""
         parser = MarkdownParser(bullets=["*", "+", "-"])
         converted_mixed = parser.convert(data)
         self.assertEqual(converted_mixed, markdown)
+
+    def test_convert_chunks(self):
+        data = """<div class="rte"><div>this is a line with <strong>bold</strong> and <span style="color: rgb(255,0,0);">red</span></div>""" \
+               """<ol><li>111</li><li>222<ol><li>aaa</li><li>bbb</li></ol></li></ol><div>\n\tend &amp; more</div><div><br/></div></div>"""
+
+        parser = MarkdownParser()
+        markdown = parser.convert(data)
+
+        # any way the html is split, the markdown is the same as converting it all at once
+        for size in (1, 7, 64, len(data)):
+            chunks = [data[i:i + size] for i in range(0, len(data), size)]
+            converted = list(MarkdownParser().convert_chunks(chunks))
+            self.assertEqual("".join(converted), markdown)
+
+        # markdown is yielded before all the html is fed
+        split = data.index("<ol>")
+        chunks = iter([data[:split], data[split:]])
+        converted = MarkdownParser().convert_chunks(chunks)
+        self.assertEqual(next(converted), "this is a line with **bold** and {color:#ff0000}red{color}")
+        # the rest of the html has not been read yet
+        self.assertEqual(next(chunks), data[split:])
+
+    def test_text(self):
+        data = """<!DOCTYPE html><div class="rte"><div><strong>bold</strong> text<br/>a &amp; b</div><!-- note -->""" \
+               """<script>var x = 1;</script><style>p {}</style><div><![CDATA[raw]]></div>"""
+
+        parser = HTMLTextParser()
+        self.assertEqual(parser.convert(data), "bold  text a & b raw")
+        # the parser can be used again
+        self.assertEqual(parser.convert("<div>abc</div>trailing"), "abc trailing")
+        self.assertEqual(parser.convert("no html"), "no html")
+        self.assertIsNone(parser.convert(None))
+
+    def test_text_whitespace(self):
+        parser = HTMLTextParser()
+        # a run of only whitespace becomes one newline or space, as BeautifulSoup does
+        self.assertEqual(parser.convert("<div>a</div>\n  \n<div>b</div>\t <b>c</b>"), "a \n b   c")
+        self.assertEqual(parser.convert("<pre>\n  </pre><textarea> \t</textarea>"), "\n    \t")
+        self.assertEqual(parser.convert("<div>\xa0</div><![CDATA[]]>"), "\xa0  ")
+        # the end tag of a void tag does not end the run of text
+        self.assertEqual(parser.convert("a<br>\n</br>b"), "a \nb")
+
+    def test_text_entities(self):
+        parser = HTMLTextParser()
+        self.assertEqual(parser.convert("&x; &x &ampx &amp; &amp &lt;&#65;&#x42;&#128;&#0;"), u"&x &x &ampx & & <AB\u20ac\ufffd")
+
+    def test_text_skipped_tags(self):
+        parser = HTMLTextParser()
+        self.assertEqual(parser.convert("<ruby>a<rp>(</rp><rt>b</rt></ruby><template><b>c</b></template>d"), "a d")
+        # closing <b> closes the <template> opened in it
+        self.assertEqual(parser.convert("<b><template>c</b>d"), "d")
+
+    def test_converter_is_abstract(self):
+        with self.assertRaises(TypeError):
+            HTMLConverter()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+import subprocess
+import sys
+
+import resilient_lib
+from resilient_lib.components import poller_common, resilient_common, templates_common
+
+
+def _run_python(code):
+    return subprocess.check_output([sys.executable, "-c", code], cwd="/").decode("utf-8").strip()
+
+
+def test_import_does_not_load_heavy_dependencies():
+    result = _run_python(
+        "import sys, resilient_lib; "
+        "print(','.join(m for m in ('bs4', 'jinja2', 'requests', 'resilient') if m in sys.modules))"
+    )
+    assert result == ""
+
+
+def test_lazy_attributes_resolve_to_module_objects():
+    assert resilient_lib.clean_html is resilient_common.clean_html
+    assert resilient_lib.render_json is templates_common.render_json
+    assert resilient_lib.SOARCommon is poller_common.SOARCommon
+    assert resilient_lib.RequestsCommon.__module__ == "resilient_lib.components.requests_common"
+
+
+def test_star_import_exports_lazy_attributes():
+    namespace = {}
+    exec("from resilient_lib import *", namespace)
+
+    for name in ("clean_html", "validate_fields", "make_payload_from_template", "poller",
+                 "RequestsCommon", "OAuth2ClientCredentialsSession", "MarkdownParser", "IntegrationError"):
+        assert name in namespace
+
+
+def test_star_import_precedence_is_kept():
+    # poller_common was the last module star imported so its LOG used to win
+    assert resilient_lib.LOG is poller_common.LOG
+
+
+def test_unknown_attribute_raises():
+    try:
+        resilient_lib.mock_attribute_that_does_not_exist
+        assert False
+    except AttributeError as e:
+        assert "mock_attribute_that_does_not_exist" in str(e)
+
+
+def test_star_attributes_match_module_names():
+    # a new public name of these modules must be added to _LAZY_STAR_ATTRIBUTES to be exported
+    star_attributes = dict(resilient_lib._LAZY_STAR_ATTRIBUTES)
+    for module in (resilient_common, templates_common, poller_common):
+        public_names = set(n for n in vars(module) if not n.startswith("_"))
+        assert set(star_attributes[module.__name__]) == public_names
+
+
+def test_star_import_does_not_export_helpers():
+    result = _run_python(
+        "import sys, resilient_lib; "
+        "all_names = resilient_lib.__all__; "
+        "print(','.join(n for n in ('ast', 'importlib', 'distribution', 'PackageNotFoundError') if n in all_names)); "
+        "print(','.join(m for m in ('jinja2', 'requests', 'resilient') if m in sys.modules))"
+    )
+    assert result == ""
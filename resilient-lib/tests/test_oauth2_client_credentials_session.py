@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 # (c) Copyright IBM Corp. 2010, 2019. All Rights Reserved.
+import threading
+import time
+
 import pytest
 import requests
-import time
 from resilient_lib.components import oauth2_client_credentials_session
 from resilient_lib.components.oauth2_client_credentials_session import OAuth2ClientCredentialsSession
 
@@ -67,6 +69,7 @@ class TestAuthenticator(object):
     def clean_up_singletons(self):
         if OAuth2ClientCredentialsSession.__dict__.get("__it__", None) is not None:
             del OAuth2ClientCredentialsSession.__it__
+        OAuth2ClientCredentialsSession.clear_token_cache()
 
     def test_multiple_sessions_multiple_tokens(self, monkeypatch):
         monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="api1"))
@@ -150,3 +153,112 @@ class TestAuthenticator(object):
 
         with pytest.raises(ValueError):
             auth.get("https://www.ibm.com")
+
+    def test_sessions_share_token(self, monkeypatch):
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="shared", expires_in=50))
+        api1 = OAuth2ClientCredentialsSession("url:example1", "s", "t")
+        monkeypatch.setattr(requests.sessions.Session, 'post', raise_error)
+        api2 = OAuth2ClientCredentialsSession("url:example1", "s", "t")
+
+        assert api2.access_token == "shared"
+        assert api1.get_token_metrics()["token_requests"] == 1
+
+        # a different scope or share_token=False gets its own token
+        with pytest.raises(ValueError):
+            OAuth2ClientCredentialsSession("url:example1", "s", "t", scope=["other"])
+        with pytest.raises(ValueError):
+            OAuth2ClientCredentialsSession("url:example1", "s", "t", share_token=False)
+
+    def test_sessions_with_different_secrets_do_not_share_token(self, monkeypatch):
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="shared", expires_in=50))
+        OAuth2ClientCredentialsSession("url:example1", "s", "t")
+
+        # a wrong or rotated secret must authenticate, and fail, rather than reuse the token
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(status_code=401))
+        with pytest.raises(ValueError):
+            OAuth2ClientCredentialsSession("url:example1", "s", "wrong")
+
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="rotated", expires_in=50))
+        assert OAuth2ClientCredentialsSession("url:example1", "s", "rotated").access_token == "rotated"
+
+    def test_subclass_does_not_share_token(self, monkeypatch):
+        class MockSubclassSession(OAuth2ClientCredentialsSession):
+            pass
+
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="base", expires_in=50))
+        OAuth2ClientCredentialsSession("url:example1", "s", "t")
+
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="subclass", expires_in=50))
+        assert MockSubclassSession("url:example1", "s", "t").access_token == "subclass"
+        assert OAuth2ClientCredentialsSession("url:example1", "s", "t").access_token == "base"
+
+    def test_single_flight_token_refresh(self, monkeypatch):
+        tokens = iter(["token{0}".format(i) for i in range(100)])
+
+        def slow_token_request(*args, **kwargs):
+            time.sleep(0.05)
+            return MockTokenRequest(expires_in=50, token=next(tokens))
+
+        monkeypatch.setattr(requests.sessions.Session, 'post', slow_token_request)
+        monkeypatch.setattr(requests.sessions.Session, 'request', mock_token_request_factory(status_code=200))
+        auth = OAuth2ClientCredentialsSession("test", "test", "test")
+        auth._token_cache.expiration_time = auth.expiration_time = time.time() - 1
+
+        threads = [threading.Thread(target=auth.get, args=("https://www.ibm.com",)) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # only one new token was requested for all 10 threads
+        assert auth.get_token_metrics()["token_requests"] == 2
+        assert auth.access_token == "token1"
+
+    def test_401_uses_token_refreshed_by_another_session(self, monkeypatch):
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="old", expires_in=50))
+        api1 = OAuth2ClientCredentialsSession("test", "test", "test")
+        api2 = OAuth2ClientCredentialsSession("test", "test", "test")
+
+        sent_tokens = []
+
+        def mock_request(session, method, url, *args, **kwargs):
+            sent_tokens.append(kwargs["headers"]["Authorization"])
+            if len(sent_tokens) == 1:
+                # another session gets a new token while this request is in flight
+                monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="new", expires_in=50))
+                api2.update_token()
+                return MockTokenRequest(status_code=401)
+            return MockTokenRequest(status_code=200)
+
+        monkeypatch.setattr(requests.sessions.Session, 'request', mock_request)
+        resp = api1.get("https://www.ibm.com")
+
+        assert resp.status_code == 200
+        assert sent_tokens == ["None old", "None new"]
+        assert api1.get_token_metrics()["token_requests"] == 2
+
+    def test_proactive_background_refresh(self, monkeypatch):
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="old", expires_in=50))
+        monkeypatch.setattr(requests.sessions.Session, 'request', mock_token_request_factory(status_code=200))
+        auth = OAuth2ClientCredentialsSession("test", "test", "test", refresh_fraction=0.5)
+        assert auth.refresh_time == pytest.approx(auth.expiration_time - 25)
+
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(token="new", expires_in=50))
+        auth._token_cache.refresh_time = auth.refresh_time = time.time() - 1
+        auth.get("https://www.ibm.com")
+
+        # the request is not held up and the new token is picked up by the next request
+        for _ in range(100):
+            if auth.get_token_metrics()["background_refreshes"]:
+                break
+            time.sleep(0.01)
+        auth.get("https://www.ibm.com")
+
+        assert auth.access_token == "new"
+        assert auth.get_token_metrics()["background_refreshes"] == 1
+
+    def test_no_proactive_refresh(self, monkeypatch):
+        monkeypatch.setattr(requests.sessions.Session, 'post', mock_token_request_factory(expires_in=50))
+        auth = OAuth2ClientCredentialsSession("test", "test", "test", refresh_fraction=None)
+        assert auth.refresh_time is None
+
@@ -13,6 +13,7 @@ from threading import Thread
 
 import mock
 import pytest
+import requests_mock
 from resilient_lib.components.poller_common import (DEFAULT_CASES_QUERY_FILTER,
                                                     IntegrationError,
                                                     SOARCommon, b_to_s,
@@ -21,7 +22,7 @@ from resilient_lib.components.poller_common import (DEFAULT_CASES_QUERY_FILTER,
                                                     poller, s_to_b)
 from resilient_lib.util import constants
 
-from resilient import SimpleHTTPException
+from resilient import SimpleClient, SimpleHTTPException
 
 NEW_CASE_PAYLOAD = {
   "name": "test case",
@@ -287,6 +288,134 @@ def test_create_datatable_row(fx_mock_resilient_client):
 
 
 
+class BulkRestClient():
+    """
+    records the posts made, failing the ones with a value in 'fail_values' with a 503 'fail_times' times.
+    If 'create_on_failure' is set, the artifacts that fail are created anyway
+    """
+
+    def __init__(self, existing_artifacts=None, fail_values=None, fail_times=1, status_code=503, create_on_failure=False):
+        self.existing_artifacts = existing_artifacts or []
+        self.fail_values = fail_values or []
+        self.fail_times = fail_times
+        self.status_code = status_code
+        self.create_on_failure = create_on_failure
+        self.posts = []
+        self.failures = {}
+
+    def get(self, uri):
+        if uri.endswith("/artifacts"):
+            return self.existing_artifacts
+        if uri == "/types/artifact":
+            return {"fields": {"type": {"values": [{"value": 1, "label": "IP Address"}, {"value": 2, "label": "DNS Name"}]}}}
+        raise ValueError(uri)
+
+    def post(self, uri, payload):
+        value = payload.get("value") if isinstance(payload, dict) and "value" in payload else str(payload)
+        if value in self.fail_values and self.failures.get(value, 0) < self.fail_times:
+            self.failures[value] = self.failures.get(value, 0) + 1
+            if self.create_on_failure:
+                self.existing_artifacts.append(dict(payload, id=100 + len(self.existing_artifacts)))
+            Response = namedtuple("Response", ["reason", "text", "status_code"])
+            raise SimpleHTTPException(Response("Service Unavailable", "try again", self.status_code))
+        self.posts.append((uri, payload))
+        return dict(payload, id=len(self.posts))
+
+
+@pytest.mark.skipif(sys.version_info < constants.MIN_SUPPORTED_PY_VERSION, reason="poller common requires python3.6 or higher")
+def test_create_case_artifacts():
+    rest_client = BulkRestClient(existing_artifacts=[{"id": 10, "type": 1, "value": "10.0.0.1"}], fail_values=["10.0.0.3"])
+    soar_common = SOARCommon(rest_client)
+
+    artifacts = [{"type": {"name": "IP Address"}, "value": "10.0.0.1"},
+                 {"type": "IP Address", "value": "10.0.0.2"},
+                 {"type": 1, "value": "10.0.0.3"},
+                 {"type": 2, "value": "10.0.0.1"},
+                 {"type": {"id": 1}, "value": "10.0.0.2"}]
+    outcomes = soar_common.create_case_artifacts(2314, artifacts, retry_delay=0)
+
+    assert [outcome["status"] for outcome in outcomes] == ["skipped", "created", "created", "created", "skipped"]
+    assert outcomes[0]["result"]["id"] == 10
+    assert [outcome["item"] for outcome in outcomes] == artifacts
+    assert rest_client.failures == {"10.0.0.3": 1}
+    assert len(rest_client.posts) == 3
+    assert all(uri == "/incidents/2314/artifacts" for uri, _payload in rest_client.posts)
+
+    rest_client.posts = []
+    soar_common.create_case_artifacts(2314, artifacts, skip_existing=False)
+    assert len(rest_client.posts) == 5
+
+
+@pytest.mark.skipif(sys.version_info < constants.MIN_SUPPORTED_PY_VERSION, reason="poller common requires python3.6 or higher")
+def test_create_case_artifacts_failed_but_created():
+    # the 503 came after the artifact was created, so it is not created again
+    rest_client = BulkRestClient(fail_values=["10.0.0.1"], create_on_failure=True)
+    soar_common = SOARCommon(rest_client)
+
+    outcomes = soar_common.create_case_artifacts(2314, [{"type": 1, "value": "10.0.0.1"}], retry_delay=0)
+    assert outcomes[0]["status"] == "created"
+    assert outcomes[0]["result"]["id"] == 100
+    assert rest_client.posts == []
+
+    # without skip_existing it cannot be checked, so it is not tried again
+    rest_client = BulkRestClient(fail_values=["10.0.0.1"])
+    soar_common = SOARCommon(rest_client)
+    outcomes = soar_common.create_case_artifacts(2314, [{"type": 1, "value": "10.0.0.1"}], skip_existing=False, retry_delay=0)
+    assert outcomes[0]["status"] == "failed"
+    assert rest_client.posts == []
+
+
+@pytest.mark.skipif(sys.version_info < constants.MIN_SUPPORTED_PY_VERSION, reason="poller common requires python3.6 or higher")
+def test_create_case_artifacts_http_calls():
+    # only create_case_artifacts tries the POST again, not the SimpleClient
+    rest_client = SimpleClient(org_name="Test Org", base_url="https://soar.example.com")
+    rest_client.org_id = 201
+    rest_client.request_retry_delay = 0
+    soar_common = SOARCommon(rest_client)
+    url = "https://soar.example.com/rest/orgs/201/incidents/2314/artifacts"
+
+    for status_code, posts in ((500, 1), (429, 3)):
+        with requests_mock.Mocker() as soar_mock:
+            soar_mock.get("https://soar.example.com/rest/orgs/201/types/artifact", json={})
+            soar_mock.post(url, status_code=status_code, text="failed")
+            outcomes = soar_common.create_case_artifacts(2314, [{"type": 1, "value": "10.0.0.1"}],
+                                                         skip_existing=False, retry_delay=0)
+            assert outcomes[0]["status"] == "failed"
+            assert len([request for request in soar_mock.request_history if request.method == "POST"]) == posts
+
+    # the client of the SOARCommon still retries other requests
+    assert rest_client.request_max_retries == 5
+
+
+@pytest.mark.skipif(sys.version_info < constants.MIN_SUPPORTED_PY_VERSION, reason="poller common requires python3.6 or higher")
+def test_create_case_comments_and_datatable_rows_failures():
+    # a 429 is tried up to retry_tries times
+    rest_client = BulkRestClient(fail_values=["{'cells': {'col': {'value': 2}}}"], fail_times=5, status_code=429)
+    soar_common = SOARCommon(rest_client)
+
+    outcomes = soar_common.create_datatable_rows(2314, "custom_dt", [{"col": 1}, {"col": 2}], retry_tries=2, retry_delay=0)
+    assert [outcome["status"] for outcome in outcomes] == ["created", "failed"]
+    assert "Service Unavailable" in outcomes[1]["error"]
+    assert rest_client.failures == {"{'cells': {'col': {'value': 2}}}": 2}
+    assert rest_client.posts[0][0] == "/incidents/2314/table_data/custom_dt/row_data"
+
+    # the row may have been created after a 503 or a 409, so they are not tried again
+    for status_code in (503, 409):
+        rest_client = BulkRestClient(fail_values=["{'cells': {'col': {'value': 2}}}"], status_code=status_code)
+        soar_common = SOARCommon(rest_client)
+        outcomes = soar_common.create_datatable_rows(2314, "custom_dt", [{"col": 1}, {"col": 2}], retry_delay=0)
+        assert [outcome["status"] for outcome in outcomes] == ["created", "failed"]
+        assert rest_client.failures == {"{'cells': {'col': {'value': 2}}}": 1}
+
+    rest_client = BulkRestClient(fail_values=["{'text': {'format': 'html', 'content': 'note 2'}}"], status_code=400)
+    soar_common = SOARCommon(rest_client)
+
+    outcomes = soar_common.create_case_comments(2314, ["note 1", "note 2", "note 3"], retry_delay=0)
+    assert [outcome["status"] for outcome in outcomes] == ["created", "failed", "created"]
+    assert outcomes[0]["result"]["text"]["content"] == "note 1"
+    assert len(rest_client.failures) == 1 and list(rest_client.failures.values()) == [1]
+
+
 @pytest.mark.livetest
 @pytest.mark.skipif(sys.version_info < constants.MIN_SUPPORTED_PY_VERSION, reason="poller common requires python3.6 or higher")
 def test_get_case_attachment(fx_mock_resilient_client):
@@ -336,6 +465,11 @@ def test_filter_soar_comments(fx_mock_resilient_client):
 
     assert resp == ["comment to add"]
 
+    mock_entity_comments = ["<div>new comment to add here</div>", "<div><b>From SOAR</b> comment</div>", "<p>comment to add</p>"]
+    resp = soar_common._filter_comments(mock_soar_comments, mock_entity_comments, filter_soar_header="<b>From SOAR</b>")
+
+    assert resp == ["<p>comment to add</p>"]
+
 
 @pytest.mark.livetest
 @pytest.mark.skipif(sys.version_info < constants.MIN_SUPPORTED_PY_VERSION, reason="poller common requires python3.6 or higher")
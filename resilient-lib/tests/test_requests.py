@@ -1,8 +1,10 @@
 import json
 import logging
 import os
+import threading
 import time
 import unittest
+from unittest import mock
 
 import pytest
 import requests
@@ -11,8 +13,10 @@ import requests_mock
 from parameterized import parameterized
 from resilient_lib import (IntegrationError, RequestsCommon,
                            RequestsCommonWithoutSession)
+from resilient_lib.components import requests_common
 from resilient_lib.components.requests_common import (
-    get_case_insensitive_key_value, is_payload_in_json)
+    HostLimiter, TokenBucket, get_case_insensitive_key_value, get_host_key,
+    is_payload_in_json)
 from retry.api import retry_call
 from six import PY2
 from tests.shared_mock_data import mock_paths
@@ -958,3 +962,155 @@ class TestFunctionRequests(unittest.TestCase):
 
         assert "Cannot use retry in resilient_lib.RequestsCommon.execute in Python 2.7" in self.caplog.text
         assert "retrying in" not in self.caplog.text
+
+
+class TestRequestsCommonPool(unittest.TestCase):
+    """ Tests for the connection pool settings and per host limits. These do not make live calls """
+
+    @pytest.fixture(autouse=True)
+    def init_caplog_fixture(self, caplog):
+        self.caplog = caplog
+
+    def setUp(self):
+        # the per host limits are shared by the whole process
+        requests_common._HOST_LIMITS.clear()
+
+    def test_default_pool_settings(self):
+        rc = RequestsCommon()
+        adapter = rc.request_obj.get_adapter("https://example.com")
+        assert adapter._pool_maxsize == 10
+        assert adapter._pool_block is False
+        assert rc.host_limiter.enabled is False
+
+    def test_pool_settings_function_section_takes_precedence(self):
+        rc = RequestsCommon(opts={"integrations": {"pool_maxsize": "20", "pool_connections": "5", "rate_limit_per_host": "2"}},
+                            function_opts={"pool_maxsize": "50", "pool_block": "true", "max_concurrent_requests_per_host": ""})
+        adapter = rc.request_obj.get_adapter("https://example.com")
+        assert adapter._pool_maxsize == 50
+        assert adapter._pool_connections == 5
+        assert adapter._pool_block is True
+        assert rc.host_limiter.max_concurrent is None
+        assert rc.host_limiter.rate == 2.0
+
+    def test_bad_limit_settings_are_ignored(self):
+        rc = RequestsCommon(function_opts={"max_concurrent_requests_per_host": "ten", "rate_limit_per_host": "0",
+                                           "rate_limit_burst": "-1"})
+        assert rc.host_limiter.enabled is False
+        assert rc.host_limiter.max_concurrent is None
+        assert rc.host_limiter.rate is None
+        assert rc.host_limiter.burst is None
+        assert "'max_concurrent_requests_per_host' must be a number greater than 0, not 'ten'" in self.caplog.text
+        assert "'rate_limit_per_host' must be a number greater than 0, not '0'" in self.caplog.text
+
+    def test_bad_pool_settings_use_the_default(self):
+        rc = RequestsCommon(function_opts={"pool_maxsize": "fifty", "pool_connections": "0"})
+        adapter = rc.request_obj.get_adapter("https://example.com")
+        assert adapter._pool_maxsize == 10
+        assert adapter._pool_connections == 10
+        assert "'pool_maxsize' must be a number greater than 0, not 'fifty'. The default of 10 is used" in self.caplog.text
+        assert "'pool_connections' must be a number greater than 0, not '0'" in self.caplog.text
+
+    def test_host_limits_are_bounded(self):
+        rc = RequestsCommon(function_opts={"max_concurrent_requests_per_host": "1"})
+
+        with mock.patch.object(requests_common, "MAX_HOST_LIMITS", 3):
+            with rc.host_limiter.limit("https://in-use.com"):
+                for i in range(5):
+                    with rc.host_limiter.limit("https://host{0}.com".format(i)):
+                        pass
+                # the least recently used are removed, but not the one still in use
+                assert sorted(rc.host_limiter.get_stats()) == ["https://host3.com:443", "https://host4.com:443",
+                                                               "https://in-use.com:443"]
+
+            with rc.host_limiter.limit("https://host3.com"):
+                pass
+            with rc.host_limiter.limit("https://host5.com"):
+                pass
+            # in-use.com is the least recently used now
+            assert sorted(rc.host_limiter.get_stats()) == ["https://host3.com:443", "https://host4.com:443",
+                                                           "https://host5.com:443"]
+
+    def test_host_limits_are_shared(self):
+        # a RequestsCommon is usually created for each function invocation
+        rc_one = RequestsCommon(function_opts={"rate_limit_per_host": "1", "rate_limit_burst": "1"})
+        rc_two = RequestsCommon(function_opts={"rate_limit_per_host": "1", "rate_limit_burst": "1"})
+        rc_other = RequestsCommon(function_opts={"rate_limit_per_host": "100"})
+
+        with rc_one.host_limiter.limit("https://example.com/api"):
+            pass
+        with rc_other.host_limiter.limit("https://example.com/api"):
+            pass
+        start = time.monotonic()
+        with rc_two.host_limiter.limit("https://example.com/api"):
+            pass
+
+        assert time.monotonic() - start >= 0.5
+        assert rc_one.host_limiter.get_stats()["https://example.com:443"]["throttled"] == 1
+        assert rc_other.host_limiter.get_stats()["https://example.com:443"]["throttled"] == 0
+
+    def test_get_host_key(self):
+        assert get_host_key("https://Example.com/api?a=b") == "https://example.com:443"
+        assert get_host_key("http://example.com/api") == "http://example.com:80"
+        assert get_host_key("http://example.com:8080") == "http://example.com:8080"
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        waits = [bucket.acquire() for _ in range(4)]
+        elapsed = time.monotonic() - start
+
+        # the burst is immediate, then each token takes 1/20th of a second
+        assert waits[0] == 0 and waits[1] == 0
+        assert elapsed >= 0.09
+
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_host_limiter_max_concurrent(self):
+        limiter = HostLimiter(max_concurrent=2)
+        running = []
+        max_running = []
+        lock = threading.Lock()
+
+        def mock_request():
+            with limiter.limit("https://example.com/api"):
+                with lock:
+                    running.append(1)
+                    max_running.append(len(running))
+                time.sleep(0.02)
+                with lock:
+                    running.pop()
+
+        threads = [threading.Thread(target=mock_request) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert max(max_running) == 2
+        stats = limiter.get_stats()["https://example.com:443"]
+        assert stats["in_flight"] == 0
+        assert stats["throttled"] >= 1
+
+    def test_host_limiter_is_per_host(self):
+        limiter = HostLimiter(rate=1, burst=1)
+        start = time.monotonic()
+        with limiter.limit("https://one.example.com"):
+            pass
+        with limiter.limit("https://two.example.com"):
+            pass
+        assert time.monotonic() - start < 0.5
+        assert sorted(limiter.get_stats()) == ["https://one.example.com:443", "https://two.example.com:443"]
+
+    @parameterized.expand(REQUESTS_COMMON_CLASSES)
+    def test_get_pool_stats(self, RCObjectType):
+        rc = RCObjectType(function_opts={"max_concurrent_requests_per_host": 5})
+        with requests_mock.Mocker() as m:
+            m.get("https://example.com/api", text="ok")
+            rc.execute("GET", "https://example.com/api")
+            rc.execute("GET", "https://example.com/api")
+
+        stats = rc.get_pool_stats()
+        assert stats["https://example.com:443"]["in_flight"] == 0
+        assert stats["https://example.com:443"]["throttled"] == 0
+
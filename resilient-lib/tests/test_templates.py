@@ -3,9 +3,13 @@ import os
 
 import jinja2
 import pytest
-from resilient_lib import (global_jinja_env, make_payload_from_template,
-                           render, render_json)
-from resilient_lib.components.templates_common import (soar_datetimeformat,
+from mock import patch
+from resilient_lib import (clear_template_cache, global_jinja_env,
+                           make_payload_from_template,
+                           make_payloads_from_template, render, render_json,
+                           render_json_batch)
+from resilient_lib.components.templates_common import (_remove_ctl_chars,
+                                                       soar_datetimeformat,
                                                        soar_splitpart,
                                                        soar_substitute,
                                                        soar_trimlist,
@@ -250,3 +254,59 @@ def test_template_injection():
 ])
 def test_sh_filter(shell_params, expected_results):
     assert sh_filter(shell_params) == expected_results
+
+
+def test_compiled_template_cache():
+    clear_template_cache()
+    template = {"name": "{{ name }}", "severity": "{{ severity }}"}
+
+    with patch.object(global_jinja_env(), "from_string", wraps=global_jinja_env().from_string) as mock_from_string:
+        results = [render_json(template, {"name": "case {0}".format(i), "severity": "High"}) for i in range(10)]
+        assert mock_from_string.call_count == 1
+
+    assert results[9] == {"name": "case 9", "severity": "High"}
+
+
+def test_template_file_cache(tmpdir):
+    clear_template_cache()
+    path = os.path.join(tmpdir.strpath, "template.jinja2")
+    with open(path, "w") as f:
+        f.write('{"name": "{{ name }}"}')
+
+    assert make_payload_from_template(path, None, {"name": "a"}) == {"name": "a"}
+
+    with patch("resilient_lib.components.templates_common.open", wraps=open, create=True) as mock_open:
+        assert make_payload_from_template(path, None, {"name": "b"}) == {"name": "b"}
+        assert mock_open.call_count == 0
+
+        # the file is read again once it changes
+        with open(path, "w") as f:
+            f.write('{"title": "{{ name }}"}')
+        os.utime(path, ns=(os.stat(path).st_mtime_ns + 1000000000,) * 2)
+        assert make_payload_from_template(path, None, {"name": "c"}) == {"title": "c"}
+
+
+def test_remove_ctl_chars():
+    assert _remove_ctl_chars("a\x01b\tc\nd\x1f\x00") == "a b c d \x00"
+    assert _remove_ctl_chars(u"ઠ\x01ડ\r\nઢ") == u"ઠ ડ  ઢ"
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_render_json_batch(processes):
+    records = ({"value": "record\t{0}".format(i)} for i in range(250))
+    results = list(render_json_batch({"result": "{{ value }}"}, records, processes=processes, chunksize=20))
+
+    assert len(results) == 250
+    assert results[0] == {"result": "record 0"}
+    assert results[249] == {"result": "record 249"}
+
+
+def test_make_payloads_from_template():
+    payloads = [TEST_ATTRIBUTES, {"attributes": dict(TEST_ATTRIBUTES["attributes"], entryDN="uid=curie,dc=example,dc=com")}]
+
+    results = list(make_payloads_from_template(TEST_OVERRIDE_TEMPLATE, None, payloads))
+    assert results == [make_payload_from_template(TEST_OVERRIDE_TEMPLATE, None, payload) for payload in payloads]
+    assert results[1]["entryDN"] == "uid=curie,dc=example,dc=com"
+
+    results = list(make_payloads_from_template(None, TEST_DEFAULT_TEMPLATE, payloads, return_json=False))
+    assert results[0] == make_payload_from_template(None, TEST_DEFAULT_TEMPLATE, payloads[0], return_json=False)
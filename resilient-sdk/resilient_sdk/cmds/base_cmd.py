@@ -33,6 +33,7 @@ class BaseCmd(object):
     # - zip_parser
     # - app_config_parser
     # - sdk_settings_parser
+    # - export_cache_parser
     CMD_ADD_PARSERS = []
 
     def __init__(self, sub_parser):
@@ -57,6 +58,9 @@ class BaseCmd(object):
         if constants.SDK_SETTINGS_PARSER_NAME in self.CMD_ADD_PARSERS:
             parser_parents.append(self._get_sdk_settings_parser())
 
+        if constants.EXPORT_CACHE_PARSER_NAME in self.CMD_ADD_PARSERS:
+            parser_parents.append(self._get_export_cache_parser())
+
         self.parser = sub_parser.add_parser(self.CMD_NAME,
                                             help=self.CMD_HELP,
                                             formatter_class=SDKArgHelpFormatter,
@@ -213,3 +217,24 @@ class BaseCmd(object):
                                          help="Path to {0} file. Default is ~/.resilient/.sdk_settings.json".format(constants.SDK_SETTINGS_FILENAME))
 
         return sdk_settings_parser
+
+    @staticmethod
+    def _get_export_cache_parser():
+        """
+        Create a parser that contains arguments for the local cache of organization exports
+
+        :return: A single argparse.ArgumentParser
+        :rtype: argparse.ArgumentParser
+        """
+        export_cache_parser = argparse.ArgumentParser(add_help=False)
+
+        export_cache_parser.add_argument("--refresh-export",
+                                         action="store_true",
+                                         help="Generate a new export of the organization, rather than use one saved by a recent command")
+
+        export_cache_parser.add_argument("--export-max-age",
+                                         type=int,
+                                         default=constants.DEFAULT_EXPORT_CACHE_MAX_AGE,
+                                         help="Seconds to reuse a saved export of the organization for, so the next commands do not each generate one. 0 to not save it. Default is {0}".format(constants.DEFAULT_EXPORT_CACHE_MAX_AGE))
+
+        return export_cache_parser
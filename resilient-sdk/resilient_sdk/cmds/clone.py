@@ -14,8 +14,8 @@ from resilient_sdk.util import constants
 from resilient_sdk.util.resilient_objects import ResilientObjMap
 from resilient_sdk.util.sdk_exception import SDKException
 from resilient_sdk.util.sdk_helpers import (add_configuration_import,
+                                            get_cached_org_export,
                                             get_from_export,
-                                            get_latest_org_export,
                                             get_object_api_names, get_res_obj,
                                             get_resilient_client,
                                             get_resilient_server_version,
@@ -66,7 +66,7 @@ class CmdClone(BaseCmd):
     $ resilient-sdk clone -s "Display name of Script" "Cloned Script display name" --changetype task
     $ resilient-sdk clone -pre version2 -r "Display name of Rule 1" "Display name of Rule 2" -f <function_to_be_cloned> <function2_to_be_cloned>"""
     CMD_DESCRIPTION = CMD_HELP
-    CMD_ADD_PARSERS = [constants.APP_CONFIG_PARSER_NAME]
+    CMD_ADD_PARSERS = [constants.APP_CONFIG_PARSER_NAME, constants.EXPORT_CACHE_PARSER_NAME]
 
     def setup(self):
         # Define codegen usage and description
@@ -148,7 +148,7 @@ class CmdClone(BaseCmd):
         # Instansiate connection to SOAR
         CmdClone.res_client = get_resilient_client(path_config_file=args.config)
 
-        org_export = get_latest_org_export(CmdClone.res_client)
+        org_export = get_cached_org_export(CmdClone.res_client, refresh_export=args.refresh_export, max_age=args.export_max_age)
 
         # For the new export data DTO minify the export to only its mandatory attributes
         new_export_data = minify_export(org_export)
@@ -4,6 +4,7 @@
 
 """ Implementation of `resilient-sdk codegen` """
 
+import hashlib
 import json
 import logging
 import os
@@ -24,6 +25,9 @@ from resilient_sdk.util.sdk_genson_overwrites import main_genson_builder_overwri
 # Get the same logger object that is used in app.py
 LOG = logging.getLogger(constants.LOGGER_NAME)
 
+# Files that 'codegen --reload' regenerates even though they exist
+RELOAD_FILE_NAMES = (package_helpers.BASE_NAME_CUSTOMIZE_PY, package_helpers.BASE_NAME_LOCAL_EXPORT_RES)
+
 
 class CmdCodegen(BaseCmd):
     """TODO Docstring"""
@@ -35,11 +39,12 @@ class CmdCodegen(BaseCmd):
     $ resilient-sdk codegen -p <name_of_package> -m 'fn_custom_md' --rule 'Rule One' 'Rule Two' --settings <path_to_custom_sdk_settings_file>
     $ resilient-sdk codegen -p <name_of_package> -m 'fn_custom_md' -c '/usr/custom_app.config'
     $ resilient-sdk codegen -p <path_current_package> --reload --workflow 'new_wf_to_add'
+    $ resilient-sdk codegen -p <path_current_package> --reload --no-cache
     $ resilient-sdk codegen -p <path_current_package> --poller
     $ resilient-sdk codegen -p <path_current_package> --gather-results
     $ resilient-sdk codegen -p <path_current_package> --gather-results '/usr/custom_app.log' -f 'func_one' 'func_two'"""
     CMD_DESCRIPTION = CMD_HELP
-    CMD_ADD_PARSERS = [constants.APP_CONFIG_PARSER_NAME, constants.RESILIENT_OBJECTS_PARSER_NAME, constants.IO_PARSER_NAME, constants.SDK_SETTINGS_PARSER_NAME]
+    CMD_ADD_PARSERS = [constants.APP_CONFIG_PARSER_NAME, constants.RESILIENT_OBJECTS_PARSER_NAME, constants.IO_PARSER_NAME, constants.SDK_SETTINGS_PARSER_NAME, constants.EXPORT_CACHE_PARSER_NAME]
 
     def setup(self):
         # Define codegen usage and description
@@ -55,6 +60,10 @@ class CmdCodegen(BaseCmd):
                                  action="store_true",
                                  help="Reload customizations and create new customize.py")
 
+        self.parser.add_argument("--no-cache",
+                                 action="store_true",
+                                 help="Use with '--reload' to regenerate all its files, even the ones with the same inputs as the last reload")
+
         self.parser.add_argument("-pr", "--poller",
                                  action="store_true",
                                  help="Build template files for a poller")
@@ -96,15 +105,61 @@ class CmdCodegen(BaseCmd):
             self.parser.print_help()
 
     @staticmethod
-    def render_jinja_mapping(jinja_mapping_dict, jinja_env, target_dir, package_dir):
+    def _get_template_inputs_hash(jinja_env, path_template, template_data, data_hashes):
+        """
+        Get a hash of everything a file rendered from a Jinja template depends on:
+        the template, the data it is rendered with and the version of the SDK
+
+        :param jinja_env: Jinja Environment
+        :param path_template: path to the template in jinja_env
+        :type path_template: str
+        :param template_data: data to render the template with
+        :type template_data: dict
+        :param data_hashes: the hash of each template_data already hashed, by its id,
+            as many templates are rendered with the same data
+        :type data_hashes: dict
+        :return: hex sha256 hash, or None if the data cannot be hashed
+        :rtype: str
+        """
+        if id(template_data) not in data_hashes:
+            try:
+                data_hashes[id(template_data)] = hashlib.sha256(json.dumps(template_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            except (TypeError, ValueError) as err:
+                LOG.debug("Could not hash the data of the template %s: %s", path_template, err)
+                data_hashes[id(template_data)] = None
+
+        if data_hashes[id(template_data)] is None:
+            return None
+
+        template_source = jinja_env.loader.get_source(jinja_env, path_template)[0]
+
+        inputs_hash = hashlib.sha256()
+        inputs_hash.update(str(sdk_helpers.get_resilient_sdk_version()).encode("utf-8"))
+        inputs_hash.update(template_source.encode("utf-8"))
+        inputs_hash.update(data_hashes[id(template_data)].encode("utf-8"))
+
+        return inputs_hash.hexdigest()
+
+    @staticmethod
+    def render_jinja_mapping(jinja_mapping_dict, jinja_env, target_dir, package_dir, reload_hashes=None, data_hashes=None):
         """
         Write all the Jinja Templates specified in jinja_mapping_dict that
         are found in the jinja_env to the target_dir. Returns a Tuple of
         newly generated files and files that were skipped
 
+        If reload_hashes is given, the files in RELOAD_FILE_NAMES are regenerated even though they exist.
+        A file is only rendered if the hash of its inputs or its content changed since
+        it was written, else it is skipped. reload_hashes is updated with the files that are written
+
         :param jinja_mapping_dict: e.g. {"file_to_write.py": ("name_of_template.py.jinja2", jinja_data)}
         :param jinja_env: Jinja Environment
         :param target_dir: Path to write Templates to
+        :param package_dir: Path to the package, the files returned are relative to it
+        :param reload_hashes: for '--reload', the path of each file relative to package_dir
+            to the hash of its inputs and content when it was last written e.g. {"setup.py": {"inputs": "ab12..", "content": "cd34.."}}
+        :type reload_hashes: dict
+        :param data_hashes: used internally to only hash the data of the templates once
+        :type data_hashes: dict
         :return: newly_generated_files, files_skipped: a Tuple of newly generated files and files skipped
         :rtype: tuple
         """
@@ -112,6 +167,9 @@ class CmdCodegen(BaseCmd):
         newly_generated_files = []
         files_skipped = []
 
+        if data_hashes is None:
+            data_hashes = {}
+
         for (file_name, file_info) in jinja_mapping_dict.items():
 
             if isinstance(file_info, dict):
@@ -129,7 +187,9 @@ class CmdCodegen(BaseCmd):
                     jinja_mapping_dict=sub_dir_mapping_dict,
                     jinja_env=jinja_env,
                     target_dir=path_sub_dir,
-                    package_dir=package_dir)
+                    package_dir=package_dir,
+                    reload_hashes=reload_hashes,
+                    data_hashes=data_hashes)
 
                 newly_generated_files += new_files
                 files_skipped += skipped_files
@@ -172,8 +232,8 @@ class CmdCodegen(BaseCmd):
                 write_target_file = None
                 for t_file in [target_file, export_target_file]:
                     if t_file and os.path.exists(t_file):
-                        # Don't skip for workflows.
-                        if target_ext == ".md" and export_target_file:
+                        # Don't skip for workflows, or for the files that are regenerated on reload.
+                        if (target_ext == ".md" and export_target_file) or (reload_hashes is not None and file_name in RELOAD_FILE_NAMES):
                             # Write to first workflow target file name format found.
                             write_target_file = t_file
                         else:
@@ -187,13 +247,36 @@ class CmdCodegen(BaseCmd):
                 if not write_target_file:
                     continue
 
+                path_relative = os.path.relpath(write_target_file, start=package_dir)
+
+                if reload_hashes is not None:
+                    inputs_hash = CmdCodegen._get_template_inputs_hash(jinja_env, path_template, template_data, data_hashes)
+                    last_hashes = reload_hashes.get(path_relative, {})
+
+                    # Skip the file if it was written from the same inputs and has not been changed since
+                    if inputs_hash and last_hashes.get("inputs") == inputs_hash and os.path.isfile(write_target_file) \
+                       and last_hashes.get("content") == sdk_helpers.get_file_hash(write_target_file):
+                        files_skipped.append(path_relative)
+                        continue
+
                 jinja_template = jinja_env.get_template(path_template)
                 jinja_rendered_text = jinja_template.render(template_data)
 
-                newly_generated_files.append(os.path.relpath(write_target_file, start=package_dir))
+                newly_generated_files.append(path_relative)
+
+                if reload_hashes is not None and file_name in RELOAD_FILE_NAMES and os.path.isfile(write_target_file):
+                    # Keep a backup of the customize.py or export.res that is replaced
+                    sdk_helpers.rename_to_bak_file(write_target_file)
 
                 sdk_helpers.write_file(write_target_file, jinja_rendered_text)
 
+                if reload_hashes is not None:
+                    # hash the file as written, the same way it is hashed to check it has not changed
+                    reload_hashes[path_relative] = {
+                        "inputs": inputs_hash,
+                        "content": sdk_helpers.get_file_hash(write_target_file)
+                    }
+
         return newly_generated_files, files_skipped
 
     @staticmethod
@@ -221,7 +304,8 @@ class CmdCodegen(BaseCmd):
             if arg:
                 all_obj_names_wanted = set(arg)
 
-            setattr(args, arg_name, list(all_obj_names_wanted.union(set(old_params.get(old_param_name, [])))))
+            # sorted so the objects are always in the same order in the regenerated files
+            setattr(args, arg_name, sorted(all_obj_names_wanted.union(set(old_params.get(old_param_name, [])))))
 
         return args
 
@@ -305,7 +389,7 @@ class CmdCodegen(BaseCmd):
         LOG.info("codegen _gen_function called")
 
     @staticmethod
-    def _gen_package(args, setup_py_attributes={}):
+    def _gen_package(args, setup_py_attributes={}, reload_hashes=None):
 
         LOG.info("Generating codegen package...")
 
@@ -343,8 +427,10 @@ class CmdCodegen(BaseCmd):
             # Instantiate connection to SOAR
             res_client = sdk_helpers.get_resilient_client(path_config_file=args.config)
 
-            # Generate + get latest export from Resilient Server
-            org_export = sdk_helpers.get_latest_org_export(res_client)
+            # Generate + get latest export from Resilient Server, or the one saved by a recent command.
+            # --reload is run to pick up changes made in SOAR, so it always generates a new one
+            org_export = sdk_helpers.get_cached_org_export(res_client, refresh_export=args.refresh_export or args.reload,
+                                                           max_age=args.export_max_age)
 
         # Get data required for Jinja2 templates from export
         jinja_data = sdk_helpers.get_from_export(org_export,
@@ -528,7 +614,8 @@ class CmdCodegen(BaseCmd):
             jinja_mapping_dict=package_mapping_dict,
             jinja_env=jinja_env,
             target_dir=output_base,
-            package_dir=output_base)
+            package_dir=output_base,
+            reload_hashes=reload_hashes)
 
         # Log new and skipped files
         if newly_generated_files:
@@ -537,6 +624,12 @@ class CmdCodegen(BaseCmd):
         if skipped_files:
             LOG.debug("Files Skipped:\n\t> %s", "\n\t> ".join(skipped_files))
 
+        if reload_hashes is not None:
+            if newly_generated_files:
+                LOG.info("Regenerated %d file(s):\n\t> %s", len(newly_generated_files), "\n\t> ".join(newly_generated_files))
+            else:
+                LOG.info("No files were regenerated as their inputs have not changed since the last reload")
+
         LOG.debug("'codegen._gen_package' complete for '%s'", package_name)
 
         return output_base
@@ -544,7 +637,7 @@ class CmdCodegen(BaseCmd):
     @staticmethod
     def _reload_package(args):
 
-        old_params, path_customize_py_bak = [], ""
+        old_params = []
 
         # Get absolute path to package
         path_package = os.path.abspath(args.package)
@@ -585,61 +678,90 @@ class CmdCodegen(BaseCmd):
         if not old_params:
             raise SDKException(u"No reload params found in {0}".format(path_customize_py))
 
-        # Rename the old customize.py with .bak
-        path_customize_py_bak = sdk_helpers.rename_to_bak_file(path_customize_py)
+        # Map command line arg name to dict key returned by codegen_reload_data() in customize.py
+        mapping_tuples = [
+            ("messagedestination", "message_destinations"),
+            ("function", "functions"),
+            ("workflow", "workflows"),
+            ("rule", "actions"),
+            ("field", "incident_fields"),
+            ("artifacttype", "incident_artifact_types"),
+            ("incidenttype", "incident_types"),
+            ("datatable", "datatables"),
+            ("task", "automatic_tasks"),
+            ("script", "scripts"),
+            ("playbook", "playbooks")
+        ]
 
-        # If local export file exists then save it to a .bak file.
-        # (Older packages may not have the /util/data/export.res file)
-        path_export_res = os.path.join(path_package, package_name,
-                                       package_helpers.PATH_UTIL_DATA_DIR,
-                                       package_helpers.BASE_NAME_LOCAL_EXPORT_RES)
-        if os.path.isfile(path_export_res):
-            path_export_res_bak = sdk_helpers.rename_to_bak_file(path_export_res)
-        else:
-            path_export_res_bak = None
+        # Merge old_params with new params specified on command line
+        args = CmdCodegen.merge_codegen_params(old_params, args, mapping_tuples)
+
+        # Parse the setup.py file
+        setup_py_attributes = package_helpers.parse_setup_py(path_setup_py_file, package_helpers.SUPPORTED_SETUP_PY_ATTRIBUTE_NAMES)
+
+        # Get the hashes of the files the last reload of this package wrote so only the changed ones are regenerated.
+        # customize.py and export.res are only renamed to .bak files when they are regenerated
+        reload_hashes = {} if getattr(args, "no_cache", False) else CmdCodegen._read_codegen_cache(path_package)
+
+        LOG.debug("Regenerating codegen '%s' package now", args.package)
+
+        # Regenerate the package
+        path_reloaded = CmdCodegen._gen_package(args, setup_py_attributes=setup_py_attributes, reload_hashes=reload_hashes)
+
+        CmdCodegen._save_codegen_cache(path_package, reload_hashes)
+
+        LOG.info("\nNOTE: Ensure the Dockerfile has the latest template introduced in v51.0.1.0")
+        LOG.info("NOTE: Ensure the MANIFEST.in file includes line:\n      recursive-include %s/util *\n", args.package)
+        LOG.debug("'codegen._reload_reload' complete for '%s'", args.package)
+
+        return path_reloaded
+
+    @staticmethod
+    def _get_codegen_cache_path(path_package):
+        """
+        :return: path of the file with the hashes of the files 'codegen --reload' wrote for the package
+        :rtype: str
+        """
+        package_hash = hashlib.sha256(path_package.encode("utf-8")).hexdigest()
+        return os.path.join(constants.PATH_SDK_CODEGEN_CACHE_DIR, "{0}.json".format(package_hash))
+
+    @classmethod
+    def _read_codegen_cache(cls, path_package):
+        """
+        :return: the hashes of the files 'codegen --reload' wrote for the package,
+            or an empty dict if there are none or they cannot be read
+        :rtype: dict
+        """
+        path_cache = cls._get_codegen_cache_path(path_package)
+
+        if not os.path.isfile(path_cache):
+            return {}
+
+        try:
+            return sdk_helpers.read_json_file(path_cache)
+        except SDKException as err:
+            LOG.debug("Could not read the saved hashes of codegen at %s: %s", path_cache, err)
+            return {}
+
+    @classmethod
+    def _save_codegen_cache(cls, path_package, reload_hashes):
+        """
+        Save the hashes of the files 'codegen --reload' wrote for the package.
+        Failing to save them is logged and ignored
+
+        :param path_package: path to the package
+        :type path_package: str
+        :param reload_hashes: the path of each file to the hash of its inputs and content
+        :type reload_hashes: dict
+        """
+        path_cache = cls._get_codegen_cache_path(path_package)
 
         try:
-            # Map command line arg name to dict key returned by codegen_reload_data() in customize.py
-            mapping_tuples = [
-                ("messagedestination", "message_destinations"),
-                ("function", "functions"),
-                ("workflow", "workflows"),
-                ("rule", "actions"),
-                ("field", "incident_fields"),
-                ("artifacttype", "incident_artifact_types"),
-                ("incidenttype", "incident_types"),
-                ("datatable", "datatables"),
-                ("task", "automatic_tasks"),
-                ("script", "scripts"),
-                ("playbook", "playbooks")
-            ]
-
-            # Merge old_params with new params specified on command line
-            args = CmdCodegen.merge_codegen_params(old_params, args, mapping_tuples)
-
-            # Parse the setup.py file
-            setup_py_attributes = package_helpers.parse_setup_py(path_setup_py_file, package_helpers.SUPPORTED_SETUP_PY_ATTRIBUTE_NAMES)
-
-            LOG.debug("Regenerating codegen '%s' package now", args.package)
-
-            # Regenerate the package
-            path_reloaded = CmdCodegen._gen_package(args, setup_py_attributes=setup_py_attributes)
-
-            LOG.info("\nNOTE: Ensure the Dockerfile has the latest template introduced in v51.0.1.0")
-            LOG.info("NOTE: Ensure the MANIFEST.in file includes line:\n      recursive-include %s/util *\n", args.package)
-            LOG.debug("'codegen._reload_reload' complete for '%s'", args.package)
-
-            return path_reloaded
-
-        # This is required in finally block as user may kill using keyboard interrupt
-        finally:
-            # If an error occurred, customize.py does not exist, rename the backup file to original
-            if not os.path.isfile(path_customize_py):
-                LOG.info(u"An error occurred. Renaming customize.py.bak to customize.py")
-                sdk_helpers.rename_file(path_customize_py_bak, package_helpers.BASE_NAME_CUSTOMIZE_PY)
-            if not os.path.isfile(path_export_res) and path_export_res_bak:
-                LOG.info(u"An error occurred. Renaming export.res.bak to export.res")
-                sdk_helpers.rename_file(path_export_res_bak, package_helpers.BASE_NAME_LOCAL_EXPORT_RES)
+            sdk_helpers.write_json_file_atomically(path_cache, reload_hashes)
+            LOG.debug("Saved the hashes of codegen to %s", path_cache)
+
+        except (IOError, OSError, TypeError, ValueError) as err:
+            LOG.debug("Could not save the hashes of codegen to %s: %s", path_cache, err)
 
     @classmethod
     def _get_results_from_log_file(cls, args):
@@ -4,10 +4,16 @@
 
 """ Implementation of 'resilient-sdk docgen' """
 
+import argparse
+import contextlib
 import logging
+import multiprocessing
 import os
 import re
 import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 
 from resilient_sdk.cmds.base_cmd import BaseCmd
 from resilient_sdk.util import constants
@@ -25,6 +31,43 @@ LOG = logging.getLogger(constants.LOGGER_NAME)
 # JINJA Constants
 README_TEMPLATE_NAME = "README.md.jinja2"
 
+# Threads to read the payload samples of the functions with
+PAYLOAD_SAMPLES_MAX_WORKERS = 8
+
+# Phases of docgen that are timed
+PHASE_LOAD = "load"
+PHASE_OBJECTS = "objects"
+PHASE_PAYLOAD_SAMPLES = "payload samples"
+PHASE_RENDER = "render"
+PHASE_WRITE = "write"
+PHASE_TOTAL = "total"
+
+
+@contextlib.contextmanager
+def _timed(timings, phase):
+    """ Add the seconds the block takes to ``timings[phase]`` """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0) + time.perf_counter() - start
+
+
+def _format_timings(timings):
+    """ Format ``timings`` as ``"load: 0.01s, objects: 0.20s, ..."`` """
+    return ", ".join("{0}: {1:.2f}s".format(phase, seconds) for phase, seconds in timings.items())
+
+
+def _init_worker_logging(log_queue, level):
+    """
+    Send the logs of a worker process to ``log_queue``, for the parent process to
+    output with its own handlers. A process that is spawned rather than forked
+    does not run ``app.py``, so the SDK logger would have no handler and no level
+    """
+    LOG.handlers = [QueueHandler(log_queue)]
+    LOG.setLevel(level)
+    LOG.propagate = False
+
 
 class CmdDocgen(BaseCmd):
     """
@@ -43,7 +86,8 @@ class CmdDocgen(BaseCmd):
     $ resilient-sdk docgen -p <name_of_package> --poller # for a poller app
     $ resilient-sdk docgen -e export.res
     $ resilient-sdk docgen -e playbook1.resz playbook2.resz -o /path/to/save/playbooks_readme.md
-    $ resilient-sdk docgen -e . -o README.md # reads all exports in current directory and outputs to README.md"""
+    $ resilient-sdk docgen -e . -o README.md # reads all exports in current directory and outputs to README.md
+    $ resilient-sdk docgen --packages fn_app_one fn_app_two --workers 4 # generates the README of each package in parallel"""
     CMD_DESCRIPTION = CMD_HELP
     CMD_ADD_PARSERS = [constants.SDK_SETTINGS_PARSER_NAME]
 
@@ -73,6 +117,15 @@ class CmdDocgen(BaseCmd):
                                  action="store_true",
                                  help="Include poller section in README generated by docgen")
 
+        self.parser.add_argument("--packages",
+                                 type=ensure_unicode,
+                                 nargs="+",
+                                 help="List of paths to packages to generate a README.md in each of, in parallel. Takes precedence over '--package' and '--exportfile'")
+
+        self.parser.add_argument("--workers",
+                                 type=int,
+                                 help="Number of processes to read exports or generate the READMEs of packages with. Defaults to the number of CPUs")
+
     @staticmethod
     def _get_fn_input_details(function):
         """Return a List of all Function Inputs which are Dictionaries with
@@ -115,6 +168,8 @@ class CmdDocgen(BaseCmd):
         workflows = export.get("workflows")
         playbooks = export.get("playbooks")
         scripts = export.get("scripts")
+        # parses the XML of each playbook once, rather than for each function
+        export_index = sdk_helpers.ExportIndex(export)
 
         for fn in functions:
             the_function = {}
@@ -130,7 +185,7 @@ class CmdDocgen(BaseCmd):
             the_function["x_api_name"] = fn.get("x_api_name", "")
 
             # look for pre/post scripts in playbooks first
-            pre_script, post_script = cls._get_pre_and_post_processing_scripts_from_playbooks(the_function, playbooks, scripts, export)
+            pre_script, post_script = cls._get_pre_and_post_processing_scripts_from_playbooks(the_function, playbooks, scripts, export_index)
             # if not found in playbooks, then look in workflows
             if not pre_script and not post_script:
                 pre_script, post_script = cls._get_pre_and_post_processing_scripts_from_workflows(the_function, workflows)
@@ -162,14 +217,16 @@ class CmdDocgen(BaseCmd):
         :type playbooks: list[dict]
         :param playbooks: list of global scripts in the export
         :type playbooks: list[dict]
+        :param export: the export, or an ``ExportIndex`` of it to look up the playbooks that use the function
+        :type export: dict|sdk_helpers.ExportIndex
         :return: pre and post processing scripts as text
         :rtype: tuple(str, str)
         """
         pre_script, post_script = None, None
+        export_index = sdk_helpers.ExportIndex.from_export(export)
 
-        for playbook in playbooks:
-            # This gets all the functions and scripts in the Playbooks's XML
-            pb_objects = sdk_helpers.get_playbook_objects(playbook)
+        # This gets all the functions and scripts in the XML of each Playbook that uses the function
+        for playbook, pb_objects in export_index.get_playbooks_using_function(the_function.get("uuid", "uuid_not_found_fn")):
 
             # loop through the playbook to find its functions
             for pb_fn in pb_objects.get("functions", []):
@@ -201,7 +258,7 @@ class CmdDocgen(BaseCmd):
                         # if we didn't find a local script, we can run the same search on
                         # global scripts and we might get a hit
                         if not script_is_found:
-                            for g_sc in sdk_helpers.get_res_obj("scripts", "uuid", "Script", [pb_sc.get("uuid")], export):
+                            for g_sc in sdk_helpers.get_res_obj("scripts", "uuid", "Script", [pb_sc.get("uuid")], export_index):
                                 if not post_script and regex_compiled.search(g_sc.get("script_text")) is not None:
                                     post_script = g_sc.get("script_text")
 
@@ -472,7 +529,10 @@ class CmdDocgen(BaseCmd):
         For each function in the functions list, search the payload samples
         directory: if the matching payload for a function is found,
         add "results" object to the function (in place) which contains the JSON
-        payload from the payload sample
+        payload from the payload sample.
+
+        The samples are read in a thread pool as reading them is mostly
+        waiting on the file system, then added to the functions in order
 
         :param functions: list of SOAR functions objects
         :type functions: list[dict]
@@ -484,24 +544,77 @@ class CmdDocgen(BaseCmd):
         # See if a payload_samples dir exists and use the contents for function results
         try:
             sdk_helpers.validate_dir_paths(os.R_OK, path_payload_samples_dir)
-
-            for f in functions:
-                fn_name = f.get("x_api_name")
-                path_payload_samples_fn_name = os.path.join(path_payload_samples_dir, fn_name)
-                path_output_json_example = os.path.join(path_payload_samples_fn_name, package_helpers.BASE_NAME_PAYLOAD_SAMPLES_EXAMPLE)
-
-                try:
-                    sdk_helpers.validate_file_paths(os.R_OK, path_output_json_example)
-                    f["results"] = sdk_helpers.read_json_file(path_output_json_example)
-                except SDKException as e:
-                    sdk_helpers.handle_file_not_found_error(e, u"Error getting results. No '{0}' file found for '{1}'.".format(
-                        package_helpers.BASE_NAME_PAYLOAD_SAMPLES_EXAMPLE, fn_name))
-
         except SDKException as e:
             sdk_helpers.handle_file_not_found_error(e, u"Error getting results. No '{0}' directory found.".format(
                 package_helpers.BASE_NAME_PAYLOAD_SAMPLES_EXAMPLE))
+            return
+
+        def read_output_json_example(f):
+            path_output_json_example = os.path.join(path_payload_samples_dir, f.get("x_api_name"), package_helpers.BASE_NAME_PAYLOAD_SAMPLES_EXAMPLE)
+            try:
+                sdk_helpers.validate_file_paths(os.R_OK, path_output_json_example)
+                return sdk_helpers.read_json_file(path_output_json_example), None
+            except SDKException as e:
+                return None, e
+
+        if not functions:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(len(functions), PAYLOAD_SAMPLES_MAX_WORKERS)) as executor:
+            for f, (results, err) in zip(functions, executor.map(read_output_json_example, functions)):
+                if err:
+                    sdk_helpers.handle_file_not_found_error(err, u"Error getting results. No '{0}' file found for '{1}'.".format(
+                        package_helpers.BASE_NAME_PAYLOAD_SAMPLES_EXAMPLE, f.get("x_api_name")))
+                else:
+                    f["results"] = results
 
-    def _get_all_objects_for_jinja_render(self, export_contents):
+    @staticmethod
+    def _get_workers(args, count):
+        """
+        Get how many processes to use to run docgen for ``count`` packages or exports.
+        Defaults to one per CPU when ``--workers`` is not given
+
+        :param args: docgen command args obj
+        :type args: argparse.Namespace
+        :param count: number of packages or exports
+        :type count: int
+        :return: number of processes to use, 1 means to run in this process
+        :rtype: int
+        """
+        workers = getattr(args, "workers", None) or os.cpu_count() or 1
+        return max(min(workers, count), 1)
+
+    @staticmethod
+    def _map(fn, iterables, workers):
+        """
+        Like ``map`` but in a pool of ``workers`` processes when more than one.
+        The results are returned in the order of ``iterables``, and the logs of
+        the processes are output by this one
+
+        :param fn: function to call, must be picklable when ``workers > 1``
+        :type fn: function
+        :param iterables: the arguments of ``fn``, one iterable for each argument
+        :type iterables: list[list]
+        :param workers: number of processes to use
+        :type workers: int
+        :return: results of ``fn``
+        :rtype: list
+        """
+        if workers <= 1:
+            return list(map(fn, *iterables))
+
+        log_queue = multiprocessing.Queue()
+        listener = QueueListener(log_queue, LOG)
+        listener.start()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_logging,
+                                     initargs=(log_queue, LOG.getEffectiveLevel())) as executor:
+                return list(executor.map(fn, *iterables))
+        finally:
+            listener.stop()
+
+    @classmethod
+    def _get_all_objects_for_jinja_render(cls, export_contents):
         """
         Take an export and gather the lists of SOAR objects to use to render
         the Jinja template properly
@@ -537,18 +650,19 @@ class CmdDocgen(BaseCmd):
             apps=sdk_helpers.get_object_api_names(ResilientObjMap.APPS, export_contents.get("apps", [])))
 
         # Lists we use in Jinja Templates
-        functions = self._get_function_details(import_def_data)
-        scripts = self._get_script_details(import_def_data.get("scripts", []))
-        rules = self._get_rule_details(import_def_data.get("rules", []))
-        datatables = self._get_datatable_details(import_def_data.get("datatables", []))
-        custom_fields = self._get_custom_fields_details(import_def_data.get("fields", []))
-        custom_artifact_types = self._get_custom_artifact_details(import_def_data.get("artifact_types", []))
-        playbooks = self._get_playbook_details(import_def_data.get("playbooks", []))
+        functions = cls._get_function_details(import_def_data)
+        scripts = cls._get_script_details(import_def_data.get("scripts", []))
+        rules = cls._get_rule_details(import_def_data.get("rules", []))
+        datatables = cls._get_datatable_details(import_def_data.get("datatables", []))
+        custom_fields = cls._get_custom_fields_details(import_def_data.get("fields", []))
+        custom_artifact_types = cls._get_custom_artifact_details(import_def_data.get("artifact_types", []))
+        playbooks = cls._get_playbook_details(import_def_data.get("playbooks", []))
         apps = import_def_data.get("apps", [])
 
         return functions, scripts, rules, datatables, custom_fields, custom_artifact_types, playbooks, apps
 
-    def _get_app_package_docgen_details(self, args, settings_file_contents={}):
+    @classmethod
+    def _get_app_package_docgen_details(cls, args, settings_file_contents={}):
         """
         Run docgen for an app package. Collect all the necessary elements of the
         app, including setup.py, export.res, screenshots, payload samples, etc...
@@ -618,7 +732,7 @@ class CmdDocgen(BaseCmd):
         # If poller flag was given try to find the template details
         poller_templates = {}
         if args.poller or is_poller_app:
-            poller_templates = self._get_poller_details(path_to_src, package_name)
+            poller_templates = cls._get_poller_details(path_to_src, package_name)
 
         requirements = {
             "setup_py_attributes": setup_py_attributes,
@@ -631,7 +745,8 @@ class CmdDocgen(BaseCmd):
 
         return package_name, customize_py_import_def, path_payload_samples_dir, path_readme, requirements, is_poller_app
 
-    def _get_export_docgen_details(self, export_path, output_path=None):
+    @classmethod
+    def _get_export_docgen_details(cls, export_path, output_path=None):
         """
         Run docgen for an export file (export.res direct file or export.resz zip file).
         Return the output based on the --output param. If not given, default to README.md
@@ -678,12 +793,175 @@ class CmdDocgen(BaseCmd):
         # return the details
         return display_name, export_contents, path_to_where_to_save_new_readme
 
+    @classmethod
+    def _get_export_jinja_objects(cls, export_path, output_path=None):
+        """
+        Read an export and get the objects to render the README with from it.
+        When docgen is given more than one export this runs in a worker process
+        for each one, so it is a classmethod that can be pickled
+
+        :param export_path: must be a path to a .res or .resz file
+        :type export_path: str
+        :param output_path: output path to save the generated file
+        :type output_path: str, optional (defaults to README.md in the current directory)
+        :return: None if the file is not a .res or .resz file, else the display name of the export,
+                 the absolute output path, the server version of the export, the lists
+                 from _get_all_objects_for_jinja_render and the time each phase took
+        :rtype: tuple(str, str, str, tuple, dict)
+        """
+        timings = {}
+
+        try:
+            with _timed(timings, PHASE_LOAD):
+                package_name, export_contents, path_readme = cls._get_export_docgen_details(export_path, output_path)
+        except SDKException:
+            return None
+
+        with _timed(timings, PHASE_OBJECTS):
+            jinja_objects = cls._get_all_objects_for_jinja_render(export_contents)
+
+        return package_name, path_readme, export_contents.get("server_version", {}).get("version"), jinja_objects, timings
+
+    @classmethod
+    def _generate_package_readme(cls, args, settings_file_contents={}):
+        """
+        Run docgen for the app package at ``args.package``: get its details,
+        render its README and write it
+
+        :param args: docgen command args obj
+        :type args: argparse.Namespace
+        :param settings_file_contents: json contents of settings file if provided
+        :type settings_file_contents: dict, optional (default {})
+        :raises SDKException: if path to package does not exist or setup.py file can't be read
+        :return: name of the package and the time each phase took
+        :rtype: tuple(str, dict)
+        """
+        timings = {}
+
+        with _timed(timings, PHASE_LOAD):
+            package_name, export_contents, path_payload_samples_dir, path_readme, requirements_obj, is_poller_app = cls._get_app_package_docgen_details(args, settings_file_contents)
+
+        with _timed(timings, PHASE_OBJECTS):
+            jinja_objects = cls._get_all_objects_for_jinja_render(export_contents)
+
+        with _timed(timings, PHASE_PAYLOAD_SAMPLES):
+            cls._add_payload_samples_to_functions(jinja_objects[0], path_payload_samples_dir)
+
+        # Other variables for Jinja Templates
+        server_version = export_contents.get("server_version", {}).get("version")
+
+        cls._render_readme(args, path_readme, package_name, server_version, requirements_obj, is_poller_app, jinja_objects, timings)
+
+        return package_name, timings
+
+    @classmethod
+    def _try_generate_package_readme(cls, args, settings_file_contents, path_package):
+        """
+        Run :meth:`_generate_package_readme` for the package at ``path_package``
+        in a worker process for ``--packages``. An SDKException is returned rather
+        than raised so one package can't stop the READMEs of the others
+
+        :param args: docgen command args obj
+        :type args: argparse.Namespace
+        :param settings_file_contents: json contents of settings file if provided
+        :type settings_file_contents: dict
+        :param path_package: path to the package
+        :type path_package: str
+        :return: name of the package and the time each phase took, or None and the error message
+        :rtype: tuple(str, dict) or tuple(None, str)
+        """
+        package_args = argparse.Namespace(**vars(args))
+        package_args.package = path_package
+        package_args.output = None
+
+        try:
+            return cls._generate_package_readme(package_args, settings_file_contents)
+        except SDKException as err:
+            return None, err.message
+
+    @classmethod
+    def _render_readme(cls, args, path_readme, package_name, server_version, requirements_obj, is_poller_app, jinja_objects, timings):
+        """
+        Render the README Jinja2 template and write it to ``path_readme``,
+        making a backup of the README that is there if needed
+
+        :param args: docgen command args obj
+        :type args: argparse.Namespace
+        :param path_readme: absolute path to write the README to
+        :type path_readme: str
+        :param package_name: name of the package or exports
+        :type package_name: str
+        :param server_version: version of SOAR the export is from
+        :type server_version: str
+        :param requirements_obj: details from the setup.py and config.py files of the package
+        :type requirements_obj: dict
+        :param is_poller_app: if the package is a poller app
+        :type is_poller_app: bool
+        :param jinja_objects: the lists from _get_all_objects_for_jinja_render
+        :type jinja_objects: tuple
+        :param timings: the time each phase took, updated with the render and write phases
+        :type timings: dict
+        """
+        jinja_functions, jinja_scripts, jinja_rules, jinja_datatables, jinja_custom_fields, jinja_custom_artifact_types, jinja_playbooks, jinja_apps = jinja_objects
+
+        package_name_dash = package_name.replace("_", "-")
+
+        with _timed(timings, PHASE_RENDER):
+            # Instantiate Jinja2 Environment with path to Jinja2 templates
+            jinja_env = sdk_helpers.setup_jinja_env("data/docgen/templates")
+            readme_template = jinja_env.get_template(README_TEMPLATE_NAME)
+            # Render the README Jinja2 Template with parameters
+            LOG.info("Rendering README for %s", package_name_dash)
+            rendered_readme = readme_template.render({
+                # basic details
+                "name_underscore": package_name,
+                "name_dash": package_name_dash,
+                "server_version": server_version,
+                "display_name": requirements_obj.get("setup_py_attributes", {}).get("display_name", package_name),
+                "short_description": requirements_obj.get("setup_py_attributes", {}).get("description"),
+                "long_description": requirements_obj.get("setup_py_attributes", {}).get("long_description"),
+                "version": requirements_obj.get("setup_py_attributes", {}).get("version"),
+                "all_dependencies": requirements_obj.get("setup_py_attributes", {}).get("install_requires", []),
+                "author": requirements_obj.get("setup_py_attributes", {}).get("author"),
+                "support_url": requirements_obj.get("setup_py_attributes", {}).get("url"),
+                "res_circuits_dependency_str": requirements_obj.get("res_circuits_dep_str"),
+                "supported_app": requirements_obj.get("supported_app"),
+                "app_configs": requirements_obj.get("jinja_app_configs", [{},{}])[1],
+
+                # lists of customizations (make unique)
+                "functions": package_helpers.make_list_of_dicts_unique(jinja_functions, lambda x: x["anchor"]),
+                "scripts": package_helpers.make_list_of_dicts_unique(jinja_scripts, lambda x: x["anchor"]),
+                "rules": package_helpers.make_list_of_dicts_unique(jinja_rules, lambda x: x["name"]),
+                "datatables": package_helpers.make_list_of_dicts_unique(jinja_datatables, lambda x: x["anchor"]),
+                "custom_fields": package_helpers.make_list_of_dicts_unique(jinja_custom_fields, lambda x: x["api_name"]),
+                "custom_artifact_types": package_helpers.make_list_of_dicts_unique(jinja_custom_artifact_types, lambda x: x["api_name"]),
+                "playbooks": package_helpers.make_list_of_dicts_unique(jinja_playbooks, lambda x: x["api_name"]),
+                "apps": package_helpers.make_list_of_dicts_unique(jinja_apps, lambda x: x["export_key"]),
+
+                # constants
+                "placeholder_string": constants.DOCGEN_PLACEHOLDER_STRING,
+                "poller_flag": args.poller or is_poller_app,
+                "poller_templates": requirements_obj.get("poller_templates", {}),
+                "sdk_version": sdk_helpers.get_resilient_sdk_version(),
+                "docgen_export": requirements_obj.get("docgen_export", False)
+            })
+
+        with _timed(timings, PHASE_WRITE):
+            # Create a backup if needed of README
+            sdk_helpers.rename_to_bak_file(path_readme, package_helpers.PATH_DEFAULT_README)
+
+            # Write the new README
+            LOG.info("Writing README to: %s", path_readme)
+            sdk_helpers.write_file(path_readme, rendered_readme)
+
     def execute_command(self, args):
         LOG.debug("docgen called with %s", args)
 
         # Set docgen name for SDKException
         SDKException.command_ran = self.CMD_NAME
 
+        start = time.perf_counter()
+
         # Validate that the given path to the sdk settings is valid
         try:
             sdk_helpers.validate_file_paths(os.R_OK, args.settings)
@@ -694,42 +972,44 @@ class CmdDocgen(BaseCmd):
             settings_file_contents = {}
             LOG.debug("Given path to SDK Settings is either not valid or not readable. Ignoring and using built-in values for docgen")
 
+        if args.packages:
+            self._execute_command_for_packages(args, settings_file_contents, start)
+            return
+
         # branch off for export file vs standard package docgen by identifying appropriate function to call to get details
         if not args.exportfile:
-            package_name, export_contents, path_payload_samples_dir, path_readme, requirements_obj, is_poller_app = self._get_app_package_docgen_details(args, settings_file_contents)
-            jinja_functions, jinja_scripts, jinja_rules, jinja_datatables, jinja_custom_fields, jinja_custom_artifact_types, jinja_playbooks, jinja_apps = self._get_all_objects_for_jinja_render(export_contents)
-            self._add_payload_samples_to_functions(jinja_functions, path_payload_samples_dir)
-
-            # Other variables for Jinja Templates
-            server_version = export_contents.get("server_version", {}).get("version")
+            package_name, timings = self._generate_package_readme(args, settings_file_contents)
         else:
             is_poller_app = False   # set is_poller_app to False because the user wants to generate README based off of export, not off of found package contents; user can still pass in --poller if desired
             package_names = []
             server_versions = []
-            jinja_functions, jinja_scripts, jinja_rules, jinja_datatables, jinja_custom_fields, jinja_custom_artifact_types, jinja_playbooks, jinja_apps = [], [], [], [], [], [], [], []
+            jinja_objects = [], [], [], [], [], [], [], []
             requirements_obj = {"docgen_export": True}
+            timings = {}
             export_paths = self._get_export_paths_from_args(args.exportfile)
             if not export_paths:
                 raise SDKException("Couldn't find any export files in list: {0}".format(args.exportfile))
-            for export_path in export_paths:
-                try:
-                    package_name, export_contents, path_readme = self._get_export_docgen_details(export_path, args.output)
-                except SDKException:
+
+            # read the exports and get their objects in a process for each, in the order they were given
+            export_results = self._map(self._get_export_jinja_objects,
+                                       [export_paths, [args.output] * len(export_paths)],
+                                       self._get_workers(args, len(export_paths)))
+
+            for export_path, export_result in zip(export_paths, export_results):
+                if not export_result:
                     LOG.warning("File path '%s' was skipped for 'docgen --export' because it was not in the proper .res or .resz format", export_path)
                     continue
 
-                functions, scripts, rules, datatables, custom_fields, custom_artifact_types, playbooks, apps = self._get_all_objects_for_jinja_render(export_contents)
-                jinja_functions.extend(functions)
-                jinja_scripts.extend(scripts)
-                jinja_rules.extend(rules)
-                jinja_datatables.extend(datatables)
-                jinja_custom_fields.extend(custom_fields)
-                jinja_custom_artifact_types.extend(custom_artifact_types)
-                jinja_playbooks.extend(playbooks)
-                jinja_apps.extend(apps)
+                package_name, path_readme, server_version, export_jinja_objects, export_timings = export_result
+
+                for jinja_list, export_list in zip(jinja_objects, export_jinja_objects):
+                    jinja_list.extend(export_list)
+
+                for phase, seconds in export_timings.items():
+                    timings[phase] = timings.get(phase, 0) + seconds
 
                 package_names.append(package_name)
-                server_versions.append(export_contents.get("server_version", {}).get("version"))
+                server_versions.append(server_version)
 
             if not package_names: # possible to get here if all skipped in above loop
                 raise SDKException("Couldn't find any export files in list: {0}".format(args.exportfile))
@@ -738,50 +1018,40 @@ class CmdDocgen(BaseCmd):
             package_name = "".join(args.output.split(".")[:-1]) if args.output else ", ".join(package_names)
             server_version = max(server_versions)
 
-        package_name_dash = package_name.replace("_", "-")
+            self._render_readme(args, path_readme, package_name, server_version, requirements_obj, is_poller_app, jinja_objects, timings)
+
+        timings[PHASE_TOTAL] = time.perf_counter() - start
+        LOG.info("docgen timings for %s: %s", package_name.replace("_", "-"), _format_timings(timings))
+
+    def _execute_command_for_packages(self, args, settings_file_contents, start):
+        """
+        Run docgen for each package given with ``--packages``, in a process for
+        each one up to ``--workers``, writing a README.md in each package
+
+        :param args: docgen command args obj
+        :type args: argparse.Namespace
+        :param settings_file_contents: json contents of settings file if provided
+        :type settings_file_contents: dict
+        :param start: ``time.perf_counter()`` when the command started
+        :type start: float
+        :raises SDKException: if '--output' is given or docgen failed for any of the packages
+        """
+        if args.output:
+            raise SDKException("'--output' can't be used with '--packages' as a README.md is written in each package")
+
+        results = self._map(self._try_generate_package_readme,
+                            [[args] * len(args.packages), [settings_file_contents] * len(args.packages), args.packages],
+                            self._get_workers(args, len(args.packages)))
+
+        failed = []
+        for path_package, (package_name, timings_or_error) in zip(args.packages, results):
+            if package_name is None:
+                LOG.error("docgen failed for package '%s':%s", path_package, timings_or_error)
+                failed.append(path_package)
+            else:
+                LOG.info("docgen timings for %s: %s", package_name.replace("_", "-"), _format_timings(timings_or_error))
+
+        LOG.info("docgen generated %d README(s) in %.2fs", len(args.packages) - len(failed), time.perf_counter() - start)
 
-        # Instantiate Jinja2 Environment with path to Jinja2 templates
-        jinja_env = sdk_helpers.setup_jinja_env("data/docgen/templates")
-        readme_template = jinja_env.get_template(README_TEMPLATE_NAME)
-        # Render the README Jinja2 Template with parameters
-        LOG.info("Rendering README for %s", package_name_dash)
-        rendered_readme = readme_template.render({
-            # basic details
-            "name_underscore": package_name,
-            "name_dash": package_name_dash,
-            "server_version": server_version,
-            "display_name": requirements_obj.get("setup_py_attributes", {}).get("display_name", package_name),
-            "short_description": requirements_obj.get("setup_py_attributes", {}).get("description"),
-            "long_description": requirements_obj.get("setup_py_attributes", {}).get("long_description"),
-            "version": requirements_obj.get("setup_py_attributes", {}).get("version"),
-            "all_dependencies": requirements_obj.get("setup_py_attributes", {}).get("install_requires", []),
-            "author": requirements_obj.get("setup_py_attributes", {}).get("author"),
-            "support_url": requirements_obj.get("setup_py_attributes", {}).get("url"),
-            "res_circuits_dependency_str": requirements_obj.get("res_circuits_dep_str"),
-            "supported_app": requirements_obj.get("supported_app"),
-            "app_configs": requirements_obj.get("jinja_app_configs", [{},{}])[1],
-
-            # lists of customizations (make unique)
-            "functions": package_helpers.make_list_of_dicts_unique(jinja_functions, lambda x: x["anchor"]),
-            "scripts": package_helpers.make_list_of_dicts_unique(jinja_scripts, lambda x: x["anchor"]),
-            "rules": package_helpers.make_list_of_dicts_unique(jinja_rules, lambda x: x["name"]),
-            "datatables": package_helpers.make_list_of_dicts_unique(jinja_datatables, lambda x: x["anchor"]),
-            "custom_fields": package_helpers.make_list_of_dicts_unique(jinja_custom_fields, lambda x: x["api_name"]),
-            "custom_artifact_types": package_helpers.make_list_of_dicts_unique(jinja_custom_artifact_types, lambda x: x["api_name"]),
-            "playbooks": package_helpers.make_list_of_dicts_unique(jinja_playbooks, lambda x: x["api_name"]),
-            "apps": package_helpers.make_list_of_dicts_unique(jinja_apps, lambda x: x["export_key"]),
-
-            # constants
-            "placeholder_string": constants.DOCGEN_PLACEHOLDER_STRING,
-            "poller_flag": args.poller or is_poller_app,
-            "poller_templates": requirements_obj.get("poller_templates", {}),
-            "sdk_version": sdk_helpers.get_resilient_sdk_version(),
-            "docgen_export": requirements_obj.get("docgen_export", False)
-        })
-
-        # Create a backup if needed of README
-        sdk_helpers.rename_to_bak_file(path_readme, package_helpers.PATH_DEFAULT_README)
-
-        # Write the new README
-        LOG.info("Writing README to: %s", path_readme)
-        sdk_helpers.write_file(path_readme, rendered_readme)
+        if failed:
+            raise SDKException("docgen failed for {0} of the {1} packages: {2}".format(len(failed), len(args.packages), ", ".join(failed)))
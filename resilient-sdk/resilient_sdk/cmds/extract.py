@@ -38,7 +38,7 @@ class CmdExtract(BaseCmd):
     $ resilient-sdk extract --script 'custom_script' --zip -c '/usr/custom_app.config'
     $ resilient-sdk extract --script 'custom_script' --name 'my_custom_export'"""
     CMD_DESCRIPTION = "Extract data in order to publish a .res export file"
-    CMD_ADD_PARSERS = [constants.APP_CONFIG_PARSER_NAME, constants.RESILIENT_OBJECTS_PARSER_NAME, constants.IO_PARSER_NAME, constants.ZIP_PARSER_NAME]
+    CMD_ADD_PARSERS = [constants.APP_CONFIG_PARSER_NAME, constants.RESILIENT_OBJECTS_PARSER_NAME, constants.IO_PARSER_NAME, constants.ZIP_PARSER_NAME, constants.EXPORT_CACHE_PARSER_NAME]
 
     def setup(self):
         # Define docgen usage and description
@@ -71,8 +71,8 @@ class CmdExtract(BaseCmd):
             # Instantiate connection to SOAR
             res_client = sdk_helpers.get_resilient_client(path_config_file=args.config)
 
-            # Generate + get latest export from Resilient Server
-            org_export = sdk_helpers.get_latest_org_export(res_client)
+            # Generate + get latest export from Resilient Server, or the one saved by a recent command
+            org_export = sdk_helpers.get_cached_org_export(res_client, refresh_export=args.refresh_export, max_age=args.export_max_age)
 
         LOG.info("Extracting data from export...")
 
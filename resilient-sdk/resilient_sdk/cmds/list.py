@@ -50,7 +50,7 @@ class CmdList(BaseCmd):
     $ resilient-sdk list --global-filter ".*(?i)cyber.*"      # matches all objects with "cyber" in them (uses '(?i)' for case-insensitive)
     $ resilient-sdk list --function --codegen-format          # list all functions and give output in codegen format
     """
-    CMD_ADD_PARSERS = [constants.APP_CONFIG_PARSER_NAME, constants.RESILIENT_OBJECTS_PARSER_NAME]
+    CMD_ADD_PARSERS = [constants.APP_CONFIG_PARSER_NAME, constants.RESILIENT_OBJECTS_PARSER_NAME, constants.EXPORT_CACHE_PARSER_NAME]
 
     def setup(self):
         SDKException.command_ran = self.CMD_NAME
@@ -86,7 +86,7 @@ class CmdList(BaseCmd):
         else:
             # Instantiate connection to SOAR and create/download latest full export
             res_client = sdk_helpers.get_resilient_client(path_config_file=args.config)
-            org_export = sdk_helpers.get_latest_org_export(res_client)
+            org_export = sdk_helpers.get_cached_org_export(res_client, refresh_export=args.refresh_export, max_age=args.export_max_age)
 
         results = {}
         LOG.debug("%sListing objects%s", constants.LOG_DIVIDER, constants.LOG_DIVIDER)
@@ -5,10 +5,14 @@
 """ Implementation of `resilient-sdk validate` """
 
 
+import hashlib
+import json
 import logging
 import os
 import re
+import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from resilient import ensure_unicode
 from resilient_sdk.cmds.base_cmd import BaseCmd
@@ -30,11 +34,15 @@ SUB_CMD_PYLINT = ("--pylint", )
 SUB_CMD_BANDIT = ("--bandit", )
 SUB_CMD_SELFTEST = ("--selftest", )
 SUB_CMD_TOX_ARGS = ("--tox-args", )
+SUB_CMD_NO_CACHE = ("--no-cache", )
 
 
 # optional parameters are skipped if they aren't included in the setup.py
 SETUP_OPTIONAL_ATTRS = ("python_requires", "author_email")
 
+# directories of a package that are not hashed to decide if the results of a stage can be reused
+VALIDATE_CACHE_IGNORED_DIRS = ("dist", "build", ".git", ".tox", ".pytest_cache", "__pycache__", constants.TOX_TEMP_PATH_XML_REPORT)
+
 
 class CmdValidate(BaseCmd):
     """
@@ -58,6 +66,35 @@ class CmdValidate(BaseCmd):
     VALIDATE_ISSUES = {}
     SUMMARY_LIST = []
 
+    STAGE_VALIDATE = "validate"
+    STAGE_SELFTEST = "selftest"
+    STAGE_TESTS = "tests"
+    STAGE_PYLINT = "pylint"
+    STAGE_BANDIT = "bandit"
+
+    # name of the method that runs each stage and returns its results
+    STAGE_METHODS = {
+        STAGE_VALIDATE: "_get_validate_results",
+        STAGE_SELFTEST: "_get_selftest_results",
+        STAGE_TESTS: "_get_tests_results",
+        STAGE_PYLINT: "_get_pylint_scan_results",
+        STAGE_BANDIT: "_get_bandit_scan_results"
+    }
+
+    # stages that run their tool in a subprocess, so they can run at the same time as the others.
+    # validate and pylint import the package and its modules in this process, so they run one
+    # after the other on the main thread
+    STAGES_IN_SUBPROCESS = (STAGE_SELFTEST, STAGE_TESTS, STAGE_BANDIT)
+
+    # stages whose results can be reused while the files they check are unchanged,
+    # and the package each runs (if any) whose version is part of the key of its results
+    STAGE_TOOLS = {
+        STAGE_VALIDATE: None,
+        STAGE_TESTS: constants.TOX_PACKAGE_NAME,
+        STAGE_PYLINT: constants.PYLINT_PACKAGE_NAME,
+        STAGE_BANDIT: constants.BANDIT_PACKAGE_NAME
+    }
+
     def setup(self):
         SDKException.command_ran = self.CMD_NAME
 
@@ -99,6 +136,10 @@ class CmdValidate(BaseCmd):
                                  nargs="*",
                                  help="""Pytest arguments to pass to tox when validating tests. Format is <attr1>="<value>". Example: '--tox-args my_arg1="value1" my_arg2="value2"'""")
 
+        self.parser.add_argument(SUB_CMD_NO_CACHE[0],
+                                 action="store_true",
+                                 help="Run every validation again, even those of files that have not changed since the last run")
+
     def execute_command(self, args, output_suppressed=False, run_from_package=False):
         """
         Runs validate. Can be any of:
@@ -135,8 +176,10 @@ class CmdValidate(BaseCmd):
         self._print_package_details(args)
 
         # validate that the given path to the sdk settings is valid
+        # (it is None if it was already found not to be, in an earlier run with the same args)
         try:
-            sdk_helpers.validate_file_paths(os.R_OK, args.settings)
+            if args.settings is not None:
+                sdk_helpers.validate_file_paths(os.R_OK, args.settings)
         except SDKException:
             args.settings = None
             self._log(constants.VALIDATE_LOG_LEVEL_WARNING, "Given path to SDK Settings is either not valid or not readable. Using defaults")
@@ -148,25 +191,20 @@ class CmdValidate(BaseCmd):
             SDKException.command_ran = "{0} {1} | {2}".format(self.CMD_NAME, constants.SUB_CMD_OPT_PACKAGE[0], constants.SUB_CMD_OPT_PACKAGE[1])
             self._run_main_validation(args, )
 
-        if not run_from_package and args.validate:
-            SDKException.command_ran = "{0} {1}".format(self.CMD_NAME, SUB_CMD_VALIDATE[0])
-            self._validate(args, )
-
-        if not run_from_package and args.tests:
-            SDKException.command_ran = "{0} {1}".format(self.CMD_NAME, SUB_CMD_TESTS[0])
-            self._run_tests(args, )
-
-        if not run_from_package and args.pylint:
-            SDKException.command_ran = "{0} {1}".format(self.CMD_NAME, SUB_CMD_PYLINT[0])
-            self._run_pylint_scan(args, )
-
-        if not run_from_package and args.bandit:
-            SDKException.command_ran = "{0} {1}".format(self.CMD_NAME, SUB_CMD_BANDIT[0])
-            self._run_bandit_scan(args, )
+        # list of (<flag>, <if given>, <stage it runs>)
+        # the stages of all the flags given run at the same time
+        sub_cmds = [
+            (SUB_CMD_VALIDATE, args.validate, self.STAGE_VALIDATE),
+            (SUB_CMD_TESTS, args.tests, self.STAGE_TESTS),
+            (SUB_CMD_PYLINT, args.pylint, self.STAGE_PYLINT),
+            (SUB_CMD_BANDIT, args.bandit, self.STAGE_BANDIT),
+            (SUB_CMD_SELFTEST, args.selftest, self.STAGE_SELFTEST)
+        ]
+        sub_cmds = [(sub_cmd, stage) for sub_cmd, given, stage in sub_cmds if given]
 
-        if not run_from_package and args.selftest:
-            SDKException.command_ran = "{0} {1}".format(self.CMD_NAME, SUB_CMD_SELFTEST[0])
-            self._run_selftest(args, )
+        if not run_from_package and sub_cmds:
+            SDKException.command_ran = "{0} {1}".format(self.CMD_NAME, " ".join(sub_cmd[0] for sub_cmd, _ in sub_cmds))
+            self._run_stages(args, [stage for _, stage in sub_cmds])
 
         self._print_summary()
         path_report = self._generate_report(self.VALIDATE_ISSUES, args, self._get_counts())
@@ -181,11 +219,207 @@ class CmdValidate(BaseCmd):
         Run all validations (no flags provided)
         """
         self._log(constants.VALIDATE_LOG_LEVEL_INFO, "{0}Running main validation{0}".format(constants.LOG_DIVIDER))
-        self._validate(args)
-        self._run_selftest(args)
-        self._run_tests(args)
-        self._run_pylint_scan(args)
-        self._run_bandit_scan(args)
+        self._run_stages(args, [self.STAGE_VALIDATE, self.STAGE_SELFTEST, self.STAGE_TESTS, self.STAGE_PYLINT, self.STAGE_BANDIT])
+
+    def _run_stages(self, args, stages):
+        """
+        Run the given stages of validate and output their results in the order given.
+
+        The stages that run in a subprocess (``STAGES_IN_SUBPROCESS``) run in the background,
+        with up to one stage per CPU, while the others run on this thread, as they change
+        ``sys.path`` and ``sys.modules``. The results of each stage are saved with a hash of the files it checks,
+        and if those files (and its settings) have not changed since the last run,
+        the saved results are output instead of running it again. Use ``--no-cache`` to
+        run every stage
+
+        :param args: command line args
+        :type args: argparse.Namespace
+        :param stages: names of the stages to run, from CmdValidate.STAGE_*
+        :type stages: list[str]
+        :raise SDKException: if the path to the package or required file is not found
+        :return: None
+        :rtype: None
+        """
+
+        # Get absolute path to package
+        path_package = os.path.abspath(args.package)
+        # Ensure the package directory exists and we have READ access
+        sdk_helpers.validate_dir_paths(os.R_OK, path_package)
+
+        use_cache = not getattr(args, "no_cache", False)
+        validate_cache = self._read_validate_cache(path_package) if use_cache else {}
+        cache_keys = self._get_stage_cache_keys(args, path_package, stages) if use_cache else {}
+
+        to_run = [stage for stage in stages if not cache_keys.get(stage) or
+                  validate_cache.get(stage, {}).get("key") != cache_keys.get(stage)]
+        in_background = [stage for stage in to_run if stage in self.STAGES_IN_SUBPROCESS]
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=max(min(len(in_background), os.cpu_count() or 1), 1)) as executor:
+            for stage in in_background:
+                futures[stage] = executor.submit(getattr(self, self.STAGE_METHODS[stage]), args)
+
+            for stage in stages:
+                if stage in to_run:
+                    if stage in futures:
+                        results = futures[stage].result()
+                    else:
+                        results = getattr(self, self.STAGE_METHODS[stage])(args)
+                    self._output_results(results)
+
+                    # results of a skipped run are not saved, so the stage runs once
+                    # what it needs is installed
+                    if cache_keys.get(stage) and all(result[3] != -1 for result in results):
+                        validate_cache[stage] = {
+                            "key": cache_keys.get(stage),
+                            "results": [[title, issues_key, status_name, valid, [issue.as_dict() for issue in issues]]
+                                        for title, issues_key, status_name, valid, issues in results]
+                        }
+                else:
+                    LOG.debug("No changes to the files checked by the '%s' stage since the last run. Using its results", stage)
+                    self._output_results([(title, issues_key, status_name, valid, [SDKValidateIssue(**issue) for issue in issues])
+                                          for title, issues_key, status_name, valid, issues in validate_cache[stage]["results"]])
+
+        if use_cache and to_run:
+            self._save_validate_cache(path_package, validate_cache)
+
+    def _output_results(self, results):
+        """
+        Output the results of a stage and add them to VALIDATE_ISSUES and SUMMARY_LIST
+
+        :param results: list of (<title>, <key in VALIDATE_ISSUES>, <name for status>, <valid or -1 if skipped>, <list of SDKValidateIssue>)
+        :type results: list[tuple]
+        """
+        for title, issues_key, status_name, valid, issues in results:
+            self._log(constants.VALIDATE_LOG_LEVEL_INFO, u"{0}{1}{0}".format(constants.LOG_DIVIDER, title))
+
+            self.VALIDATE_ISSUES[issues_key] = issues
+            self.SUMMARY_LIST += issues
+
+            for issue in issues:
+                self._log(issue.get_logging_level(), issue.error_str())
+
+            self._print_status(constants.VALIDATE_LOG_LEVEL_INFO, status_name, valid)
+
+    @classmethod
+    def _get_stage_cache_keys(cls, args, path_package, stages):
+        """
+        Return a key for each stage that can reuse its last results: a hash of the content
+        of the files it checks, its settings and the versions of python, the SDK and the tool it runs.
+        ``selftest`` connects to SOAR, so it always runs
+
+        :param args: command line args
+        :type args: argparse.Namespace
+        :param path_package: path to the package
+        :type path_package: str
+        :param stages: names of the stages to run
+        :type stages: list[str]
+        :return: dictionary of each stage to its key
+        :rtype: dict
+        """
+        stages = [stage for stage in stages if stage in cls.STAGE_TOOLS]
+        if not stages:
+            return {}
+
+        file_hashes = cls._get_package_file_hashes(path_package)
+        package_name = package_helpers.parse_setup_py(os.path.join(path_package, package_helpers.BASE_NAME_SETUP_PY), ["name"]).get("name")
+        path_settings = getattr(args, "settings", None)
+        settings_hash = cls._get_file_hash(path_settings) if path_settings and os.path.isfile(path_settings) else None
+
+        cache_keys = {}
+        for stage in stages:
+            tool = cls.STAGE_TOOLS[stage]
+            key = {
+                "stage": stage,
+                "python": sys.version,
+                "sdk": str(sdk_helpers.get_resilient_sdk_version()),
+                "tool": str(sdk_helpers.get_package_version(tool)) if tool else None,
+                "settings": settings_hash,
+                "tox_args": getattr(args, "tox_args", None) if stage == cls.STAGE_TESTS else None,
+                # pylint and bandit only scan the source of the package
+                "files": sorted((path, file_hash) for path, file_hash in file_hashes.items()
+                                if stage not in (cls.STAGE_PYLINT, cls.STAGE_BANDIT) or path.startswith(package_name + "/"))
+            }
+            cache_keys[stage] = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+        return cache_keys
+
+    @staticmethod
+    def _get_file_hash(path_file):
+        """
+        :return: sha256 hash of the content of the file
+        :rtype: str
+        """
+        return sdk_helpers.get_file_hash(path_file)
+
+    @classmethod
+    def _get_package_file_hashes(cls, path_package):
+        """
+        Return the hash of the content of each file in the package,
+        except those in VALIDATE_CACHE_IGNORED_DIRS and *.egg-info directories
+        which are built or written by validate itself
+
+        :param path_package: path to the package
+        :type path_package: str
+        :return: dictionary of the path of each file, relative to the package and separated by '/', to its hash
+        :rtype: dict
+        """
+        file_hashes = {}
+
+        for root, dirs, files in os.walk(path_package):
+            dirs[:] = [d for d in dirs if d not in VALIDATE_CACHE_IGNORED_DIRS and not d.endswith(".egg-info")]
+            for file_name in files:
+                path_file = os.path.join(root, file_name)
+                rel_path = os.path.relpath(path_file, path_package).replace(os.sep, "/")
+                file_hashes[rel_path] = cls._get_file_hash(path_file)
+
+        return file_hashes
+
+    @staticmethod
+    def _get_validate_cache_path(path_package):
+        """
+        :return: path of the file with the saved results of the stages for the package
+        :rtype: str
+        """
+        package_hash = hashlib.sha256(path_package.encode("utf-8")).hexdigest()
+        return os.path.join(constants.PATH_SDK_VALIDATE_CACHE_DIR, "{0}.json".format(package_hash))
+
+    @classmethod
+    def _read_validate_cache(cls, path_package):
+        """
+        :return: the saved results of the stages for the package, or an empty dict
+            if there are none or they cannot be read
+        :rtype: dict
+        """
+        path_cache = cls._get_validate_cache_path(path_package)
+
+        if not os.path.isfile(path_cache):
+            return {}
+
+        try:
+            return sdk_helpers.read_json_file(path_cache)
+        except SDKException as err:
+            LOG.debug("Could not read the saved results of validate at %s: %s", path_cache, err)
+            return {}
+
+    @classmethod
+    def _save_validate_cache(cls, path_package, validate_cache):
+        """
+        Save the results of the stages for the package. Failing to save them is logged and ignored
+
+        :param path_package: path to the package
+        :type path_package: str
+        :param validate_cache: dictionary of each stage to its key and results
+        :type validate_cache: dict
+        """
+        path_cache = cls._get_validate_cache_path(path_package)
+
+        try:
+            sdk_helpers.write_json_file_atomically(path_cache, validate_cache)
+            LOG.debug("Saved the results of validate to %s", path_cache)
+
+        except (IOError, OSError, TypeError, ValueError) as err:
+            LOG.debug("Could not save the results of validate to %s: %s", path_cache, err)
 
 
     def _print_package_details(self, args):
@@ -313,6 +547,18 @@ class CmdValidate(BaseCmd):
         :return: None
         :rtype: None
         """
+        self._output_results(self._get_validate_results(args))
+
+    def _get_validate_results(self, args):
+        """
+        Run the static validations of _validate()
+
+        :param args: command line args
+        :type args: argparse.ArgumentParser
+        :raise SDKException: if the path to the package or required file is not found
+        :return: list of (<title>, <key in VALIDATE_ISSUES>, <name for status>, <valid>, <list of SDKValidateIssue>)
+        :rtype: list[tuple]
+        """
 
         # Get absolute path to package
         path_package = os.path.abspath(args.package)
@@ -320,30 +566,46 @@ class CmdValidate(BaseCmd):
         sdk_helpers.validate_dir_paths(os.R_OK, path_package)
         self._log(constants.VALIDATE_LOG_LEVEL_DEBUG, "Path to project: {0}".format(path_package))
 
+        # parse the import definition once for all the checks that use it
+        import_definition = self._get_import_definition(path_package)
 
-        # list of ("<file_name>", <validation_function>)
+        # list of ("<file_name>", <validation_function>, <named args>)
         # this list gets looped and each sub method is ran to check if file is valid
         validations = [
-            ("setup.py", self._validate_setup),
-            ("package files", self._validate_package_files),
-            ("payload samples", self._validate_payload_samples),
+            ("setup.py", self._validate_setup, {}),
+            ("package files", self._validate_package_files, {"import_definition": import_definition}),
+            ("payload samples", self._validate_payload_samples, {"import_definition": import_definition}),
         ]
 
+        results = []
 
         # loop through files and their associated validation functions
-        for file_name, validation_func in validations:
-            self._log(constants.VALIDATE_LOG_LEVEL_INFO, u"{0}Validating {1}{0}".format(constants.LOG_DIVIDER, file_name))
-
+        for file_name, validation_func, kwargs in validations:
             # validate given file using static helper method
-            file_valid, issues = validation_func(path_package)
-            self.VALIDATE_ISSUES[file_name] = issues
-            self.SUMMARY_LIST += issues
+            file_valid, issues = validation_func(path_package, **kwargs)
+            results.append((u"Validating {0}".format(file_name), file_name, file_name, file_valid, issues))
 
-            # log output from validation
-            for issue in issues:
-                self._log(issue.get_logging_level(), issue.error_str())
+        return results
 
-            self._print_status(constants.VALIDATE_LOG_LEVEL_INFO, file_name, file_valid)
+    @staticmethod
+    def _get_import_definition(path_package):
+        """
+        Parse the import definition of the package from its util/data/export.res
+        or customize.py file
+
+        :param path_package: path to package
+        :type path_package: str
+        :return: the import definition, or None if it cannot be parsed.
+            The validations that use it then report why
+        :rtype: dict
+        """
+        try:
+            package_name = package_helpers.parse_setup_py(os.path.join(path_package, package_helpers.BASE_NAME_SETUP_PY), ["name"]).get("name")
+            path_customize_py = os.path.join(path_package, package_name, package_helpers.PATH_CUSTOMIZE_PY)
+            sdk_helpers.validate_file_paths(os.R_OK, path_customize_py)
+            return package_helpers.get_import_definition_from_customize_py(path_customize_py)
+        except SDKException:
+            return None
 
 
     @staticmethod
@@ -460,7 +722,7 @@ class CmdValidate(BaseCmd):
         return setup_valid, issues
 
     @staticmethod
-    def _validate_package_files(path_package):
+    def _validate_package_files(path_package, import_definition=None):
         """
         Validate the contents of the following files:
         - apikey_permissions.txt
@@ -478,6 +740,8 @@ class CmdValidate(BaseCmd):
 
         :param path_package: path to package
         :type path_package: str
+        :param import_definition: (optional) the import definition of the package, if already parsed
+        :type import_definition: dict
         :return: Returns boolean value of whether or not the run passed and a sorted list of SDKValidateIssue
         :rtype: (bool, list[SDKValidateIssue])
         """
@@ -537,7 +801,8 @@ class CmdValidate(BaseCmd):
                     package_version=package_version,
                     package_name=package_name,
                     path_file=path_file,
-                    path_package=path_package
+                    path_package=path_package,
+                    import_definition=import_definition
                 )
 
             issues.extend(issue_list)
@@ -550,7 +815,7 @@ class CmdValidate(BaseCmd):
         return package_files_valid, issues
 
     @staticmethod
-    def _validate_payload_samples(path_package):
+    def _validate_payload_samples(path_package, import_definition=None):
         """
         Validate the contents of the output_json_example.json and output_json_schema.json
         files for each function in a package. The payload samples are generated (empty) by codegen
@@ -560,6 +825,8 @@ class CmdValidate(BaseCmd):
 
         :param path_package: path to package
         :type path_package: str
+        :param import_definition: (optional) the import definition of the package, if already parsed
+        :type import_definition: dict
         :return: Returns boolean value of whether or not the payload check passed and a sorted list of SDKValidateIssue
         :rtype: (bool, list[SDKValidateIssue])
         """
@@ -573,7 +840,8 @@ class CmdValidate(BaseCmd):
         issues = validation_configurations.payload_samples_attributes.get("func")(
             path_package=path_package,
             package_name=package_name,
-            attr_dict=validation_configurations.payload_samples_attributes
+            attr_dict=validation_configurations.payload_samples_attributes,
+            import_definition=import_definition
         )
 
         # sort and look for and invalid issues
@@ -801,8 +1069,15 @@ class CmdValidate(BaseCmd):
         Note that this method sets the values for path_sdk_settings and tox_args to a default if they are
         not passed in with their respective --settings or --tox-args flags
         """
-        self._log(constants.VALIDATE_LOG_LEVEL_INFO, "{0}Running tests{0}".format(constants.LOG_DIVIDER))
+        self._output_results(self._get_tests_results(args))
 
+    def _get_tests_results(self, args):
+        """
+        Run the tox tests of _run_tests()
+
+        :return: list of (<title>, <key in VALIDATE_ISSUES>, <name for status>, <valid or -1 if skipped>, <list of SDKValidateIssue>)
+        :rtype: list[tuple]
+        """
         # Get absolute path to package
         path_package = os.path.abspath(args.package)
         # Ensure the package directory exists and we have READ access
@@ -813,13 +1088,8 @@ class CmdValidate(BaseCmd):
 
         # check if tox tests installed and run tox if so
         tox_tests_valid_or_skipped, issues = self._validate_tox_tests(path_package, tox_args, args.settings)
-        self.VALIDATE_ISSUES["tests"] = issues
-        self.SUMMARY_LIST += issues
 
-        for issue in issues:
-            self._log(issue.get_logging_level(), issue.error_str())
-
-        self._print_status(constants.VALIDATE_LOG_LEVEL_INFO, "tests", tox_tests_valid_or_skipped)
+        return [("Running tests", "tests", "tests", tox_tests_valid_or_skipped, issues)]
 
     def _run_pylint_scan(self, args):
         """
@@ -827,8 +1097,15 @@ class CmdValidate(BaseCmd):
 
         Pylint scan can be isolated by passing in the --pylint flag
         """
-        self._log(constants.VALIDATE_LOG_LEVEL_INFO, "{0}Running pylint{0}".format(constants.LOG_DIVIDER))
+        self._output_results(self._get_pylint_scan_results(args))
+
+    def _get_pylint_scan_results(self, args):
+        """
+        Run the pylint scan of _run_pylint_scan()
 
+        :return: list of (<title>, <key in VALIDATE_ISSUES>, <name for status>, <valid or -1 if skipped>, <list of SDKValidateIssue>)
+        :rtype: list[tuple]
+        """
         # Get absolute path to package
         path_package = os.path.abspath(args.package)
         # Ensure the package directory exists and we have READ access
@@ -836,13 +1113,8 @@ class CmdValidate(BaseCmd):
 
         # check if pylint installed in env and run pylint scan if so
         pylint_valid_or_skipped, issues = self._pylint_scan(path_package, args.settings)
-        self.VALIDATE_ISSUES["pylint"] = issues
-        self.SUMMARY_LIST += issues
 
-        for issue in issues:
-            self._log(issue.get_logging_level(), issue.error_str())
-
-        self._print_status(constants.VALIDATE_LOG_LEVEL_INFO, "Pylint Scan", pylint_valid_or_skipped)
+        return [("Running pylint", "pylint", "Pylint Scan", pylint_valid_or_skipped, issues)]
 
     def _run_bandit_scan(self, args):
         """
@@ -852,12 +1124,20 @@ class CmdValidate(BaseCmd):
 
         NOTE: bandit scan is only available in python >= 3.6
         """
+        self._output_results(self._get_bandit_scan_results(args))
+
+    def _get_bandit_scan_results(self, args):
+        """
+        Run the bandit scan of _run_bandit_scan()
+
+        :return: list of (<title>, <key in VALIDATE_ISSUES>, <name for status>, <valid or -1 if skipped>, <list of SDKValidateIssue>),
+            empty if this version of python does not support bandit
+        :rtype: list[tuple]
+        """
 
         # Check if Python >= MIN_SUPPORTED_PY_VERSION
         if not sdk_helpers.is_python_min_supported_version("{0}: Bandit Scan".format(constants.ERROR_WRONG_PYTHON_VERSION)):
-            return
-
-        self._log(constants.VALIDATE_LOG_LEVEL_INFO, "{0}Running Bandit Scan{0}".format(constants.LOG_DIVIDER))
+            return []
 
         # Get absolute path to package
         path_package = os.path.abspath(args.package)
@@ -866,21 +1146,22 @@ class CmdValidate(BaseCmd):
 
         # check if bandit installed in env and run bandit scan if so
         bandit_valid_or_skipped, issues = self._bandit_scan(path_package, args.settings)
-        self.VALIDATE_ISSUES["bandit"] = issues
-        self.SUMMARY_LIST += issues
-
-        for issue in issues:
-            self._log(issue.get_logging_level(), issue.error_str())
 
-        self._print_status(constants.VALIDATE_LOG_LEVEL_INFO, "Bandit Scan", bandit_valid_or_skipped)
+        return [("Running Bandit Scan", "bandit", "Bandit Scan", bandit_valid_or_skipped, issues)]
 
     def _run_selftest(self, args):
         """
         Validates and executes selftest.py
         """
-        self._log(constants.VALIDATE_LOG_LEVEL_INFO, "{0}Validating selftest.py{0}".format(constants.LOG_DIVIDER))
+        self._output_results(self._get_selftest_results(args))
 
+    def _get_selftest_results(self, args):
+        """
+        Validate and execute selftest.py for _run_selftest()
 
+        :return: list of (<title>, <key in VALIDATE_ISSUES>, <name for status>, <valid>, <list of SDKValidateIssue>)
+        :rtype: list[tuple]
+        """
         # Get absolute path to package
         path_package = os.path.abspath(args.package)
         # Ensure the package directory exists and we have READ access
@@ -891,13 +1172,8 @@ class CmdValidate(BaseCmd):
 
         # validate selftest.py and then execute it if valid
         file_valid, issues = self._validate_selftest(path_package, path_app_config)
-        self.VALIDATE_ISSUES["selftest.py"] = issues
-        self.SUMMARY_LIST += issues
-
-        for issue in issues:
-            self._log(issue.get_logging_level(), issue.error_str())
 
-        self._print_status(constants.VALIDATE_LOG_LEVEL_INFO, "selftest.py", file_valid)
+        return [("Validating selftest.py", "selftest.py", "selftest.py", file_valid, issues)]
 
 
 
@@ -942,7 +1218,7 @@ class CmdValidate(BaseCmd):
         file_template = jinja_env.get_template(constants.VALIDATE_REPORT_TEMPLATE_NAME)
 
         # filter out any full paths in args
-        args = vars(args)
+        args = dict(vars(args))
         for arg in args:
             if isinstance(args[arg], str) and os.path.isdir(args[arg]):
                 args[arg] = os.path.basename(args[arg])
@@ -43,6 +43,7 @@ IO_PARSER_NAME = "io_parser"
 ZIP_PARSER_NAME = "zip_parser"
 APP_CONFIG_PARSER_NAME = "app_config_parser"
 SDK_SETTINGS_PARSER_NAME = "sdk_settings_parser"
+EXPORT_CACHE_PARSER_NAME = "export_cache_parser"
 
 # file for SDK settings
 SDK_SETTINGS_FILENAME = ".sdk_settings.json"
@@ -51,6 +52,16 @@ SDK_SETTINGS_BANDIT_SECTION_NAME = "bandit"
 
 SUB_CMD_OPT_GATHER_RESULTS = "--gather-results"
 
+# local cache of the organization exports used by codegen, list, clone and extract
+PATH_SDK_EXPORT_CACHE_DIR = os.path.join(PATH_RES_DEFAULT_DIR, "sdk_export_cache")
+DEFAULT_EXPORT_CACHE_MAX_AGE = 0 # seconds, 0 to not save exports
+
+# results of the validate stages, reused while the files they check are unchanged
+PATH_SDK_VALIDATE_CACHE_DIR = os.path.join(PATH_RES_DEFAULT_DIR, "sdk_validate_cache")
+
+# hashes of the files 'codegen --reload' generated, to skip those whose inputs are unchanged
+PATH_SDK_CODEGEN_CACHE_DIR = os.path.join(PATH_RES_DEFAULT_DIR, "sdk_codegen_cache")
+
 # Resilient export file suffix.
 RES_EXPORT_SUFFIX = ".res"
 # Endpoint url for importing a configuration
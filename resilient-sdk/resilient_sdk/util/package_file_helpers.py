@@ -435,8 +435,9 @@ def get_import_definition_from_local_export_res(path_export_res_file):
 
 def get_export_from_zip(path_zip, format_str="zip"):
     """
-    Given a path to an export.resz (zip file), extract the export.res file from within.
+    Given a path to an export.resz (zip file), read the export.res file from within.
     This applies to System exports from the UI or Playbook exports from the UI.
+    The export.res file is read from the zip in memory, without extracting the zip
 
     :param path_zip: absolute path to the .resz file
     :type path_zip: str
@@ -446,22 +447,25 @@ def get_export_from_zip(path_zip, format_str="zip"):
     :return: the contents of the export.res file within the zip
     :rtype: dict
     """
-    temp_dir = tempfile.mkdtemp()
     try:
         with zipfile.ZipFile(path_zip, "r") as myzip:
-            myzip.extractall(temp_dir)
+            # only a .res file at the top level of the zip is the export
+            for file_name in myzip.namelist():
+                if file_name.endswith(".res") and "/" not in file_name:
+                    export_bytes = myzip.read(file_name)
+                    break
+            else:
+                raise SDKException("No export.res found in {0}".format(path_zip))
     except zipfile.BadZipfile as err:
         raise SDKException(str(err))
 
-    for file_path in os.listdir(temp_dir):
-        if file_path.endswith(".res"):
-            export_file_path = os.path.join(temp_dir, file_path)
-            break
-    else:
-        raise SDKException("No export.res found in {0}".format(path_zip))
-    export_content = get_import_definition_from_local_export_res(export_file_path)
+    try:
+        export_content = json.loads(export_bytes.decode("utf-8"))
+    except ValueError as err:
+        raise SDKException("Could not read corrupt JSON file at {0}\n{1}".format(os.path.join(path_zip, file_name), err))
 
-    shutil.rmtree(temp_dir)
+    # Remove the incident type that was added by codegen that allows the data to import
+    export_content = remove_default_incident_type_from_import_definition(export_content)
 
     return export_content
 
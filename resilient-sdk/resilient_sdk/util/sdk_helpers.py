@@ -6,6 +6,7 @@
 import ast
 import copy
 import datetime
+import gzip
 import hashlib
 import importlib
 import io
@@ -194,6 +195,41 @@ def read_json_file(path, section=None):
         return file_contents
 
 
+def write_json_file_atomically(path, contents, compress=False):
+    """
+    Write ``contents`` as JSON to ``path``. It is written to a temp file first,
+    then moved to ``path``, so another command never reads half of it.
+    The directory of ``path`` is created, readable only by the current user, if it does not exist
+
+    :param path: path of the file to write
+    :type path: str
+    :param contents: JSON serializable contents
+    :type contents: dict
+    :param compress: if ``True`` the file is gzipped, defaults to ``False``
+    :type compress: bool
+    :raises (IOError, OSError, TypeError, ValueError): if it could not be written
+    """
+    path_dir = os.path.dirname(path)
+    if not os.path.isdir(path_dir):
+        os.makedirs(path_dir, mode=0o700)
+
+    fd, path_temp_file = tempfile.mkstemp(dir=path_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            data = json.dumps(contents).encode("utf-8")
+            if compress:
+                with gzip.GzipFile(fileobj=temp_file, mode="wb", compresslevel=1) as gzip_file:
+                    gzip_file.write(data)
+            else:
+                temp_file.write(data)
+
+        os.replace(path_temp_file, path)
+    except Exception:
+        if os.path.isfile(path_temp_file):
+            os.remove(path_temp_file)
+        raise
+
+
 def read_zip_file(path, pattern):
     """Returns unzipped contents of file whose name matches a pattern
     in zip file at path.
@@ -346,6 +382,24 @@ def generate_uuid_from_string(the_string):
     return str(uuid.UUID(the_md5_hex_str))
 
 
+def get_file_hash(path_file):
+    """
+    Returns the sha256 hash of the content of the file at path_file
+
+    :param path_file: path to the file
+    :type path_file: str
+    :return: hex sha256 hash of the content of the file
+    :rtype: str
+    """
+    file_hash = hashlib.sha256()
+
+    with open(path_file, "rb") as the_file:
+        for block in iter(lambda: the_file.read(65536), b""):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
 def has_permissions(permissions, path):
     """
     Raises an exception if the user does not have the given permissions to path
@@ -467,6 +521,98 @@ def get_latest_org_export(res_client):
     return res_client.post(latest_export_uri, customizations_to_get)
 
 
+def get_org_export_cache_path(res_client):
+    """
+    Get the path of the saved export of the organization ``res_client`` is
+    connected to. It is keyed by the host, organization, server version and
+    the API key or user that connected, as each may see different objects
+
+    :param res_client: required for communication back to resilient
+    :type res_client: sdk_helpers.get_resilient_client()
+    :return: path of the saved export in ``constants.PATH_SDK_EXPORT_CACHE_DIR``
+    :rtype: str
+    """
+    cache_key = u"{0}|{1}|{2}|{3}".format(getattr(res_client, "base_url", None),
+                                           getattr(res_client, "org_name", None),
+                                           get_resilient_server_version(res_client),
+                                           getattr(res_client, "api_key_id", None) or getattr(res_client, "user_id", None))
+
+    file_name = "{0}.json.gz".format(hashlib.sha256(cache_key.encode("utf-8")).hexdigest())
+    return os.path.join(constants.PATH_SDK_EXPORT_CACHE_DIR, file_name)
+
+
+def get_cached_org_export(res_client, refresh_export=False, max_age=constants.DEFAULT_EXPORT_CACHE_MAX_AGE):
+    """
+    Get an export of the organization. If ``max_age`` is set and an export
+    was saved by a command within ``max_age`` seconds it is reused, else a
+    new one is generated with :func:`get_latest_org_export` and saved.
+
+    :param res_client: required for communication back to resilient
+    :type res_client: sdk_helpers.get_resilient_client()
+    :param refresh_export: if ``True`` always generate a new export
+    :type refresh_export: bool
+    :param max_age: seconds to reuse a saved export for. If 0, the default, the export is not saved
+    :type max_age: int
+    :return: the export of the organization
+    :rtype: dict
+    """
+    path_cached_export = get_org_export_cache_path(res_client)
+
+    if not refresh_export and max_age > 0 and os.path.isfile(path_cached_export):
+        age = time.time() - os.path.getmtime(path_cached_export)
+
+        if age <= max_age:
+            try:
+                with gzip.open(path_cached_export, "rt", encoding="utf-8") as cached_export_file:
+                    org_export = json.load(cached_export_file)
+
+                LOG.info("Using the organization export saved %d seconds ago. Use --refresh-export to generate a new one", age)
+                return org_export
+
+            except (IOError, OSError, ValueError) as err:
+                LOG.debug("Could not read saved export %s: %s", path_cached_export, err)
+
+    org_export = get_latest_org_export(res_client)
+
+    if max_age > 0:
+        save_org_export(path_cached_export, org_export)
+
+    return org_export
+
+
+def save_org_export(path_cached_export, org_export):
+    """
+    Save an export of the organization to ``path_cached_export``. Only the
+    current user can read it. Failing to save it is logged and ignored
+
+    :param path_cached_export: path from :func:`get_org_export_cache_path`
+    :type path_cached_export: str
+    :param org_export: the export of the organization
+    :type org_export: dict
+    """
+    try:
+        write_json_file_atomically(path_cached_export, org_export, compress=True)
+        LOG.debug("Saved organization export to %s", path_cached_export)
+
+    except (IOError, OSError, TypeError, ValueError) as err:
+        LOG.debug("Could not save organization export to %s: %s", path_cached_export, err)
+
+
+def clear_org_export_cache(res_client):
+    """
+    Remove the saved export of the organization ``res_client`` is connected to,
+    for example after its configuration has been changed by an import
+
+    :param res_client: required for communication back to resilient
+    :type res_client: sdk_helpers.get_resilient_client()
+    """
+    path_cached_export = get_org_export_cache_path(res_client)
+
+    if os.path.isfile(path_cached_export):
+        os.remove(path_cached_export)
+        LOG.debug("Removed saved organization export %s", path_cached_export)
+
+
 def add_configuration_import(new_export_data, res_client):
     """
     Makes a REST request to add a configuration import.
@@ -492,6 +638,8 @@ def add_configuration_import(new_export_data, res_client):
         assert isinstance(result, dict)
     if result.get("status", '') == "PENDING":
         confirm_configuration_import(result, result.get("id"), res_client)
+        # the saved export no longer matches the organization
+        clear_org_export_cache(res_client)
     else:
         raise SDKException(
             "Could not import because the server did not return an import ID")
@@ -605,6 +753,139 @@ def get_obj_from_list(identifer, obj_list, condition=lambda o: True):
     return {}
 
 
+class ExportIndex(object):
+    """
+    Index of the objects in an export, so they can be looked up without
+    scanning the lists of the export each time. An index of a list of the
+    export by one attribute of its objects is built the first time it is used.
+
+    The index holds the objects of the export, not copies of them, and the
+    lists of the export must not be changed while it is used.
+
+    **Example:**
+
+    .. code-block:: python
+
+        export_index = ExportIndex(org_export)
+        fn = export_index.find("functions", "export_key", "fn_my_function")
+        playbooks = export_index.get_playbooks_using_function(fn.get("uuid"))
+
+    :param export: The result of calling get_latest_org_export()
+    :type export: Dict
+    """
+
+    def __init__(self, export):
+        self.export = export
+        self._indexes = {}
+        self._playbooks_by_function = None
+
+    @classmethod
+    def from_export(cls, export):
+        """
+        :param export: an export or an ``ExportIndex`` of one
+        :return: the ``ExportIndex`` of the export
+        :rtype: ExportIndex
+        """
+        return export if isinstance(export, cls) else cls(export)
+
+    def get_section(self, obj_name):
+        """
+        :param obj_name: Name of the Object list in the Export e.g. "functions"
+        :return: the list of objects, or an empty list if it is not in the export
+        :rtype: List
+        """
+        return self.export.get(obj_name) or []
+
+    def get_index(self, obj_name, obj_identifer):
+        """
+        Return a dict of the objects of a list of the export by an attribute.
+        String values are stripped, as with :func:`get_obj_from_list`
+
+        :param obj_name: Name of the Object list in the Export e.g. "functions"
+        :type obj_name: str
+        :param obj_identifer: The attribute of the object we use to identify it e.g. "export_key"
+        :type obj_identifer: str
+        :return: Dictionary of each value of the attribute to the list of objects with that value, in the order of the export
+        :rtype: Dict
+        """
+        key = (obj_name, obj_identifer)
+        index = self._indexes.get(key)
+
+        if index is None:
+            index = self._indexes[key] = {}
+            for o in self.get_section(obj_name):
+                value = o.get(obj_identifer)
+                if isinstance(value, str):
+                    value = value.strip()
+                try:
+                    index.setdefault(value, []).append(o)
+                except TypeError:
+                    # values that are lists or dicts cannot be looked up
+                    continue
+
+        return index
+
+    def find_all(self, obj_name, obj_identifer, value, condition=lambda o: True):
+        """
+        :return: the objects of a list of the export with the value of the attribute that meet the ``condition``
+        :rtype: List
+        """
+        if isinstance(value, str):
+            value = value.strip()
+        try:
+            return [o for o in self.get_index(obj_name, obj_identifer).get(value, []) if condition(o)]
+        except TypeError:
+            return []
+
+    def find(self, obj_name, obj_identifer, value, condition=lambda o: True):
+        """
+        Return the object of a list of the export with the value of the attribute
+        that meets the ``condition``. If there are more than one, the last is returned
+        like :func:`get_obj_from_list`
+
+        :param obj_name: Name of the Object list in the Export e.g. "functions"
+        :type obj_name: str
+        :param obj_identifer: The attribute of the object we use to identify it e.g. "export_key"
+        :type obj_identifer: str
+        :param value: the value of the attribute
+        :type value: str
+        :param condition: A lambda function to evaluate each object
+        :type condition: function
+        :return: the object or ``None`` if not found
+        :rtype: Dict
+        """
+        found = self.find_all(obj_name, obj_identifer, value, condition)
+        return found[-1] if found else None
+
+    def get_identifiers(self, obj_name, obj_identifer, condition=lambda o: True):
+        """
+        :return: the values of the attribute of the objects that meet the ``condition``, in the order of the export
+        :rtype: List
+        """
+        return [value for value, objs in self.get_index(obj_name, obj_identifer).items()
+                if isinstance(value, str) and any(condition(o) for o in objs)]
+
+    def get_playbooks_using_function(self, function_uuid):
+        """
+        Return the playbooks that use a function and the objects in their XML.
+        The XML of each playbook is parsed once, the first time this is called
+
+        :param function_uuid: the uuid of the function
+        :type function_uuid: str
+        :return: tuples of each playbook and the result of calling get_playbook_objects() for it,
+            in the order of the export
+        :rtype: List
+        """
+        if self._playbooks_by_function is None:
+            self._playbooks_by_function = {}
+            for playbook in self.get_section("playbooks"):
+                pb_objects = get_playbook_objects(playbook)
+                for fn_uuid in OrderedDict((pb_fn.get("uuid"), True) for pb_fn in pb_objects.get("functions", [])):
+                    self._playbooks_by_function.setdefault(fn_uuid, []).append((playbook, pb_objects))
+
+        return self._playbooks_by_function.get(function_uuid, [])
+
+
 def get_res_obj(obj_name, obj_identifer, obj_display_name, wanted_list, export, condition=lambda o: True, include_api_name=True):
     """
     Return a List of Resilient Objects that are in the 'wanted_list' and meet the 'condition'
@@ -617,8 +898,8 @@ def get_res_obj(obj_name, obj_identifer, obj_display_name, wanted_list, export,
     :type obj_display_name: str
     :param wanted_list: List of identifers for objects we want to return
     :type wanted_list: List of str
-    :param export: The result of calling get_latest_org_export()
-    :type export: Dict
+    :param export: The result of calling get_latest_org_export(), or an ExportIndex of it
+    :type export: Dict or ExportIndex
     :param condition: A lambda function to evaluate each object
     :type condition: function
     :param include_api_name: Whether or not to return the objects API name as a field.
@@ -627,6 +908,7 @@ def get_res_obj(obj_name, obj_identifer, obj_display_name, wanted_list, export,
     :rtype: List
     """
     return_list = []
+    export_index = ExportIndex.from_export(export)
 
     # This loops wanted_list
     # If an entry is dict format, it will have value and identifier attributes
@@ -637,23 +919,21 @@ def get_res_obj(obj_name, obj_identifer, obj_display_name, wanted_list, export,
         if isinstance(obj, dict):
             temp_obj_identifier = obj.get("identifier", "")
             obj_value = obj.get("value", "")
-            full_obj = get_obj_from_list(temp_obj_identifier,
-                                         export.get(obj_name, ""),
+            full_obj = export_index.find(obj_name, temp_obj_identifier, obj_value,
                                          lambda wanted_obj, i=temp_obj_identifier, v=obj_value: True if wanted_obj.get(i) == v else False)
 
-            wanted_list[index] = full_obj.get(obj_value).get(obj_identifer)
+            wanted_list[index] = full_obj.get(obj_identifer)
 
     if wanted_list:
-        ex_obj = get_obj_from_list(obj_identifer, export.get(obj_name, ""), condition)
-
         for o in set(wanted_list):
             stripped_o = o.strip()
-            if stripped_o not in ex_obj:
-                raise SDKException(u"{0}: '{1}' not found in this export.\n{0}s Available:\n\t{2}".format(obj_display_name, stripped_o, "\n\t".join(ex_obj.keys())))
+            obj = export_index.find(obj_name, obj_identifer, stripped_o, condition)
+            if obj is None:
+                ex_obj_names = export_index.get_identifiers(obj_name, obj_identifer, condition)
+                raise SDKException(u"{0}: '{1}' not found in this export.\n{0}s Available:\n\t{2}".format(obj_display_name, stripped_o, "\n\t".join(ex_obj_names)))
 
             # Add x_api_name to each object, so we can easily reference. This avoids needing to know if
             # obj attribute is 'name' or 'programmatic_name' etc.
-            obj = ex_obj.get(stripped_o)
             if include_api_name:
                 obj["x_api_name"] = obj[obj_identifer]
             return_list.append(obj)
@@ -700,6 +980,9 @@ def get_from_export(export,
     # Create a deepcopy of the export, so we don't overwrite the original
     export = copy.deepcopy(export)
 
+    # Index the export once, rather than scanning it for each object we get
+    export_index = ExportIndex(export)
+
     # Set paramaters to Lists if falsy
     message_destinations = message_destinations if message_destinations else []
     functions = functions if functions else []
@@ -719,7 +1002,7 @@ def get_from_export(export,
     }
 
     # Get Rules
-    return_dict["rules"] = get_res_obj("actions", ResilientObjMap.RULES, "Rule", rules, export)
+    return_dict["rules"] = get_res_obj("actions", ResilientObjMap.RULES, "Rule", rules, export_index)
 
     if get_related_objects:
         # For Rules we attempt to locate related workflows and message_destinations
@@ -728,7 +1011,7 @@ def get_from_export(export,
             # Get Activity Fields for Rules
             view_items = r.get("view_items", [])
             activity_field_uuids = [v.get("content") for v in view_items if "content" in v and v.get("field_type") == ResilientFieldTypes.ACTIVITY_FIELD]
-            r["activity_fields"] = get_res_obj("fields", "uuid", "Activity Field", activity_field_uuids, export)
+            r["activity_fields"] = get_res_obj("fields", "uuid", "Activity Field", activity_field_uuids, export_index)
             return_dict["all_fields"].extend([u"actioninvocation/{0}".format(fld.get("name")) for fld in r.get("activity_fields")])
 
             # Get names of Workflows that are related to Rule
@@ -761,21 +1044,26 @@ def get_from_export(export,
             if f.get("destination_handle") in message_destinations:
                 functions.append(f.get(ResilientObjMap.FUNCTIONS))
 
-    return_dict["functions"] = get_res_obj("functions", ResilientObjMap.FUNCTIONS, "Function", functions, export)
+    return_dict["functions"] = get_res_obj("functions", ResilientObjMap.FUNCTIONS, "Function", functions, export_index)
 
     for f in return_dict.get("functions"):
         # Get Function Inputs
         view_items = f.get("view_items", [])
         function_input_uuids = [v.get("content") for v in view_items if "content" in v and v.get("field_type") == ResilientFieldTypes.FUNCTION_INPUT]
-        f["inputs"] = get_res_obj("fields", "uuid", "Function Input", function_input_uuids, export)
+        f["inputs"] = get_res_obj("fields", "uuid", "Function Input", function_input_uuids, export_index)
 
         return_dict["all_fields"].extend([u"__function/{0}".format(fld.get("name")) for fld in f.get("inputs")])
 
         # Get Function's Message Destination name
         message_destinations.append(f.get("destination_handle", ""))
 
+    # The first of the Functions with each uuid
+    functions_by_uuid = {}
+    for fn in return_dict["functions"]:
+        functions_by_uuid.setdefault(fn.get("uuid", "b"), fn)
+
     # Get Workflows
-    return_dict["workflows"] = get_res_obj("workflows", ResilientObjMap.WORKFLOWS, "Workflow", workflows, export)
+    return_dict["workflows"] = get_res_obj("workflows", ResilientObjMap.WORKFLOWS, "Workflow", workflows, export_index)
 
     if get_related_objects:
         # For workflows we attempt to locate related functions
@@ -786,52 +1074,51 @@ def get_from_export(export,
 
             # Add the Display Name and Name to each wf_function
             for wf_fn in wf_functions:
-                for fn in return_dict["functions"]:
-                    if wf_fn.get("uuid", "a") == fn.get("uuid", "b"):
-                        wf_fn["name"] = fn.get("name")
-                        wf_fn["display_name"] = fn.get("display_name")
-                        wf_fn["message_destination"] = fn.get("destination_handle", "")
-                        break
+                fn = functions_by_uuid.get(wf_fn.get("uuid", "a"))
+                if fn:
+                    wf_fn["name"] = fn.get("name")
+                    wf_fn["display_name"] = fn.get("display_name")
+                    wf_fn["message_destination"] = fn.get("destination_handle", "")
 
             workflow["wf_functions"] = wf_functions
 
     # Get Message Destinations
-    return_dict["message_destinations"] = get_res_obj("message_destinations", ResilientObjMap.MESSAGE_DESTINATIONS, "Message Destination", message_destinations, export)
+    return_dict["message_destinations"] = get_res_obj("message_destinations", ResilientObjMap.MESSAGE_DESTINATIONS, "Message Destination", message_destinations, export_index)
 
     # Get Incident Fields (Custom and Internal)
-    return_dict["fields"] = get_res_obj("fields", ResilientObjMap.FIELDS, "Field", fields, export,
+    return_dict["fields"] = get_res_obj("fields", ResilientObjMap.FIELDS, "Field", fields, export_index,
                                         condition=lambda o: True if o.get("type_id") == ResilientTypeIds.INCIDENT else False)
 
     return_dict["all_fields"].extend([u"incident/{0}".format(fld.get("name")) for fld in return_dict.get("fields")])
 
     # Get Custom Artifact Types
-    return_dict["artifact_types"] = get_res_obj("incident_artifact_types", ResilientObjMap.INCIDENT_ARTIFACT_TYPES, "Custom Artifact", artifact_types, export)
+    return_dict["artifact_types"] = get_res_obj("incident_artifact_types", ResilientObjMap.INCIDENT_ARTIFACT_TYPES, "Custom Artifact", artifact_types, export_index)
 
     # Get Incident Types
-    return_dict["incident_types"] = get_res_obj("incident_types", ResilientObjMap.INCIDENT_TYPES, "Custom Incident Type", incident_types, export)
+    return_dict["incident_types"] = get_res_obj("incident_types", ResilientObjMap.INCIDENT_TYPES, "Custom Incident Type", incident_types, export_index)
 
     # Get Data Tables
-    return_dict["datatables"] = get_res_obj("types", ResilientObjMap.DATATABLES, "Datatable", datatables, export,
+    return_dict["datatables"] = get_res_obj("types", ResilientObjMap.DATATABLES, "Datatable", datatables, export_index,
                                             condition=lambda o: True if o.get("type_id") == ResilientTypeIds.DATATABLE else False)
 
     # Get Custom Tasks
-    return_dict["tasks"] = get_res_obj("automatic_tasks", ResilientObjMap.TASKS, "Custom Task", tasks, export)
+    return_dict["tasks"] = get_res_obj("automatic_tasks", ResilientObjMap.TASKS, "Custom Task", tasks, export_index)
 
     # Get related Phases for Tasks
     phase_ids = [t.get("phase_id") for t in return_dict.get("tasks")]
-    return_dict["phases"] = get_res_obj("phases", ResilientObjMap.PHASES, "Phase", phase_ids, export)
+    return_dict["phases"] = get_res_obj("phases", ResilientObjMap.PHASES, "Phase", phase_ids, export_index)
 
     # Get Scripts
-    return_dict["scripts"] = get_res_obj("scripts", ResilientObjMap.SCRIPTS, "Script", scripts, export)
+    return_dict["scripts"] = get_res_obj("scripts", ResilientObjMap.SCRIPTS, "Script", scripts, export_index)
 
     # Get Apps
-    return_dict["apps"] = get_res_obj("apps", ResilientObjMap.APPS, "Apps", apps, export)
+    return_dict["apps"] = get_res_obj("apps", ResilientObjMap.APPS, "Apps", apps, export_index)
 
     # Get Playbooks
     if playbooks and constants.CURRENT_SOAR_SERVER_VERSION and constants.CURRENT_SOAR_SERVER_VERSION < constants.MIN_SOAR_SERVER_VERSION_PLAYBOOKS:
         raise SDKException(constants.ERROR_PLAYBOOK_SUPPORT)
     else:
-        return_dict["playbooks"] = get_res_obj("playbooks", ResilientObjMap.PLAYBOOKS, "Playbook", playbooks, export)
+        return_dict["playbooks"] = get_res_obj("playbooks", ResilientObjMap.PLAYBOOKS, "Playbook", playbooks, export_index)
 
         if get_related_objects:
             # For Playbooks we attempt to locate related functions and scripts
@@ -842,12 +1129,11 @@ def get_from_export(export,
 
                 # Add the Display Name and Name to each wf_function
                 for pb_fn in pb_objects.get("functions", []):
-                    for fn in return_dict["functions"]:
-                        if pb_fn.get("uuid", "uuid_not_found_pb") == fn.get("uuid", "uuid_not_found_fn"):
-                            pb_fn["name"] = fn.get("name")
-                            pb_fn["display_name"] = fn.get("display_name")
-                            pb_fn["message_destination"] = fn.get("destination_handle", "")
-                            break
+                    fn = functions_by_uuid.get(pb_fn.get("uuid", "uuid_not_found_pb"))
+                    if fn:
+                        pb_fn["name"] = fn.get("name")
+                        pb_fn["display_name"] = fn.get("display_name")
+                        pb_fn["message_destination"] = fn.get("destination_handle", "")
 
                 # If a playbook script is local, its information can be directly extracted from the playbook,
                 # if not, the script's information has to be extracted from the global scripts
@@ -860,7 +1146,7 @@ def get_from_export(export,
 
                     # If the script is not found in the Playbook or Global Scripts, then its UUID is used to find the script form the org export
                     if not found_script:
-                        _unfound_scripts = get_res_obj("scripts", "uuid", "Script", [pb_sc.get("uuid")], export)
+                        _unfound_scripts = get_res_obj("scripts", "uuid", "Script", [pb_sc.get("uuid")], export_index)
                         for script in _unfound_scripts:
                             # Renaming the x_api_name to name. Since the script was fetched with UUID, the x_api_name is the UUID
                             script["x_api_name"] = script["name"]
@@ -870,7 +1156,7 @@ def get_from_export(export,
 
                 # add name to each sub playbook input
                 for pb_sub_pb in pb_objects.get("sub_pbs", []):
-                    replace_uuids_in_subplaybook_data(pb_sub_pb, export)
+                    replace_uuids_in_subplaybook_data(pb_sub_pb, export_index)
 
                 activation_type = playbook.get("activation_type", "")
                 if playbook.get("type") == "subplaybook":
@@ -982,20 +1268,23 @@ def minify_export(export,
 
             values = keys_to_minify[key][attribute_name]
             # strip out extra spaces from the attribute (ie Display name for Rules, Scripts, etc.)
-            values = [name.strip() for name in values]
+            values = set(name.strip() for name in values)
 
             obj = minified_export.get(key)
 
             if obj:
-                for data in list(obj):
+                kept = []
+                for data in obj:
 
                     if not data.get(attribute_name):
                         LOG.warning("No %s in %s", attribute_name, key)
 
                     # strip out extra spaces from the attribute (ie Display name for Rules, Scripts, etc.)
-                    # If this Resilient Object is not in our minify list, remove it
-                    if not data.get(attribute_name, "").strip() in values:
-                        minified_export[key].remove(data)
+                    # If this Resilient Object is in our minify list, keep it
+                    if data.get(attribute_name, "").strip() in values:
+                        kept.append(data)
+
+                minified_export[key] = kept
 
         elif key in keys_to_clear:
             minified_export[key] = None
@@ -1070,23 +1359,21 @@ def find_parent_child_types(export, object_type, attribute_name, name_list):
     """[get all parent objects (like incident_types)]
 
     Args:
-        export ([dict]): [export file to parse]
+        export ([dict]): [export file to parse, or an ExportIndex of it]
         object_type ([str]): [heirarchy of objects to parse]
         attribute_name ([str]): [name of field to check for]
         name_list ([list]): [list of objects to same]
     """
 
     extended_name_list = name_list[:]
+    export_index = ExportIndex.from_export(export)
 
-    if export.get(object_type):
-        section = export.get(object_type)
-        for name in name_list:
-            for item in section:
-              if item.get(attribute_name) == name:
-                  if item.get('parent_id'):
-                      # add the parent hierarchy
-                      parent_list = find_parent_child_types(export, object_type, attribute_name, [item.get('parent_id')])
-                      extended_name_list.extend(parent_list)
+    for name in name_list:
+        for item in export_index.find_all(object_type, attribute_name, name, lambda o, n=name: o.get(attribute_name) == n):
+            if item.get('parent_id'):
+                # add the parent hierarchy
+                parent_list = find_parent_child_types(export_index, object_type, attribute_name, [item.get('parent_id')])
+                extended_name_list.extend(parent_list)
 
     return list(set(extended_name_list))
 
@@ -1332,32 +1619,33 @@ def replace_uuids_in_subplaybook_data(playbook_data, export):
 
     :param playbook_data: sub playbook to process
     :type playbook_data: dict
-    :param export: full export data
-    :type export: dict
+    :param export: full export data, or an ExportIndex of it
+    :type export: dict or ExportIndex
     """
+    # the playbooks in the export with the uuid of the sub playbook
+    sub_pbs = ExportIndex.from_export(export).find_all("playbooks", "uuid", playbook_data.get("uuid", "uuid_not_found_pb"))
 
     # add name to each sub playbook input
-    for sub_pb in export.get("playbooks", []):
-        if playbook_data.get("uuid", "uuid_not_found_pb") == sub_pb.get("uuid", "uuid_not_found_fn"):
-            fields = sub_pb.get("fields_type", {}).get("fields", {})
-
-            # update sub playbook's name
-            playbook_data["name"] = sub_pb.get("display_name")
-            for field_name, field in fields.items():
-                if field.get("uuid", "uuid_not_found") in playbook_data.get("inputs", {}):
-                    # convert input uuid to input_name
-                    playbook_data["inputs"][field.get("uuid")]["input_name"] = field.get("text")
-                    playbook_data["inputs"][field.get("uuid")]["input_api_name"] = field_name
-                    # add input type
-                    playbook_data["inputs"][field.get("uuid")]["input_type_name"] = field.get("input_type")
-                    # selects and multiselects reference their UUID in the data extracted from xml,
-                    # so we need to replace that with the true value found in the sub_pb
-                    if field.get("input_type") == "select":
-                        select_input_uuid = playbook_data["inputs"][field.get("uuid")]["static_input"]["select_value"]
-                        playbook_data["inputs"][field.get("uuid")]["static_input"]["select_value"] = next(value.get("label") for value in field.get("values") if value.get("uuid") == select_input_uuid)
-                    elif field.get("input_type") == "multiselect":
-                        select_input_uuids = playbook_data["inputs"][field.get("uuid")]["static_input"]["multiselect_value"]
-                        playbook_data["inputs"][field.get("uuid")]["static_input"]["multiselect_value"] = ", ".join(value.get("label") for value in field.get("values") if value.get("uuid") in select_input_uuids)
+    for sub_pb in sub_pbs:
+        fields = sub_pb.get("fields_type", {}).get("fields", {})
+
+        # update sub playbook's name
+        playbook_data["name"] = sub_pb.get("display_name")
+        for field_name, field in fields.items():
+            if field.get("uuid", "uuid_not_found") in playbook_data.get("inputs", {}):
+                # convert input uuid to input_name
+                playbook_data["inputs"][field.get("uuid")]["input_name"] = field.get("text")
+                playbook_data["inputs"][field.get("uuid")]["input_api_name"] = field_name
+                # add input type
+                playbook_data["inputs"][field.get("uuid")]["input_type_name"] = field.get("input_type")
+                # selects and multiselects reference their UUID in the data extracted from xml,
+                # so we need to replace that with the true value found in the sub_pb
+                if field.get("input_type") == "select":
+                    select_input_uuid = playbook_data["inputs"][field.get("uuid")]["static_input"]["select_value"]
+                    playbook_data["inputs"][field.get("uuid")]["static_input"]["select_value"] = next(value.get("label") for value in field.get("values") if value.get("uuid") == select_input_uuid)
+                elif field.get("input_type") == "multiselect":
+                    select_input_uuids = playbook_data["inputs"][field.get("uuid")]["static_input"]["multiselect_value"]
+                    playbook_data["inputs"][field.get("uuid")]["static_input"]["multiselect_value"] = ", ".join(value.get("label") for value in field.get("values") if value.get("uuid") in select_input_uuids)
 
     # make input easier to get in jinja2
     for _, input in playbook_data.get("inputs", {}).items():
@@ -1662,37 +1950,36 @@ def parse_optionals(optionals):
     return parsed_optionals
 
 
-def run_subprocess(args, change_dir=None, cmd_name="", log_level_threshold=logging.DEBUG):
+def run_subprocess(args, change_dir=None, cmd_name="", log_level_threshold=logging.DEBUG, env=None):
     """
-    Run a given command as a subprocess. Optionally change directory before running the command (use change_dir parameter)
+    Run a given command as a subprocess. Optionally run the command in another directory (use change_dir parameter).
+    The working directory and environment of this process are not changed, so commands can be run from more than one thread
 
     :param args: (required) args should be a sequence of program arguments or else a single string (see subprocess.Popen for more details)
     :type args: str | list[str]
-    :param change_dir: (optional) path of directory to change to before running command
+    :param change_dir: (optional) path of directory to run the command in
     :type change_dir: str
     :param cmd_name: (optional) the name of the command to run as a subprocess. will be used to log in the format "Running <cmd_name> ..."
     :type cmd_name: str
     :param log_level_threshold: (optional) the logging level at which to output the stdout/stderr for the subprocess; default is DEBUG
     :type log_level_threshold: int
+    :param env: (optional) environment variables of the command; default is the environment of this process
+    :type env: dict
     :return: the exit code and string details of the run
     :rtype: (int, str)
     """
 
     LOG.debug("Running {0} as a subprocess".format(args))
 
-    # save starting directory
-    current_dir = os.getcwd()
-
-    # if change_dir is set, change to that dir
+    # if change_dir is set, run the command in that dir
     if change_dir:
-        LOG.debug("Changing directory to {0}".format(change_dir))
-        os.chdir(change_dir)
+        LOG.debug("Running in directory {0}".format(change_dir))
 
     if isinstance(args, str):
         args = shlex.split(args)
 
     # run given command as a subprocess
-    proc = subprocess.Popen(args, stderr=subprocess.STDOUT, stdout=subprocess.PIPE, bufsize=0)
+    proc = subprocess.Popen(args, stderr=subprocess.STDOUT, stdout=subprocess.PIPE, bufsize=0, cwd=change_dir or None, env=env)
 
     sys.stdout.write("Running {0} (this may take a while) ...".format(cmd_name))
     sys.stdout.flush()
@@ -1720,13 +2007,6 @@ def run_subprocess(args, change_dir=None, cmd_name="", log_level_threshold=loggi
         time.sleep(0.75)
         details = stdout.decode("utf-8")
 
-
-    # move back to original directory
-    # note that this just changes the working directory for the python process,
-    # — thus if the subprocess was interrupted and the program quits,
-    # the directory of the user's terminal won't be affected
-    os.chdir(current_dir)
-
     return proc.returncode, details
 
 
@@ -221,19 +221,17 @@ def selftest_run_selftestpy(attr_dict, package_name, **kwargs):
     :rtype: (bool, SDKValidateIssue)
     """
 
-    # Set env var
+    # Set env var for the subprocess only, as other validations may be running at the same time
     path_app_config = kwargs.get("path_app_config")
     if not path_app_config:
         path_app_config = ""
     LOG.debug("\nSetting $APP_CONFIG_FILE to '%s'\n", path_app_config)
-    os.environ[constants.ENV_VAR_APP_CONFIG_FILE] = path_app_config
+    selftest_env = dict(os.environ)
+    selftest_env[constants.ENV_VAR_APP_CONFIG_FILE] = path_app_config
 
     # run resilient-circuits selftest in a subprocess
     selftest_cmd = ['resilient-circuits', 'selftest', '-l', package_name.replace("_", "-")]
-    returncode, details = sdk_helpers.run_subprocess(selftest_cmd, cmd_name="selftest")
-
-    # Unset env var
-    os.environ[constants.ENV_VAR_APP_CONFIG_FILE] = ""
+    returncode, details = sdk_helpers.run_subprocess(selftest_cmd, cmd_name="selftest", env=selftest_env)
 
     # details is grabbed from output and currently in different formats based on the return code.
     #
@@ -541,7 +539,25 @@ def package_files_validate_config_py(path_file, attr_dict, **_):
             solution=attr_dict.get("fail_solution")
         )]
 
-def package_files_validate_customize_py(path_file, attr_dict, **_):
+def _get_import_definition(path_file, import_definition=None):
+    """
+    Return ``import_definition`` if validate already parsed it, so the checks
+    of the package files do not each load and decode it again. Otherwise parse it
+    from ``path_file``, raising an SDKException if something goes wrong
+
+    :param path_file: path to the customize.py file
+    :type path_file: str
+    :param import_definition: (optional) the import definition already parsed from ``path_file``
+    :type import_definition: dict
+    :return: the import definition
+    :rtype: dict
+    """
+    if import_definition is not None:
+        return import_definition
+
+    return package_helpers.get_import_definition_from_customize_py(path_file)
+
+def package_files_validate_customize_py(path_file, attr_dict, import_definition=None, **_):
     """
     Helper method for package files to validate the import definition from customize.py.
     This works by using the get_import_definition_from_customize_py helper method from package_file_helpers.
@@ -555,6 +571,8 @@ def package_files_validate_customize_py(path_file, attr_dict, **_):
     :type path_file: str
     :param attr_dict: (required) dictionary of attributes for the customize.py file defined in ``package_files``
     :type attr_dict: dict
+    :param import_definition: (optional) the import definition already parsed from ``path_file``
+    :type import_definition: dict
     :param _: (unused) other unused named args
     :type _: dict
     :return: a passing issue if the customize.py file can yield a successful ImportDefinition; a critical issue if the parse fails
@@ -564,7 +582,7 @@ def package_files_validate_customize_py(path_file, attr_dict, **_):
     try:
         # parse import definition information from customize.py file
         # this will raise an SDKException if something goes wrong
-        import_def = package_helpers.get_import_definition_from_customize_py(path_file)
+        import_def = _get_import_definition(path_file, import_definition)
         return [SDKValidateIssue(
             name=attr_dict.get("name"),
             description=attr_dict.get("pass_msg"),
@@ -587,7 +605,7 @@ def package_files_validate_customize_py(path_file, attr_dict, **_):
             solution=attr_dict.get("fail_solution")
         )]
 
-def package_files_validate_script_python_versions(path_file, attr_dict, **_):
+def package_files_validate_script_python_versions(path_file, attr_dict, import_definition=None, **_):
     """
     Validate that no scripts packaged with this app are written in Python 2.
 
@@ -623,6 +641,8 @@ def package_files_validate_script_python_versions(path_file, attr_dict, **_):
     :type path_file: str
     :param attr_dict: (required) dictionary of attributes for the customize.py file defined in ``package_files``
     :type attr_dict: dict
+    :param import_definition: (optional) the import definition already parsed from ``path_file``
+    :type import_definition: dict
     :param _: (unused) other unused named args
     :type _: dict
     :return: a list of issues containing the PY2 scripts to be updated; or a passing issue if no scripts were found
@@ -631,7 +651,7 @@ def package_files_validate_script_python_versions(path_file, attr_dict, **_):
     try:
         # parse import definition information from customize.py file
         # this will raise an SDKException if something goes wrong
-        export_res = package_helpers.get_import_definition_from_customize_py(path_file)
+        export_res = _get_import_definition(path_file, import_definition)
     except SDKException:
         # something went wrong in reading the import definition.
         # since this is already checked in another function elsewhere,
@@ -712,11 +732,11 @@ def package_files_validate_script_python_versions(path_file, attr_dict, **_):
     else:
         return issues
 
-def package_files_validate_no_playbook_dependencies_missing(path_file, path_package, attr_dict, **_):
+def package_files_validate_no_playbook_dependencies_missing(path_file, path_package, attr_dict, import_definition=None, **_):
     try:
         # parse import definition information from customize.py file
         # this will raise an SDKException if something goes wrong
-        export_res = package_helpers.get_import_definition_from_customize_py(path_file)
+        export_res = _get_import_definition(path_file, import_definition)
     except SDKException:
         # something went wrong in reading the import definition.
         # since this is already checked in another function elsewhere,
@@ -769,6 +789,7 @@ def _validate_playbook_conditions_all_fields_included(export_res, attr_dict, pat
 
 def _validate_playbook_conditions_all_functions_included(export_res, attr_dict, path_package):
     issues = []
+    packaged_fn_uuids = set(fn.get("uuid", "uuid_not_found_fn") for fn in export_res["functions"])
 
 
     for playbook in export_res.get("playbooks") or []:
@@ -779,7 +800,7 @@ def _validate_playbook_conditions_all_functions_included(export_res, attr_dict,
         # find any missing functions
         missing_fn_uuids = []
         for pb_fn in pb_objects.get("functions", []):
-            pb_fn_not_found = len([fn for fn in export_res["functions"] if pb_fn.get("uuid", "uuid_not_found_pb") == fn.get("uuid", "uuid_not_found_fn")]) == 0
+            pb_fn_not_found = pb_fn.get("uuid", "uuid_not_found_pb") not in packaged_fn_uuids
 
             if pb_fn_not_found:
                 missing_fn_uuids.append(pb_fn.get("uuid"))
@@ -1112,7 +1133,7 @@ def package_files_validate_base_image(path_file, attr_dict, path_package, **_):
 
     return issues
 
-def payload_samples_validate_payload_samples(path_package, package_name, attr_dict):
+def payload_samples_validate_payload_samples(path_package, package_name, attr_dict, import_definition=None):
     """
     This function verifies:
     - (WARNING) the customize file is readable and the import definition from it contains a "functions" section
@@ -1132,6 +1153,8 @@ def payload_samples_validate_payload_samples(path_package, package_name, attr_di
     :type package_name: str
     :param attr_dict: dictionary of attributes for the payload samples defined in ``payload_samples_attributes``
     :type attr_dict: dict
+    :param import_definition: (optional) the import definition already parsed from the customize.py file
+    :type import_definition: dict
     :return: a list (this can be a mix) of passing issues and/or a critical issues
     :rtype: list[SDKValidateIssue]
     """
@@ -1142,7 +1165,7 @@ def payload_samples_validate_payload_samples(path_package, package_name, attr_di
         # parse import definition information from customize.py file
         # this will raise an SDKException if something goes wrong
         sdk_helpers.validate_file_paths(os.R_OK, path_customize)
-        import_def = package_helpers.get_import_definition_from_customize_py(path_customize)
+        import_def = _get_import_definition(path_customize, import_definition)
     except SDKException:
         return [SDKValidateIssue(
             name=package_helpers.BASE_NAME_PAYLOAD_SAMPLES_DIR,
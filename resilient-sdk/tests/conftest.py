@@ -144,6 +144,31 @@ def fx_mock_res_client():
     _rm_temp_dir()
 
 
+# the constants of the directories where the SDK saves exports, validate results and codegen hashes
+SDK_CACHE_DIRS = ("PATH_SDK_EXPORT_CACHE_DIR", "PATH_SDK_VALIDATE_CACHE_DIR", "PATH_SDK_CODEGEN_CACHE_DIR")
+
+
+@pytest.fixture(autouse=True)
+def fx_mock_sdk_cache_dirs():
+    """
+    Before: Change each directory of SDK_CACHE_DIRS to a new temp directory,
+            so tests do not reuse each other's saved exports, results or hashes
+    After: Remove the temp directories and change the paths back to their original values
+
+    Yields a dict of each name in SDK_CACHE_DIRS to its temp directory
+    """
+    old_cache_dirs = dict((name, getattr(constants, name)) for name in SDK_CACHE_DIRS)
+    cache_dirs = dict((name, tempfile.mkdtemp(prefix="sdk_{0}_".format(name.lower()))) for name in SDK_CACHE_DIRS)
+    for name, path in cache_dirs.items():
+        setattr(constants, name, path)
+
+    yield cache_dirs
+
+    for name, path in cache_dirs.items():
+        shutil.rmtree(path, ignore_errors=True)
+        setattr(constants, name, old_cache_dirs[name])
+
+
 @pytest.fixture
 def fx_mk_temp_dir():
     """
@@ -6,6 +6,7 @@
 import pytest
 from argparse import ArgumentParser
 from resilient_sdk.cmds.base_cmd import BaseCmd
+from resilient_sdk.util import constants
 
 
 def test_no_CMD_NAME(fx_get_sub_parser):
@@ -76,4 +77,18 @@ def test_get_io_parser():
 
 def test_get_zip_parser():
     # TODO
-    pass
\ No newline at end of file
+    pass
+
+
+def test_get_export_cache_parser():
+    export_cache_parser = BaseCmd._get_export_cache_parser()
+
+    assert isinstance(export_cache_parser, ArgumentParser)
+
+    args = export_cache_parser.parse_args([])
+    assert args.refresh_export is False
+    assert args.export_max_age == constants.DEFAULT_EXPORT_CACHE_MAX_AGE
+
+    args = export_cache_parser.parse_args(["--refresh-export", "--export-max-age", "60"])
+    assert args.refresh_export is True
+    assert args.export_max_age == 60
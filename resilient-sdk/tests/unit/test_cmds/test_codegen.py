@@ -113,11 +113,12 @@ def test_cmd_codegen(fx_get_sub_parser, fx_cmd_line_args_codegen_package):
     $ resilient-sdk codegen -p <name_of_package> -m 'fn_custom_md' --rule 'Rule One' 'Rule Two' --settings <path_to_custom_sdk_settings_file>
     $ resilient-sdk codegen -p <name_of_package> -m 'fn_custom_md' -c '/usr/custom_app.config'
     $ resilient-sdk codegen -p <path_current_package> --reload --workflow 'new_wf_to_add'
+    $ resilient-sdk codegen -p <path_current_package> --reload --no-cache
     $ resilient-sdk codegen -p <path_current_package> --poller
     $ resilient-sdk codegen -p <path_current_package> --gather-results
     $ resilient-sdk codegen -p <path_current_package> --gather-results '/usr/custom_app.log' -f 'func_one' 'func_two'"""
     assert cmd_codegen.CMD_DESCRIPTION == cmd_codegen.CMD_HELP
-    assert cmd_codegen.CMD_ADD_PARSERS == [constants.APP_CONFIG_PARSER_NAME, constants.RESILIENT_OBJECTS_PARSER_NAME, constants.IO_PARSER_NAME, constants.SDK_SETTINGS_PARSER_NAME]
+    assert cmd_codegen.CMD_ADD_PARSERS == [constants.APP_CONFIG_PARSER_NAME, constants.RESILIENT_OBJECTS_PARSER_NAME, constants.IO_PARSER_NAME, constants.SDK_SETTINGS_PARSER_NAME, constants.EXPORT_CACHE_PARSER_NAME]
 
     args = cmd_codegen.parser.parse_known_args()[0]
     assert args.package == "fn_main_mock_integration"
@@ -298,6 +299,71 @@ def test_render_jinja_mapping_path_object_existing_file_skipped(fx_mk_temp_dir):
     assert not any("company_logo.png" in f for f in new_files)
 
 
+def test_render_jinja_mapping_reload_hashes(fx_mk_temp_dir):
+
+    mock_jinja_data = {
+        "functions": [{"x_api_name": "fn_mock_function_1"}],
+        "export_data": {"server_version": {"version": "35.0.0"}}
+    }
+
+    jinja_env = sdk_helpers.setup_jinja_env(constants.PACKAGE_TEMPLATE_PATH)
+
+    jinja_mapping_dict = {
+        "setup.py": ("setup.py.jinja2", mock_jinja_data),
+        "util": {
+            "customize.py": ("package/util/customize.py.jinja2", mock_jinja_data)
+        }
+    }
+    path_customize_py = os.path.join(mock_paths.TEST_TEMP_DIR, "util", "customize.py")
+    reload_hashes = {}
+
+    new_files, skipped_files = CmdCodegen.render_jinja_mapping(jinja_mapping_dict, jinja_env, mock_paths.TEST_TEMP_DIR, mock_paths.TEST_TEMP_DIR, reload_hashes=reload_hashes)
+    assert sorted(new_files) == ["setup.py", os.path.join("util", "customize.py")]
+    assert reload_hashes[os.path.join("util", "customize.py")]["content"] == sdk_helpers.get_file_hash(path_customize_py)
+
+    # same inputs: nothing is rendered
+    new_files, skipped_files = CmdCodegen.render_jinja_mapping(jinja_mapping_dict, jinja_env, mock_paths.TEST_TEMP_DIR, mock_paths.TEST_TEMP_DIR, reload_hashes=reload_hashes)
+    assert new_files == []
+    assert sorted(skipped_files) == ["setup.py", os.path.join("util", "customize.py")]
+
+    # new inputs: customize.py is regenerated and a backup made, setup.py exists so is still skipped
+    mock_jinja_data["functions"].append({"x_api_name": "fn_mock_function_2"})
+    new_files, skipped_files = CmdCodegen.render_jinja_mapping(jinja_mapping_dict, jinja_env, mock_paths.TEST_TEMP_DIR, mock_paths.TEST_TEMP_DIR, reload_hashes=reload_hashes)
+    assert new_files == [os.path.join("util", "customize.py")]
+    assert '            u"fn_mock_function_2"\n' in sdk_helpers.read_file(path_customize_py)
+    assert len([f for f in os.listdir(os.path.join(mock_paths.TEST_TEMP_DIR, "util")) if f.endswith(".bak")]) == 1
+
+    # same inputs but the file was changed since: it is regenerated
+    sdk_helpers.write_file(path_customize_py, "changed by hand")
+    new_files, skipped_files = CmdCodegen.render_jinja_mapping(jinja_mapping_dict, jinja_env, mock_paths.TEST_TEMP_DIR, mock_paths.TEST_TEMP_DIR, reload_hashes=reload_hashes)
+    assert new_files == [os.path.join("util", "customize.py")]
+
+
+def test_render_jinja_mapping_reload_hashes_crlf(fx_mk_temp_dir):
+
+    mock_jinja_data = {
+        "functions": [{"x_api_name": "fn_mock_function_1"}],
+        "export_data": {"server_version": {"version": "35.0.0"}}
+    }
+    jinja_env = sdk_helpers.setup_jinja_env(constants.PACKAGE_TEMPLATE_PATH)
+    jinja_mapping_dict = {"util": {"customize.py": ("package/util/customize.py.jinja2", mock_jinja_data)}}
+    reload_hashes = {}
+
+    def mock_write_file(path, contents):
+        # like a text mode write on Windows
+        with open(path, mode="w", encoding="utf-8", newline="\r\n") as the_file:
+            the_file.write(contents)
+
+    with patch("resilient_sdk.cmds.codegen.sdk_helpers.write_file", side_effect=mock_write_file):
+        new_files, skipped_files = CmdCodegen.render_jinja_mapping(jinja_mapping_dict, jinja_env, mock_paths.TEST_TEMP_DIR, mock_paths.TEST_TEMP_DIR, reload_hashes=reload_hashes)
+        assert new_files == [os.path.join("util", "customize.py")]
+
+        # the hash is of the bytes written, so the unchanged file is skipped
+        new_files, skipped_files = CmdCodegen.render_jinja_mapping(jinja_mapping_dict, jinja_env, mock_paths.TEST_TEMP_DIR, mock_paths.TEST_TEMP_DIR, reload_hashes=reload_hashes)
+        assert new_files == []
+        assert skipped_files == [os.path.join("util", "customize.py")]
+
+
 def test_gen_package_with_playbooks(fx_get_sub_parser, fx_reset_argv, fx_mk_temp_dir, fx_add_dev_env_var):
     """
     This tests that when a package is generated with codegen
@@ -501,7 +567,8 @@ def test_reload_package(fx_copy_fn_main_mock_integration, fx_get_sub_parser, fx_
     # Get modification time for workflow file "wf_mock_workflow_one.md" in seconds since the epoch.'
     wf_modified_time = os.path.getmtime(os.path.join(path_package_reloaded, "data", "wf_mock_workflow_one.md"))
 
-    # Perform another test reload.
+    # Perform another test reload, regenerating all its files.
+    sys.argv.append("--no-cache")
     args = cmd_codegen.parser.parse_known_args()[0]
     path_package_reloaded = cmd_codegen._reload_package(args)
 
@@ -531,6 +598,48 @@ def test_reload_package(fx_copy_fn_main_mock_integration, fx_get_sub_parser, fx_
     assert new_wf_modified_time > wf_modified_time
 
 
+def test_reload_package_unchanged(fx_copy_fn_main_mock_integration, fx_get_sub_parser, fx_cmd_line_args_codegen_reload, caplog):
+    """
+    This tests that reloading a package again with the same inputs does not
+    rewrite any files, and that '--no-cache' rewrites them
+    """
+    output_path = os.path.join(mock_paths.TEST_TEMP_DIR, "mock_path", "fn_main_mock_integration-1.1.0")
+    mock_integration_name = fx_copy_fn_main_mock_integration[0]
+    shutil.move(fx_copy_fn_main_mock_integration[1], output_path)
+
+    sys.argv[sys.argv.index(mock_integration_name)] = output_path
+    sys.argv.extend(["-e", mock_paths.MOCK_RELOAD_EXPORT_RES])
+
+    cmd_codegen = CmdCodegen(fx_get_sub_parser)
+    cmd_codegen._reload_package(cmd_codegen.parser.parse_known_args()[0])
+    # reload again as the first adds the objects of 'Additional Mock Rule' to the reload params in customize.py
+    path_package_reloaded = cmd_codegen._reload_package(cmd_codegen.parser.parse_known_args()[0])
+
+    path_util = os.path.join(path_package_reloaded, mock_integration_name, "util")
+    path_customize_py = os.path.join(path_util, "customize.py")
+    path_wf_md = os.path.join(path_package_reloaded, "data", "wf_mock_workflow_one.md")
+    customize_py_modified_time = os.path.getmtime(path_customize_py)
+    wf_modified_time = os.path.getmtime(path_wf_md)
+    files_in_util = sorted(os.listdir(path_util))
+
+    caplog.clear()
+    cmd_codegen._reload_package(cmd_codegen.parser.parse_known_args()[0])
+
+    assert "No files were regenerated as their inputs have not changed since the last reload" in caplog.text
+    assert os.path.getmtime(path_customize_py) == customize_py_modified_time
+    assert os.path.getmtime(path_wf_md) == wf_modified_time
+    # no more backups of customize.py
+    assert sorted(os.listdir(path_util)) == files_in_util
+
+    caplog.clear()
+    sys.argv.append("--no-cache")
+    cmd_codegen._reload_package(cmd_codegen.parser.parse_known_args()[0])
+
+    assert "Regenerated" in caplog.text
+    assert "wf_mock_workflow_one.md" in caplog.text
+    assert os.path.getmtime(path_wf_md) > wf_modified_time
+
+
 def test_reload_package_w_playbook(fx_copy_fn_main_mock_integration_w_playbooks, fx_get_sub_parser, fx_cmd_line_args_codegen_reload):
 
     output_path = os.path.join(mock_paths.TEST_TEMP_DIR, "mock_path", "fn_main_mock_integration-1.1.0")
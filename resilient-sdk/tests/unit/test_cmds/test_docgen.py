@@ -5,11 +5,14 @@
 import os
 import sys
 
+import pytest
+
 from packaging.version import parse as parse_version
 from resilient_sdk.cmds import CmdDocgen, base_cmd
 from resilient_sdk.util import constants
 from resilient_sdk.util import package_file_helpers as package_helpers
 from resilient_sdk.util import sdk_helpers
+from resilient_sdk.util.sdk_exception import SDKException
 import tests.shared_mock_data.sdk_mock_paths as mock_paths
 
 
@@ -25,7 +28,8 @@ def test_cmd_docgen_setup(fx_get_sub_parser, fx_cmd_line_args_docgen):
     $ resilient-sdk docgen -p <name_of_package> --poller # for a poller app
     $ resilient-sdk docgen -e export.res
     $ resilient-sdk docgen -e playbook1.resz playbook2.resz -o /path/to/save/playbooks_readme.md
-    $ resilient-sdk docgen -e . -o README.md # reads all exports in current directory and outputs to README.md"""
+    $ resilient-sdk docgen -e . -o README.md # reads all exports in current directory and outputs to README.md
+    $ resilient-sdk docgen --packages fn_app_one fn_app_two --workers 4 # generates the README of each package in parallel"""
     assert cmd_docgen.CMD_DESCRIPTION == cmd_docgen.CMD_HELP
 
     args = cmd_docgen.parser.parse_known_args()[0]
@@ -425,3 +429,48 @@ def test_execute_command_for_two_exports(fx_get_sub_parser, fx_cmd_line_args_doc
     assert "Rendering README for" in caplog.text
     assert "mock_xml_test_report.xml' was skipped for 'docgen --export' because it was not in the proper" in caplog.text
     assert "Writing README to" in caplog.text
+
+def test_execute_command_for_two_exports_in_processes(fx_get_sub_parser, fx_cmd_line_args_docgen_two_export_files, fx_mk_os_tmp_dir, caplog):
+    cmd_docgen = CmdDocgen(fx_get_sub_parser)
+    path_readme_one_process = os.path.join(fx_mk_os_tmp_dir, "README_one_process.md")
+    path_readme_processes = os.path.join(fx_mk_os_tmp_dir, "README_processes.md")
+
+    args = cmd_docgen.parser.parse_known_args(fx_cmd_line_args_docgen_two_export_files[1:] + ["-o", path_readme_one_process, "--workers", "1"])[0]
+    cmd_docgen.execute_command(args)
+
+    args = cmd_docgen.parser.parse_known_args(fx_cmd_line_args_docgen_two_export_files[1:] + ["-o", path_readme_processes, "--workers", "2"])[0]
+    cmd_docgen.execute_command(args)
+
+    # skipped exports are still logged, the exports are merged in the order given
+    assert caplog.text.count("mock_xml_test_report.xml' was skipped for 'docgen --export'") == 2
+    assert "docgen timings for" in caplog.text
+    assert "load: " in caplog.text and "render: " in caplog.text
+
+    readme_one_process = sdk_helpers.read_file(path_readme_one_process)
+    readme_processes = sdk_helpers.read_file(path_readme_processes)
+    assert readme_processes == [line.replace("README_one_process", "README_processes") for line in readme_one_process]
+
+def test_execute_command_for_packages(fx_get_sub_parser, fx_cmd_line_args_docgen, fx_copy_fn_main_mock_integration_w_playbooks, caplog):
+    cmd_docgen = CmdDocgen(fx_get_sub_parser)
+    path_package = fx_copy_fn_main_mock_integration_w_playbooks[1]
+    path_not_a_package = os.path.join(path_package, "doesnt_exist")
+
+    args = cmd_docgen.parser.parse_known_args(["docgen", "--packages", path_package, path_not_a_package, "--workers", "2"])[0]
+
+    with pytest.raises(SDKException, match="docgen failed for 1 of the 2 packages: {0}".format(path_not_a_package)):
+        cmd_docgen.execute_command(args)
+
+    assert os.path.isfile(os.path.join(path_package, "README.md"))
+    assert "docgen failed for package '{0}'".format(path_not_a_package) in caplog.text
+    # logged by the worker process
+    assert "Rendering README for fn-main-mock-integration" in caplog.text
+    assert "docgen timings for fn-main-mock-integration: load: " in caplog.text
+    assert "docgen generated 1 README(s) in" in caplog.text
+
+def test_execute_command_for_packages_with_output(fx_get_sub_parser, fx_cmd_line_args_docgen):
+    cmd_docgen = CmdDocgen(fx_get_sub_parser)
+
+    args = cmd_docgen.parser.parse_known_args(["docgen", "--packages", "fn_one", "fn_two", "-o", "README.md"])[0]
+
+    with pytest.raises(SDKException, match="'--output' can't be used with '--packages'"):
+        cmd_docgen.execute_command(args)
@@ -4,6 +4,9 @@
 
 import os
 import sys
+import threading
+import time
+from contextlib import ExitStack
 
 import pytest
 from mock import patch
@@ -541,3 +544,99 @@ def test_execute_command(fx_copy_fn_main_mock_integration, fx_cmd_line_args_vali
         assert "Validation Results" in caplog.text
         assert u"ล ฦ ว ศ ษ ส ห ฬ อ" in caplog.text
         assert "setup.py attribute 'author' remains unchanged from the default value" in caplog.text
+
+
+@pytest.mark.skipif(sys.version_info < constants.MIN_SUPPORTED_PY_VERSION, reason="requires python3.6 or higher")
+def test_execute_command_reuses_results(fx_copy_fn_main_mock_integration, fx_cmd_line_args_validate, fx_get_sub_parser, caplog):
+
+    mock_integration_name = fx_copy_fn_main_mock_integration[0]
+    path_package = fx_copy_fn_main_mock_integration[1]
+
+    # Replace cmd line arg "fn_main_mock_integration" with path to temp dir location
+    sys.argv[sys.argv.index(mock_integration_name)] = path_package
+
+    # Add cmd line arg
+    sys.argv.extend(["--validate"])
+
+    cmd_validate = CmdValidate(fx_get_sub_parser)
+    args = cmd_validate.parser.parse_known_args()[0]
+
+    with patch.object(CmdValidate, "_get_validate_results", autospec=True, side_effect=CmdValidate._get_validate_results) as mock_validate:
+
+        cmd_validate.execute_command(args)
+        assert mock_validate.call_count == 1
+
+        # nothing changed, so the results of the last run are output
+        caplog.clear()
+        cmd_validate.execute_command(args)
+        assert mock_validate.call_count == 1
+        assert "setup.py attribute 'author' remains unchanged from the default value" in caplog.text
+        assert "No changes to the files checked by the 'validate' stage" in caplog.text
+
+        # a file of the package changed
+        with open(os.path.join(path_package, "README.md"), "a") as readme:
+            readme.write("\nmore details\n")
+
+        cmd_validate.execute_command(args)
+        assert mock_validate.call_count == 2
+
+        args.no_cache = True
+        cmd_validate.execute_command(args)
+        assert mock_validate.call_count == 3
+
+
+def test_run_stages_output_in_order(fx_copy_fn_main_mock_integration, fx_cmd_line_args_validate, fx_get_sub_parser, caplog):
+
+    mock_integration_name = fx_copy_fn_main_mock_integration[0]
+
+    # Replace cmd line arg "fn_main_mock_integration" with path to temp dir location
+    sys.argv[sys.argv.index(mock_integration_name)] = fx_copy_fn_main_mock_integration[1]
+
+    cmd_validate = CmdValidate(fx_get_sub_parser)
+    args = cmd_validate.parser.parse_known_args()[0]
+
+    def mock_results(title, delay):
+        def get_results(args):
+            time.sleep(delay)
+            return [(title, title, title, True, [SDKValidateIssue(title, "pass", SDKValidateIssue.SEVERITY_LEVEL_DEBUG)])]
+        return get_results
+
+    with patch.object(cmd_validate, "_get_pylint_scan_results", side_effect=mock_results("mock pylint", 0.2)):
+        with patch.object(cmd_validate, "_get_bandit_scan_results", side_effect=mock_results("mock bandit", 0)):
+
+            cmd_validate._run_stages(args, [CmdValidate.STAGE_PYLINT, CmdValidate.STAGE_BANDIT])
+
+    assert caplog.text.index("mock pylint PASS") < caplog.text.index("mock bandit PASS")
+    assert "mock pylint" in cmd_validate.VALIDATE_ISSUES and "mock bandit" in cmd_validate.VALIDATE_ISSUES
+
+
+def test_run_stages_in_process_on_main_thread(fx_copy_fn_main_mock_integration, fx_cmd_line_args_validate, fx_get_sub_parser):
+
+    mock_integration_name = fx_copy_fn_main_mock_integration[0]
+
+    # Replace cmd line arg "fn_main_mock_integration" with path to temp dir location
+    sys.argv[sys.argv.index(mock_integration_name)] = fx_copy_fn_main_mock_integration[1]
+
+    cmd_validate = CmdValidate(fx_get_sub_parser)
+    args = cmd_validate.parser.parse_known_args()[0]
+    args.no_cache = True
+    threads = {}
+
+    def mock_results(stage):
+        def get_results(args):
+            threads[stage] = threading.current_thread()
+            return [("mock " + stage, "mock " + stage, stage, True, [])]
+        return get_results
+
+    stages = [CmdValidate.STAGE_VALIDATE, CmdValidate.STAGE_SELFTEST, CmdValidate.STAGE_TESTS,
+              CmdValidate.STAGE_PYLINT, CmdValidate.STAGE_BANDIT]
+    with ExitStack() as stack:
+        for stage in stages:
+            stack.enter_context(patch.object(cmd_validate, CmdValidate.STAGE_METHODS[stage], side_effect=mock_results(stage)))
+        cmd_validate._run_stages(args, stages)
+
+    # validate and pylint import the package, so they do not run at the same time as anything else
+    assert threads[CmdValidate.STAGE_VALIDATE] is threading.main_thread()
+    assert threads[CmdValidate.STAGE_PYLINT] is threading.main_thread()
+    for stage in CmdValidate.STAGES_IN_SUBPROCESS:
+        assert threads[stage] is not threading.main_thread()
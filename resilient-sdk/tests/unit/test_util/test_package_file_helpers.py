@@ -8,6 +8,7 @@ import os
 import shutil
 import subprocess
 import sys
+import zipfile
 
 import pytest
 import tests.shared_mock_data.sdk_mock_paths as mock_paths
@@ -472,6 +473,15 @@ def test_get_export_from_zip_not_found():
     with pytest.raises(SDKException):
         package_helpers.get_export_from_zip(mock_paths.MOCK_EXPORT_RES) # not a zip file
 
+def test_get_export_from_zip_no_export_res(fx_mk_temp_dir):
+    path_zip = os.path.join(mock_paths.TEST_TEMP_DIR, "no_export.resz")
+    with zipfile.ZipFile(path_zip, "w") as myzip:
+        myzip.writestr("nested/export.res", "{}")
+        myzip.writestr("README.md", "not an export")
+
+    with pytest.raises(SDKException, match="No export.res found in"):
+        package_helpers.get_export_from_zip(path_zip)
+
 
 @pytest.mark.skipif(sys.version_info < constants.MIN_SUPPORTED_PY_VERSION, reason="requires python3.6 or higher to do list of dictionary == check")
 @pytest.mark.parametrize("list_dicts, has_duplicates, optional_lambda",
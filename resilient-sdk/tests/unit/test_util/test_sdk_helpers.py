@@ -4,6 +4,7 @@
 
 import copy
 import datetime
+import gzip
 import json
 import os
 import re
@@ -259,6 +260,66 @@ def test_get_object_api_names(fx_mock_res_client):
     assert all(elem in ["mock_function_one", "mock_function_two"] for elem in func_api_names) is True
 
 
+def test_get_cached_org_export(fx_mock_res_client, fx_mock_sdk_cache_dirs, caplog):
+    org_export = sdk_helpers.get_latest_org_export(fx_mock_res_client)
+
+    with patch("resilient_sdk.util.sdk_helpers.get_latest_org_export") as mock_get_latest_org_export:
+        mock_get_latest_org_export.return_value = org_export
+
+        # the first command generates and saves the export, the next one reuses it
+        assert sdk_helpers.get_cached_org_export(fx_mock_res_client, max_age=600) == org_export
+        assert sdk_helpers.get_cached_org_export(fx_mock_res_client, max_age=600) == org_export
+        assert mock_get_latest_org_export.call_count == 1
+        assert "Using the organization export saved" in caplog.text
+
+        path_cached_export = sdk_helpers.get_org_export_cache_path(fx_mock_res_client)
+        assert os.path.dirname(path_cached_export) == fx_mock_sdk_cache_dirs["PATH_SDK_EXPORT_CACHE_DIR"]
+        assert os.path.isfile(path_cached_export)
+
+        sdk_helpers.get_cached_org_export(fx_mock_res_client, refresh_export=True, max_age=600)
+        assert mock_get_latest_org_export.call_count == 2
+
+        # too old to reuse
+        os.utime(path_cached_export, (0, 0))
+        sdk_helpers.get_cached_org_export(fx_mock_res_client, max_age=600)
+        assert mock_get_latest_org_export.call_count == 3
+
+        sdk_helpers.clear_org_export_cache(fx_mock_res_client)
+        assert not os.path.isfile(path_cached_export)
+
+        # not saved by default
+        sdk_helpers.get_cached_org_export(fx_mock_res_client)
+        sdk_helpers.get_cached_org_export(fx_mock_res_client, max_age=0)
+        assert mock_get_latest_org_export.call_count == 5
+        assert not os.path.isfile(path_cached_export)
+
+
+def test_get_org_export_cache_path_of_each_user(fx_mock_res_client, fx_mock_sdk_cache_dirs):
+    path_cached_export = sdk_helpers.get_org_export_cache_path(fx_mock_res_client)
+
+    with patch.object(fx_mock_res_client, "api_key_id", "another-api-key", create=True):
+        assert sdk_helpers.get_org_export_cache_path(fx_mock_res_client) != path_cached_export
+
+    with patch.object(fx_mock_res_client, "user_id", 9999, create=True):
+        assert sdk_helpers.get_org_export_cache_path(fx_mock_res_client) != path_cached_export
+
+
+def test_write_json_file_atomically(fx_mk_os_tmp_dir):
+    path = os.path.join(fx_mk_os_tmp_dir, "cache", "contents.json")
+    sdk_helpers.write_json_file_atomically(path, {"a": 1})
+    assert sdk_helpers.read_json_file(path) == {"a": 1}
+    assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+
+    sdk_helpers.write_json_file_atomically(path, {"a": 2}, compress=True)
+    with gzip.open(path, "rt") as gzip_file:
+        assert json.load(gzip_file) == {"a": 2}
+
+    # the file is left as it was and the temp file is removed when it can't be written
+    with pytest.raises(TypeError):
+        sdk_helpers.write_json_file_atomically(path, {"a": object()})
+    assert os.listdir(os.path.dirname(path)) == ["contents.json"]
+
+
 def test_get_res_obj():
     org_export = sdk_helpers.read_json_file(mock_paths.MOCK_EXPORT_RES)
 
@@ -267,6 +328,30 @@ def test_get_res_obj():
 
     assert all(elem.get("x_api_name") in artifacts_wanted for elem in artifacts) is True
 
+def test_export_index():
+    org_export = sdk_helpers.read_json_file(mock_paths.MOCK_EXPORT_RES_W_PLAYBOOK_W_SCRIPTS)
+    export_index = sdk_helpers.ExportIndex(org_export)
+
+    fn = export_index.find("functions", "export_key", "fn_test_dynamic_input")
+    assert fn is org_export.get("functions")[0]
+    assert export_index.find("functions", "export_key", "fn_does_not_exist") is None
+    assert export_index.find_all("functions", "export_key", "fn_test_dynamic_input", lambda o: o.get("name") == "not_the_name") == []
+    assert export_index.get_identifiers("functions", "export_key") == ["fn_test_dynamic_input"]
+    assert export_index.get_section("not_in_export") == []
+
+    # built once
+    assert export_index.get_index("functions", "export_key") is export_index.get_index("functions", "export_key")
+    assert sdk_helpers.ExportIndex.from_export(export_index) is export_index
+
+    playbooks = export_index.get_playbooks_using_function(fn.get("uuid"))
+    assert [pb.get("name") for pb, pb_objects in playbooks] == ["fn_test_dynamic_input", "subplaybook_test_sub_playbook"]
+    assert all(pb_objects.get("functions") for pb, pb_objects in playbooks)
+    assert export_index.get_playbooks_using_function("uuid_not_found") == []
+
+    # get_res_obj takes an ExportIndex too
+    scripts = sdk_helpers.get_res_obj("scripts", "name", "Script", ["handle output for playbook readme"], export_index)
+    assert scripts[0].get("uuid") == "9c3e685b-acf8-42fd-a1a8-021366d40f9d"
+
 def test_get_incident_types():
     org_export = sdk_helpers.read_json_file(mock_paths.MOCK_EXPORT_RES)
 
@@ -451,6 +451,22 @@ def test_pass_package_files_validate_customize_py(fx_copy_fn_main_mock_integrati
         assert isinstance(result, SDKValidateIssue)
         assert result.severity == SDKValidateIssue.SEVERITY_LEVEL_DEBUG
 
+def test_package_files_validate_customize_py_import_definition_given(fx_copy_fn_main_mock_integration, fx_get_package_files_config):
+
+    filename = "customize.py"
+    i = fx_get_package_files_config[filename]
+    attr_dict = sdk_validate_configs.package_files[i][1]
+    path_file = os.path.join(fx_copy_fn_main_mock_integration[1], attr_dict.get("path").format(fx_copy_fn_main_mock_integration[0]))
+
+    # the import definition already parsed by validate is used, rather than parsing it again
+    with patch("resilient_sdk.util.sdk_validate_helpers.package_helpers.get_import_definition_from_customize_py") as mock_import_def:
+
+        result = sdk_validate_helpers.package_files_validate_customize_py(path_file, attr_dict, import_definition={"action_order": [], "actions": [ {} ]})
+
+        mock_import_def.assert_not_called()
+        assert len(result) == 1
+        assert result[0].severity == SDKValidateIssue.SEVERITY_LEVEL_DEBUG
+
 def test_fail_package_files_validate_customize_py(fx_copy_fn_main_mock_integration, fx_get_package_files_config):
 
     filename = "customize.py"
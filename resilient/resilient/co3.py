@@ -14,9 +14,10 @@ from argparse import Namespace
 import requests
 from cachetools import TTLCache, cachedmethod
 
-from . import co3base
+from . import co3base, constants
 from .co3base import NoChange, ensure_unicode, get_proxy_dict
 from .patch import PatchStatus
+from .traffic_capture import ReplayAdapter, open_capture
 
 try:
     # Python 3
@@ -142,10 +143,14 @@ def get_client(opts, custom_headers=None, **kwargs):
                           "verify": verify,
                           "certauth": certauth,
                           "custom_headers": custom_headers}
-    if opts.get("log_http_responses"):
-        LOG.warning("Logging all HTTP Responses from Resilient to %s", opts["log_http_responses"])
+    if opts.get("log_http_responses") or opts.get(constants.APP_CONFIG_CAPTURE_HTTP_TRAFFIC):
         simple_client = LoggingSimpleClient
-        simple_client_args["logging_directory"] = opts["log_http_responses"]
+        if opts.get("log_http_responses"):
+            LOG.warning("Logging all HTTP Responses from Resilient to %s", opts["log_http_responses"])
+            simple_client_args["logging_directory"] = opts["log_http_responses"]
+        if opts.get(constants.APP_CONFIG_CAPTURE_HTTP_TRAFFIC):
+            LOG.warning("Capturing all HTTP Responses from Resilient to %s", opts[constants.APP_CONFIG_CAPTURE_HTTP_TRAFFIC])
+            simple_client_args["capture_file"] = opts[constants.APP_CONFIG_CAPTURE_HTTP_TRAFFIC]
     else:
         simple_client = SimpleClient
 
@@ -165,6 +170,13 @@ def get_client(opts, custom_headers=None, **kwargs):
         mock_class = getattr(module, class_name)
         res_mock = mock_class(org_name=opts.get("org"), email=opts["email"])
         resilient_client.session.mount("https://", res_mock.adapter)
+    elif opts.get(constants.APP_CONFIG_REPLAY_HTTP_TRAFFIC):
+        # Answer requests with the responses of a capture
+        LOG.warning("Replaying '%s' for Resilient REST API", opts[constants.APP_CONFIG_REPLAY_HTTP_TRAFFIC])
+        latency_scale = opts.get(constants.APP_CONFIG_REPLAY_LATENCY_SCALE)
+        if latency_scale is None:
+            latency_scale = constants.APP_CONFIG_REPLAY_LATENCY_SCALE_DEFAULT
+        resilient_client.session.mount("https://", ReplayAdapter(opts[constants.APP_CONFIG_REPLAY_HTTP_TRAFFIC], latency_scale=latency_scale))
 
     #
     #   Check if we are using API Key or user/password. API key is the
@@ -810,9 +822,22 @@ class SimpleClient(co3base.BaseClient):
 
 
 class LoggingSimpleClient(SimpleClient):
-    """ Simple Client version that logs all Resilient REST API responses to disk.  Useful when building a Mock."""
-    def __init__(self, logging_directory="", *args, **kwargs):
+    """
+    Simple Client version that logs all Resilient REST API responses to disk.  Useful when building a Mock.
+
+    Each response is written to separate JSON/DATA and HEADER files in ``logging_directory``
+    and/or, if ``capture_file`` is set, appended to that file by a background thread.
+    Mount a :class:`resilient.traffic_capture.ReplayAdapter` of the file on a client's session
+    to answer its requests with the captured responses.
+    """
+    def __init__(self, logging_directory="", *args, capture_file=None, **kwargs):
         super(LoggingSimpleClient, self).__init__(*args, **kwargs)
+        self.logging_directory = None
+        self.capture = None
+        if capture_file:
+            self.capture = open_capture(os.path.expandvars(os.path.expanduser(capture_file)))
+            if not logging_directory:
+                return
         try:
             directory = os.path.expanduser(logging_directory)
             directory = os.path.expandvars(directory)
@@ -824,6 +849,10 @@ class LoggingSimpleClient(SimpleClient):
 
     def _log_response(self, response, *args, **kwargs):
         """ Log Headers and JSON from a Requests Response object """
+        if self.capture:
+            self.capture.record(response)
+        if not self.logging_directory:
+            return
         url = urlparse.urlparse(response.url)
         filename = "_".join((str(response.status_code), "{0}",
                              response.request.method,
@@ -110,6 +110,9 @@ class ArgumentParser(argparse.ArgumentParser):
         default_max_request_retries = self.getopt(constants.PACKAGE_NAME, constants.APP_CONFIG_REQUEST_MAX_RETRIES) or constants.APP_CONFIG_REQUEST_MAX_RETRIES_DEFAULT
         default_request_retry_delay = self.getopt(constants.PACKAGE_NAME, constants.APP_CONFIG_REQUEST_RETRY_DELAY) or constants.APP_CONFIG_REQUEST_RETRY_DELAY_DEFAULT
         default_request_retry_backoff = self.getopt(constants.PACKAGE_NAME, constants.APP_CONFIG_REQUEST_RETRY_BACKOFF) or constants.APP_CONFIG_REQUEST_RETRY_BACKOFF_DEFAULT
+        default_capture_http_traffic = self.getopt(constants.PACKAGE_NAME, constants.APP_CONFIG_CAPTURE_HTTP_TRAFFIC)
+        default_replay_http_traffic = self.getopt(constants.PACKAGE_NAME, constants.APP_CONFIG_REPLAY_HTTP_TRAFFIC)
+        default_replay_latency_scale = self.getopt(constants.PACKAGE_NAME, constants.APP_CONFIG_REPLAY_LATENCY_SCALE) or constants.APP_CONFIG_REPLAY_LATENCY_SCALE_DEFAULT
 
         # PAM plugin configurations
         if helpers.is_running_in_app_host(constants.ENV_VAR_APP_HOST_CONTAINER):
@@ -202,6 +205,20 @@ class ArgumentParser(argparse.ArgumentParser):
                           default=default_request_retry_backoff,
                           help="Multiplier applied to delay between retry attempts. Defaults to 2")
 
+        self.add_argument("--{0}".format(constants.APP_CONFIG_CAPTURE_HTTP_TRAFFIC),
+                          default=default_capture_http_traffic,
+                          help="Capture all Resilient REST API responses to this file, to replay later")
+
+        self.add_argument("--{0}".format(constants.APP_CONFIG_REPLAY_HTTP_TRAFFIC),
+                          default=default_replay_http_traffic,
+                          help="Answer Resilient REST API requests with the responses captured in this file")
+
+        self.add_argument("--{0}".format(constants.APP_CONFIG_REPLAY_LATENCY_SCALE),
+                          type=float,
+                          default=default_replay_latency_scale,
+                          help="Multiplier applied to the time captured responses took when replaying them. "
+                               "Defaults to 1, 0 for no delay")
+
         self.add_argument("--{0}".format(constants.PAM_TYPE_CONFIG),
                           default=default_pam_type,
                           help="PAM plugin type to use for pulling secrets. Defaults to Keyring")
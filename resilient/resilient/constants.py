@@ -41,12 +41,16 @@ APP_CONFIG_MAX_CONNECTION_RETRIES = "max_connection_retries"
 APP_CONFIG_REQUEST_MAX_RETRIES = "request_max_retries"
 APP_CONFIG_REQUEST_RETRY_DELAY = "request_retry_delay"
 APP_CONFIG_REQUEST_RETRY_BACKOFF = "request_retry_backoff"
+APP_CONFIG_CAPTURE_HTTP_TRAFFIC = "capture_http_traffic"
+APP_CONFIG_REPLAY_HTTP_TRAFFIC = "replay_http_traffic"
+APP_CONFIG_REPLAY_LATENCY_SCALE = "replay_latency_scale"
 
 # app config default values
 APP_CONFIG_MAX_CONNECTION_RETRIES_DEFAULT = -1
 APP_CONFIG_REQUEST_MAX_RETRIES_DEFAULT = 5
 APP_CONFIG_REQUEST_RETRY_DELAY_DEFAULT = 2
 APP_CONFIG_REQUEST_RETRY_BACKOFF_DEFAULT = 2
+APP_CONFIG_REPLAY_LATENCY_SCALE_DEFAULT = 1.0
 
 # PAM plugin constants
 PAM_TYPE_CONFIG = "pam_type"
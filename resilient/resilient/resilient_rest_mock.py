@@ -3,6 +3,7 @@
 
 import logging
 from collections import namedtuple
+import functools
 import json
 import re
 import requests_mock
@@ -11,6 +12,13 @@ LOG = logging.getLogger(__name__)
 LOG.addHandler(logging.StreamHandler())
 LOG.setLevel(logging.DEBUG)
 
+# number of distinct (method, url) pairs whose matching routes are remembered
+ROUTE_CACHE_SIZE = 4096
+
+# characters that end the literal text at the start of an endpoint regex
+_REGEX_SPECIAL = set("\\^$.|?*+()[]{}")
+_REGEX_QUANTIFIERS = set("?*+{")
+
 
 def resilient_endpoint(request_type, uri):
     def mark(func):
@@ -20,17 +28,124 @@ def resilient_endpoint(request_type, uri):
     return mark
 
 
+def get_literal_prefix(uri):
+    """
+    Get the literal text every URL matching the endpoint regex ``uri`` must contain
+
+    >>> get_literal_prefix("/incidents/[0-9]+")
+    '/incidents/'
+    >>> get_literal_prefix("/incidents/?")
+    '/incidents'
+
+    :param uri: the regex of an endpoint
+    :type uri: str
+    :return: the literal text at the start of ``uri``. Empty if ``uri`` has no such text
+    :rtype: str
+    """
+    if "|" in uri:
+        # alternatives may not share any text
+        return ""
+
+    literal = []
+    i = 0
+    while i < len(uri):
+        char = uri[i]
+        if char == "\\" and i + 1 < len(uri) and not uri[i + 1].isalnum():
+            # an escaped character like \? or \.
+            char = uri[i + 1]
+            i += 1
+        elif char in _REGEX_SPECIAL:
+            if char in _REGEX_QUANTIFIERS and literal:
+                # the character before a quantifier is optional or repeated
+                literal.pop()
+            break
+        literal.append(char)
+        i += 1
+    return "".join(literal)
+
+
+class Route(object):
+    """ An endpoint of a :class:`ResilientMock` with its regex compiled """
+
+    __slots__ = ("priority", "method", "uri", "regex", "literal", "segment", "handler")
+
+    def __init__(self, priority, method, uri, handler):
+        self.priority = priority
+        self.method = method
+        self.uri = uri
+        self.regex = re.compile(uri)
+        self.literal = get_literal_prefix(uri)
+        self.handler = handler
+
+        # A literal like "/incidents/" can only be in a URL that has "incidents"
+        # as one of its "/" separated parts, so the route can be indexed on it
+        self.segment = None
+        if self.literal.startswith("/"):
+            end = self.literal.find("/", 1)
+            if end > 1:
+                self.segment = self.literal[1:end]
+
+    def matches(self, url):
+        return self.literal in url and self.regex.search(url) is not None
+
+
+class RouteTable(object):
+    """
+    The endpoints of a :class:`ResilientMock`, indexed by request method and
+    by the first part of the literal text of their regex.
+
+    :meth:`get_routes` returns the same routes, in the same order, that
+    registering each endpoint as its own ``requests_mock`` matcher would try:
+    the routes registered last are tried first.
+
+    :param endpoints: ``(method, uri, handler)`` of each endpoint, in the order they are registered
+    :type endpoints: list
+    """
+
+    def __init__(self, endpoints):
+        # method -> {segment: [Route]}
+        self._indexed = {}
+        # method -> [Route] that do not have a segment
+        self._unindexed = {}
+        self.routes = []
+
+        for priority, (method, uri, handler) in enumerate(reversed(list(endpoints))):
+            route = Route(priority, method, uri, handler)
+            self.routes.append(route)
+            if route.segment:
+                self._indexed.setdefault(method, {}).setdefault(route.segment, []).append(route)
+            else:
+                self._unindexed.setdefault(method, []).append(route)
+
+        self.get_routes = functools.lru_cache(maxsize=ROUTE_CACHE_SIZE)(self._get_routes)
+
+    def _get_routes(self, method, url):
+        """
+        :return: the routes that match ``method`` and ``url``, in the order to try them
+        :rtype: tuple
+        """
+        candidates = list(self._unindexed.get(method, ()))
+        indexed = self._indexed.get(method)
+        if indexed:
+            for segment in set(url.split("/")).intersection(indexed):
+                candidates.extend(indexed[segment])
+            candidates.sort(key=lambda route: route.priority)
+        return tuple(route for route in candidates if route.matches(url))
+
+
 class ResilientMockType(type):
     def __new__(mcl, name, bases, nmspc):
         Endpoint = namedtuple("Endpoint", "type uri")
         try:
-            endpoints = bases[0].registered_endpoints
+            # copy so that a subclass does not add its endpoints to its base class
+            endpoints = dict(bases[0].registered_endpoints)
         except:
             endpoints = {}
         for obj in nmspc.values():
             if hasattr(obj, 'uri'):
                 endpoints[Endpoint(type=obj.request_type, uri=obj.uri)] = obj
         nmspc['registered_endpoints'] = endpoints
+        nmspc['route_table'] = RouteTable((endpoint.type, endpoint.uri, handler) for endpoint, handler in endpoints.items())
         return super(ResilientMockType, mcl).__new__(mcl, name, bases, nmspc)
 
 @add_metaclass(ResilientMockType)
@@ -42,24 +157,26 @@ class ResilientMock(object):
         self.org_name = org_name or "Test Org"
         if log_registration:
             LOG.info("Initialize ResilientMock %s %s", self.email, self.org_name)
+            for endpoint, handler in self.registered_endpoints.items():
+                LOG.debug("Registering %s %s to %s", endpoint.type,
+                          endpoint.uri, str(handler))
 
         self.adapter = requests_mock.Adapter()
-        for endpoint, handler in self.registered_endpoints.items():
-            # Register with regex since some endpoints embed the org_id in the path
-            if log_registration:
-                LOG.debug("Registering %s %s to %s", endpoint.type,
-                      endpoint.uri, str(handler))
-            self.adapter.add_matcher(lambda request,
-                                     method=endpoint.type,
-                                     callback=handler,
-                                     uri=endpoint.uri: self._custom_matcher(method,
-                                                                   uri,
-                                                                   lambda request: callback(self, request),
-                                                                   request))
+        # Match with regex since some endpoints embed the org_id in the path.
+        # One matcher looks up the matching endpoints in the route table
+        self.adapter.add_matcher(self._dispatch)
+
+    def _dispatch(self, request):
+        """ matcher function for passing to adapter.add_matcher() """
+        for route in self.route_table.get_routes(request.method, request.url):
+            response = route.handler(self, request)
+            if response is not None:
+                return response
+        return None
 
     @staticmethod
     def _custom_matcher(request_type, uri, response_callback, request):
-        """ matcher function for passing to adapter.add_matcher() """
+        """ matcher function for a single endpoint """
         if request.method == request_type and re.search(uri, request.url):
             return response_callback(request)
         else:
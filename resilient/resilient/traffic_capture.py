@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+"""
+Capture the Resilient REST API traffic of a client to a single file and
+replay it later without a server.
+
+The file has a JSON object on each line: a ``{"version": 1}`` header, then
+a record of each response. Each line is flushed as it is written, so the
+responses captured before a process is killed can still be replayed. Captures
+appended to one another can be replayed together.
+
+Request headers and bodies are not captured, and neither are the cookies and
+``Set-Cookie`` headers of responses. The ``csrf_token`` of the ``/rest/session``
+responses is replaced with :data:`REDACTED`, so the session of the client that
+was captured is not written to the capture file. When a session is replayed, the
+client gets :data:`REDACTED` as its ``X-sess-id`` and ``JSESSIONID``.
+"""
+
+import atexit
+import base64
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.parse as urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+LOG = logging.getLogger(__name__)
+
+CAPTURE_VERSION = 1
+
+REDACTED = "REDACTED"
+SESSION_PATH = "/rest/session"
+SESSION_COOKIE = "JSESSIONID"
+SESSION_REDACTED_FIELDS = ("csrf_token",)
+REDACTED_HEADERS = ("set-cookie",)
+
+# path -> the open TrafficCapture writing to it
+_CAPTURES = {}
+_CAPTURES_LOCK = threading.Lock()
+
+
+def get_capture_key(method, url):
+    """
+    The key to match a captured response on: the method and the path
+    and query of the URL, so a capture can be replayed against any host
+
+    :param method: ``GET``, ``POST``, etc.
+    :type method: str
+    :param url: full URL of the request
+    :type url: str
+    :return: ``METHOD /path?query``
+    :rtype: str
+    """
+    parsed = urlparse.urlsplit(url)
+    path = parsed.path or "/"
+    if parsed.query:
+        path = u"{0}?{1}".format(path, parsed.query)
+    return u"{0} {1}".format(method.upper(), path)
+
+
+def is_session_key(key):
+    """
+    :param key: ``METHOD /path?query`` from :func:`get_capture_key`
+    :type key: str
+    :return: ``True`` if ``key`` is a request to the ``/rest/session`` endpoints
+    :rtype: bool
+    """
+    path = key.split(" ", 1)[-1].split("?", 1)[0]
+    return path == SESSION_PATH or path.startswith(SESSION_PATH + "/")
+
+
+def redact_session_content(content):
+    """
+    Replace the value of the :data:`SESSION_REDACTED_FIELDS` in the JSON
+    body of a ``/rest/session`` response with :data:`REDACTED`.
+    A body that is not a JSON object is dropped.
+
+    :param content: body of the response
+    :type content: bytes
+    :return: the redacted body
+    :rtype: bytes
+    """
+    try:
+        session = json.loads(content)
+    except ValueError:
+        return b""
+    if not isinstance(session, dict):
+        return b""
+    for field in SESSION_REDACTED_FIELDS:
+        if field in session:
+            session[field] = REDACTED
+    return json.dumps(session).encode("utf-8")
+
+
+def open_capture(path):
+    """
+    Get the open :class:`TrafficCapture` writing to ``path``, or start one.
+    Clients that capture to the same file share one capture, so a client
+    created later does not overwrite the responses of an earlier one.
+
+    :param path: path of the capture file
+    :type path: str
+    :rtype: TrafficCapture
+    """
+    path = os.path.abspath(path)
+    with _CAPTURES_LOCK:
+        capture = _CAPTURES.get(path)
+        if capture is None:
+            capture = TrafficCapture(path)
+            _CAPTURES[path] = capture
+        return capture
+
+
+class TrafficCapture(object):
+    """
+    Append the responses passed to :meth:`record` to a capture file.
+    The responses are written by a background thread, so recording a
+    response does not slow down the request that made it.
+
+    **Example:**
+
+    .. code-block:: python
+
+        capture = TrafficCapture("/tmp/soar_traffic.jsonl")
+        session.hooks["response"].append(lambda response, *args, **kwargs: capture.record(response))
+        ...
+        capture.close()
+
+    :param path: path of the capture file to create. An existing file is overwritten
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.recorded = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_capture, name="TrafficCapture", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, response):
+        """
+        Queue ``response`` to be written to the capture file
+
+        :param response: a response with its content read (not ``stream=True``)
+        :type response: requests.Response
+        """
+        if not self._closed:
+            self._queue.put((response, time.time()))
+
+    def close(self):
+        """ Write the queued responses, then close the capture file """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+        with _CAPTURES_LOCK:
+            if _CAPTURES.get(os.path.abspath(self.path)) is self:
+                _CAPTURES.pop(os.path.abspath(self.path))
+
+    def _write_capture(self):
+        with open(self.path, "w", encoding="utf-8") as capture_file:
+            capture_file.write(json.dumps({"version": CAPTURE_VERSION}) + "\n")
+            capture_file.flush()
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                response, timestamp = item
+                try:
+                    capture_file.write(json.dumps(self._make_record(response, timestamp)) + "\n")
+                    capture_file.flush()
+                    self.recorded += 1
+                except Exception as err:
+                    LOG.error("Failed to capture response from %s: %s", response.url, err)
+        LOG.info("Captured %s responses to %s", self.recorded, self.path)
+
+    @staticmethod
+    def _make_record(response, timestamp):
+        key = get_capture_key(response.request.method, response.url)
+        content = response.content or b""
+        if is_session_key(key):
+            content = redact_session_content(content)
+        record = {
+            "key": key,
+            "url": response.url,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": {name: value for name, value in response.headers.items()
+                        if name.lower() not in REDACTED_HEADERS},
+            "content": base64.b64encode(content).decode("ascii"),
+            "elapsed": response.elapsed.total_seconds() if response.elapsed else 0.0,
+            "timestamp": timestamp
+        }
+        return record
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    A ``requests`` transport adapter that answers requests with the
+    responses in a capture file written by :class:`TrafficCapture`.
+
+    The responses captured for the same method, path and query are
+    returned in the order they were captured, starting again from the
+    first one when they run out. A request that was not captured gets
+    a ``404`` response. Replayed ``/rest/session`` responses set a
+    ``JSESSIONID`` cookie of :data:`REDACTED`, as the captured cookie
+    is not in the capture file. A line that is not complete, like the
+    last one of a capture whose process was killed, is skipped.
+
+    **Example:**
+
+    .. code-block:: python
+
+        client = SimpleClient(org_name="My Org", base_url="https://soar.example.com")
+        client.session.mount("https://", ReplayAdapter("/tmp/soar_traffic.jsonl", latency_scale=0.5))
+
+    :param path: path of the capture file
+    :type path: str
+    :param latency_scale: multiply the time each captured response took by this
+        and wait that long before returning it. ``0`` returns responses immediately
+    :type latency_scale: float
+    """
+
+    def __init__(self, path, latency_scale=1.0):
+        super(ReplayAdapter, self).__init__()
+        self.path = path
+        self.latency_scale = float(latency_scale)
+        self._capture_file = open(path, "rb")
+        self._records = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+
+        # key -> offsets of its records in the file, which are read the first time they are replayed
+        index = {}
+        offset = 0
+        for line in self._capture_file:
+            try:
+                key = json.loads(line).get("key")
+            except ValueError:
+                LOG.warning("Skipping a line of %s that is not complete at offset %s", path, offset)
+                key = None
+            if key:
+                index.setdefault(key, []).append(offset)
+            offset += len(line)
+        self._index = index
+
+    @property
+    def keys(self):
+        """ ``METHOD /path?query`` of every captured request """
+        return list(self._index)
+
+    def _get_record(self, key):
+        entries = self._index.get(key)
+        if not entries:
+            return None
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = (position + 1) % len(entries)
+            offset = entries[position]
+            record = self._records.get(offset)
+            if record is None:
+                self._capture_file.seek(offset)
+                record = json.loads(self._capture_file.readline())
+                record["content"] = base64.b64decode(record["content"])
+                self._records[offset] = record
+        return record
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = get_capture_key(request.method, request.url)
+        record = self._get_record(key)
+
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.connection = self
+
+        if record is None:
+            LOG.warning("No captured response for %s", key)
+            response.status_code = 404
+            response.reason = "Not Found"
+            response._content = b""
+            return response
+
+        if self.latency_scale and record["elapsed"]:
+            time.sleep(record["elapsed"] * self.latency_scale)
+
+        response.status_code = record["status_code"]
+        response.reason = record["reason"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = record["content"]
+
+        if is_session_key(key):
+            response.cookies.set(SESSION_COOKIE, REDACTED)
+        return response
+
+    def close(self):
+        self._capture_file.close()
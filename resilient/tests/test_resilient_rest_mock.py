@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+import re
+
+import pytest
+import requests
+import requests_mock
+from resilient.resilient_rest_mock import (ResilientMock, get_literal_prefix,
+                                           resilient_endpoint)
+
+MOCK_URL = "https://example.com"
+
+
+class MockRoutes(ResilientMock):
+
+    @resilient_endpoint("GET", "/incidents/[0-9]+")
+    def incident_get(self, request):
+        return requests_mock.create_response(request, status_code=200, json={"handler": "incident_get"})
+
+    @resilient_endpoint("GET", "/incidents/[0-9]+/artifacts")
+    def artifacts_get(self, request):
+        return requests_mock.create_response(request, status_code=200, json={"handler": "artifacts_get"})
+
+    @resilient_endpoint("POST", "/incidents/[0-9]+")
+    def incident_post(self, request):
+        return requests_mock.create_response(request, status_code=200, json={"handler": "incident_post"})
+
+    @resilient_endpoint("GET", "/functions")
+    def functions_get(self, request):
+        return requests_mock.create_response(request, status_code=200, json={"handler": "functions_get"})
+
+    @resilient_endpoint("GET", "/functions/.*$")
+    def functions_get_xxx(self, request):
+        if request.path.endswith("/none"):
+            # fall through to the next matching endpoint
+            return None
+        return requests_mock.create_response(request, status_code=200, json={"handler": "functions_get_xxx"})
+
+
+class MockRoutesOverride(MockRoutes):
+
+    @resilient_endpoint("GET", "/functions")
+    def functions_get(self, request):
+        return requests_mock.create_response(request, status_code=200, json={"handler": "override"})
+
+
+def _get(mock, method, path):
+    session = requests.Session()
+    session.mount(MOCK_URL, mock.adapter)
+    return session.request(method, MOCK_URL + path)
+
+
+def _linear_match(mock, method, url):
+    """ the endpoint matched by registering each endpoint as its own matcher """
+    for endpoint in reversed(list(mock.registered_endpoints)):
+        if endpoint.type == method and re.search(endpoint.uri, url):
+            return endpoint.uri
+    return None
+
+
+@pytest.mark.parametrize("uri, expected", [
+    ("/incidents/[0-9]+", "/incidents/"),
+    ("/incidents/?", "/incidents"),
+    ("/incidents/query\\?.*", "/incidents/query?"),
+    ("/wikis/[0123456789]{1,2}$", "/wikis/"),
+    ("/types/[\\w_]+$", "/types/"),
+    ("/rest/session", "/rest/session"),
+    ("(/a|/b)", ""),
+    ("^/rest", ""),
+])
+def test_get_literal_prefix(uri, expected):
+    assert get_literal_prefix(uri) == expected
+
+
+@pytest.mark.parametrize("method, path, expected", [
+    ("GET", "/rest/orgs/201/incidents/2314", "incident_get"),
+    ("GET", "/rest/orgs/201/incidents/2314/artifacts", "artifacts_get"),
+    ("POST", "/rest/orgs/201/incidents/2314", "incident_post"),
+    ("GET", "/rest/orgs/201/functions?handle_format=names", "functions_get"),
+    ("GET", "/rest/orgs/201/functions/fn_mock", "functions_get_xxx"),
+    ("GET", "/rest/orgs/201/functions/none", "functions_get"),
+])
+def test_dispatch(method, path, expected):
+    mock = MockRoutes(log_registration=False)
+    response = _get(mock, method, path)
+    assert response.status_code == 200
+    assert response.json()["handler"] == expected
+
+
+def test_dispatch_no_match():
+    mock = MockRoutes(log_registration=False)
+    with pytest.raises(requests_mock.exceptions.NoMockAddress):
+        _get(mock, "PUT", "/rest/orgs/201/incidents/2314")
+
+
+def test_dispatch_matches_linear_order():
+    mock = MockRoutes(log_registration=False)
+    for method in ("GET", "POST"):
+        for path in ("/rest/orgs/201/incidents/1", "/rest/orgs/201/incidents/1/artifacts",
+                     "/rest/orgs/201/functions", "/rest/orgs/201/functions/x", "/rest/orgs/201/tasks/1"):
+            url = MOCK_URL + path
+            routes = mock.route_table.get_routes(method, url)
+            first = routes[0].uri if routes else None
+            assert first == _linear_match(mock, method, url)
+
+
+def test_subclass_override():
+    assert _get(MockRoutesOverride(log_registration=False), "GET", "/rest/orgs/201/functions").json()["handler"] == "override"
+    # the override is not added to the base class
+    assert _get(MockRoutes(log_registration=False), "GET", "/rest/orgs/201/functions").json()["handler"] == "functions_get"
+    assert len(MockRoutesOverride.registered_endpoints) == len(MockRoutes.registered_endpoints)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# (c) Copyright IBM Corp. 2025. All Rights Reserved.
+
+import base64
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+
+import requests
+import requests_mock
+from resilient import SimpleClient
+from resilient.co3 import LoggingSimpleClient
+from resilient.traffic_capture import (CAPTURE_VERSION, REDACTED,
+                                       ReplayAdapter, TrafficCapture,
+                                       get_capture_key, is_session_key,
+                                       open_capture)
+from tests.shared_mock_data import mock_paths
+
+MOCK_URL = "https://example.com"
+MOCK_SESSION = {"csrf_token": "mock_csrf_token", "user_id": 1, "orgs": [{"id": 201, "name": "Mock Org", "enabled": True}]}
+
+
+def _mock_server(adapter):
+    adapter.register_uri("POST", MOCK_URL + "/rest/session", json=MOCK_SESSION,
+                         headers={"Set-Cookie": "JSESSIONID=MockSessionId; Path=/; Secure; HttpOnly"})
+    adapter.register_uri("GET", MOCK_URL + "/rest/orgs/201/incidents/1",
+                         [{"json": {"id": 1, "vers": 1}}, {"json": {"id": 1, "vers": 2}}])
+    adapter.register_uri("GET", MOCK_URL + "/rest/orgs/201/incidents/1/attachments/1/contents",
+                         content=b"\x00\x01binary", headers={"Content-Type": "application/octet-stream"})
+
+
+def _read_records(path):
+    """ the header and the records of each key in a capture file """
+    with open(path) as capture_file:
+        lines = [json.loads(line) for line in capture_file]
+    records = {}
+    for record in lines[1:]:
+        records.setdefault(record["key"], []).append(record)
+    return lines[0], records
+
+
+def _capture(path):
+    client = LoggingSimpleClient(org_name="Mock Org", base_url=MOCK_URL, capture_file=path)
+    adapter = requests_mock.Adapter()
+    client.session.mount("https://", adapter)
+    _mock_server(adapter)
+
+    client.connect("api@example.com", "mock_password")
+    client.get("/incidents/1")
+    client.get("/incidents/1")
+    client.get_content("/incidents/1/attachments/1/contents")
+    client.capture.close()
+    return client
+
+
+def test_get_capture_key():
+    assert get_capture_key("get", "https://example.com/rest/orgs/201/incidents/1?handle_format=names") == "GET /rest/orgs/201/incidents/1?handle_format=names"
+    assert get_capture_key("POST", "https://other.example.com:8443") == "POST /"
+
+
+def test_capture(fx_mk_temp_dir):
+    path = os.path.join(mock_paths.TEST_TEMP_DIR, "capture.jsonl")
+    client = _capture(path)
+
+    assert client.capture.recorded == 4
+    assert client.logging_directory is None
+
+    header, records = _read_records(path)
+    assert header == {"version": CAPTURE_VERSION}
+    assert len(records["GET /rest/orgs/201/incidents/1"]) == 2
+    # request bodies (which have the password) are not captured
+    assert "mock_password" not in json.dumps(records["POST /rest/session?include_permissions=false"])
+
+
+def test_is_session_key():
+    assert is_session_key("POST /rest/session?include_permissions=false")
+    assert is_session_key("GET /rest/session/201/acl")
+    assert not is_session_key("GET /rest/sessions")
+    assert not is_session_key("GET /rest/orgs/201/incidents/1")
+
+
+def test_capture_redacts_session(fx_mk_temp_dir):
+    path = os.path.join(mock_paths.TEST_TEMP_DIR, "capture.jsonl")
+    _capture(path)
+
+    header, records = _read_records(path)
+    session_record = records["POST /rest/session?include_permissions=false"][0]
+    assert "cookies" not in session_record
+    assert "set-cookie" not in [name.lower() for name in session_record["headers"]]
+    assert json.loads(base64.b64decode(session_record["content"]))["csrf_token"] == REDACTED
+
+    # the session is not anywhere in the capture
+    with open(path, "rb") as capture_file:
+        data = capture_file.read()
+    assert b"mock_csrf_token" not in data
+    assert b"MockSessionId" not in data
+
+
+def test_open_capture_shared(fx_mk_temp_dir):
+    path = os.path.join(mock_paths.TEST_TEMP_DIR, "capture.jsonl")
+    capture = open_capture(path)
+    assert open_capture(path) is capture
+    capture.close()
+    assert open_capture(path) is not capture
+    open_capture(path).close()
+
+
+def test_replay(fx_mk_temp_dir):
+    path = os.path.join(mock_paths.TEST_TEMP_DIR, "capture.jsonl")
+    _capture(path)
+
+    client = SimpleClient(org_name="Mock Org", base_url="https://soar.example.com")
+    client.session.mount("https://", ReplayAdapter(path, latency_scale=0))
+
+    userinfo = client.connect("api@example.com", "any password")
+    assert userinfo == dict(MOCK_SESSION, csrf_token=REDACTED)
+    assert client.headers["X-sess-id"] == REDACTED
+    assert client.cookies["JSESSIONID"] == REDACTED
+
+    # responses to the same request are replayed in order, then start again
+    assert client.get("/incidents/1")["vers"] == 1
+    assert client.get("/incidents/1")["vers"] == 2
+    assert client.get("/incidents/1")["vers"] == 1
+
+    assert client.get_content("/incidents/1/attachments/1/contents") == b"\x00\x01binary"
+
+
+def test_replay_not_captured(fx_mk_temp_dir):
+    path = os.path.join(mock_paths.TEST_TEMP_DIR, "capture.jsonl")
+    _capture(path)
+
+    session = requests.Session()
+    session.mount("https://", ReplayAdapter(path, latency_scale=0))
+    assert session.get(MOCK_URL + "/rest/orgs/201/incidents/2").status_code == 404
+
+
+def test_replay_latency(fx_mk_temp_dir):
+    path = os.path.join(mock_paths.TEST_TEMP_DIR, "capture.jsonl")
+    response = requests.Response()
+    response.request = requests.Request("GET", MOCK_URL + "/rest/const").prepare()
+    response.url = response.request.url
+    response.status_code = 200
+    response._content = b"{}"
+    response.elapsed = datetime.timedelta(seconds=0.2)
+
+    capture = TrafficCapture(path)
+    capture.record(response)
+    capture.close()
+
+    session = requests.Session()
+    session.mount("https://", ReplayAdapter(path, latency_scale=0.5))
+    start = time.monotonic()
+    replayed = session.get(MOCK_URL + "/rest/const")
+    assert time.monotonic() - start >= 0.1
+    assert replayed.json() == {}
+
+
+def test_replay_killed_capture(fx_mk_temp_dir):
+    # the responses captured before the process was killed are in the file
+    path = os.path.join(mock_paths.TEST_TEMP_DIR, "capture.jsonl")
+    code = """
+import os, signal, sys, time, requests
+from resilient.traffic_capture import TrafficCapture
+response = requests.Response()
+response.request = requests.Request("GET", "https://example.com/rest/const").prepare()
+response.url = response.request.url
+response.status_code = 200
+response._content = b"{}"
+capture = TrafficCapture(sys.argv[1])
+capture.record(response)
+while not capture.recorded:
+    time.sleep(0.01)
+os.kill(os.getpid(), signal.SIGKILL)
+"""
+    process = subprocess.run([sys.executable, "-c", code, path])
+    assert process.returncode != 0
+
+    # and a line cut short by the kill is skipped
+    with open(path, "a") as capture_file:
+        capture_file.write('{"key": "GET /rest/orgs/201/incid')
+
+    session = requests.Session()
+    session.mount("https://", ReplayAdapter(path, latency_scale=0))
+    assert session.get(MOCK_URL + "/rest/const").json() == {}